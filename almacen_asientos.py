@@ -0,0 +1,476 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from itertools import accumulate, islice
+
+
+class _Prefijo:
+    """Los primeros elementos de un arreglo que sigue creciendo al final, de solo lectura:
+    len(), iterar y los slices no pasan del tamaño que tenía al crearlo"""
+    
+    __slots__ = ("arreglo", "tamano")
+    
+    def __init__(self, arreglo):
+        self.arreglo = arreglo
+        self.tamano = len(arreglo)
+    
+    def __len__(self):
+        return self.tamano
+    
+    def __iter__(self):
+        return islice(self.arreglo, self.tamano)
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return self.arreglo[slice(*indice.indices(self.tamano))]
+        if indice < 0:
+            indice += self.tamano
+        return self.arreglo[indice]
+
+
+class AlmacenAsientos:
+    """Almacén columnar de asientos contables basado en arreglos tipados.
+    
+    En lugar de guardar un diccionario por asiento y otro por cada línea del mayor,
+    cada dato se guarda en un arreglo de tipo fijo. Las cuentas y las descripciones
+    se guardan una sola vez en catálogos y las líneas solo guardan su id.
+    """
+    
+    CARGO = 0
+    ABONO = 1
+    
+    # Actividades de los flujos de efectivo; los de "apertura" forman el saldo inicial
+    ACTIVIDADES = ("operacion", "inversion", "financiamiento", "apertura")
+    
+    # Columna de lados de un asiento según su número de cargos y abonos (b"\x00\x00\x01", ...)
+    _PATRONES_LADO = {}
+    
+    def __init__(self):
+        # Catálogos (texto -> id)
+        self.nombres_cuentas = []
+        self.ids_cuentas = {}
+        self.descripciones = []
+        self.ids_descripciones = {}
+        
+        # Columnas por asiento
+        self.asiento_fecha = array("i")  # Fecha como ordinal (date.toordinal)
+        self.asiento_descripcion = array("i")
+        self.asiento_inicio = array("q")  # Primera línea del asiento
+        
+        # Índice de asientos ordenado por fecha (ids y sus fechas), para filtrar periodos
+        # con bisect aunque haya asientos registrados con una fecha anterior
+        self.asientos_por_fecha = array("q")
+        self.fechas_ordenadas = array("i")
+        
+        # Columnas por línea
+        self.linea_asiento = array("q")
+        self.linea_cuenta = array("i")
+        self.linea_lado = array("b")  # 0 = cargo, 1 = abono
+        self.linea_monto = array("q")  # Centavos
+        
+        # Índice de líneas por cuenta para los esquemas de mayor
+        self.lineas_por_cuenta = {}
+        
+        # Índice de saldos por cuenta: fechas de sus líneas en orden y saldo acumulado
+        # (cargos - abonos) hasta cada una, para consultar saldos a una fecha con bisect
+        self.fechas_por_cuenta = {}
+        self.acumulados_por_cuenta = {}
+        self.cuentas_desordenadas = set()  # Cuentas con líneas anteriores a la última fecha
+        # Líneas en orden de fecha de las cuentas que tuvieron líneas con fecha anterior
+        # (en las demás es el mismo orden de lineas_por_cuenta)
+        self.lineas_ordenadas_por_cuenta = {}
+        
+        # Movimientos netos de efectivo (Caja y Bancos) por asiento, para el estado de flujos
+        self.flujo_asiento = array("q")
+        self.flujo_monto = array("q")  # Centavos; positivo si entra efectivo
+        self.flujo_actividad = array("b")  # Posición en ACTIVIDADES, asignada al registrar
+        
+        # Totales acumulados de los flujos por actividad (fechas en orden y total hasta
+        # cada una), para obtener el total de una actividad en un periodo con bisect
+        self.fechas_por_actividad = {}
+        self.acumulados_por_actividad = {}
+        self.actividades_desordenadas = set()
+        
+        # Cache de fechas ya formateadas
+        self._fechas_texto = {}
+    
+    def id_cuenta(self, nombre):
+        """Devuelve el id de una cuenta, dándola de alta si no existe"""
+        id_cuenta = self.ids_cuentas.get(nombre)
+        if id_cuenta is None:
+            id_cuenta = len(self.nombres_cuentas)
+            self.nombres_cuentas.append(nombre)
+            self.ids_cuentas[nombre] = id_cuenta
+        return id_cuenta
+    
+    def id_descripcion(self, texto):
+        """Devuelve el id de una descripción, dándola de alta si no existe"""
+        id_descripcion = self.ids_descripciones.get(texto)
+        if id_descripcion is None:
+            id_descripcion = len(self.descripciones)
+            self.descripciones.append(texto)
+            self.ids_descripciones[texto] = id_descripcion
+        return id_descripcion
+    
+    @staticmethod
+    def lotes_por_fecha(registros, tamano_lote=10000):
+        """Agrupa registros (dicts con fecha, descripcion, cargos, abonos y opcionalmente
+        actividad) en lotes de asientos (descripcion, cargos, abonos, actividad)
+        consecutivos con la misma fecha; genera (fecha, lote)"""
+        lote = []
+        fecha_lote = None
+        for registro in registros:
+            if lote and (registro["fecha"] != fecha_lote or len(lote) >= tamano_lote):
+                yield fecha_lote, lote
+                lote = []
+            fecha_lote = registro["fecha"]
+            lote.append((registro["descripcion"], registro["cargos"], registro["abonos"], registro.get("actividad")))
+        if lote:
+            yield fecha_lote, lote
+    
+    def iter_registros(self, asientos):
+        """Genera los asientos indicados como registros (fecha, descripcion, cargos, abonos
+        y, si mueven efectivo, la actividad de su flujo)"""
+        flujo_asiento = self.flujo_asiento
+        for asiento in asientos:
+            movimientos = ({}, {})
+            for linea in self.lineas_asiento(asiento):
+                movimientos[self.linea_lado[linea]][self.nombres_cuentas[self.linea_cuenta[linea]]] = self.linea_monto[linea]
+            registro = {
+                "fecha": self.asiento_fecha[asiento],
+                "descripcion": self.descripciones[self.asiento_descripcion[asiento]],
+                "cargos": movimientos[self.CARGO],
+                "abonos": movimientos[self.ABONO]
+            }
+            posicion = bisect_left(flujo_asiento, asiento)
+            if posicion < len(flujo_asiento) and flujo_asiento[posicion] == asiento:
+                registro["actividad"] = self.ACTIVIDADES[self.flujo_actividad[posicion]]
+            yield registro
+    
+    def subconjunto(self, asientos):
+        """Almacén nuevo con solo los asientos indicados, en ese orden y renumerados"""
+        almacen = AlmacenAsientos()
+        for fecha, lote in self.lotes_por_fecha(self.iter_registros(asientos)):
+            almacen.agregar_asientos(fecha, lote)
+        return almacen
+    
+    def agregar_asiento(self, fecha, descripcion, cargos, abonos):
+        """Agrega un asiento y sus líneas; devuelve el id del asiento"""
+        return self.agregar_asientos(fecha, ((descripcion, cargos, abonos),))[0]
+    
+    def agregar_asientos(self, fecha, asientos):
+        """Agrega un lote de asientos (descripcion, cargos, abonos[, actividad]) con la misma fecha.
+        
+        Las columnas se llenan primero en listas y se extienden una sola vez por lote; por
+        asiento se extienden con sus cargos y abonos completos y solo el índice del mayor
+        se arma línea por línea. Devuelve el id del primer asiento del lote y el cambio neto
+        (cargos - abonos) de cada cuenta movida.
+        """
+        primero = len(self.asiento_fecha)
+        linea = len(self.linea_asiento)
+        ids_descripciones = self.ids_descripciones
+        patrones_lado = self._PATRONES_LADO
+        
+        descripciones = []
+        inicios = []
+        lineas_asiento = []
+        lineas_lado = []
+        nombres = []
+        lineas_monto = []
+        nuevas_por_cuenta = {}  # Nombre de la cuenta -> (líneas, montos con signo)
+        
+        for asiento, datos in enumerate(asientos, primero):
+            descripcion, cargos, abonos = datos[0], datos[1], datos[2]  # datos[3] es la actividad
+            id_descripcion = ids_descripciones.get(descripcion)
+            if id_descripcion is None:
+                id_descripcion = self.id_descripcion(descripcion)
+            descripciones.append(id_descripcion)
+            inicios.append(linea)
+            for cuenta, monto in cargos.items():
+                nuevas = nuevas_por_cuenta.get(cuenta)
+                if nuevas is None:
+                    nuevas = nuevas_por_cuenta[cuenta] = ([], [])
+                nuevas[0].append(linea)
+                nuevas[1].append(monto)
+                linea += 1
+            for cuenta, monto in abonos.items():
+                nuevas = nuevas_por_cuenta.get(cuenta)
+                if nuevas is None:
+                    nuevas = nuevas_por_cuenta[cuenta] = ([], [])
+                nuevas[0].append(linea)
+                nuevas[1].append(-monto)
+                linea += 1
+            lineas = len(cargos) + len(abonos)
+            lineas_asiento += [asiento] * lineas
+            lado = patrones_lado.get((len(cargos), len(abonos)))
+            if lado is None:
+                lado = patrones_lado[len(cargos), len(abonos)] = bytes(len(cargos)) + b"\x01" * len(abonos)
+            lineas_lado.append(lado)
+            nombres += cargos
+            nombres += abonos
+            lineas_monto += cargos.values()
+            lineas_monto += abonos.values()
+        
+        ids_cuentas = {cuenta: self.id_cuenta(cuenta) for cuenta in nuevas_por_cuenta}
+        self.asiento_fecha.extend(array("i", (fecha,)) * len(descripciones))
+        self.asiento_descripcion.extend(descripciones)
+        self.asiento_inicio.extend(inicios)
+        self.linea_asiento.extend(lineas_asiento)
+        self.linea_cuenta.extend(map(ids_cuentas.__getitem__, nombres))
+        self.linea_lado.frombytes(b"".join(lineas_lado))
+        self.linea_monto.extend(lineas_monto)
+        
+        # Todo el lote tiene la misma fecha: se inserta en un solo bloque después de los
+        # asientos con fecha menor o igual (al final si la fecha no es anterior). Con una
+        # fecha anterior se arman arreglos nuevos en lugar de insertar en los mismos, para
+        # que una vista() conserve los que tenía
+        posicion = bisect_right(self.fechas_ordenadas, fecha)
+        ids = array("q", range(primero, primero + len(descripciones)))
+        fechas = array("i", (fecha,)) * len(descripciones)
+        if posicion == len(self.fechas_ordenadas):
+            self.asientos_por_fecha.extend(ids)
+            self.fechas_ordenadas.extend(fechas)
+        else:
+            self.asientos_por_fecha = self.asientos_por_fecha[:posicion] + ids + self.asientos_por_fecha[posicion:]
+            self.fechas_ordenadas = self.fechas_ordenadas[:posicion] + fechas + self.fechas_ordenadas[posicion:]
+        for cuenta, nuevas in nuevas_por_cuenta.items():
+            id_cuenta = ids_cuentas[cuenta]
+            indice = self.lineas_por_cuenta.get(id_cuenta)
+            if indice is None:
+                indice = self.lineas_por_cuenta[id_cuenta] = array("q")
+                self.fechas_por_cuenta[id_cuenta] = array("i")
+                self.acumulados_por_cuenta[id_cuenta] = array("q")
+            indice.extend(nuevas[0])
+            ordenadas = self.lineas_ordenadas_por_cuenta.get(id_cuenta)
+            if ordenadas is not None:
+                ordenadas.extend(nuevas[0])
+            self._acumular(id_cuenta, fecha, nuevas[1])
+        return primero, {cuenta: sum(nuevas[1]) for cuenta, nuevas in nuevas_por_cuenta.items()}
+    
+    def _acumular(self, id_cuenta, fecha, montos):
+        """Agrega al índice de saldos de una cuenta sus montos (con signo) de una misma fecha"""
+        fechas = self.fechas_por_cuenta[id_cuenta]
+        acumulados = self.acumulados_por_cuenta[id_cuenta]
+        if fechas and fechas[-1] > fecha:
+            # Línea con fecha anterior: el índice se reordena en la siguiente consulta
+            self.cuentas_desordenadas.add(id_cuenta)
+        saldo = acumulados[-1] if acumulados else 0
+        fechas.extend(array("i", (fecha,)) * len(montos))
+        acumulados.extend(islice(accumulate(montos, initial=saldo), 1, None))
+    
+    def ordenar_saldos(self):
+        """Reconstruye, ordenados por fecha, el índice de saldos de las cuentas desordenadas
+        y los totales acumulados de las actividades desordenadas"""
+        for actividad in self.actividades_desordenadas:
+            flujos = sorted((self.asiento_fecha[asiento], monto)
+                            for asiento, monto, codigo in zip(self.flujo_asiento, self.flujo_monto, self.flujo_actividad)
+                            if codigo == actividad)
+            self.fechas_por_actividad[actividad] = array("i", (fecha for fecha, _ in flujos))
+            self.acumulados_por_actividad[actividad] = array("q", accumulate(monto for _, monto in flujos))
+        self.actividades_desordenadas.clear()
+        for id_cuenta in self.cuentas_desordenadas:
+            lineas = sorted(self.lineas_por_cuenta[id_cuenta],
+                            key=lambda linea: self.asiento_fecha[self.linea_asiento[linea]])
+            fechas = array("i")
+            acumulados = array("q")
+            saldo = 0
+            for linea in lineas:
+                monto = self.linea_monto[linea]
+                saldo += -monto if self.linea_lado[linea] else monto
+                fechas.append(self.asiento_fecha[self.linea_asiento[linea]])
+                acumulados.append(saldo)
+            self.fechas_por_cuenta[id_cuenta] = fechas
+            self.acumulados_por_cuenta[id_cuenta] = acumulados
+            self.lineas_ordenadas_por_cuenta[id_cuenta] = array("q", lineas)
+        self.cuentas_desordenadas.clear()
+    
+    def saldo_al(self, id_cuenta, fecha):
+        """Saldo (cargos - abonos) de una cuenta con las líneas hasta una fecha ordinal inclusive"""
+        if self.cuentas_desordenadas:
+            self.ordenar_saldos()
+        fechas = self.fechas_por_cuenta.get(id_cuenta)
+        if not fechas:
+            return 0
+        posicion = bisect_right(fechas, fecha)
+        return self.acumulados_por_cuenta[id_cuenta][posicion - 1] if posicion else 0
+    
+    def iter_lineas_cuenta(self, id_cuenta, desde=None, hasta=None):
+        """Genera las líneas de una cuenta con fecha ordinal entre desde y hasta (inclusive),
+        en orden de fecha; los límites se buscan con bisect en su índice de saldos y no se
+        copian ni recorren las líneas fuera del periodo"""
+        if self.cuentas_desordenadas:
+            self.ordenar_saldos()
+        fechas = self.fechas_por_cuenta.get(id_cuenta)
+        if not fechas:
+            return
+        lineas = self.lineas_ordenadas_por_cuenta.get(id_cuenta)
+        if lineas is None:
+            lineas = self.lineas_por_cuenta[id_cuenta]
+        inicio = 0 if desde is None else bisect_left(fechas, desde)
+        fin = len(fechas) if hasta is None else bisect_right(fechas, hasta)
+        for posicion in range(inicio, fin):
+            yield lineas[posicion]
+    
+    def posiciones_entre(self, desde=None, hasta=None):
+        """Posiciones en asientos_por_fecha de los asientos con fecha ordinal entre desde y
+        hasta (inclusive), sin copiar sus ids"""
+        inicio = 0 if desde is None else bisect_left(self.fechas_ordenadas, desde)
+        fin = len(self.fechas_ordenadas) if hasta is None else bisect_right(self.fechas_ordenadas, hasta)
+        return range(inicio, fin)
+    
+    def asientos_entre(self, desde=None, hasta=None):
+        """Ids de los asientos con fecha ordinal entre desde y hasta (inclusive), en orden de fecha"""
+        posiciones = self.posiciones_entre(desde, hasta)
+        return self.asientos_por_fecha[posiciones.start:posiciones.stop]
+    
+    def agregar_flujos(self, fecha, asientos, montos, actividades):
+        """Agrega los movimientos netos de efectivo de algunos asientos de una misma fecha
+        (ids, centavos y posición de su actividad en ACTIVIDADES) y los suma a los totales
+        acumulados de cada actividad"""
+        self.flujo_asiento.extend(asientos)
+        self.flujo_monto.extend(montos)
+        self.flujo_actividad.extend(actividades)
+        codigos = set(actividades)
+        for actividad in codigos:
+            if len(codigos) == 1:
+                montos_actividad = montos
+            else:
+                montos_actividad = [monto for monto, codigo in zip(montos, actividades) if codigo == actividad]
+            fechas = self.fechas_por_actividad.get(actividad)
+            if fechas is None:
+                fechas = self.fechas_por_actividad[actividad] = array("i")
+                self.acumulados_por_actividad[actividad] = array("q")
+            acumulados = self.acumulados_por_actividad[actividad]
+            if fechas and fechas[-1] > fecha:
+                self.actividades_desordenadas.add(actividad)
+            total = acumulados[-1] if acumulados else 0
+            fechas.extend(array("i", (fecha,)) * len(montos_actividad))
+            acumulados.extend(islice(accumulate(montos_actividad, initial=total), 1, None))
+    
+    def iter_flujos(self, desde=None, hasta=None, actividad=None, fin=None):
+        """Genera (descripcion, monto) de cada movimiento de efectivo, en orden; con
+        actividad (posición en ACTIVIDADES) solo los de esa actividad, y con fin solo los
+        fin primeros (los que había al tomar num_flujos(), aunque se registren más).
+        
+        Con un periodo solo se recorren los asientos de esas fechas y su flujo se busca
+        con bisect (los flujos están ordenados por id de asiento).
+        """
+        descripciones = self.descripciones
+        asiento_descripcion = self.asiento_descripcion
+        flujo_actividad = self.flujo_actividad
+        if desde is None and hasta is None:
+            flujos = zip(self.flujo_asiento, self.flujo_monto, flujo_actividad)
+            for asiento, monto, codigo in flujos if fin is None else islice(flujos, fin):
+                if actividad is None or codigo == actividad:
+                    yield descripciones[asiento_descripcion[asiento]], monto
+            return
+        flujo_asiento = self.flujo_asiento
+        limite = len(flujo_asiento) if fin is None else fin
+        for asiento in self.asientos_entre(desde, hasta):
+            posicion = bisect_left(flujo_asiento, asiento, 0, limite)
+            if posicion < limite and flujo_asiento[posicion] == asiento:
+                if actividad is None or flujo_actividad[posicion] == actividad:
+                    yield descripciones[asiento_descripcion[asiento]], self.flujo_monto[posicion]
+    
+    def total_flujos(self, actividad, desde=None, hasta=None):
+        """Número y total (centavos) de los flujos de una actividad en un periodo de fechas
+        ordinales (inclusive), con bisect en sus totales acumulados"""
+        if self.actividades_desordenadas:
+            self.ordenar_saldos()
+        fechas = self.fechas_por_actividad.get(actividad)
+        if not fechas:
+            return 0, 0
+        acumulados = self.acumulados_por_actividad[actividad]
+        inicio = 0 if desde is None else bisect_left(fechas, desde)
+        fin = len(fechas) if hasta is None else bisect_right(fechas, hasta)
+        if fin <= inicio:
+            return 0, 0
+        return fin - inicio, acumulados[fin - 1] - (acumulados[inicio - 1] if inicio else 0)
+    
+    def num_flujos(self):
+        """Número de movimientos de efectivo registrados"""
+        return len(self.flujo_asiento)
+    
+    def copia(self):
+        """Copia independiente del almacén; las columnas se copian completas (memcpy)"""
+        copia = AlmacenAsientos.__new__(AlmacenAsientos)
+        copia.__dict__.update(self.__dict__)
+        for atributo, valor in self.__dict__.items():
+            if isinstance(valor, array):
+                setattr(copia, atributo, valor[:])
+            elif isinstance(valor, (list, dict, set)):
+                setattr(copia, atributo, valor.copy())
+        for atributo in ("lineas_por_cuenta", "fechas_por_cuenta", "acumulados_por_cuenta",
+                         "lineas_ordenadas_por_cuenta", "fechas_por_actividad", "acumulados_por_actividad"):
+            setattr(copia, atributo, {id_cuenta: columna[:] for id_cuenta, columna in getattr(self, atributo).items()})
+        return copia
+    
+    def vista(self):
+        """Vista de solo lectura de lo registrado hasta ahora, para consultarla desde otro
+        hilo mientras este sigue registrando, sin copiar las columnas.
+        
+        Comparte los arreglos, que solo crecen al final (los que se reordenan se
+        reemplazan por otros), y cada uno se ve hasta el tamaño que tenía: los asientos,
+        saldos y flujos que se registren después no aparecen en la vista. Se toma en el
+        hilo que registra; antes se ordenan los índices de saldos que lo necesiten.
+        """
+        if self.cuentas_desordenadas or self.actividades_desordenadas:
+            self.ordenar_saldos()
+        vista = AlmacenAsientos.__new__(AlmacenAsientos)
+        vista.__dict__.update(self.__dict__)
+        for atributo, valor in self.__dict__.items():
+            if isinstance(valor, array):
+                setattr(vista, atributo, _Prefijo(valor))
+        for atributo in ("lineas_por_cuenta", "fechas_por_cuenta", "acumulados_por_cuenta",
+                         "lineas_ordenadas_por_cuenta", "fechas_por_actividad", "acumulados_por_actividad"):
+            setattr(vista, atributo, {clave: _Prefijo(columna) for clave, columna in getattr(self, atributo).items()})
+        vista.nombres_cuentas = self.nombres_cuentas.copy()
+        vista.ids_cuentas = self.ids_cuentas.copy()
+        vista.cuentas_desordenadas = set()
+        vista.actividades_desordenadas = set()
+        return vista
+    
+    def num_asientos(self):
+        """Número de asientos registrados"""
+        return len(self.asiento_fecha)
+    
+    def num_lineas(self):
+        """Número de líneas (cargos y abonos) registradas"""
+        return len(self.linea_asiento)
+    
+    def lineas_asiento(self, asiento):
+        """Rango de líneas que pertenecen a un asiento"""
+        inicio = self.asiento_inicio[asiento]
+        if asiento + 1 < len(self.asiento_inicio):
+            fin = self.asiento_inicio[asiento + 1]
+        else:
+            fin = len(self.linea_asiento)
+        return range(inicio, fin)
+    
+    def fecha_texto(self, ordinal):
+        """Formatea una fecha ordinal como dd/mm/aaaa"""
+        texto = self._fechas_texto.get(ordinal)
+        if texto is None:
+            texto = self._fechas_texto[ordinal] = date.fromordinal(ordinal).strftime("%d/%m/%Y")
+        return texto
+    
+    def memoria(self):
+        """Bytes ocupados por las columnas, el índice del mayor y los catálogos"""
+        columnas = [self.asiento_fecha, self.asiento_descripcion, self.asiento_inicio,
+                    self.asientos_por_fecha, self.fechas_ordenadas,
+                    self.linea_asiento, self.linea_cuenta, self.linea_lado, self.linea_monto,
+                    self.flujo_asiento, self.flujo_monto, self.flujo_actividad]
+        for indice in (self.lineas_por_cuenta, self.fechas_por_cuenta, self.acumulados_por_cuenta,
+                       self.lineas_ordenadas_por_cuenta, self.fechas_por_actividad, self.acumulados_por_actividad):
+            columnas.extend(indice.values())
+        total = sum(columna.buffer_info()[1] * columna.itemsize for columna in columnas)
+        total += sum(len(texto.encode("utf-8")) for texto in self.descripciones)
+        total += sum(len(nombre.encode("utf-8")) for nombre in self.nombres_cuentas)
+        return total
+    
+    def memoria_por_millon_lineas(self):
+        """Bytes que ocuparía el almacén por cada millón de líneas, según el uso actual"""
+        lineas = self.num_lineas()
+        if lineas == 0:
+            return 0
+        return self.memoria() * 1_000_000 // lineas
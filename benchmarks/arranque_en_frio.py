@@ -0,0 +1,71 @@
+"""Tiempo de arranque en frío según el tamaño del diario.
+
+Compara volver a aplicar toda la bitácora contra cargar el punto de control más
+reciente y aplicar solo la cola de asientos posteriores.
+
+Uso: python benchmarks/arranque_en_frio.py [tamaño1 tamaño2 ...]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bitacora import BitacoraJSONL
+from puntos_control import PuntosControl
+from sistema_contable_completo import SistemaContable
+
+ASIENTOS_COLA = 1000
+
+
+def preparar(directorio, cantidad):
+    """Crea una bitácora con `cantidad` asientos, un punto de control y una cola posterior"""
+    ruta = os.path.join(directorio, "diario.jsonl")
+    puntos = PuntosControl(os.path.join(directorio, "puntos"), cada=cantidad * 10)
+    sistema = SistemaContable(BitacoraJSONL(ruta, fsync_cada=None), puntos)
+    lote = []
+    for i in range(cantidad - ASIENTOS_COLA):
+        monto = 10000 + i % 5000
+        iva = monto * 16 // 100
+        lote.append(("Compra de mercancía en efectivo (pagado con Bancos)",
+                     {"Mercancía": monto, "IVA acreditable": iva}, {"Bancos": monto + iva}))
+        if len(lote) == 10000:
+            sistema.registrar_asientos_lote(lote)
+            lote = []
+    sistema.registrar_asientos_lote(lote)
+    puntos.escribir(sistema)
+    sistema.registrar_asientos_lote([("Gasto financiero (pagado con Bancos)",
+                                      {"Gastos financieros": 100}, {"Bancos": 100})] * ASIENTOS_COLA)
+    sistema.persistencia.cerrar()
+    return ruta, puntos.directorio
+
+
+def medir(cantidad):
+    directorio = tempfile.mkdtemp()
+    try:
+        ruta, directorio_puntos = preparar(directorio, cantidad)
+        
+        inicio = time.perf_counter()
+        SistemaContable(BitacoraJSONL(ruta))
+        completo = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        SistemaContable(BitacoraJSONL(ruta), PuntosControl(directorio_puntos))
+        con_punto = time.perf_counter() - inicio
+        return completo, con_punto
+    finally:
+        shutil.rmtree(directorio)
+
+
+def main():
+    tamanos = [int(t) for t in sys.argv[1:]] or [10_000, 100_000, 300_000]
+    print(f"{'Asientos':>10} {'Bitácora completa':>18} {'Punto de control':>17}")
+    for cantidad in tamanos:
+        completo, con_punto = medir(cantidad)
+        print(f"{cantidad:>10,} {completo:>16.3f} s {con_punto:>15.3f} s")
+
+
+if __name__ == "__main__":
+    main()
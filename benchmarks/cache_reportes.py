@@ -0,0 +1,91 @@
+"""Reportes de periodos anteriores repetidos mientras se registran asientos del día.
+
+Simula un día de trabajo: se piden una y otra vez la balanza y el balance general de
+los meses anteriores mientras se registran asientos con la fecha de hoy. Compara
+generar los reportes siempre (sin caché) contra tomarlos de la caché de reportes, que
+solo descarta los del periodo abierto, y muestra sus estadísticas.
+
+Uso: python benchmarks/cache_reportes.py [num_asientos] [consultas]
+"""
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sistema_contable_completo import SistemaContable
+
+
+def preparar(cantidad):
+    """Sistema con `cantidad` asientos repartidos en el último año, 1,000 por día"""
+    sistema = SistemaContable()
+    inicio = sistema.fecha_ordinal - 365
+    for desde in range(0, cantidad, 1000):
+        lote = []
+        for i in range(desde, min(desde + 1000, cantidad)):
+            monto = 10000 + i % 5000
+            iva = monto * 16 // 100
+            lote.append(("Compra de mercancía en efectivo (pagado con Bancos)",
+                         {"Mercancía": monto, "IVA acreditable": iva}, {"Bancos": monto + iva}))
+        sistema.registrar_asientos_lote(lote, inicio + (desde // 1000) % 365)
+    return sistema
+
+
+def meses_anteriores(sistema, cantidad=12):
+    """(desde, hasta) de los `cantidad` meses cerrados anteriores al actual"""
+    hoy = date.fromordinal(sistema.fecha_ordinal)
+    anio, mes = hoy.year, hoy.month
+    periodos = []
+    for _ in range(cantidad):
+        fin = date(anio, mes, 1).toordinal() - 1
+        anio, mes = (anio, mes - 1) if mes > 1 else (anio - 1, 12)
+        periodos.append((date(anio, mes, 1).toordinal(), fin))
+    return periodos
+
+
+def jornada(sistema, periodos, consultas, generar):
+    """Segundos de `consultas` pedidas de reportes de los periodos, con un asiento de hoy
+    entre cada una; generar(sistema, metodo, desde, hasta) produce el reporte"""
+    inicio = time.perf_counter()
+    for i in range(consultas):
+        desde, hasta = periodos[i % len(periodos)]
+        generar(sistema, "balanza_comprobacion", desde, hasta)
+        generar(sistema, "balance_general", None, hasta)
+        sistema.registrar_asiento("Venta de mostrador", {"Caja": 10000}, {"Ventas": 10000})
+    return time.perf_counter() - inicio
+
+
+def sin_cache(sistema, metodo, desde, hasta):
+    """Genera el reporte sin pasar por la caché"""
+    return getattr(sistema, "_" + metodo)(None, desde, hasta)
+
+
+def con_cache(sistema, metodo, desde, hasta):
+    """Pide el reporte como lo hace la aplicación (con la caché)"""
+    return getattr(sistema, "generar_" + metodo)(desde=desde, hasta=hasta)
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    consultas = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    sistema = preparar(cantidad)
+    periodos = meses_anteriores(sistema)
+    
+    # Los reportes de la caché deben ser iguales a los generados
+    for desde, hasta in periodos:
+        assert con_cache(sistema, "balanza_comprobacion", desde, hasta) == sin_cache(sistema, "balanza_comprobacion", desde, hasta)
+        assert con_cache(sistema, "balance_general", None, hasta) == sin_cache(sistema, "balance_general", None, hasta)
+    
+    generando = jornada(sistema, periodos, consultas, sin_cache)
+    sistema.cache_reportes.limpiar(sistema.version)
+    cache = jornada(sistema, periodos, consultas, con_cache)
+    
+    print(f"{cantidad:,} asientos, {consultas:,} consultas de 2 reportes")
+    print(f"  Sin caché: {generando * 1000 / consultas:8.3f} ms por consulta")
+    print(f"  Con caché: {cache * 1000 / consultas:8.3f} ms por consulta  (x{generando / cache:.1f})")
+    print(f"  Estadísticas: {sistema.cache_reportes.estadisticas()}")
+
+
+if __name__ == "__main__":
+    main()
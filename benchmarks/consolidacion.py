@@ -0,0 +1,82 @@
+"""Tiempo de la balanza consolidada de un grupo de empresas según el número de procesos.
+
+Cada empresa tiene su propia base SQLite y se agrega al grupo sin cargarla; sus saldos
+se calculan con GROUP BY en los procesos del pool y se suman en el proceso principal.
+También se comprueba que el consolidado sea igual a sumar las empresas una por una.
+
+Uso: python benchmarks/consolidacion.py [empresas] [líneas por empresa]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from multiempresa import GrupoEmpresas
+from persistencia_sqlite import PersistenciaSQLite
+
+FECHA_INICIAL = 738000
+
+
+def preparar(ruta, lineas, semilla):
+    """Crea la base de una empresa con unas `lineas` líneas (3 por asiento)"""
+    persistencia = PersistenciaSQLite(ruta)
+    persistencia.anexar(FECHA_INICIAL, [("Asiento de apertura", {"Bancos": 10_000_000}, {"Capital social": 10_000_000})])
+    asientos = lineas // 3
+    for inicio in range(0, asientos, 10000):
+        lote = []
+        for i in range(inicio, min(inicio + 10000, asientos)):
+            monto = 10000 + (i * semilla) % 5000
+            iva = monto * 16 // 100
+            lote.append(("Compra de mercancía en efectivo (pagado con Bancos)",
+                         {"Mercancía": monto, "IVA acreditable": iva}, {"Bancos": monto + iva}))
+        persistencia.anexar(FECHA_INICIAL + inicio // 10000, lote)
+    persistencia.cerrar()
+
+
+def consolidar(rutas, procesos):
+    """Segundos de la balanza consolidada con un pool de `procesos` procesos"""
+    grupo = GrupoEmpresas(procesos)
+    for i, ruta in enumerate(rutas):
+        grupo.agregar_empresa(f"Empresa {i + 1}", persistencia=PersistenciaSQLite(ruta))
+    grupo.saldos_consolidados()  # Arranca los procesos del pool
+    inicio = time.perf_counter()
+    balanza = grupo.generar_balanza_consolidada()
+    segundos = time.perf_counter() - inicio
+    saldos = grupo.saldos_consolidados()
+    grupo.cerrar()
+    return segundos, balanza, saldos
+
+
+def main():
+    empresas = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    lineas = int(sys.argv[2]) if len(sys.argv) > 2 else 300_000
+    directorio = tempfile.mkdtemp()
+    try:
+        rutas = [os.path.join(directorio, f"empresa_{i}.db") for i in range(empresas)]
+        for i, ruta in enumerate(rutas):
+            preparar(ruta, lineas, i + 1)
+        
+        # Referencia: sumar las empresas una por una en este proceso
+        esperado = {}
+        for ruta in rutas:
+            persistencia = PersistenciaSQLite(ruta)
+            for cuenta, saldo in persistencia.saldos_por_cuenta().items():
+                esperado[cuenta] = esperado.get(cuenta, 0) + saldo
+            persistencia.cerrar()
+        
+        print(f"{empresas} empresas x {lineas:,} líneas ({os.cpu_count()} núcleos)")
+        base = None
+        for procesos in sorted({1, 2, 4, os.cpu_count() or 1}):
+            segundos, _, saldos = consolidar(rutas, procesos)
+            assert {c: s for c, s in saldos.items() if s} == {c: s for c, s in esperado.items() if s}
+            base = base or segundos
+            print(f"  {procesos:>2} procesos: {segundos:7.2f} s  (x{base / segundos:.2f})")
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    main()
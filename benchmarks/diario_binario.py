@@ -0,0 +1,83 @@
+"""Memoria residente al resumir un diario binario mapeado con mmap.
+
+Escribe un diario binario con el número de líneas indicado y, en otro proceso, lo
+abre, recorre el libro diario completo y calcula la balanza de un periodo. Se
+reporta el tiempo y el pico de memoria residente (RSS) de ese proceso. Cada paso
+corre en su propio proceso porque el pico de RSS se hereda del proceso padre.
+
+Uso: python benchmarks/diario_binario.py [líneas1 líneas2 ...]
+"""
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, RAIZ)
+
+from almacen_asientos import AlmacenAsientos
+from diario_binario import DiarioBinario, escribir_diario_binario
+
+FECHA_INICIAL = 738000
+
+
+def preparar(ruta, lineas):
+    """Escribe un diario binario con unas `lineas` líneas (3 por asiento)"""
+    almacen = AlmacenAsientos()
+    asientos = lineas // 3
+    for inicio in range(0, asientos, 10000):
+        lote = []
+        for i in range(inicio, min(inicio + 10000, asientos)):
+            monto = 10000 + i % 5000
+            iva = monto * 16 // 100
+            lote.append(("Compra de mercancía en efectivo (pagado con Bancos)",
+                         {"Mercancía": monto, "IVA acreditable": iva}, {"Bancos": monto + iva}))
+        almacen.agregar_asientos(FECHA_INICIAL + inicio // 10000, lote)
+    escribir_diario_binario(almacen, ruta)
+
+
+def resumir(ruta):
+    """Abre el diario, recorre el libro diario y calcula la balanza de un periodo"""
+    from sistema_contable_completo import SistemaContable
+    sistema = SistemaContable()
+    diario = DiarioBinario(ruta)
+    inicio = time.perf_counter()
+    lineas_diario = sum(1 for _ in sistema.iter_diario(fuente=diario))
+    sistema.generar_balanza_comprobacion(diario.saldos_por_cuenta(FECHA_INICIAL, FECHA_INICIAL + 100))
+    segundos = time.perf_counter() - inicio
+    diario.cerrar()
+    # ru_maxrss está en KiB en Linux
+    print(lineas_diario, segundos, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def medir(lineas):
+    directorio = tempfile.mkdtemp()
+    try:
+        ruta = os.path.join(directorio, "diario.bin")
+        subprocess.run([sys.executable, __file__, "--preparar", ruta, str(lineas)], check=True)
+        salida = subprocess.run([sys.executable, __file__, "--resumir", ruta],
+                                capture_output=True, text=True, check=True).stdout.split()
+        return os.path.getsize(ruta), float(salida[1]), int(salida[2]) / 1024
+    finally:
+        shutil.rmtree(directorio)
+
+
+def main():
+    if sys.argv[1:2] == ["--preparar"]:
+        preparar(sys.argv[2], int(sys.argv[3]))
+        return
+    if sys.argv[1:2] == ["--resumir"]:
+        resumir(sys.argv[2])
+        return
+    tamanos = [int(t) for t in sys.argv[1:]] or [300_000, 3_000_000]
+    print(f"{'Líneas':>12} {'Archivo':>10} {'Diario + balanza':>17} {'RSS máximo':>11}")
+    for lineas in tamanos:
+        tamano, segundos, rss = medir(lineas)
+        print(f"{lineas:>12,} {tamano / 2**20:>7.0f} MB {segundos:>15.2f} s {rss:>8.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Exportación del diario y del mayor por bloques contra generar el texto completo.
+
+Mide el tiempo de exportar el libro diario a CSV, JSONL y XLSX y el mayor por cuenta
+en paralelo, y compara el pico de memoria (tracemalloc) de exportar el diario a CSV con
+el de generar_diario(), que arma todo el texto en memoria. El pico de la exportación
+debe ser el mismo con una cuarta parte de las líneas que con todas.
+
+Uso: python benchmarks/exportacion.py [num_asientos]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from exportador import exportar_diario, exportar_mayor_por_cuenta, FORMATOS
+from sistema_contable_completo import SistemaContable
+
+
+def preparar(cantidad):
+    """Sistema con `cantidad` asientos de 5 líneas repartidos en un año"""
+    sistema = SistemaContable()
+    inicio = sistema.fecha_ordinal - 365
+    for desde in range(0, cantidad, 10000):
+        lote = []
+        for i in range(desde, min(desde + 10000, cantidad)):
+            monto = 10000 + i % 5000
+            iva = monto * 16 // 100
+            lote.append(("Venta de mercancía en efectivo (depositado en Bancos)",
+                         {"Bancos": monto + iva, "Costo de ventas": monto // 2},
+                         {"Ventas": monto, "IVA trasladado": iva, "Mercancía": monto // 2}))
+        sistema.registrar_asientos_lote(lote, inicio + (desde // 10000) % 365)
+    return sistema
+
+
+def pico(funcion):
+    """Pico de memoria (bytes) asignada mientras se ejecuta funcion()"""
+    tracemalloc.start()
+    funcion()
+    maximo = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return maximo
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    sistema = preparar(cantidad)
+    lineas = sistema.almacen.num_lineas()
+    directorio = tempfile.mkdtemp()
+    try:
+        print(f"{cantidad:,} asientos, {lineas:,} líneas")
+        for formato in FORMATOS:
+            inicio = time.perf_counter()
+            filas = exportar_diario(sistema, os.path.join(directorio, f"diario.{formato}"))
+            segundos = time.perf_counter() - inicio
+            assert filas == lineas
+            print(f"  Diario {formato:<5}  {segundos:7.2f} s  ({lineas / segundos:10,.0f} líneas/s)")
+        
+        inicio = time.perf_counter()
+        filas = exportar_mayor_por_cuenta(sistema, os.path.join(directorio, "mayor"))
+        segundos = time.perf_counter() - inicio
+        assert sum(filas.values()) == lineas
+        print(f"  Mayor por cuenta ({len(filas)} archivos, {os.cpu_count()} núcleos)  {segundos:7.2f} s")
+        
+        ruta = os.path.join(directorio, "pico.csv")
+        cuarto = preparar(cantidad // 4)
+        print("  Pico de memoria:")
+        print(f"    generar_diario()          {pico(sistema.generar_diario) / 2**20:8.1f} MiB")
+        print(f"    exportar a CSV            {pico(lambda: exportar_diario(sistema, ruta)) / 2**20:8.1f} MiB")
+        print(f"    exportar a CSV (1/4)      {pico(lambda: exportar_diario(cuarto, ruta)) / 2**20:8.1f} MiB")
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    main()
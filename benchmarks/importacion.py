@@ -0,0 +1,88 @@
+"""Importación de un estado de cuenta CSV: lotes contra una operación por fila.
+
+Genera un CSV con movimientos de un año y lo importa con importar_archivo (leer ->
+mapear -> clasificar -> registrar en lotes). Como referencia registra los mismos
+asientos uno por uno, como al capturar cada fila en los formularios. También mide el pico de memoria del flujo sin registrar (tracemalloc)
+con el archivo completo y con una cuarta parte: debe ser el mismo.
+
+Uso: python benchmarks/importacion.py [filas]
+"""
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from importador import clasificar, importar_archivo, leer_csv, mapear, COLUMNAS_CSV
+from sistema_contable_completo import SistemaContable
+
+CONCEPTOS = (("Depósito ventas sucursal", 1), ("Comisión por transferencia", -1), ("Pago a proveedor", -1),
+             ("Renta de local", -1), ("Flete de mercancía", -1), ("Depósito ventas en línea", 1))
+
+
+def generar_csv(ruta, filas):
+    """Estado de cuenta con `filas` movimientos ordenados por fecha a lo largo de un año"""
+    inicio = date(2025, 1, 1).toordinal()
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(["fecha", "descripcion", "monto"])
+        for i in range(filas):
+            concepto, signo = CONCEPTOS[i % len(CONCEPTOS)]
+            fecha = date.fromordinal(inicio + i * 365 // filas).isoformat()
+            escritor.writerow([fecha, concepto, f"{signo * (100 + i % 900)}.{i % 100:02d}"])
+
+
+def fila_por_fila(sistema, ruta):
+    """Registra el asiento de cada fila por separado, como desde los formularios"""
+    for fila in clasificar(mapear(leer_csv(ruta)), sistema):
+        sistema.registrar_asiento(*fila["asiento"][:3], fecha=fila["fecha"])
+
+
+def pico_flujo(ruta):
+    """Pico de memoria (bytes) de leer, mapear y clasificar el archivo sin registrar"""
+    sistema = SistemaContable()
+    tracemalloc.start()
+    for _ in clasificar(mapear(leer_csv(ruta), COLUMNAS_CSV), sistema):
+        pass
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return pico
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    directorio = tempfile.mkdtemp()
+    try:
+        ruta = os.path.join(directorio, "estado_cuenta.csv")
+        ruta_cuarto = os.path.join(directorio, "estado_cuenta_cuarto.csv")
+        generar_csv(ruta, filas)
+        generar_csv(ruta_cuarto, filas // 4)
+        
+        sistema = SistemaContable()
+        inicio = time.perf_counter()
+        resumen = importar_archivo(sistema, ruta, errores=os.path.join(directorio, "errores.csv"))
+        en_lotes = time.perf_counter() - inicio
+        assert resumen["registradas"] == filas, resumen
+        
+        referencia = SistemaContable()
+        inicio = time.perf_counter()
+        fila_por_fila(referencia, ruta)
+        una_por_una = time.perf_counter() - inicio
+        assert referencia.cuentas == sistema.cuentas
+        
+        print(f"{filas:,} filas ({resumen['lotes']:,} lotes)")
+        print(f"  Fila por fila: {una_por_una:7.2f} s  ({filas / una_por_una:10,.0f} filas/s)")
+        print(f"  En lotes:      {en_lotes:7.2f} s  ({filas / en_lotes:10,.0f} filas/s)  (x{una_por_una / en_lotes:.1f})")
+        print(f"  Pico de memoria del flujo: {pico_flujo(ruta_cuarto) / 1024:,.0f} KiB con {filas // 4:,} filas, "
+              f"{pico_flujo(ruta) / 1024:,.0f} KiB con {filas:,}")
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Ingesta de un directorio de CFDI 4.0 según el número de procesos.
+
+Genera facturas de compra y de venta (PUE y PPD, con varios conceptos cada una) y las
+registra con ingerir_directorio usando 1, 2, 4 y todos los núcleos. Después vuelve a
+ingerir el mismo directorio: todos los UUID ya están en el índice y ninguno se registra
+dos veces.
+
+Uso: python benchmarks/ingesta_cfdi.py [facturas] [conceptos por factura]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cfdi import IndiceUUID, ingerir_directorio
+from sistema_contable_completo import SistemaContable
+
+RFC_EMPRESA = "EMP010101AAA"
+RFC_TERCERO = "XAXX010101000"
+
+
+def escribir_cfdi(ruta, folio, conceptos):
+    """CFDI 4.0 de ingreso timbrado; los pares son ventas y los nones compras"""
+    venta = folio % 2 == 0
+    emisor, receptor = (RFC_EMPRESA, RFC_TERCERO) if venta else (RFC_TERCERO, RFC_EMPRESA)
+    metodo = "PPD" if folio % 3 == 0 else "PUE"
+    fecha = date.fromordinal(date(2026, 1, 1).toordinal() + folio % 90).isoformat()
+    importes = [10000 + (folio * 37 + i * 11) % 90000 for i in range(conceptos)]  # Centavos
+    ivas = [importe * 16 // 100 for importe in importes]
+    subtotal = sum(importes)
+    iva = sum(ivas)
+    partes = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<cfdi:Comprobante xmlns:cfdi="http://www.sat.gob.mx/cfd/4" '
+        'xmlns:tfd="http://www.sat.gob.mx/TimbreFiscalDigital" Version="4.0" '
+        f'Folio="{folio}" Fecha="{fecha}T12:00:00" SubTotal="{subtotal / 100:.2f}" Moneda="MXN" '
+        f'Total="{(subtotal + iva) / 100:.2f}" TipoDeComprobante="I" MetodoPago="{metodo}" Exportacion="01">\n'
+        f'  <cfdi:Emisor Rfc="{emisor}" Nombre="EMISOR" RegimenFiscal="601"/>\n'
+        f'  <cfdi:Receptor Rfc="{receptor}" Nombre="RECEPTOR" UsoCFDI="G01"/>\n'
+        '  <cfdi:Conceptos>\n'
+    ]
+    for i, (importe, iva_concepto) in enumerate(zip(importes, ivas)):
+        partes.append(
+            f'    <cfdi:Concepto ClaveProdServ="01010101" Cantidad="1" Descripcion="Artículo {i}" '
+            f'ValorUnitario="{importe / 100:.2f}" Importe="{importe / 100:.2f}" ObjetoImp="02">\n'
+            f'      <cfdi:Impuestos><cfdi:Traslados><cfdi:Traslado Base="{importe / 100:.2f}" Impuesto="002" '
+            f'TipoFactor="Tasa" TasaOCuota="0.160000" Importe="{iva_concepto / 100:.2f}"/></cfdi:Traslados></cfdi:Impuestos>\n'
+            '    </cfdi:Concepto>\n')
+    partes.append(
+        '  </cfdi:Conceptos>\n'
+        f'  <cfdi:Impuestos TotalImpuestosTrasladados="{iva / 100:.2f}"><cfdi:Traslados>'
+        f'<cfdi:Traslado Base="{subtotal / 100:.2f}" Impuesto="002" TipoFactor="Tasa" TasaOCuota="0.160000" '
+        f'Importe="{iva / 100:.2f}"/></cfdi:Traslados></cfdi:Impuestos>\n'
+        f'  <cfdi:Complemento><tfd:TimbreFiscalDigital Version="1.1" UUID="{uuid.UUID(int=folio + 1)}" '
+        f'FechaTimbrado="{fecha}T12:05:00"/></cfdi:Complemento>\n'
+        '</cfdi:Comprobante>\n')
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        archivo.write("".join(partes))
+    return subtotal, iva
+
+
+def main():
+    facturas = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    conceptos = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    directorio = tempfile.mkdtemp()
+    try:
+        carpeta = os.path.join(directorio, "cfdi")
+        os.makedirs(carpeta)
+        iva_compras = 0
+        for folio in range(facturas):
+            # Sin el UUID en el nombre, para que se tengan que leer todas
+            _, iva = escribir_cfdi(os.path.join(carpeta, f"factura_{folio:07d}.xml"), folio, conceptos)
+            iva_compras += iva if folio % 2 else 0
+        
+        print(f"{facturas:,} facturas de {conceptos} conceptos ({os.cpu_count()} núcleos)")
+        base = None
+        for procesos in sorted({1, 2, 4, os.cpu_count() or 1}):
+            sistema = SistemaContable()
+            indice = IndiceUUID(os.path.join(directorio, f"indice_{procesos}.db"))
+            inicio = time.perf_counter()
+            resumen = ingerir_directorio(sistema, carpeta, RFC_EMPRESA, indice, procesos=procesos)
+            segundos = time.perf_counter() - inicio
+            assert resumen["registrados"] == facturas and resumen["errores"] == 0, resumen
+            cuentas = sistema.cuentas
+            assert cuentas["IVA acreditable"] + cuentas["IVA por acreditar"] == iva_compras
+            
+            inicio = time.perf_counter()
+            repetido = ingerir_directorio(sistema, carpeta, RFC_EMPRESA, indice, procesos=procesos)
+            segundos_repetido = time.perf_counter() - inicio
+            assert repetido["registrados"] == 0 and repetido["duplicados"] == facturas, repetido
+            indice.cerrar()
+            
+            base = base or segundos
+            print(f"  {procesos:>2} procesos: {segundos:7.2f} s  ({facturas / segundos:8,.0f} facturas/s, x{base / segundos:.2f})"
+                  f"  repetida: {segundos_repetido:6.2f} s")
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    main()
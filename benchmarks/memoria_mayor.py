@@ -0,0 +1,54 @@
+"""Memoria del diario y el mayor: diccionarios por línea contra el almacén columnar.
+
+Registra las mismas operaciones en el sistema original (sistema_contable.py, que
+guarda un diccionario con fecha y descripción por cada línea del mayor) y en el
+sistema actual, y mide con tracemalloc la memoria que queda asignada.
+
+Uso: python benchmarks/memoria_mayor.py [num_operaciones]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import sistema_contable
+import sistema_contable_completo
+
+
+def registrar(sistema, cantidad):
+    """Registra `cantidad` operaciones de compra (3 o 4 líneas cada una)"""
+    for i in range(cantidad):
+        monto = 100 + i % 500
+        if i % 3 == 0:
+            sistema.compra_efectivo(monto, "Bancos" if i % 2 else "Caja")
+        elif i % 3 == 1:
+            sistema.compra_credito(monto)
+        else:
+            sistema.compra_papeleria(monto)
+
+
+def medir(clase, cantidad):
+    """Bytes asignados por un sistema con `cantidad` operaciones registradas"""
+    tracemalloc.start()
+    sistema = clase()
+    registrar(sistema, cantidad)
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memoria, sistema
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    anterior, sistema_anterior = medir(sistema_contable.SistemaContable, cantidad)
+    actual, sistema_actual = medir(sistema_contable_completo.SistemaContable, cantidad)
+    lineas = sistema_actual.almacen.num_lineas()
+    
+    print(f"Operaciones: {cantidad:,}  Líneas del mayor: {lineas:,}")
+    print(f"{'Diccionarios por línea':<24} {anterior / 2**20:>8.1f} MB {anterior / lineas:>8.1f} bytes/línea")
+    print(f"{'Almacén columnar':<24} {actual / 2**20:>8.1f} MB {actual / lineas:>8.1f} bytes/línea")
+    print(f"Reducción: {anterior / actual:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
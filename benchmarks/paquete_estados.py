@@ -0,0 +1,80 @@
+"""Tiempo del paquete de estados de cierre de mes: en serie contra generar_paquete.
+
+Uso: python benchmarks/paquete_estados.py [num_asientos] [procesos]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from paquete_estados import REPORTES, generar_paquete
+from sistema_contable_completo import SistemaContable, escribir_reporte
+
+
+def poblar(sistema, cantidad):
+    """Registra ventas, compras y gastos en lotes de 10,000 asientos"""
+    asientos = []
+    for i in range(cantidad):
+        monto = 10000 + i % 5000
+        iva = monto * 16 // 100
+        if i % 3 == 0:
+            asientos.append(("Venta de mercancía en efectivo (depositado en Bancos)",
+                             {"Bancos": monto + iva}, {"Ventas": monto, "IVA trasladado": iva}))
+        elif i % 3 == 1:
+            asientos.append(("Compra de mercancía en efectivo (pagado con Bancos)",
+                             {"Mercancía": monto, "IVA acreditable": iva}, {"Bancos": monto + iva}))
+        else:
+            asientos.append(("Gasto de administración (pagado con Caja)",
+                             {"Gastos de administración": monto}, {"Caja": monto}))
+        if len(asientos) == 10000:
+            sistema.registrar_asientos_lote(asientos)
+            asientos = []
+    if asientos:
+        sistema.registrar_asientos_lote(asientos)
+
+
+def en_serie(sistema, directorio):
+    """Los mismos reportes uno tras otro en este proceso, de una sola instantánea"""
+    os.makedirs(directorio)
+    instantanea = sistema.instantanea()
+    for nombre, metodo in REPORTES:
+        with open(os.path.join(directorio, nombre + ".txt"), "w", encoding="utf-8") as archivo:
+            generar = getattr(instantanea, metodo)
+            if metodo.startswith("iter_"):
+                escribir_reporte(generar(), archivo)
+            else:
+                archivo.write(generar())
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    procesos = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    sistema = SistemaContable()
+    poblar(sistema, cantidad)
+    
+    directorio = tempfile.mkdtemp()
+    try:
+        inicio = time.perf_counter()
+        en_serie(sistema, os.path.join(directorio, "serie"))
+        serie = time.perf_counter() - inicio
+        
+        tiempos = generar_paquete(sistema, os.path.join(directorio, "paquete"), procesos=procesos)
+        for nombre, _ in REPORTES:
+            with open(os.path.join(directorio, "serie", nombre + ".txt"), encoding="utf-8") as a, \
+                    open(os.path.join(directorio, "paquete", nombre + ".txt"), encoding="utf-8") as b:
+                assert a.read() == b.read(), nombre
+        
+        print(f"{cantidad:,} asientos ({os.cpu_count()} núcleos)")
+        for nombre, _ in REPORTES:
+            print(f"  {nombre:<22} {tiempos[nombre]:7.2f} s")
+        print(f"  {'en serie':<22} {serie:7.2f} s")
+        print(f"  {'paquete en paralelo':<22} {tiempos['total']:7.2f} s  (x{serie / tiempos['total']:.2f})")
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    main()
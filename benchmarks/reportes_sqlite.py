@@ -0,0 +1,71 @@
+"""Tiempo de los reportes de saldos calculados con GROUP BY en SQLite.
+
+Compara recuperar todo el diario en memoria para generar la balanza contra calcular
+los saldos con una consulta agrupada por cuenta sobre la base de datos.
+
+Uso: python benchmarks/reportes_sqlite.py [líneas1 líneas2 ...]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from persistencia_sqlite import PersistenciaSQLite
+from sistema_contable_completo import SistemaContable
+
+FECHA_INICIAL = 738000
+
+
+def preparar(ruta, lineas):
+    """Crea una base de datos con unas `lineas` líneas (3 por asiento)"""
+    persistencia = PersistenciaSQLite(ruta)
+    persistencia.anexar(FECHA_INICIAL, [("Asiento de apertura", {"Bancos": 10_000_000}, {"Capital social": 10_000_000})])
+    asientos = lineas // 3
+    for inicio in range(0, asientos, 10000):
+        lote = []
+        for i in range(inicio, min(inicio + 10000, asientos)):
+            monto = 10000 + i % 5000
+            iva = monto * 16 // 100
+            lote.append(("Compra de mercancía en efectivo (pagado con Bancos)",
+                         {"Mercancía": monto, "IVA acreditable": iva}, {"Bancos": monto + iva}))
+        persistencia.anexar(FECHA_INICIAL + inicio // 10000, lote)
+    persistencia.cerrar()
+
+
+def medir(lineas):
+    directorio = tempfile.mkdtemp()
+    try:
+        ruta = os.path.join(directorio, "diario.db")
+        preparar(ruta, lineas)
+        
+        inicio = time.perf_counter()
+        sistema = SistemaContable(PersistenciaSQLite(ruta))
+        sistema.generar_balanza_comprobacion()
+        en_memoria = time.perf_counter() - inicio
+        
+        persistencia = PersistenciaSQLite(ruta)
+        inicio = time.perf_counter()
+        saldos = persistencia.saldos_por_cuenta()
+        sistema.generar_balanza_comprobacion(saldos)
+        sistema.generar_balance_general(saldos)
+        sistema.generar_estado_resultados(saldos)
+        con_sql = time.perf_counter() - inicio
+        persistencia.cerrar()
+        return en_memoria, con_sql
+    finally:
+        shutil.rmtree(directorio)
+
+
+def main():
+    tamanos = [int(t) for t in sys.argv[1:]] or [300_000, 3_000_000]
+    print(f"{'Líneas':>12} {'Recuperar + balanza':>20} {'GROUP BY + estados':>19}")
+    for lineas in tamanos:
+        en_memoria, con_sql = medir(lineas)
+        print(f"{lineas:>12,} {en_memoria:>18.3f} s {con_sql:>17.3f} s")
+
+
+if __name__ == "__main__":
+    main()
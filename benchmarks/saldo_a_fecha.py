@@ -0,0 +1,69 @@
+"""Balanza a una fecha de corte: índice de saldos acumulados contra volver a sumar.
+
+Compara generar la balanza con generar_balanza_comprobacion(hasta=...) (bisect en el
+saldo acumulado de cada cuenta) contra sumar todas las líneas hasta la fecha.
+
+Uso: python benchmarks/saldo_a_fecha.py [num_asientos]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sistema_contable_completo import SistemaContable
+
+CONSULTAS = 100
+
+
+def preparar(cantidad):
+    """Sistema con `cantidad` asientos repartidos en un año, 1,000 por día"""
+    sistema = SistemaContable()
+    inicio = sistema.fecha_ordinal - 365
+    for desde in range(0, cantidad, 1000):
+        lote = []
+        for i in range(desde, min(desde + 1000, cantidad)):
+            monto = 10000 + i % 5000
+            iva = monto * 16 // 100
+            lote.append(("Compra de mercancía en efectivo (pagado con Bancos)",
+                         {"Mercancía": monto, "IVA acreditable": iva}, {"Bancos": monto + iva}))
+        sistema.registrar_asientos_lote(lote, inicio + (desde // 1000) % 365)
+    return sistema
+
+
+def saldos_sumando(sistema, fecha):
+    """Saldos a una fecha recorriendo todas las líneas del almacén"""
+    almacen = sistema.almacen
+    saldos = dict.fromkeys(sistema.cuentas, 0)
+    for linea in range(almacen.num_lineas()):
+        if almacen.asiento_fecha[almacen.linea_asiento[linea]] <= fecha:
+            monto = almacen.linea_monto[linea]
+            saldos[almacen.nombres_cuentas[almacen.linea_cuenta[linea]]] += -monto if almacen.linea_lado[linea] else monto
+    return saldos
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    sistema = preparar(cantidad)
+    fechas = [sistema.fecha_ordinal - 365 + i * 365 // CONSULTAS for i in range(CONSULTAS)]
+    
+    inicio = time.perf_counter()
+    for fecha in fechas[:5]:
+        esperado = sistema.generar_balanza_comprobacion(saldos_sumando(sistema, fecha))
+    sumando = (time.perf_counter() - inicio) / 5
+    
+    inicio = time.perf_counter()
+    for fecha in fechas:
+        sistema.generar_balanza_comprobacion(hasta=fecha)
+    con_indice = (time.perf_counter() - inicio) / CONSULTAS
+    
+    # La fecha del encabezado es distinta; el resto de la balanza debe coincidir
+    assert sistema.generar_balanza_comprobacion(hasta=fechas[4]).split("\n")[2:] == esperado.split("\n")[2:]
+    print(f"Asientos: {cantidad:,}  Líneas: {sistema.almacen.num_lineas():,}")
+    print(f"Sumando líneas:    {sumando * 1000:>10.2f} ms por balanza")
+    print(f"Saldos acumulados: {con_indice * 1000:>10.2f} ms por balanza")
+    print(f"Aceleración: {sumando / con_indice:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
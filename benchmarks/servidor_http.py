@@ -0,0 +1,128 @@
+"""Rendimiento del servicio HTTP/JSON con muchas terminales conectadas a la vez.
+
+Arranca servidor.py en otro proceso (bitácora con un fsync por lote) y abre `clientes`
+conexiones concurrentes (keep-alive) por loopback. Cada cliente hace `peticiones`
+peticiones: 3 de cada 10 registran una venta (venta_efectivo o venta_credito) y las
+demás leen saldos. Mide peticiones por segundo y la latencia (p50/p95/p99) de lecturas
+y escrituras, con max_lote=1 (un lote y un fsync por venta) y con lotes agrupados.
+Al final comprueba que el saldo de Ventas coincide con las ventas enviadas.
+
+Uso: python benchmarks/servidor_http.py [clientes] [peticiones por cliente]
+"""
+import asyncio
+import json
+import os
+import resource
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+async def pedir(lector, escritor, metodo, ruta, datos=None):
+    """Envía una petición por una conexión abierta; devuelve (estado, cuerpo)"""
+    cuerpo = b"" if datos is None else json.dumps(datos).encode("utf-8")
+    escritor.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                   f"Content-Length: {len(cuerpo)}\r\n\r\n".encode("latin-1") + cuerpo)
+    await escritor.drain()
+    estado = int((await lector.readline()).split()[1])
+    longitud = 0
+    while True:
+        linea = await lector.readline()
+        if linea == b"\r\n":
+            break
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        if nombre.lower() == "content-length":
+            longitud = int(valor)
+    return estado, await lector.readexactly(longitud)
+
+
+async def cliente(puerto, numero, peticiones, latencias):
+    """Una terminal: ventas y consultas de saldo por la misma conexión"""
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    vendido = 0
+    try:
+        for i in range(peticiones):
+            if (numero + i) % 10 < 3:
+                monto = 100 + (numero * 7 + i) % 900
+                operacion = "venta_efectivo" if i % 2 else "venta_credito"
+                datos = {"monto_sin_iva": str(monto), "costo_venta": str(monto // 2)}
+                tipo, metodo, ruta = "escrituras", "POST", f"/operaciones/{operacion}"
+            else:
+                tipo, metodo, ruta, datos = "lecturas", "GET", "/saldos" if i % 2 else "/saldos/Bancos", None
+            inicio = time.perf_counter()
+            estado, _ = await pedir(lector, escritor, metodo, ruta, datos)
+            latencias[tipo].append(time.perf_counter() - inicio)
+            assert estado == 200, estado
+            if tipo == "escrituras":
+                vendido += monto * 100
+    finally:
+        escritor.close()
+    return vendido
+
+
+def percentil(valores, porcentaje):
+    return valores[min(len(valores) - 1, int(len(valores) * porcentaje / 100))]
+
+
+async def medir(puerto, clientes, peticiones):
+    """Corre los clientes a la vez; devuelve (segundos, latencias, ventas enviadas, estado final)"""
+    latencias = {"lecturas": [], "escrituras": []}
+    inicio = time.perf_counter()
+    vendido = await asyncio.gather(*[cliente(puerto, numero, peticiones, latencias) for numero in range(clientes)])
+    segundos = time.perf_counter() - inicio
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    _, estado = await pedir(lector, escritor, "GET", "/estado")
+    _, ventas = await pedir(lector, escritor, "GET", "/saldos/Ventas")
+    escritor.close()
+    estado = json.loads(estado)
+    estado["ventas"] = -json.loads(ventas)["saldo"]
+    return segundos, latencias, sum(vendido), estado
+
+
+def arrancar(directorio, max_lote):
+    """Arranca servidor.py en un puerto libre; devuelve (proceso, puerto)"""
+    proceso = subprocess.Popen([sys.executable, "servidor.py", "--puerto", "0", "--max-lote", str(max_lote),
+                                "--bitacora", os.path.join(directorio, f"bitacora_{max_lote}.jsonl")],
+                               cwd=RAIZ, stdout=subprocess.PIPE, text=True)
+    linea = proceso.stdout.readline()  # "Escuchando en http://127.0.0.1:<puerto>"
+    return proceso, int(linea.rsplit(":", 1)[1])
+
+
+def main():
+    clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    peticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    # Cada conexión ocupa un descriptor aquí y otro en el servidor (que hereda el límite)
+    suave, duro = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if suave < clientes + 100:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(duro, clientes * 2 + 100), duro))
+    
+    directorio = tempfile.mkdtemp()
+    try:
+        print(f"{clientes} clientes x {peticiones} peticiones (30% ventas, {os.cpu_count()} núcleos)")
+        for max_lote in (1, 1000):
+            proceso, puerto = arrancar(directorio, max_lote)
+            try:
+                segundos, latencias, vendido, estado = asyncio.run(medir(puerto, clientes, peticiones))
+            finally:
+                proceso.send_signal(signal.SIGINT)  # Cierre ordenado: vacía la cola y cierra la bitácora
+                proceso.wait(timeout=30)
+            assert estado["ventas"] == vendido, (estado["ventas"], vendido)
+            total = clientes * peticiones
+            print(f"  max_lote={max_lote:<5} {segundos:6.2f} s  {total / segundos:8,.0f} peticiones/s  "
+                  f"{estado['registrados']:,} ventas en {estado['lotes']:,} lotes "
+                  f"({estado['registrados'] / estado['lotes']:.1f} por lote)")
+            for tipo, valores in latencias.items():
+                valores.sort()
+                print(f"    {tipo:<11} p50 {percentil(valores, 50) * 1000:7.1f} ms  "
+                      f"p95 {percentil(valores, 95) * 1000:7.1f} ms  p99 {percentil(valores, 99) * 1000:7.1f} ms")
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    main()
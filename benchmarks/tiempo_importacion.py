@@ -0,0 +1,66 @@
+"""Tiempo de importación de los módulos de entrada contra un presupuesto.
+
+Importa cada módulo en un intérprete nuevo con "python -X importtime" y toma el tiempo
+acumulado del módulo (el mínimo de varias corridas). Falla (código de salida 1) si
+algún módulo pasa su presupuesto o si importarlo carga tkinter: la interfaz gráfica
+solo se debe importar al abrirla.
+
+Uso: python benchmarks/tiempo_importacion.py [corridas]
+"""
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Tiempo acumulado máximo (ms) de importar cada módulo sin la interfaz gráfica
+PRESUPUESTO_MS = {
+    "sistema_contable_completo": 40,
+    "sistema_contable": 20,
+    "comandos": 50,
+}
+
+
+def medir(modulo):
+    """(ms acumulados de importar modulo, módulos de tkinter cargados) en un intérprete nuevo"""
+    resultado = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                               cwd=RAIZ, capture_output=True, text=True, check=True)
+    microsegundos = None
+    tkinter = []
+    for linea in resultado.stderr.splitlines():
+        if not linea.startswith("import time:"):
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        nombre = nombre.strip()
+        if nombre == modulo:
+            microsegundos = int(acumulado)
+        elif nombre.split(".")[0] in ("tkinter", "_tkinter"):
+            tkinter.append(nombre)
+    return microsegundos / 1000, tkinter
+
+
+def main():
+    corridas = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    # Una corrida previa escribe el bytecode (__pycache__) para no medir la compilación
+    for modulo in PRESUPUESTO_MS:
+        medir(modulo)
+    
+    fallas = 0
+    for modulo, presupuesto in PRESUPUESTO_MS.items():
+        tiempos = []
+        for _ in range(corridas):
+            milisegundos, tkinter = medir(modulo)
+            tiempos.append(milisegundos)
+        minimo = min(tiempos)
+        estado = "ok"
+        if minimo > presupuesto:
+            estado = "EXCEDE EL PRESUPUESTO"
+        if tkinter:
+            estado = f"CARGA TKINTER ({', '.join(tkinter)})"
+        fallas += estado != "ok"
+        print(f"  {modulo:<27} {minimo:6.1f} ms  (presupuesto {presupuesto} ms)  {estado}")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
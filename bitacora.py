@@ -0,0 +1,230 @@
+import json
+import os
+import threading
+import zlib
+
+
+class BitacoraJSONL:
+    """Bitácora de escritura anticipada (write-ahead log) de solo anexado.
+    
+    Cada asiento se guarda en una línea con el formato "<crc32 en hex> <json>\n".
+    La escritura a disco (fsync) se agrupa: se hace cada fsync_cada asientos y/o
+    cada fsync_ms milisegundos, en lugar de una vez por asiento.
+    """
+    
+    def __init__(self, ruta, fsync_cada=1, fsync_ms=None):
+        self.ruta = ruta
+        self.fsync_cada = fsync_cada
+        self.fsync_ms = fsync_ms
+        self.ultimo_id = 0
+        self._archivo = None
+        self._posicion = None
+        self._pendientes = 0
+        self._candado = threading.Lock()
+        self._cerrada = threading.Event()
+        self._sincronizador = None
+    
+    def leer(self, posicion=0):
+        """Genera los registros válidos de la bitácora, en orden, a partir de una posición
+        devuelta por posicion() (por ejemplo la guardada en un punto de control).
+        
+        Al llegar a una línea incompleta o con suma de verificación incorrecta (cola
+        dañada por una caída) se trunca el archivo en ese punto. Una posición que no es
+        el inicio de una línea (por ejemplo de un punto de control anterior a que se
+        reemplazara la bitácora) lanza ValueError sin tocar el archivo.
+        """
+        if not os.path.exists(self.ruta):
+            if posicion:
+                raise ValueError(f"La bitácora {self.ruta} no existe y se pidió leerla desde la posición {posicion}")
+            return
+        valido = posicion
+        with open(self.ruta, "rb") as archivo:
+            if posicion:
+                archivo.seek(posicion - 1)
+                if archivo.read(1) != b"\n":
+                    raise ValueError(f"La posición {posicion} no es el inicio de un asiento en {self.ruta}")
+            for linea in archivo:
+                registro = self._decodificar(linea)
+                if registro is None:
+                    break
+                valido += len(linea)
+                self.ultimo_id = registro["id"]
+                yield registro
+        
+        if valido < os.path.getsize(self.ruta):
+            os.truncate(self.ruta, valido)
+    
+    @staticmethod
+    def _decodificar(linea):
+        """Devuelve el registro de una línea o None si está incompleta o dañada"""
+        if not linea.endswith(b"\n"):
+            return None
+        try:
+            crc, cuerpo = linea[:-1].split(b" ", 1)
+            if int(crc, 16) != zlib.crc32(cuerpo):
+                return None
+            return json.loads(cuerpo)
+        except ValueError:
+            return None
+    
+    def saldos_por_cuenta(self, desde=None, hasta=None):
+        """Saldo (cargos - abonos) de cada cuenta recorriendo la bitácora, opcionalmente solo
+        con los asientos de un periodo de fechas ordinales (inclusive).
+        
+        No trunca una cola dañada (puede leerse desde otro proceso mientras se escribe).
+        """
+        saldos = {}
+        if not os.path.exists(self.ruta):
+            return saldos
+        with open(self.ruta, "rb") as archivo:
+            for linea in archivo:
+                registro = self._decodificar(linea)
+                if registro is None:
+                    break
+                fecha = registro["fecha"]
+                if (desde is not None and fecha < desde) or (hasta is not None and fecha > hasta):
+                    continue
+                for cuenta, monto in registro["cargos"].items():
+                    saldos[cuenta] = saldos.get(cuenta, 0) + monto
+                for cuenta, monto in registro["abonos"].items():
+                    saldos[cuenta] = saldos.get(cuenta, 0) - monto
+        return saldos
+    
+    def anexar(self, fecha, asientos):
+        """Anexa un lote de asientos (descripcion, cargos, abonos[, actividad]) con la misma fecha ordinal"""
+        with self._candado:
+            if self._archivo is None:
+                self._abrir()
+            lineas = []
+            for descripcion, cargos, abonos, *actividad in asientos:
+                self.ultimo_id += 1
+                lineas.append(self._codificar(self.ultimo_id, fecha, descripcion, cargos, abonos, *actividad))
+            datos = b"".join(lineas)
+            self._archivo.write(datos)
+            self._posicion += len(datos)
+            self._pendientes += len(lineas)
+            
+            if self.fsync_cada is not None and self._pendientes >= self.fsync_cada:
+                self._sincronizar()
+    
+    @staticmethod
+    def _codificar(id_asiento, fecha, descripcion, cargos, abonos, actividad=None):
+        """Línea de la bitácora para un asiento, con su suma de verificación; la actividad
+        del flujo de efectivo solo se guarda si se indicó"""
+        registro = {
+            "id": id_asiento,
+            "fecha": fecha,
+            "descripcion": descripcion,
+            "cargos": cargos,
+            "abonos": abonos
+        }
+        if actividad is not None:
+            registro["actividad"] = actividad
+        cuerpo = json.dumps(registro, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return b"%08x %s\n" % (zlib.crc32(cuerpo), cuerpo)
+    
+    def reemplazar(self, registros):
+        """Reemplaza todo el contenido por los registros dados (fecha, descripcion, cargos,
+        abonos y opcionalmente actividad), numerados desde 1; se escribe un archivo nuevo que sustituye al anterior
+        de forma atómica (por ejemplo al compactar la bitácora en un cierre de periodo)"""
+        with self._candado:
+            temporal = self.ruta + ".tmp"
+            ultimo_id = 0
+            with open(temporal, "wb") as archivo:
+                for registro in registros:
+                    ultimo_id += 1
+                    archivo.write(self._codificar(ultimo_id, registro["fecha"], registro["descripcion"],
+                                                  registro["cargos"], registro["abonos"], registro.get("actividad")))
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            if self._archivo is not None:
+                self._archivo.close()
+                self._archivo = None
+            os.replace(temporal, self.ruta)
+            self._sincronizar_directorio()
+            self.ultimo_id = ultimo_id
+            self._pendientes = 0
+    
+    def _abrir(self):
+        """Abre el archivo para anexar y, si hay fsync por tiempo, arranca el hilo que lo hace"""
+        nuevo = not os.path.exists(self.ruta)
+        self._archivo = open(self.ruta, "ab")
+        self._posicion = self._archivo.tell()
+        if nuevo:
+            self._sincronizar_directorio()
+        if self.fsync_ms is not None and self._sincronizador is None:
+            self._sincronizador = threading.Thread(target=self._sincronizar_periodicamente, daemon=True)
+            self._sincronizador.start()
+    
+    def _sincronizar_directorio(self):
+        """fsync del directorio de la bitácora, para que sobreviva a una caída la entrada del
+        archivo (al crearlo o al sustituirlo con os.replace) y no solo su contenido"""
+        if not hasattr(os, "O_DIRECTORY"):
+            return  # En Windows os.open no puede abrir directorios
+        descriptor = os.open(os.path.dirname(os.path.abspath(self.ruta)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+    
+    def posicion(self):
+        """Posición (en bytes) después del último asiento anexado"""
+        with self._candado:
+            if self._archivo is not None:
+                return self._posicion
+            return os.path.getsize(self.ruta) if os.path.exists(self.ruta) else 0
+    
+    def huella(self, posicion):
+        """Suma de verificación de la línea que termina en posicion, o None si posicion es 0
+        o ahí no termina un asiento. Un punto de control la guarda para reconocer que la
+        bitácora se reemplazó (por ejemplo al compactarla en un cierre de periodo)"""
+        if not posicion:
+            return None
+        with self._candado:
+            if self._archivo is not None:
+                self._archivo.flush()
+        if not os.path.exists(self.ruta) or os.path.getsize(self.ruta) < posicion:
+            return None
+        with open(self.ruta, "rb") as archivo:
+            # Se lee hacia atrás desde posicion hasta el salto de línea anterior
+            inicio = posicion
+            bloque = b""
+            while True:
+                tamano = min(inicio, 4096)
+                inicio -= tamano
+                archivo.seek(inicio)
+                bloque = archivo.read(tamano) + bloque
+                salto = bloque.rfind(b"\n", 0, len(bloque) - 1)
+                if salto >= 0 or inicio == 0:
+                    break
+        linea = bloque[salto + 1:]
+        if self._decodificar(linea) is None:
+            return None
+        return linea.split(b" ", 1)[0].decode("ascii")
+    
+    def _sincronizar_periodicamente(self):
+        """Hilo que hace fsync de los asientos pendientes cada fsync_ms milisegundos"""
+        while not self._cerrada.wait(self.fsync_ms / 1000):
+            self.sincronizar()
+    
+    def sincronizar(self):
+        """Escribe a disco los asientos pendientes"""
+        with self._candado:
+            self._sincronizar()
+    
+    def _sincronizar(self):
+        """Hace flush y fsync; se llama con el candado tomado"""
+        if self._archivo is None or self._pendientes == 0:
+            return
+        self._archivo.flush()
+        os.fsync(self._archivo.fileno())
+        self._pendientes = 0
+    
+    def cerrar(self):
+        """Sincroniza los asientos pendientes y cierra el archivo"""
+        self._cerrada.set()
+        with self._candado:
+            self._sincronizar()
+            if self._archivo is not None:
+                self._archivo.close()
+                self._archivo = None
@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+
+
+class CacheReportes:
+    """Caché de reportes de texto con desalojo LRU (el usado hace más tiempo sale primero).
+    
+    Cada entrada se identifica por (tipo de reporte, desde, hasta, ...) y guarda el rango
+    de fechas de los asientos que la afectan. El sistema lleva una versión del diario que
+    sube con cada lote registrado; al registrar asientos en una fecha solo se descartan
+    las entradas cuyo rango la incluye, así que los reportes de periodos anteriores
+    siguen sirviendo. Una entrada solo se usa y se guarda con la versión vigente (una
+    instantánea atrasada no lee ni escribe reportes de otra versión). La memoria se acota
+    con el total de caracteres de los reportes guardados.
+    """
+    
+    def __init__(self, max_caracteres=20_000_000):
+        self.max_caracteres = max_caracteres
+        self.version = 0  # Versión del diario de las entradas vigentes
+        self.caracteres = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidadas = 0
+        self.desalojadas = 0
+        self._entradas = OrderedDict()  # Clave -> (desde, hasta, texto)
+        self._candado = threading.Lock()
+    
+    def __getstate__(self):
+        """Una copia enviada a otro proceso (por ejemplo con una instantánea) empieza vacía"""
+        return {"max_caracteres": self.max_caracteres}
+    
+    def __setstate__(self, estado):
+        self.__init__(estado["max_caracteres"])
+    
+    def obtener(self, clave, version):
+        """Texto guardado para la clave o None si no está o es de otra versión"""
+        with self._candado:
+            entrada = self._entradas.get(clave) if version == self.version else None
+            if entrada is None:
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return entrada[2]
+    
+    def guardar(self, clave, version, texto, desde=None, hasta=None):
+        """Guarda un reporte generado con la versión dada; desde/hasta (ordinales, None sin
+        límite) son las fechas de los asientos que lo afectan"""
+        with self._candado:
+            if version != self.version or len(texto) > self.max_caracteres:
+                return
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self.caracteres -= len(anterior[2])
+            self._entradas[clave] = (desde, hasta, texto)
+            self.caracteres += len(texto)
+            while self.caracteres > self.max_caracteres:
+                _, (_, _, viejo) = self._entradas.popitem(last=False)
+                self.caracteres -= len(viejo)
+                self.desalojadas += 1
+    
+    def invalidar(self, fecha, version):
+        """Pasa a la versión dada descartando las entradas afectadas por asientos de esa fecha"""
+        with self._candado:
+            self.version = version
+            afectadas = [clave for clave, (desde, hasta, _) in self._entradas.items()
+                         if (desde is None or desde <= fecha) and (hasta is None or fecha <= hasta)]
+            for clave in afectadas:
+                self.caracteres -= len(self._entradas.pop(clave)[2])
+            self.invalidadas += len(afectadas)
+    
+    def limpiar(self, version):
+        """Pasa a la versión dada descartando todas las entradas"""
+        with self._candado:
+            self.version = version
+            self.invalidadas += len(self._entradas)
+            self._entradas.clear()
+            self.caracteres = 0
+    
+    def estadisticas(self):
+        """Aciertos, fallos, entradas y caracteres guardados, invalidadas y desalojadas"""
+        with self._candado:
+            consultas = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+                "entradas": len(self._entradas),
+                "caracteres": self.caracteres,
+                "invalidadas": self.invalidadas,
+                "desalojadas": self.desalojadas
+            }
@@ -0,0 +1,330 @@
+"""Ingesta de facturas CFDI (XML) de un directorio como asientos de compras y ventas.
+
+Uso: python cfdi.py DIRECTORIO --rfc RFC [--indice cfdi_ingeridos.db]
+                    [--bitacora diario_contable.jsonl] [--procesos N] [--errores errores_cfdi.csv]
+"""
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+
+from bitacora import BitacoraJSONL
+from dinero import a_centavos
+from sistema_contable_completo import RUTA_BITACORA, SistemaContable
+
+# Índice de los UUID ya registrados
+RUTA_INDICE = "cfdi_ingeridos.db"
+
+# Impuesto del SAT que corresponde al IVA en los traslados
+IMPUESTO_IVA = "002"
+
+# El UUID va al final de la descripción de cada asiento de un CFDI (ver asiento_cfdi)
+_UUID_DESCRIPCION = re.compile(r"CFDI ([0-9A-F-]{36})\)$")
+
+
+class IndiceUUID:
+    """Índice en disco (SQLite) de los UUID de los CFDI ya registrados.
+    
+    Solo se consulta por lotes de UUID, así que no hace falta cargarlo completo en memoria.
+    """
+    
+    def __init__(self, ruta=RUTA_INDICE):
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta)
+        self.conexion.execute("CREATE TABLE IF NOT EXISTS cfdi (uuid TEXT PRIMARY KEY, fecha INTEGER, archivo TEXT)")
+        self.conexion.commit()
+    
+    def contiene(self, uuids):
+        """Los UUID dados que ya están en el índice"""
+        uuids = list(uuids)
+        encontrados = set()
+        for inicio in range(0, len(uuids), 500):
+            parte = uuids[inicio:inicio + 500]
+            consulta = f"SELECT uuid FROM cfdi WHERE uuid IN ({','.join('?' * len(parte))})"
+            encontrados.update(uuid for uuid, in self.conexion.execute(consulta, parte))
+        return encontrados
+    
+    def agregar(self, registros):
+        """Agrega (uuid, fecha ordinal, archivo) en una sola transacción"""
+        with self.conexion:
+            self.conexion.executemany("INSERT OR IGNORE INTO cfdi VALUES (?, ?, ?)", registros)
+    
+    def completar(self, sistema):
+        """Agrega los UUID que están en los asientos del sistema y faltan en el índice.
+        
+        Los asientos se guardan antes de marcar sus UUID, así que una caída entre los dos
+        pasos deja CFDI registrados fuera del índice; como el UUID va en la descripción
+        del asiento, se recuperan del diario. Solo se revisa el catálogo de descripciones
+        (una por CFDI), y las fechas se buscan solo si falta alguno. Devuelve cuántos agregó.
+        """
+        almacen = sistema.almacen
+        por_descripcion = {}
+        for id_descripcion, descripcion in enumerate(almacen.descripciones):
+            encontrado = _UUID_DESCRIPCION.search(descripcion)
+            if encontrado:
+                por_descripcion[id_descripcion] = encontrado.group(1)
+        faltantes = set(por_descripcion.values()) - self.contiene(por_descripcion.values())
+        if not faltantes:
+            return 0
+        registros = {}
+        for asiento, id_descripcion in enumerate(almacen.asiento_descripcion):
+            uuid = por_descripcion.get(id_descripcion)
+            if uuid in faltantes:
+                registros[uuid] = (uuid, almacen.asiento_fecha[asiento], None)
+        self.agregar(registros.values())
+        return len(registros)
+    
+    def cerrar(self):
+        """Cierra la conexión con el índice"""
+        self.conexion.close()
+
+
+def _centavos(texto, tipo_cambio):
+    """Centavos en moneda nacional de un importe del CFDI"""
+    return a_centavos(Decimal(texto or "0") * tipo_cambio)
+
+
+def leer_cfdi(ruta):
+    """Datos de un CFDI leídos con iterparse: uuid, fecha (ordinal), tipo de comprobante,
+    método de pago, RFC del emisor y del receptor, y subtotal, descuento, IVA trasladado,
+    otros impuestos y total en centavos (convertidos a pesos con TipoCambio si la moneda no es MXN).
+    
+    Los atributos se toman en el evento "start" y cada elemento se libera al terminar,
+    así que los conceptos de una factura grande no se acumulan en memoria. Solo se suma
+    el IVA de los traslados del nodo Impuestos del comprobante (no el de cada concepto).
+    """
+    datos = {"archivo": ruta, "uuid": None}
+    importes = {}
+    iva = Decimal(0)
+    profundidad = 0
+    en_impuestos = False
+    for evento, elemento in ET.iterparse(ruta, events=("start", "end")):
+        etiqueta = elemento.tag.rpartition("}")[2]
+        if evento == "start":
+            profundidad += 1
+            if profundidad == 1:
+                if etiqueta != "Comprobante":
+                    raise ValueError("No es un CFDI")
+                datos["version"] = elemento.get("Version")
+                datos["fecha"] = date.fromisoformat(elemento.get("Fecha")[:10]).toordinal()
+                datos["tipo"] = elemento.get("TipoDeComprobante")
+                datos["metodo_pago"] = elemento.get("MetodoPago")
+                datos["moneda"] = elemento.get("Moneda", "MXN")
+                importes = {nombre: elemento.get(atributo) for nombre, atributo in
+                            (("subtotal", "SubTotal"), ("descuento", "Descuento"), ("total", "Total"),
+                             ("tipo_cambio", "TipoCambio"))}
+            elif profundidad == 2 and etiqueta in ("Emisor", "Receptor"):
+                datos[etiqueta.lower()] = (elemento.get("Rfc") or "").upper()
+            elif profundidad == 2 and etiqueta == "Impuestos":
+                en_impuestos = True
+            elif en_impuestos and etiqueta == "Traslado" and elemento.get("Impuesto") == IMPUESTO_IVA:
+                iva += Decimal(elemento.get("Importe") or "0")  # Los exentos no tienen importe
+            elif etiqueta == "TimbreFiscalDigital":
+                datos["uuid"] = elemento.get("UUID").upper()
+        else:
+            profundidad -= 1
+            if profundidad == 1 and etiqueta == "Impuestos":
+                en_impuestos = False
+            elemento.clear()
+    
+    if datos["uuid"] is None:
+        raise ValueError("El CFDI no está timbrado (sin UUID)")
+    tipo_cambio = Decimal(1) if datos["moneda"] in ("MXN", "XXX") else Decimal(importes["tipo_cambio"])
+    datos["subtotal"] = _centavos(importes["subtotal"], tipo_cambio)
+    datos["descuento"] = _centavos(importes["descuento"], tipo_cambio)
+    datos["total"] = _centavos(importes["total"], tipo_cambio)
+    datos["iva"] = a_centavos(iva * tipo_cambio)
+    # Lo que el total tiene además del subtotal, el descuento y el IVA (retenciones, IEPS);
+    # se calcula en la moneda del CFDI para que la conversión no deje diferencias de centavos
+    otros = Decimal(importes["total"]) - Decimal(importes["subtotal"]) + Decimal(importes["descuento"] or "0") - iva
+    datos["otros_impuestos"] = a_centavos(otros * tipo_cambio)
+    return datos
+
+
+def _leer_en_proceso(ruta):
+    """leer_cfdi para el pool de procesos: un archivo dañado regresa su error en lugar de lanzarlo"""
+    try:
+        return leer_cfdi(ruta)
+    except (OSError, ET.ParseError, ValueError, ArithmeticError, TypeError, KeyError) as error:
+        return {"archivo": ruta, "error": f"{type(error).__name__}: {error}"}
+
+
+def asiento_cfdi(datos, rfc, cuenta="Bancos"):
+    """Asiento (descripcion, cargos, abonos) de un CFDI de ingreso según quién lo emite.
+    
+    - Compra PUE (pagada en una exhibición): como compra_efectivo, IVA acreditable.
+    - Compra PPD (pago en parcialidades o diferido): como compra_credito, IVA por acreditar.
+    - Venta PUE: cobrada en cuenta, IVA trasladado.
+    - Venta PPD: a Clientes, IVA por trasladar hasta que se cobre.
+    Los montos son los de la factura, no se recalcula el IVA. Lanza ValueError si el
+    CFDI no se puede registrar así.
+    """
+    if datos["tipo"] != "I":
+        raise ValueError(f"Tipo de comprobante {datos['tipo']!r} no se registra (solo ingreso, I)")
+    if datos["metodo_pago"] not in ("PUE", "PPD"):
+        raise ValueError(f"Método de pago desconocido: {datos['metodo_pago']!r}")
+    if datos["otros_impuestos"] != 0:
+        raise ValueError("El total incluye otros impuestos o retenciones")
+    neto = datos["subtotal"] - datos["descuento"]
+    iva = datos["iva"]
+    total = neto + iva
+    uuid = datos["uuid"]
+    credito = datos["metodo_pago"] == "PPD"
+    
+    if datos.get("receptor") == rfc:
+        if credito:
+            return (f"Compra de mercancía a crédito (CFDI {uuid})",
+                    {"Mercancía": neto, "IVA por acreditar": iva}, {"Proveedores": total})
+        return (f"Compra de mercancía en efectivo (pagado con {cuenta}, CFDI {uuid})",
+                {"Mercancía": neto, "IVA acreditable": iva}, {cuenta: total})
+    if datos.get("emisor") == rfc:
+        if credito:
+            return (f"Venta de mercancía a crédito (CFDI {uuid})",
+                    {"Clientes": total}, {"Ventas": neto, "IVA por trasladar": iva})
+        return (f"Venta de mercancía en efectivo (depositado en {cuenta}, CFDI {uuid})",
+                {cuenta: total}, {"Ventas": neto, "IVA trasladado": iva})
+    raise ValueError(f"El RFC {rfc} no es emisor ni receptor")
+
+
+def _sin_ceros(asiento):
+    """Quita las cuentas con monto cero (por ejemplo el IVA de una factura exenta)"""
+    descripcion, cargos, abonos = asiento
+    return (descripcion, {c: m for c, m in cargos.items() if m}, {c: m for c, m in abonos.items() if m})
+
+
+def ingerir(sistema, rutas, rfc, indice, procesos=None, cuenta="Bancos", tamano_bloque=1000, errores=None):
+    """Registra en el sistema los CFDI de las rutas, leídos en paralelo en un ProcessPoolExecutor.
+    
+    Los archivos que se llaman como un UUID ya registrado (<UUID>.xml) se omiten sin
+    leerlos; los demás se leen en los procesos del pool y este proceso, mientras tanto,
+    registra los bloques ya leídos: cada bloque se agrupa por fecha y se registra con
+    registrar_asientos_lote, y luego sus UUID se agregan al índice. Antes de empezar se
+    agregan al índice los UUID de los asientos del sistema que falten (IndiceUUID.completar),
+    por si una ingesta anterior se interrumpió entre los dos pasos. Los CFDI con error o
+    que no se pueden registrar se escriben en el CSV errores (archivo, uuid, error) y no
+    detienen la ingesta. Devuelve {"archivos", "registrados", "duplicados", "errores"}.
+    """
+    rfc = rfc.upper()
+    rutas = list(rutas)
+    resumen = {"archivos": len(rutas), "registrados": 0, "duplicados": 0, "errores": 0}
+    indice.completar(sistema)
+    nombres = {os.path.splitext(os.path.basename(ruta))[0].upper(): ruta for ruta in rutas}
+    conocidos = indice.contiene(nombres)
+    if conocidos:
+        omitir = {nombres[uuid] for uuid in conocidos}
+        rutas = [ruta for ruta in rutas if ruta not in omitir]
+        resumen["duplicados"] += len(omitir)
+    
+    archivo_errores = None
+    escritor = None
+    
+    def reportar(datos, mensaje):
+        nonlocal archivo_errores, escritor
+        resumen["errores"] += 1
+        if errores is None:
+            return
+        if escritor is None:
+            archivo_errores = open(errores, "w", newline="", encoding="utf-8")
+            escritor = csv.writer(archivo_errores)
+            escritor.writerow(["archivo", "uuid", "error"])
+        escritor.writerow([datos["archivo"], datos.get("uuid") or "", mensaje])
+    
+    def registrar(bloque):
+        ya_registrados = indice.contiene(datos["uuid"] for datos in bloque if "error" not in datos)
+        por_fecha = {}
+        vistos = set()
+        for datos in bloque:
+            if "error" in datos:
+                reportar(datos, datos["error"])
+                continue
+            if datos["uuid"] in ya_registrados or datos["uuid"] in vistos:
+                resumen["duplicados"] += 1
+                continue
+            if sistema.fecha_cierre is not None and datos["fecha"] <= sistema.fecha_cierre:
+                reportar(datos, f"El periodo al {sistema.almacen.fecha_texto(sistema.fecha_cierre)} está cerrado")
+                continue
+            try:
+                asiento = _sin_ceros(asiento_cfdi(datos, rfc, cuenta))
+            except ValueError as error:
+                reportar(datos, str(error))
+                continue
+            vistos.add(datos["uuid"])
+            por_fecha.setdefault(datos["fecha"], []).append((datos, asiento))
+        
+        registrados = []
+        for fecha, facturas in sorted(por_fecha.items()):
+            try:
+                sistema.registrar_asientos_lote([asiento for _, asiento in facturas], fecha)
+                registrados.extend(facturas)
+            except ValueError:
+                # Se registran una por una para reportar solo las inválidas
+                for datos, asiento in facturas:
+                    try:
+                        sistema.registrar_asientos_lote([asiento], fecha)
+                        registrados.append((datos, asiento))
+                    except ValueError as error:
+                        reportar(datos, str(error))
+        # Los UUID se marcan hasta que sus asientos están en disco
+        if sistema.persistencia is not None:
+            sistema.persistencia.sincronizar()
+        indice.agregar([(datos["uuid"], datos["fecha"], datos["archivo"]) for datos, _ in registrados])
+        resumen["registrados"] += len(registrados)
+    
+    try:
+        if rutas:
+            procesos = procesos or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                leidos = ejecutor.map(_leer_en_proceso, rutas, chunksize=max(1, min(64, len(rutas) // (procesos * 4))))
+                while True:
+                    bloque = list(islice(leidos, tamano_bloque))
+                    if not bloque:
+                        break
+                    registrar(bloque)
+    finally:
+        if archivo_errores is not None:
+            archivo_errores.close()
+    return resumen
+
+
+def ingerir_directorio(sistema, directorio, rfc, indice, **opciones):
+    """ingerir() con los archivos .xml de un directorio"""
+    rutas = sorted(entrada.path for entrada in os.scandir(directorio)
+                   if entrada.is_file() and entrada.name.lower().endswith(".xml"))
+    return ingerir(sistema, rutas, rfc, indice, **opciones)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Registra los CFDI de un directorio como compras y ventas")
+    parser.add_argument("directorio")
+    parser.add_argument("--rfc", required=True, help="RFC de la empresa (emisor en ventas, receptor en compras)")
+    parser.add_argument("--indice", default=RUTA_INDICE)
+    parser.add_argument("--bitacora", default=RUTA_BITACORA)
+    parser.add_argument("--procesos", type=int)
+    parser.add_argument("--cuenta", default="Bancos", help="Cuenta de efectivo de las facturas PUE")
+    parser.add_argument("--errores", default="errores_cfdi.csv")
+    argumentos = parser.parse_args()
+    
+    persistencia = BitacoraJSONL(argumentos.bitacora, fsync_cada=None)
+    sistema = SistemaContable(persistencia)
+    indice = IndiceUUID(argumentos.indice)
+    try:
+        resumen = ingerir_directorio(sistema, argumentos.directorio, argumentos.rfc, indice,
+                                     procesos=argumentos.procesos, cuenta=argumentos.cuenta,
+                                     errores=argumentos.errores)
+    finally:
+        persistencia.cerrar()
+        indice.cerrar()
+    print(f"{resumen['archivos']} archivos: {resumen['registrados']} registrados, "
+          f"{resumen['duplicados']} ya registrados, {resumen['errores']} con error")
+    if resumen["errores"]:
+        print(f"Detalle de los errores en {argumentos.errores}")
+
+
+if __name__ == "__main__":
+    main()
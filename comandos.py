@@ -0,0 +1,214 @@
+"""Línea de comandos del sistema contable, sin interfaz gráfica.
+
+Registra asientos desde un archivo, imprime cualquier reporte, exporta el diario o el
+mayor y cierra periodos usando SistemaContable directamente. tkinter solo se importa con
+el comando gui.
+
+Uso: python -m comandos [--bitacora RUTA | --sqlite RUTA] [--puntos-control DIRECTORIO] COMANDO ...
+  
+  registrar ARCHIVO [--cuenta Bancos] [--errores errores_importacion.csv]
+      .jsonl: un asiento por línea {"fecha": "AAAA-MM-DD", "descripcion": ...,
+              "cargos": {cuenta: pesos}, "abonos": {cuenta: pesos}[, "actividad": ...]}
+      .csv / .ofx / .qfx: estado de cuenta clasificado con las reglas de importador
+  reporte {diario,mayor,balanza,balance,resultados,capital,flujos} [--desde F] [--hasta F] [--salida RUTA]
+  exportar {diario,mayor,mayor-por-cuenta} RUTA [--formato csv|jsonl|xlsx] [--desde F] [--hasta F]
+  cierre HASTA [--anual] [--archivo archivo_contable]
+  gui
+      abre la interfaz gráfica con la misma persistencia y puntos de control
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date
+
+from almacen_asientos import AlmacenAsientos
+from bitacora import BitacoraJSONL
+from dinero import a_centavos
+from sistema_contable_completo import DIRECTORIO_ARCHIVO, RUTA_BITACORA, SistemaContable, configurar_locale, escribir_reporte
+
+# Reportes que se generan línea por línea (iter_*) y los que se generan como texto (generar_*)
+REPORTES_ITERADOS = {
+    "diario": lambda sistema, desde, hasta: sistema.iter_diario(desde=desde, hasta=hasta),
+    "mayor": lambda sistema, desde, hasta: sistema.iter_mayor(desde=desde, hasta=hasta),
+    "flujos": lambda sistema, desde, hasta: sistema.iter_estado_flujos_efectivo(desde, hasta),
+}
+REPORTES_TEXTO = {
+    "balanza": "generar_balanza_comprobacion",
+    "balance": "generar_balance_general",
+    "resultados": "generar_estado_resultados",
+    "capital": "generar_estado_cambios_capital",
+}
+
+
+def fecha(texto):
+    """Fecha AAAA-MM-DD de la línea de comandos"""
+    try:
+        return date.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Fecha no válida: {texto!r} (use AAAA-MM-DD)")
+
+
+def leer_asientos(ruta):
+    """Genera los asientos de un archivo JSONL como registros (fecha ordinal, descripcion,
+    cargos y abonos en centavos), sin cargar el archivo completo"""
+    with open(ruta, encoding="utf-8") as archivo:
+        for numero, linea in enumerate(archivo, 1):
+            if not linea.strip():
+                continue
+            try:
+                datos = json.loads(linea)
+                registro = {
+                    "fecha": date.fromisoformat(datos["fecha"]).toordinal(),
+                    "descripcion": datos["descripcion"],
+                    "cargos": {cuenta: a_centavos(monto) for cuenta, monto in datos["cargos"].items()},
+                    "abonos": {cuenta: a_centavos(monto) for cuenta, monto in datos["abonos"].items()},
+                }
+            except (ValueError, KeyError, TypeError, ArithmeticError) as error:
+                raise ValueError(f"{ruta}, línea {numero}: asiento no válido ({error!r})")
+            if "actividad" in datos:
+                registro["actividad"] = datos["actividad"]
+            yield registro
+
+
+def registrar_archivo(sistema, ruta, tamano_lote=10000):
+    """Registra los asientos de un archivo JSONL en lotes de asientos consecutivos con la
+    misma fecha. Cada lote se registra completo o no se registra. Devuelve cuántos se registraron"""
+    total = 0
+    for fecha_lote, lote in AlmacenAsientos.lotes_por_fecha(leer_asientos(ruta), tamano_lote):
+        sistema.registrar_asientos_lote(lote, fecha_lote)
+        total += len(lote)
+    return total
+
+
+def _registrar(sistema, argumentos):
+    if os.path.splitext(argumentos.archivo)[1].lower() == ".jsonl":
+        print(f"{registrar_archivo(sistema, argumentos.archivo)} asientos registrados")
+        return 0
+    from importador import importar_archivo
+    resumen = importar_archivo(sistema, argumentos.archivo, cuenta=argumentos.cuenta, errores=argumentos.errores)
+    print(f"{resumen['filas']} filas: {resumen['registradas']} registradas, {resumen['errores']} con error")
+    if resumen["errores"]:
+        print(f"Detalle de los errores en {argumentos.errores}")
+        return 1
+    return 0
+
+
+def _con_salto_final(lineas):
+    """Las líneas de un reporte, terminadas en salto de línea aunque la última no lo tenga"""
+    ultima = "\n"
+    for ultima in lineas:
+        yield ultima
+    if not ultima.endswith("\n"):
+        yield "\n"
+
+
+def _reporte(sistema, argumentos):
+    if argumentos.tipo in REPORTES_ITERADOS:
+        lineas = REPORTES_ITERADOS[argumentos.tipo](sistema, argumentos.desde, argumentos.hasta)
+    else:
+        generar = getattr(sistema, REPORTES_TEXTO[argumentos.tipo])
+        lineas = (generar(desde=argumentos.desde, hasta=argumentos.hasta),)
+    lineas = _con_salto_final(lineas)
+    if argumentos.salida is None:
+        escribir_reporte(lineas, sys.stdout)
+    else:
+        with open(argumentos.salida, "w", encoding="utf-8") as destino:
+            escribir_reporte(lineas, destino)
+    return 0
+
+
+def _exportar(sistema, argumentos):
+    import exportador
+    periodo = {"desde": argumentos.desde, "hasta": argumentos.hasta, "cuentas": argumentos.cuentas}
+    if argumentos.libro == "mayor-por-cuenta":
+        filas = exportador.exportar_mayor_por_cuenta(sistema, argumentos.ruta, argumentos.formato or "csv",
+                                                     procesos=argumentos.procesos, **periodo)
+        print(f"{len(filas)} archivos, {sum(filas.values())} filas en {argumentos.ruta}")
+        return 0
+    exportar = exportador.exportar_diario if argumentos.libro == "diario" else exportador.exportar_mayor
+    print(f"{exportar(sistema, argumentos.ruta, argumentos.formato, **periodo)} filas en {argumentos.ruta}")
+    return 0
+
+
+def _cierre(sistema, argumentos):
+    ruta = sistema.cerrar_periodo(argumentos.hasta, argumentos.anual, argumentos.archivo)
+    print(f"Periodo cerrado al {argumentos.hasta:%d/%m/%Y}; detalle archivado en {ruta}")
+    return 0
+
+
+def crear_parser():
+    """Parser de argumentos con un subcomando por operación"""
+    parser = argparse.ArgumentParser(prog="python -m comandos", description="Sistema contable sin interfaz gráfica")
+    parser.add_argument("--bitacora", default=RUTA_BITACORA, help="Bitácora JSONL del diario")
+    parser.add_argument("--sqlite", help="Usar una base SQLite como persistencia en lugar de la bitácora")
+    parser.add_argument("--puntos-control", help="Directorio de puntos de control")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    
+    registrar = comandos.add_parser("registrar", help="Registra los asientos de un archivo JSONL, CSV u OFX")
+    registrar.add_argument("archivo")
+    registrar.add_argument("--cuenta", default="Bancos", help="Cuenta del estado de cuenta (CSV/OFX)")
+    registrar.add_argument("--errores", default="errores_importacion.csv")
+    registrar.set_defaults(ejecutar=_registrar)
+    
+    reporte = comandos.add_parser("reporte", help="Imprime un reporte")
+    reporte.add_argument("tipo", choices=list(REPORTES_ITERADOS) + list(REPORTES_TEXTO))
+    reporte.add_argument("--salida", help="Archivo de salida (por omisión la salida estándar)")
+    reporte.set_defaults(ejecutar=_reporte)
+    
+    exportar = comandos.add_parser("exportar", help="Exporta el diario o el mayor a CSV, JSONL o XLSX")
+    exportar.add_argument("libro", choices=("diario", "mayor", "mayor-por-cuenta"))
+    exportar.add_argument("ruta", help="Archivo (o directorio con mayor-por-cuenta)")
+    exportar.add_argument("--formato", choices=("csv", "jsonl", "xlsx"), help="Por omisión, el de la extensión")
+    exportar.add_argument("--cuentas", nargs="+")
+    exportar.add_argument("--procesos", type=int)
+    exportar.set_defaults(ejecutar=_exportar)
+    
+    for subparser in (reporte, exportar):
+        subparser.add_argument("--desde", type=fecha)
+        subparser.add_argument("--hasta", type=fecha)
+    
+    cierre = comandos.add_parser("cierre", help="Cierra el periodo que termina en HASTA (AAAA-MM-DD)")
+    cierre.add_argument("hasta", type=fecha)
+    cierre.add_argument("--anual", action="store_true", help="Traspasa la utilidad del ejercicio a utilidades retenidas")
+    cierre.add_argument("--archivo", default=DIRECTORIO_ARCHIVO, help="Directorio del diario archivado")
+    cierre.set_defaults(ejecutar=_cierre)
+    
+    comandos.add_parser("gui", help="Abre la interfaz gráfica")
+    return parser
+
+
+def main(argv=None):
+    argumentos = crear_parser().parse_args(argv)
+    if argumentos.sqlite:
+        from persistencia_sqlite import PersistenciaSQLite
+        persistencia = PersistenciaSQLite(argumentos.sqlite)
+    elif argumentos.comando == "gui":
+        # La interfaz guarda cada asiento en disco al registrarlo
+        persistencia = BitacoraJSONL(argumentos.bitacora)
+    else:
+        # Un solo fsync al cerrar en lugar de uno por asiento
+        persistencia = BitacoraJSONL(argumentos.bitacora, fsync_cada=None)
+    puntos_control = None
+    if argumentos.puntos_control:
+        from puntos_control import PuntosControl
+        puntos_control = PuntosControl(argumentos.puntos_control)
+    try:
+        if argumentos.comando == "gui":
+            from interfaz_contable import main as main_interfaz
+            main_interfaz(persistencia=persistencia, puntos_control=puntos_control)  # También configura el locale
+            return 0
+        configurar_locale()
+        sistema = SistemaContable(persistencia, puntos_control)
+        return argumentos.ejecutar(sistema, argumentos)
+    except (ValueError, OSError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if puntos_control is not None:
+            puntos_control.esperar()
+        persistencia.cerrar()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
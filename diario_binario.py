@@ -0,0 +1,198 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+from datetime import date
+
+# Encabezado: firma, versión, número de líneas, posición del índice del mayor,
+# posición y longitud de la tabla de cadenas (JSON)
+ENCABEZADO = struct.Struct("<8sIqqqq")
+FIRMA = b"FINBIN\x00\x01"
+VERSION = 1
+
+# Una línea por cargo o abono: asiento, monto (centavos), fecha ordinal, cuenta, descripción, lado
+LINEA = struct.Struct("<qqiiib")
+
+# Líneas que se procesan por bloque al recorrer el archivo
+LINEAS_POR_BLOQUE = 65536
+
+
+def escribir_diario_binario(almacen, ruta):
+    """Escribe el contenido de un AlmacenAsientos en un diario binario de ancho fijo.
+    
+    Los asientos se escriben en orden de fecha (con su número original) aunque se hayan
+    registrado con fecha anterior. Después de las líneas va el índice del mayor (posiciones
+    de las líneas de cada cuenta, también en orden de fecha) y al final la tabla de
+    cadenas con las cuentas, las descripciones y el saldo de cada cuenta. Se escribe en
+    un archivo temporal que luego reemplaza al definitivo.
+    """
+    total = almacen.num_lineas()
+    inicio_indice = ENCABEZADO.size + total * LINEA.size
+    posiciones = array("q", bytes(8 * total))  # Línea del almacén -> posición en el archivo
+    
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(ENCABEZADO.pack(FIRMA, VERSION, total, inicio_indice, 0, 0))
+        bloque = bytearray(LINEAS_POR_BLOQUE * LINEA.size)
+        desplazamiento = 0
+        posicion = 0
+        for asiento in almacen.asientos_por_fecha:
+            fecha = almacen.asiento_fecha[asiento]
+            descripcion = almacen.asiento_descripcion[asiento]
+            for linea in almacen.lineas_asiento(asiento):
+                if desplazamiento == len(bloque):
+                    archivo.write(bloque)
+                    desplazamiento = 0
+                LINEA.pack_into(bloque, desplazamiento, asiento, almacen.linea_monto[linea], fecha,
+                                almacen.linea_cuenta[linea], descripcion, almacen.linea_lado[linea])
+                desplazamiento += LINEA.size
+                posiciones[linea] = posicion
+                posicion += 1
+        archivo.write(memoryview(bloque)[:desplazamiento])
+        
+        indice = []
+        inicio = inicio_indice
+        for id_cuenta, lineas in almacen.lineas_por_cuenta.items():
+            saldo = 0
+            for linea in lineas:
+                monto = almacen.linea_monto[linea]
+                saldo += -monto if almacen.linea_lado[linea] else monto
+            array("q", sorted(posiciones[linea] for linea in lineas)).tofile(archivo)
+            indice.append([id_cuenta, inicio, len(lineas), saldo])
+            inicio += len(lineas) * 8
+        
+        cadenas = json.dumps({
+            "cuentas": almacen.nombres_cuentas,
+            "descripciones": almacen.descripciones,
+            "indice": indice
+        }, ensure_ascii=False).encode("utf-8")
+        archivo.write(cadenas)
+        archivo.seek(0)
+        archivo.write(ENCABEZADO.pack(FIRMA, VERSION, total, inicio_indice, inicio, len(cadenas)))
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+
+
+class DiarioBinario:
+    """Diario binario de ancho fijo leído con mmap, para ejercicios archivados.
+    
+    Las líneas se recorren por bloques directamente sobre el archivo mapeado (sin
+    copiarlas ni crear un diccionario por línea) y las páginas ya leídas se liberan,
+    de modo que la memoria residente no crece con el tamaño del archivo. Ofrece
+    iter_asientos, cuentas_mayor y saldos_por_cuenta para los reportes del sistema.
+    """
+    
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, "rb") as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        firma, version, self.num_lineas, self._inicio_indice, inicio_cadenas, longitud = \
+            ENCABEZADO.unpack_from(self._mapa, 0)
+        if firma != FIRMA or version != VERSION:
+            self._mapa.close()
+            raise ValueError(f"No es un diario binario válido: {ruta}")
+        cadenas = json.loads(self._mapa[inicio_cadenas:inicio_cadenas + longitud])
+        self.nombres_cuentas = cadenas["cuentas"]
+        self.descripciones = cadenas["descripciones"]
+        self._indice = cadenas["indice"]
+        self._fechas_texto = {}
+    
+    def cerrar(self):
+        """Libera el archivo mapeado"""
+        self._mapa.close()
+    
+    def fecha_texto(self, ordinal):
+        """Formatea una fecha ordinal como dd/mm/aaaa"""
+        texto = self._fechas_texto.get(ordinal)
+        if texto is None:
+            texto = self._fechas_texto[ordinal] = date.fromordinal(ordinal).strftime("%d/%m/%Y")
+        return texto
+    
+    def _liberar(self, inicio, fin):
+        """Descarta de la memoria residente las páginas completas de [inicio, fin)"""
+        if hasattr(self._mapa, "madvise"):
+            inicio -= inicio % mmap.PAGESIZE
+            fin -= fin % mmap.PAGESIZE
+            if fin > inicio:
+                self._mapa.madvise(mmap.MADV_DONTNEED, inicio, fin - inicio)
+    
+    def iter_lineas(self):
+        """Genera (asiento, monto, fecha, cuenta, descripcion, lado) de cada línea, en orden"""
+        inicio = ENCABEZADO.size
+        fin_lineas = self._inicio_indice
+        tamano_bloque = LINEAS_POR_BLOQUE * LINEA.size
+        with memoryview(self._mapa) as vista:
+            while inicio < fin_lineas:
+                fin = min(inicio + tamano_bloque, fin_lineas)
+                with vista[inicio:fin] as bloque:
+                    yield from LINEA.iter_unpack(bloque)
+                self._liberar(inicio, fin)
+                inicio = fin
+    
+    @staticmethod
+    def _limites(desde, hasta):
+        """Límites de un periodo de fechas ordinales; None es sin límite"""
+        return (date.min.toordinal() if desde is None else desde,
+                date.max.toordinal() if hasta is None else hasta)
+    
+    def iter_asientos(self, desde=None, hasta=None):
+        """Genera (numero, fecha, descripcion, cargos, abonos) de cada asiento, con
+        cargos y abonos como listas de (cuenta, monto); opcionalmente solo los de un periodo"""
+        cuentas = self.nombres_cuentas
+        desde, hasta = self._limites(desde, hasta)
+        actual = None
+        for asiento, monto, fecha, cuenta, descripcion, lado in self.iter_lineas():
+            if not desde <= fecha <= hasta:
+                continue
+            if actual is None or asiento != actual[0]:
+                if actual is not None:
+                    yield actual[0] + 1, self.fecha_texto(actual[1]), self.descripciones[actual[2]], actual[3], actual[4]
+                actual = (asiento, fecha, descripcion, [], [])
+            actual[3 + lado].append((cuentas[cuenta], monto))
+        if actual is not None:
+            yield actual[0] + 1, self.fecha_texto(actual[1]), self.descripciones[actual[2]], actual[3], actual[4]
+    
+    def cuentas_mayor(self, desde=None, hasta=None):
+        """Genera (cuenta, cargos, abonos, saldo) por cuenta para los esquemas de mayor,
+        con cargos y abonos como generadores de (fecha, descripcion, monto).
+        
+        Con un periodo se omiten las cuentas sin movimientos en él y el saldo es el del periodo.
+        """
+        periodo = desde is not None or hasta is not None
+        desde, hasta = self._limites(desde, hasta)
+        for id_cuenta, inicio, cantidad, saldo in self._indice:
+            if periodo:
+                saldo = None
+                for lado, monto in self._movimientos(inicio, cantidad, None, desde, hasta, completos=False):
+                    saldo = (saldo or 0) + (-monto if lado else monto)
+                if saldo is None:
+                    continue
+            yield (self.nombres_cuentas[id_cuenta], self._movimientos(inicio, cantidad, 0, desde, hasta),
+                   self._movimientos(inicio, cantidad, 1, desde, hasta), saldo)
+    
+    def _movimientos(self, inicio, cantidad, lado_buscado, desde, hasta, completos=True):
+        """Genera (fecha, descripcion, monto) de las líneas de un lado y periodo en un tramo
+        del índice; con completos=False genera solo (lado, monto) de ambos lados"""
+        with memoryview(self._mapa) as vista, vista[inicio:inicio + cantidad * 8].cast("q") as lineas:
+            for linea in lineas:
+                _, monto, fecha, _, descripcion, lado = LINEA.unpack_from(self._mapa, ENCABEZADO.size + linea * LINEA.size)
+                if not desde <= fecha <= hasta:
+                    continue
+                if not completos:
+                    yield lado, monto
+                elif lado == lado_buscado:
+                    yield self.fecha_texto(fecha), self.descripciones[descripcion], monto
+    
+    def saldos_por_cuenta(self, desde=None, hasta=None):
+        """Saldo (cargos - abonos) de cada cuenta; con un periodo de fechas ordinales se
+        recorre el archivo, sin periodo se usan los saldos guardados al escribirlo"""
+        if desde is None and hasta is None:
+            return {self.nombres_cuentas[id_cuenta]: saldo for id_cuenta, _, _, saldo in self._indice}
+        desde, hasta = self._limites(desde, hasta)
+        saldos = [0] * len(self.nombres_cuentas)
+        for _, monto, fecha, cuenta, _, lado in self.iter_lineas():
+            if desde <= fecha <= hasta:
+                saldos[cuenta] += -monto if lado else monto
+        return {self.nombres_cuentas[id_cuenta]: saldos[id_cuenta] for id_cuenta, _, _, _ in self._indice}
@@ -0,0 +1,51 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Todos los montos del sistema se manejan como enteros en centavos.
+# Los montos en pesos solo existen al capturar datos y al mostrarlos.
+
+TASA_IVA = Decimal("0.16")
+_UNIDAD = Decimal(1)
+
+
+def redondear(valor):
+    """Redondea un Decimal en centavos al centavo entero más cercano (mitad hacia arriba)"""
+    try:
+        return int(valor.quantize(_UNIDAD, rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        # Más dígitos de los que admite el contexto decimal (p. ej. "1e999")
+        raise ValueError(f"Monto fuera de rango: {valor}") from None
+
+
+def _decimal(valor):
+    """Convierte un int, float, str o Decimal a un Decimal finito. Los textos inválidos,
+    infinitos y NaN levantan ValueError, igual que float() con un texto inválido"""
+    if isinstance(valor, float):
+        # str() evita arrastrar el error binario del float (0.1 -> "0.1")
+        valor = str(valor)
+    try:
+        decimal = Decimal(valor)
+    except InvalidOperation:
+        raise ValueError(f"Monto inválido: {valor!r}") from None
+    if not decimal.is_finite():
+        raise ValueError(f"Monto inválido: {valor!r}")
+    return decimal
+
+
+def a_centavos(monto):
+    """Convierte un monto en pesos (int, float, str o Decimal) a centavos enteros"""
+    return redondear(_decimal(monto) * 100)
+
+
+def calcular_iva(centavos, tasa=TASA_IVA):
+    """Calcula el IVA de un monto en centavos, redondeado al centavo (mitad hacia arriba)"""
+    return redondear(Decimal(centavos) * tasa)
+
+
+def proporcion(centavos, porcentaje):
+    """Parte de un monto en centavos que corresponde a un porcentaje, redondeada al centavo"""
+    return redondear(Decimal(centavos) * _decimal(porcentaje) / 100)
+
+
+def pesos(centavos):
+    """Convierte centavos a pesos como Decimal exacto, para mostrarlo con formato"""
+    return Decimal(centavos).scaleb(-2)
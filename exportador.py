@@ -0,0 +1,336 @@
+import csv
+import json
+import os
+import re
+import zipfile
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
+from xml.sax.saxutils import escape
+
+
+# Columnas de cada exportación y su tipo: los montos van en centavos en memoria y se
+# escriben en pesos en CSV y XLSX y en centavos enteros en JSONL
+COLUMNAS_DIARIO = (("asiento", "entero"), ("fecha", "fecha"), ("descripcion", "texto"), ("cuenta", "texto"),
+                   ("cargo", "monto"), ("abono", "monto"))
+COLUMNAS_MAYOR = (("cuenta", "texto"), ("fecha", "fecha"), ("asiento", "entero"), ("descripcion", "texto"),
+                  ("cargo", "monto"), ("abono", "monto"), ("saldo", "monto"))
+
+FORMATOS = ("csv", "jsonl", "xlsx")
+
+TAMANO_BLOQUE = 10000  # Filas por bloque: lo único que se tiene en memoria al exportar
+
+# Filas de datos por hoja de XLSX (el límite de Excel es 1,048,576 con el encabezado)
+FILAS_POR_HOJA = 1_048_575
+
+
+def bloques_diario(almacen, desde=None, hasta=None, cuentas=None, tamano_bloque=TAMANO_BLOQUE):
+    """Genera el libro diario en bloques de filas (una por línea del asiento), en orden de fecha.
+    
+    desde/hasta son ordinales (None sin límite); con cuentas (nombres) solo se incluyen
+    completos los asientos que mueven alguna de ellas.
+    """
+    ids = None if cuentas is None else {almacen.ids_cuentas[c] for c in cuentas if c in almacen.ids_cuentas}
+    nombres = almacen.nombres_cuentas
+    bloque = []
+    # Se recorren las posiciones del índice por fecha, sin copiar los ids del periodo
+    for posicion in almacen.posiciones_entre(desde, hasta):
+        asiento = almacen.asientos_por_fecha[posicion]
+        lineas = almacen.lineas_asiento(asiento)
+        if ids is not None and not any(almacen.linea_cuenta[linea] in ids for linea in lineas):
+            continue
+        fecha = almacen.asiento_fecha[asiento]
+        descripcion = almacen.descripciones[almacen.asiento_descripcion[asiento]]
+        for linea in lineas:
+            monto = almacen.linea_monto[linea]
+            abono = almacen.linea_lado[linea]
+            bloque.append((asiento + 1, fecha, descripcion, nombres[almacen.linea_cuenta[linea]],
+                           0 if abono else monto, monto if abono else 0))
+        if len(bloque) >= tamano_bloque:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def _movimientos(almacen, id_cuenta, desde=None, hasta=None):
+    """Genera (fecha, asiento, descripcion, lado, monto) de las líneas de una cuenta en un
+    periodo, en orden de fecha (con bisect en el índice de saldos de la cuenta)"""
+    descripciones = almacen.descripciones
+    for linea in almacen.iter_lineas_cuenta(id_cuenta, desde, hasta):
+        asiento = almacen.linea_asiento[linea]
+        yield (almacen.asiento_fecha[asiento], asiento, descripciones[almacen.asiento_descripcion[asiento]],
+               almacen.linea_lado[linea], almacen.linea_monto[linea])
+
+
+def _bloques_movimientos(cuenta, saldo, movimientos, tamano_bloque):
+    """Bloques de filas del mayor de una cuenta con el saldo acumulado después de cada línea"""
+    bloque = []
+    for fecha, asiento, descripcion, lado, monto in movimientos:
+        if lado:
+            saldo -= monto
+            bloque.append((cuenta, fecha, asiento + 1, descripcion, 0, monto, saldo))
+        else:
+            saldo += monto
+            bloque.append((cuenta, fecha, asiento + 1, descripcion, monto, 0, saldo))
+        if len(bloque) >= tamano_bloque:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def bloques_mayor(almacen, id_cuenta, desde=None, hasta=None, tamano_bloque=TAMANO_BLOQUE):
+    """Genera el esquema de mayor de una cuenta en bloques de filas, en orden de fecha, con
+    el saldo acumulado después de cada línea (a partir del saldo al día anterior a desde)"""
+    saldo = 0 if desde is None else almacen.saldo_al(id_cuenta, desde - 1)
+    yield from _bloques_movimientos(almacen.nombres_cuentas[id_cuenta], saldo,
+                                    _movimientos(almacen, id_cuenta, desde, hasta), tamano_bloque)
+
+
+def _texto_pesos(centavos):
+    """Monto en pesos con dos decimales, igual a str(pesos(centavos)) pero sin Decimal"""
+    if centavos < 0:
+        enteros, resto = divmod(-centavos, 100)
+        return f"-{enteros}.{resto:02d}"
+    enteros, resto = divmod(centavos, 100)
+    return f"{enteros}.{resto:02d}"
+
+
+def _convertidores(columnas, formato):
+    """Función que convierte cada columna de una fila al valor que se escribe"""
+    fechas = {}
+    
+    def fecha_iso(ordinal):
+        texto = fechas.get(ordinal)
+        if texto is None:
+            texto = fechas[ordinal] = date.fromordinal(ordinal).isoformat()
+        return texto
+    
+    monto = (lambda centavos: centavos) if formato == "jsonl" else _texto_pesos
+    por_tipo = {"entero": None, "texto": None, "fecha": fecha_iso, "monto": monto}
+    return [por_tipo[tipo] for _, tipo in columnas]
+
+
+def _convertir(bloque, convertidores):
+    """Filas de un bloque con sus valores convertidos"""
+    return [[valor if convertir is None else convertir(valor) for valor, convertir in zip(fila, convertidores)]
+            for fila in bloque]
+
+
+def _escribir_csv(bloques, columnas, ruta):
+    """CSV con encabezado; montos en pesos y fechas AAAA-MM-DD"""
+    convertidores = _convertidores(columnas, "csv")
+    filas = 0
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow([nombre for nombre, _ in columnas])
+        for bloque in bloques:
+            escritor.writerows(_convertir(bloque, convertidores))
+            filas += len(bloque)
+    return filas
+
+
+def _escribir_jsonl(bloques, columnas, ruta):
+    """Un objeto JSON por fila; montos en centavos enteros y fechas AAAA-MM-DD"""
+    convertidores = _convertidores(columnas, "jsonl")
+    nombres = [nombre for nombre, _ in columnas]
+    filas = 0
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        for bloque in bloques:
+            archivo.write("".join(json.dumps(dict(zip(nombres, fila)), ensure_ascii=False) + "\n"
+                                  for fila in _convertir(bloque, convertidores)))
+            filas += len(bloque)
+    return filas
+
+
+def _fila_xlsx(valores, tipos):
+    """XML de una fila de la hoja: los montos y enteros como números, lo demás como texto"""
+    celdas = []
+    for valor, tipo in zip(valores, tipos):
+        if tipo in ("monto", "entero"):
+            celdas.append(f"<c><v>{valor}</v></c>")
+        else:
+            celdas.append(f'<c t="inlineStr"><is><t>{escape(valor)}</t></is></c>')
+    return "<row>" + "".join(celdas) + "</row>"
+
+
+def _escribir_xlsx(bloques, columnas, ruta):
+    """Libro XLSX mínimo escrito con zipfile; cada hoja se comprime mientras se escribe y
+    se abre otra al llegar al límite de filas de Excel"""
+    convertidores = _convertidores(columnas, "xlsx")
+    tipos = [tipo for _, tipo in columnas]
+    encabezado = _fila_xlsx([nombre for nombre, _ in columnas], ["texto"] * len(columnas))
+    filas = 0
+    hojas = 0
+    hoja = None
+    en_hoja = 0
+    with zipfile.ZipFile(ruta, "w", zipfile.ZIP_DEFLATED) as libro:
+        def abrir_hoja():
+            nonlocal hoja, hojas, en_hoja
+            hojas += 1
+            en_hoja = 0
+            hoja = libro.open(f"xl/worksheets/sheet{hojas}.xml", "w", force_zip64=True)
+            hoja.write(('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+                        + encabezado).encode("utf-8"))
+        
+        def cerrar_hoja():
+            hoja.write(b"</sheetData></worksheet>")
+            hoja.close()
+        
+        abrir_hoja()
+        for bloque in bloques:
+            filas_bloque = _convertir(bloque, convertidores)
+            while filas_bloque:
+                if en_hoja == FILAS_POR_HOJA:
+                    cerrar_hoja()
+                    abrir_hoja()
+                parte = filas_bloque[:FILAS_POR_HOJA - en_hoja]
+                filas_bloque = filas_bloque[len(parte):]
+                hoja.write("".join(_fila_xlsx(fila, tipos) for fila in parte).encode("utf-8"))
+                en_hoja += len(parte)
+                filas += len(parte)
+        cerrar_hoja()
+        
+        numeros = range(1, hojas + 1)
+        libro.writestr("[Content_Types].xml",
+                       '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                       '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                       '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                       '<Default Extension="xml" ContentType="application/xml"/>'
+                       '<Override PartName="/xl/workbook.xml" '
+                       'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                       + "".join(f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+                                 'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                                 for n in numeros)
+                       + "</Types>")
+        libro.writestr("_rels/.rels",
+                       '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                       '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                       '<Relationship Id="rId1" '
+                       'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+                       'Target="xl/workbook.xml"/></Relationships>')
+        libro.writestr("xl/workbook.xml",
+                       '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                       '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                       'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+                       + "".join(f'<sheet name="Hoja{n}" sheetId="{n}" r:id="rId{n}"/>' for n in numeros)
+                       + "</sheets></workbook>")
+        libro.writestr("xl/_rels/workbook.xml.rels",
+                       '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                       '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                       + "".join(f'<Relationship Id="rId{n}" '
+                                 'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                                 f'Target="worksheets/sheet{n}.xml"/>' for n in numeros)
+                       + "</Relationships>")
+    return filas
+
+
+_ESCRITORES = {"csv": _escribir_csv, "jsonl": _escribir_jsonl, "xlsx": _escribir_xlsx}
+
+
+def escribir(bloques, columnas, ruta, formato=None):
+    """Escribe bloques de filas en ruta como CSV, JSONL o XLSX (por omisión según la
+    extensión), un bloque a la vez; devuelve el número de filas escritas"""
+    formato = formato or os.path.splitext(ruta)[1].lstrip(".").lower()
+    if formato not in _ESCRITORES:
+        raise ValueError(f"Formato no soportado: {formato!r} (use {', '.join(FORMATOS)})")
+    return _ESCRITORES[formato](bloques, columnas, ruta)
+
+
+def _ids_cuentas(almacen, cuentas):
+    """Ids de las cuentas pedidas (todas las del mayor con None), en el orden del mayor"""
+    if cuentas is None:
+        return list(almacen.lineas_por_cuenta)
+    for cuenta in cuentas:
+        if cuenta not in almacen.ids_cuentas:
+            raise ValueError(f"La cuenta '{cuenta}' no tiene movimientos")
+    return [almacen.ids_cuentas[cuenta] for cuenta in cuentas]
+
+
+def exportar_diario(sistema, ruta, formato=None, desde=None, hasta=None, cuentas=None, tamano_bloque=TAMANO_BLOQUE):
+    """Exporta el libro diario del sistema (fechas date u ordinales); devuelve las filas escritas"""
+    desde, hasta = sistema._periodo(desde, hasta)
+    return escribir(bloques_diario(sistema.almacen, desde, hasta, cuentas, tamano_bloque), COLUMNAS_DIARIO, ruta, formato)
+
+
+def exportar_mayor(sistema, ruta, formato=None, desde=None, hasta=None, cuentas=None, tamano_bloque=TAMANO_BLOQUE):
+    """Exporta los esquemas de mayor de las cuentas en un solo archivo, una cuenta tras otra"""
+    desde, hasta = sistema._periodo(desde, hasta)
+    almacen = sistema.almacen
+    
+    def bloques():
+        for id_cuenta in _ids_cuentas(almacen, cuentas):
+            yield from bloques_mayor(almacen, id_cuenta, desde, hasta, tamano_bloque)
+    
+    return escribir(bloques(), COLUMNAS_MAYOR, ruta, formato)
+
+
+def _columnas_cuenta(almacen, id_cuenta, desde, hasta):
+    """Columnas del mayor de una cuenta en un periodo: lo único que recibe el proceso que
+    la exporta (fechas, asientos, lados, montos y descripciones de sus líneas)"""
+    fechas = array("i")
+    asientos = array("q")
+    lados = array("b")
+    montos = array("q")
+    ids_descripciones = array("i")
+    textos = {}  # Descripción -> id dentro de la cuenta
+    for fecha, asiento, descripcion, lado, monto in _movimientos(almacen, id_cuenta, desde, hasta):
+        fechas.append(fecha)
+        asientos.append(asiento)
+        lados.append(lado)
+        montos.append(monto)
+        id_descripcion = textos.get(descripcion)
+        if id_descripcion is None:
+            id_descripcion = textos[descripcion] = len(textos)
+        ids_descripciones.append(id_descripcion)
+    saldo = 0 if desde is None else almacen.saldo_al(id_cuenta, desde - 1)
+    return almacen.nombres_cuentas[id_cuenta], saldo, (fechas, asientos, lados, montos, ids_descripciones, list(textos))
+
+
+def _exportar_cuenta(columnas, ruta, formato, tamano_bloque):
+    """Escribe el mayor de una cuenta a partir de sus columnas; se ejecuta en un proceso del pool"""
+    cuenta, saldo, (fechas, asientos, lados, montos, ids_descripciones, textos) = columnas
+    movimientos = zip(fechas, asientos, map(textos.__getitem__, ids_descripciones), lados, montos)
+    return escribir(_bloques_movimientos(cuenta, saldo, movimientos, tamano_bloque), COLUMNAS_MAYOR, ruta, formato)
+
+
+def exportar_mayor_por_cuenta(sistema, directorio, formato="csv", desde=None, hasta=None, cuentas=None,
+                              procesos=None, tamano_bloque=TAMANO_BLOQUE):
+    """Exporta el mayor de cada cuenta en su propio archivo "mayor_<cuenta>.<formato>",
+    en paralelo en un ProcessPoolExecutor.
+    
+    Cada proceso recibe solo las columnas de la cuenta que exporta (sus líneas del
+    periodo), que se toman de este sistema justo antes de enviarla: a lo más hay una
+    cuenta por proceso en vuelo, no una copia del almacén. Como exportar_mayor, lee
+    el almacén del sistema, así que no debe registrarse nada mientras tanto. Las
+    cuentas con más líneas se envían primero para repartir mejor. Devuelve {cuenta:
+    filas escritas}.
+    """
+    if formato not in _ESCRITORES:
+        raise ValueError(f"Formato no soportado: {formato!r} (use {', '.join(FORMATOS)})")
+    desde, hasta = sistema._periodo(desde, hasta)
+    almacen = sistema.almacen
+    ids = sorted(_ids_cuentas(almacen, cuentas), key=lambda i: len(almacen.lineas_por_cuenta.get(i, ())), reverse=True)
+    os.makedirs(directorio, exist_ok=True)
+    if procesos is None:
+        procesos = min(len(ids), os.cpu_count() or 1) or 1
+    
+    filas = {}
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        pendientes = {}
+        for id_cuenta in ids:
+            if len(pendientes) >= procesos:
+                listos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    filas[pendientes.pop(futuro)] = futuro.result()
+            cuenta = almacen.nombres_cuentas[id_cuenta]
+            nombre = re.sub(r"\W+", "_", cuenta)
+            ruta = os.path.join(directorio, f"mayor_{nombre}.{formato}")
+            futuro = ejecutor.submit(_exportar_cuenta, _columnas_cuenta(almacen, id_cuenta, desde, hasta), ruta,
+                                     formato, tamano_bloque)
+            pendientes[futuro] = cuenta
+        for futuro, cuenta in pendientes.items():
+            filas[cuenta] = futuro.result()
+    return {almacen.nombres_cuentas[id_cuenta]: filas[almacen.nombres_cuentas[id_cuenta]] for id_cuenta in ids}
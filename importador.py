@@ -0,0 +1,272 @@
+import csv
+import os
+import re
+from datetime import datetime
+from decimal import Decimal
+
+from dinero import TASA_IVA, a_centavos, pesos, redondear
+
+# Parámetros de cada operación del sistema que puede asignar una regla, además de la
+# fecha. El importe del archivo incluye el IVA: monto_sin_iva se obtiene de él y monto
+# (gasto_financiero, sin IVA) es el importe tal cual
+OPERACIONES = {
+    "compra_efectivo": ("monto_sin_iva", "cuenta_origen"),
+    "compra_credito": ("monto_sin_iva",),
+    "anticipo_cliente": ("monto_sin_iva", "cuenta_destino"),
+    "compra_papeleria": ("monto_sin_iva", "cuenta_origen"),
+    "venta_efectivo": ("monto_sin_iva", "costo_venta", "cuenta_destino"),
+    "venta_credito": ("monto_sin_iva", "costo_venta"),
+    "gasto_administracion": ("monto_sin_iva", "cuenta_origen"),
+    "gasto_venta": ("monto_sin_iva", "cuenta_origen"),
+    "gasto_financiero": ("monto", "cuenta_origen"),
+}
+
+# Reglas por omisión para un estado de cuenta: (expresión regular sobre la descripción o
+# None para cualquiera, signo del monto "+" / "-" o None para cualquiera, operación).
+# Se usa la primera que coincide
+REGLAS = (
+    (r"comisi[oó]n|intereses|\biva\b", "-", "gasto_financiero"),
+    (r"papeler[ií]a", "-", "compra_papeleria"),
+    (r"publicidad|flete|env[ií]o|paqueter[ií]a", "-", "gasto_venta"),
+    (r"proveedor|compra|mercanc[ií]a", "-", "compra_efectivo"),
+    (r"anticipo", "+", "anticipo_cliente"),
+    (None, "-", "gasto_administracion"),
+    (None, "+", "venta_efectivo"),
+)
+
+# Columnas del archivo para cada campo: fecha, descripcion y monto (o retiro y deposito
+# por separado); costo es el costo de venta de la fila, si el archivo lo trae
+COLUMNAS_CSV = {"fecha": "fecha", "descripcion": "descripcion", "monto": "monto"}
+COLUMNAS_OFX = {"fecha": "DTPOSTED", "descripcion": "NAME", "monto": "TRNAMT"}
+
+FORMATOS_FECHA = ("%Y-%m-%d", "%d/%m/%Y", "%Y%m%d")
+
+_ETIQUETA_OFX = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)")
+
+
+def leer_csv(ruta, delimitador=",", codificacion="utf-8-sig"):
+    """Genera las filas de un CSV con encabezados como {"fila": número, "datos": {columna: texto}}"""
+    with open(ruta, newline="", encoding=codificacion) as archivo:
+        for numero, datos in enumerate(csv.DictReader(archivo, delimiter=delimitador), 2):
+            yield {"fila": numero, "datos": datos}
+
+
+def leer_ofx(ruta, codificacion="latin-1"):
+    """Genera los movimientos (<STMTTRN>) de un archivo OFX como {"fila": número, "datos":
+    {etiqueta: texto}}; lee el archivo línea por línea y acepta OFX 1.x (SGML, sin
+    etiquetas de cierre) y 2.x (XML)"""
+    datos = None
+    numero = 0
+    with open(ruta, encoding=codificacion) as archivo:
+        for linea in archivo:
+            for cierre, etiqueta, valor in _ETIQUETA_OFX.findall(linea):
+                etiqueta = etiqueta.upper()
+                if etiqueta == "STMTTRN":
+                    if cierre and datos is not None:
+                        numero += 1
+                        yield {"fila": numero, "datos": datos}
+                        datos = None
+                    elif not cierre:
+                        datos = {}
+                elif datos is not None and not cierre:
+                    datos[etiqueta] = valor.strip()
+
+
+def _fecha(texto, formato, fechas):
+    """Ordinal de una fecha del archivo; las ya convertidas se toman de fechas"""
+    ordinal = fechas.get(texto)
+    if ordinal is not None:
+        return ordinal
+    texto_fecha = texto.strip()
+    if formato is not None:
+        ordinal = datetime.strptime(texto_fecha, formato).toordinal()
+    else:
+        if len(texto_fecha) > 8 and texto_fecha[:8].isdigit():
+            texto_fecha = texto_fecha[:8]  # OFX: AAAAMMDDhhmmss[zona]
+        for formato_posible in FORMATOS_FECHA:
+            try:
+                ordinal = datetime.strptime(texto_fecha, formato_posible).toordinal()
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"Fecha no reconocida: {texto!r}")
+    fechas[texto] = ordinal
+    return ordinal
+
+
+def _centavos(texto):
+    """Centavos de un importe del archivo ("$1,234.50", "-80.00", "(80.00)"); vacío es 0"""
+    texto = texto.strip().replace("$", "").replace(",", "").replace(" ", "")
+    if not texto:
+        return 0
+    if texto.startswith("(") and texto.endswith(")"):
+        texto = "-" + texto[1:-1]
+    try:
+        return a_centavos(Decimal(texto))
+    except ArithmeticError:
+        raise ValueError(f"Importe no válido: {texto!r}") from None
+
+
+def mapear(filas, columnas=COLUMNAS_CSV, formato_fecha=None):
+    """Agrega a cada fila su fecha (ordinal), descripcion, monto y costo (centavos; el
+    monto con signo: positivo entra dinero) tomados de las columnas indicadas.
+    
+    Una fila que no se puede convertir sigue adelante con "error" para el reporte.
+    """
+    fechas = {}
+    for fila in filas:
+        if "error" in fila:
+            yield fila
+            continue
+        datos = fila["datos"]
+        try:
+            fila["fecha"] = _fecha(datos[columnas["fecha"]], formato_fecha, fechas)
+            fila["descripcion"] = (datos.get(columnas["descripcion"]) or "").strip()
+            if "monto" in columnas:
+                fila["monto"] = _centavos(datos[columnas["monto"]])
+            else:
+                fila["monto"] = _centavos(datos[columnas["deposito"]] or "") - _centavos(datos[columnas["retiro"]] or "")
+            fila["costo"] = _centavos(datos[columnas["costo"]] or "") if "costo" in columnas else 0
+        except KeyError as error:
+            fila["error"] = f"Falta la columna {error}"
+        except ValueError as error:
+            fila["error"] = str(error)
+        yield fila
+
+
+def clasificar(filas, sistema, reglas=REGLAS, cuenta="Bancos"):
+    """Elige la operación de cada fila con la primera regla que coincide y agrega su
+    asiento (el de esa operación, de sistema.asiento_operacion) en "asiento".
+    
+    El importe de la fila es el total cobrado o pagado: en las operaciones con IVA el
+    monto sin IVA es importe / 1.16 y el IVA el resto (total=importe), así la línea de
+    cuenta es igual al importe. cuenta es la cuenta de efectivo del archivo (Bancos para un estado de
+    cuenta, Caja para un corte de caja). También se revisa aquí lo que haría rechazar
+    el lote completo al registrarlo (fecha en un periodo cerrado, cuentas inexistentes).
+    """
+    reglas = [(None if patron is None else re.compile(patron, re.IGNORECASE), signo, operacion)
+              for patron, signo, operacion in reglas]
+    for _, _, operacion in reglas:
+        if operacion not in OPERACIONES:
+            raise ValueError(f"Operación desconocida: {operacion!r}")
+    for fila in filas:
+        if "error" in fila:
+            yield fila
+            continue
+        monto = fila["monto"]
+        if monto == 0:
+            fila["error"] = "Monto en cero"
+            yield fila
+            continue
+        signo_fila = "+" if monto > 0 else "-"
+        for patron, signo, operacion in reglas:
+            if (signo is None or signo == signo_fila) and (patron is None or patron.search(fila["descripcion"])):
+                break
+        else:
+            fila["error"] = "Ninguna regla coincide"
+            yield fila
+            continue
+        if sistema.fecha_cierre is not None and fila["fecha"] <= sistema.fecha_cierre:
+            fila["error"] = f"El periodo al {sistema.almacen.fecha_texto(sistema.fecha_cierre)} está cerrado"
+            yield fila
+            continue
+        
+        bruto = abs(monto)
+        neto = redondear(Decimal(bruto) / (1 + TASA_IVA))
+        valores = {"monto_sin_iva": pesos(neto), "monto": pesos(bruto), "costo_venta": pesos(fila["costo"]),
+                   "cuenta_origen": cuenta, "cuenta_destino": cuenta}
+        argumentos = {parametro: valores[parametro] for parametro in OPERACIONES[operacion]}
+        try:
+            (descripcion, cargos, abonos), _ = sistema.asiento_operacion(operacion, total=bruto, **argumentos)
+        except (ValueError, ArithmeticError) as error:
+            fila["error"] = str(error)
+            yield fila
+            continue
+        # Sin las líneas en cero (el costo de venta cuando el archivo no lo trae)
+        asiento = (descripcion, {cuenta: monto for cuenta, monto in cargos.items() if monto},
+                   {cuenta: monto for cuenta, monto in abonos.items() if monto})
+        faltantes = [nombre for nombre in (*asiento[1], *asiento[2]) if nombre not in sistema.cuentas]
+        if faltantes:
+            fila["error"] = f"La cuenta '{faltantes[0]}' no existe"
+            yield fila
+            continue
+        fila["operacion"] = operacion
+        fila["asiento"] = asiento
+        yield fila
+
+
+def importar(sistema, filas, tamano_lote=10000, errores=None):
+    """Registra en el sistema las filas clasificadas, en lotes de filas consecutivas con la
+    misma fecha (registrar_asientos_lote).
+    
+    Las filas con error no detienen la importación: se escriben en el archivo CSV
+    errores (fila, error y datos originales) a medida que aparecen. Si un lote es
+    rechazado se registra fila por fila para reportar solo las inválidas. Devuelve
+    {"filas", "registradas", "errores", "lotes"}.
+    """
+    resumen = {"filas": 0, "registradas": 0, "errores": 0, "lotes": 0}
+    archivo_errores = None
+    escritor = None
+    
+    def reportar(fila, mensaje):
+        nonlocal archivo_errores, escritor
+        resumen["errores"] += 1
+        if errores is None:
+            return
+        if escritor is None:
+            archivo_errores = open(errores, "w", newline="", encoding="utf-8")
+            escritor = csv.writer(archivo_errores)
+            escritor.writerow(["fila", "error", "datos"])
+        escritor.writerow([fila["fila"], mensaje, " | ".join(f"{k}={v}" for k, v in fila["datos"].items())])
+    
+    def registrar(fecha, lote):
+        resumen["lotes"] += 1
+        try:
+            sistema.registrar_asientos_lote([fila["asiento"] for fila in lote], fecha)
+            resumen["registradas"] += len(lote)
+        except ValueError:
+            for fila in lote:
+                try:
+                    sistema.registrar_asientos_lote([fila["asiento"]], fecha)
+                    resumen["registradas"] += 1
+                except ValueError as error:
+                    reportar(fila, str(error))
+    
+    try:
+        lote = []
+        fecha_lote = None
+        for fila in filas:
+            resumen["filas"] += 1
+            if "error" in fila:
+                reportar(fila, fila["error"])
+                continue
+            if lote and (fila["fecha"] != fecha_lote or len(lote) >= tamano_lote):
+                registrar(fecha_lote, lote)
+                lote = []
+            fecha_lote = fila["fecha"]
+            lote.append(fila)
+        if lote:
+            registrar(fecha_lote, lote)
+    finally:
+        if archivo_errores is not None:
+            archivo_errores.close()
+    return resumen
+
+
+def importar_archivo(sistema, ruta, columnas=None, reglas=REGLAS, cuenta="Bancos", formato_fecha=None,
+                     tamano_lote=10000, errores=None, delimitador=","):
+    """Importa un estado de cuenta o exportación de punto de venta (.csv u .ofx/.qfx) con
+    el flujo leer -> mapear -> clasificar -> importar, sin cargar el archivo completo.
+    
+    Devuelve el resumen de importar().
+    """
+    if os.path.splitext(ruta)[1].lower() in (".ofx", ".qfx"):
+        filas = leer_ofx(ruta)
+        columnas = columnas or COLUMNAS_OFX
+    else:
+        filas = leer_csv(ruta, delimitador)
+        columnas = columnas or COLUMNAS_CSV
+    filas = mapear(filas, columnas, formato_fecha)
+    filas = clasificar(filas, sistema, reglas, cuenta)
+    return importar(sistema, filas, tamano_lote, errores)
@@ -0,0 +1,747 @@
+import tkinter as tk
+from tkinter import ttk, scrolledtext, messagebox
+from datetime import datetime
+import queue
+import threading
+from bitacora import BitacoraJSONL
+from dinero import pesos
+from sistema_contable_completo import RUTA_BITACORA, SistemaContable, configurar_locale
+
+
+class ReporteCancelado(Exception):
+    """Se lanza cuando una solicitud de reporte es reemplazada por otra más reciente"""
+
+
+class AplicacionContable:
+    def __init__(self, root, persistencia=None, puntos_control=None):
+        self.root = root
+        self.root.title("Sistema Contable Completo")
+        self.root.geometry("1000x700")
+        self.root.resizable(True, True)
+        
+        # Crear el sistema contable, recuperando los asientos guardados
+        self.sistema = SistemaContable(persistencia, puntos_control)
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+        
+        # Barra de estado con el progreso de los reportes en segundo plano
+        self.estado_frame = ttk.Frame(root)
+        self.estado_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0, 10))
+        self.barra_progreso = ttk.Progressbar(self.estado_frame, mode="indeterminate", length=150)
+        self.barra_progreso.pack(side=tk.RIGHT)
+        self.estado_label = ttk.Label(self.estado_frame, text="")
+        self.estado_label.pack(side=tk.RIGHT, padx=5)
+        
+        # Crear el cuaderno de pestañas
+        self.notebook = ttk.Notebook(root)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Crear las pestañas
+        self.tab_transacciones = ttk.Frame(self.notebook)
+        self.tab_diario = ttk.Frame(self.notebook)
+        self.tab_mayor = ttk.Frame(self.notebook)
+        self.tab_balanza = ttk.Frame(self.notebook)
+        self.tab_balance = ttk.Frame(self.notebook)
+        self.tab_resultados = ttk.Frame(self.notebook)
+        self.tab_cambios_capital = ttk.Frame(self.notebook)
+        self.tab_flujos_efectivo = ttk.Frame(self.notebook)
+        
+        self.notebook.add(self.tab_transacciones, text="Transacciones")
+        self.notebook.add(self.tab_diario, text="Libro Diario")
+        self.notebook.add(self.tab_mayor, text="Esquemas de Mayor")
+        self.notebook.add(self.tab_balanza, text="Balanza de Comprobación")
+        self.notebook.add(self.tab_balance, text="Balance General")
+        self.notebook.add(self.tab_resultados, text="Estado de Resultados")
+        self.notebook.add(self.tab_cambios_capital, text="Cambios en Capital")
+        self.notebook.add(self.tab_flujos_efectivo, text="Flujos de Efectivo")
+        
+        # Configurar la pestaña de transacciones
+        self.configurar_tab_transacciones()
+        
+        # Estado de los reportes ya mostrados, para solo agregar lo nuevo
+        self._diario_asientos = None  # Asientos mostrados en el libro diario
+        self._mayor_lineas = None  # Líneas mostradas en los esquemas de mayor
+        self._huellas = {}  # Cifras con las que se generó cada reporte de resumen
+        
+        # Reportes por pestaña y pestañas cuyo reporte está desactualizado; un reporte
+        # solo se regenera cuando su pestaña está visible o al pulsar Actualizar
+        self._reportes = {}
+        self._pendientes = set()
+        
+        # Los reportes grandes se generan en un hilo de trabajo sobre una vista del
+        # sistema; los resultados regresan por una cola que se revisa con after()
+        self._cola_trabajos = queue.Queue()
+        self._cola_resultados = queue.Queue()
+        self._generaciones = {}  # Última solicitud de cada pestaña
+        self._en_proceso = {}  # Pestañas con un trabajo en curso -> nombre del reporte
+        threading.Thread(target=self._trabajador_reportes, daemon=True).start()
+        self.root.after(50, self._revisar_resultados)
+        
+        # Configurar las pestañas de reportes
+        self.configurar_tab_reportes(self.tab_diario, self.actualizar_diario)
+        self.configurar_tab_reportes(self.tab_mayor, self.actualizar_mayor)
+        self.configurar_tab_reportes(self.tab_balanza, self.actualizar_balanza)
+        self.configurar_tab_reportes(self.tab_balance, self.actualizar_balance)
+        self.configurar_tab_reportes(self.tab_resultados, self.actualizar_resultados)
+        self.configurar_tab_reportes(self.tab_cambios_capital, self.actualizar_cambios_capital)
+        self.configurar_tab_reportes(self.tab_flujos_efectivo, self.actualizar_flujos_efectivo)
+        
+        # Los reportes se generan al abrir su pestaña
+        self.notebook.bind("<<NotebookTabChanged>>", self._al_cambiar_pestana)
+        self.marcar_reportes_pendientes()
+        
+        # Mostrar mensaje de bienvenida
+        if self.sistema.asientos_recuperados:
+            messagebox.showinfo("Sistema Contable", f"Se recuperaron {self.sistema.asientos_recuperados} asientos guardados.")
+        else:
+            messagebox.showinfo("Sistema Contable", "Sistema inicializado con saldos iniciales.\nSe ha registrado el asiento de apertura.")
+    
+    def cerrar(self):
+        """Escribe a disco los asientos pendientes y cierra la ventana"""
+        if self.sistema.puntos_control is not None:
+            self.sistema.puntos_control.esperar()
+        if self.sistema.persistencia is not None:
+            self.sistema.persistencia.cerrar()
+        self.root.destroy()
+    
+    def configurar_tab_transacciones(self):
+        """Configura la pestaña de transacciones"""
+        # Frame principal
+        main_frame = ttk.Frame(self.tab_transacciones)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Frame para seleccionar tipo de transacción
+        tipo_frame = ttk.LabelFrame(main_frame, text="Tipo de Transacción")
+        tipo_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.tipo_transaccion = tk.StringVar(value="compra_efectivo")
+        
+        # Opciones de transacciones
+        opciones = [
+            ("Compra en Efectivo", "compra_efectivo"),
+            ("Compra a Crédito", "compra_credito"),
+            ("Compra Combinada", "compra_combinada"),
+            ("Anticipo de Cliente", "anticipo_cliente"),
+            ("Compra de Papelería", "compra_papeleria"),
+            ("Rentas Pagadas por Anticipado", "rentas_anticipadas"),
+            ("Venta en Efectivo", "venta_efectivo"),
+            ("Venta a Crédito", "venta_credito"),
+            ("Gasto de Administración", "gasto_administracion"),
+            ("Gasto de Venta", "gasto_venta"),
+            ("Gasto Financiero", "gasto_financiero"),
+            ("Cierre de Periodo", "cierre_periodo")
+        ]
+        
+        # Crear los radio buttons en una cuadrícula
+        for i, (texto, valor) in enumerate(opciones):
+            rb = ttk.Radiobutton(tipo_frame, text=texto, value=valor, variable=self.tipo_transaccion)
+            rb.grid(row=i//4, column=i%4, sticky=tk.W, padx=10, pady=5)
+            rb.bind("<ButtonRelease-1>", lambda event: self.root.after(100, self.cambiar_formulario))
+        
+        # Frame para los formularios
+        self.form_frame = ttk.LabelFrame(main_frame, text="Datos de la Transacción")
+        self.form_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Frame para los resultados
+        self.resultado_frame = ttk.LabelFrame(main_frame, text="Resultado")
+        self.resultado_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.resultado_text = scrolledtext.ScrolledText(self.resultado_frame, wrap=tk.WORD, height=5)
+        self.resultado_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Inicializar el formulario
+        self.formulario_actual = None
+        self.cambiar_formulario()
+    
+    def configurar_tab_reportes(self, tab, actualizar_func):
+        """Configura una pestaña de reportes"""
+        # Frame principal
+        main_frame = ttk.Frame(tab)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Registrar el reporte de la pestaña
+        self._reportes[tab] = actualizar_func
+        
+        # Botón de actualizar
+        btn_actualizar = ttk.Button(main_frame, text="Actualizar", command=lambda: self.actualizar_reporte(tab))
+        btn_actualizar.pack(anchor=tk.NE, padx=5, pady=5)
+        
+        # Área de texto
+        text_area = scrolledtext.ScrolledText(main_frame, wrap=tk.WORD)
+        text_area.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Guardar referencia al área de texto
+        tab.text_area = text_area
+    
+    def cambiar_formulario(self):
+        """Cambia el formulario según el tipo de transacción seleccionado"""
+        # Limpiar el formulario actual
+        if self.formulario_actual:
+            self.formulario_actual.destroy()
+        
+        # Crear un nuevo frame para el formulario
+        self.formulario_actual = ttk.Frame(self.form_frame)
+        self.formulario_actual.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        tipo = self.tipo_transaccion.get()
+        
+        # Función para crear el selector de cuenta de origen
+        def crear_selector_cuenta(row, default="Bancos", label="Cuenta de Origen:"):
+            ttk.Label(self.formulario_actual, text=label).grid(row=row, column=0, padx=5, pady=5, sticky=tk.W)
+            cuenta_var = tk.StringVar(value=default)
+            cuenta_combo = ttk.Combobox(self.formulario_actual, textvariable=cuenta_var, state="readonly")
+            cuenta_combo['values'] = ("Caja", "Bancos")
+            cuenta_combo.grid(row=row, column=1, padx=5, pady=5, sticky=tk.W)
+            return cuenta_var
+        
+        if tipo == "compra_efectivo":
+            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            self.cuenta_origen_var = crear_selector_cuenta(1)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Compra", 
+                                      command=self.registrar_compra_efectivo)
+            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "compra_credito":
+            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Compra", 
+                                      command=self.registrar_compra_credito)
+            btn_registrar.grid(row=1, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "compra_combinada":
+            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            ttk.Label(self.formulario_actual, text="% en Efectivo:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+            self.porcentaje_entry = ttk.Entry(self.formulario_actual)
+            self.porcentaje_entry.grid(row=1, column=1, padx=5, pady=5)
+            self.porcentaje_entry.insert(0, "50")
+            
+            self.cuenta_origen_var = crear_selector_cuenta(2)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Compra", 
+                                      command=self.registrar_compra_combinada)
+            btn_registrar.grid(row=3, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "anticipo_cliente":
+            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            self.cuenta_destino_var = crear_selector_cuenta(1, label="Cuenta de Destino:")
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Anticipo", 
+                                      command=self.registrar_anticipo_cliente)
+            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "compra_papeleria":
+            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            self.cuenta_origen_var = crear_selector_cuenta(1)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Compra", 
+                                      command=self.registrar_compra_papeleria)
+            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "rentas_anticipadas":
+            ttk.Label(self.formulario_actual, text="Monto Mensual (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            ttk.Label(self.formulario_actual, text="Número de Meses:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+            self.meses_entry = ttk.Entry(self.formulario_actual)
+            self.meses_entry.grid(row=1, column=1, padx=5, pady=5)
+            self.meses_entry.insert(0, "3")
+            
+            self.cuenta_origen_var = crear_selector_cuenta(2)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Pago", 
+                                      command=self.registrar_rentas_anticipadas)
+            btn_registrar.grid(row=3, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "venta_efectivo":
+            ttk.Label(self.formulario_actual, text="Monto de Venta (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            ttk.Label(self.formulario_actual, text="Costo de la Mercancía:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+            self.costo_entry = ttk.Entry(self.formulario_actual)
+            self.costo_entry.grid(row=1, column=1, padx=5, pady=5)
+            
+            self.cuenta_destino_var = crear_selector_cuenta(2, label="Cuenta de Destino:")
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Venta", 
+                                      command=self.registrar_venta_efectivo)
+            btn_registrar.grid(row=3, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "venta_credito":
+            ttk.Label(self.formulario_actual, text="Monto de Venta (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            ttk.Label(self.formulario_actual, text="Costo de la Mercancía:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+            self.costo_entry = ttk.Entry(self.formulario_actual)
+            self.costo_entry.grid(row=1, column=1, padx=5, pady=5)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Venta", 
+                                      command=self.registrar_venta_credito)
+            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "gasto_administracion":
+            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            self.cuenta_origen_var = crear_selector_cuenta(1)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Gasto", 
+                                      command=self.registrar_gasto_administracion)
+            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "gasto_venta":
+            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            self.cuenta_origen_var = crear_selector_cuenta(1)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Gasto", 
+                                      command=self.registrar_gasto_venta)
+            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "gasto_financiero":
+            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            self.cuenta_origen_var = crear_selector_cuenta(1)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Gasto", 
+                                      command=self.registrar_gasto_financiero)
+            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "cierre_periodo":
+            ttk.Label(self.formulario_actual, text="Fecha de Cierre (dd/mm/aaaa):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.fecha_cierre_entry = ttk.Entry(self.formulario_actual)
+            self.fecha_cierre_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            self.cierre_anual_var = tk.BooleanVar(value=False)
+            ttk.Checkbutton(self.formulario_actual, text="Cierre anual (traspasar a Utilidades retenidas)",
+                            variable=self.cierre_anual_var).grid(row=1, column=0, columnspan=2, padx=5, pady=5, sticky=tk.W)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Cerrar Periodo",
+                                      command=self.registrar_cierre_periodo)
+            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
+    
+    def registrar_compra_efectivo(self):
+        """Registra una compra en efectivo"""
+        try:
+            monto = float(self.monto_entry.get())
+            cuenta_origen = self.cuenta_origen_var.get()
+            resultado = self.sistema.compra_efectivo(monto, cuenta_origen)
+            self.mostrar_resultado(resultado)
+            self.marcar_reportes_pendientes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
+    
+    def registrar_compra_credito(self):
+        """Registra una compra a crédito"""
+        try:
+            monto = float(self.monto_entry.get())
+            resultado = self.sistema.compra_credito(monto)
+            self.mostrar_resultado(resultado)
+            self.marcar_reportes_pendientes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
+    
+    def registrar_compra_combinada(self):
+        """Registra una compra combinada"""
+        try:
+            monto = float(self.monto_entry.get())
+            porcentaje = float(self.porcentaje_entry.get())
+            cuenta_origen = self.cuenta_origen_var.get()
+            
+            if porcentaje < 0 or porcentaje > 100:
+                messagebox.showerror("Error", "El porcentaje debe estar entre 0 y 100.")
+                return
+            
+            resultado = self.sistema.compra_combinada(monto, porcentaje, cuenta_origen)
+            self.mostrar_resultado(resultado)
+            self.marcar_reportes_pendientes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese valores válidos.")
+    
+    def registrar_anticipo_cliente(self):
+        """Registra un anticipo de cliente"""
+        try:
+            monto = float(self.monto_entry.get())
+            cuenta_destino = self.cuenta_destino_var.get()
+            resultado = self.sistema.anticipo_cliente(monto, cuenta_destino)
+            self.mostrar_resultado(resultado)
+            self.marcar_reportes_pendientes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
+    
+    def registrar_compra_papeleria(self):
+        """Registra una compra de papelería"""
+        try:
+            monto = float(self.monto_entry.get())
+            cuenta_origen = self.cuenta_origen_var.get()
+            resultado = self.sistema.compra_papeleria(monto, cuenta_origen)
+            self.mostrar_resultado(resultado)
+            self.marcar_reportes_pendientes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
+    
+    def registrar_rentas_anticipadas(self):
+        """Registra el pago de rentas anticipadas"""
+        try:
+            monto = float(self.monto_entry.get())
+            meses = int(self.meses_entry.get())
+            cuenta_origen = self.cuenta_origen_var.get()
+            
+            if meses <= 0:
+                messagebox.showerror("Error", "El número de meses debe ser mayor a 0.")
+                return
+            
+            resultado = self.sistema.pago_rentas_anticipadas(monto, meses, cuenta_origen)
+            self.mostrar_resultado(resultado)
+            self.marcar_reportes_pendientes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese valores válidos.")
+    
+    def registrar_venta_efectivo(self):
+        """Registra una venta en efectivo"""
+        try:
+            monto = float(self.monto_entry.get())
+            costo = float(self.costo_entry.get())
+            cuenta_destino = self.cuenta_destino_var.get()
+            
+            resultado = self.sistema.venta_efectivo(monto, costo, cuenta_destino)
+            self.mostrar_resultado(resultado)
+            self.marcar_reportes_pendientes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese valores válidos.")
+    
+    def registrar_venta_credito(self):
+        """Registra una venta a crédito"""
+        try:
+            monto = float(self.monto_entry.get())
+            costo = float(self.costo_entry.get())
+            
+            resultado = self.sistema.venta_credito(monto, costo)
+            self.mostrar_resultado(resultado)
+            self.marcar_reportes_pendientes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese valores válidos.")
+    
+    def registrar_gasto_administracion(self):
+        """Registra un gasto de administración"""
+        try:
+            monto = float(self.monto_entry.get())
+            cuenta_origen = self.cuenta_origen_var.get()
+            
+            resultado = self.sistema.gasto_administracion(monto, cuenta_origen)
+            self.mostrar_resultado(resultado)
+            self.marcar_reportes_pendientes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
+    
+    def registrar_gasto_venta(self):
+        """Registra un gasto de venta"""
+        try:
+            monto = float(self.monto_entry.get())
+            cuenta_origen = self.cuenta_origen_var.get()
+            
+            resultado = self.sistema.gasto_venta(monto, cuenta_origen)
+            self.mostrar_resultado(resultado)
+            self.marcar_reportes_pendientes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
+    
+    def registrar_gasto_financiero(self):
+        """Registra un gasto financiero"""
+        try:
+            monto = float(self.monto_entry.get())
+            cuenta_origen = self.cuenta_origen_var.get()
+            
+            resultado = self.sistema.gasto_financiero(monto, cuenta_origen)
+            self.mostrar_resultado(resultado)
+            self.marcar_reportes_pendientes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
+    
+    def registrar_cierre_periodo(self):
+        """Cierra el periodo hasta la fecha indicada"""
+        try:
+            hasta = datetime.strptime(self.fecha_cierre_entry.get().strip(), "%d/%m/%Y").date()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese una fecha válida (dd/mm/aaaa).")
+            return
+        if not messagebox.askyesno("Cierre de Periodo",
+                                   f"Los asientos al {hasta:%d/%m/%Y} se archivarán y ya no se podrán modificar. ¿Continuar?"):
+            return
+        try:
+            ruta = self.sistema.cerrar_periodo(hasta, anual=self.cierre_anual_var.get())
+        except ValueError as error:
+            messagebox.showerror("Error", str(error))
+            return
+        self.mostrar_resultado(f"Periodo al {hasta:%d/%m/%Y} cerrado con éxito.\nDetalle archivado en: {ruta}")
+        # El diario se compactó: el libro diario y el mayor se redibujan completos
+        self._diario_asientos = None
+        self._mayor_lineas = None
+        self.marcar_reportes_pendientes()
+    
+    def mostrar_resultado(self, texto):
+        """Muestra el resultado de una operación"""
+        self.resultado_text.delete(1.0, tk.END)
+        self.resultado_text.insert(tk.END, texto)
+    
+    def _enviar_trabajo(self, tab, nombre, calcular, aplicar):
+        """Envía un reporte al hilo de trabajo; reemplaza cualquier solicitud anterior de la pestaña.
+        
+        calcular(cancelado) se ejecuta en el hilo de trabajo y aplicar(valor) en el hilo de Tk.
+        """
+        generacion = self._generaciones.get(tab, 0) + 1
+        self._generaciones[tab] = generacion
+        self._en_proceso[tab] = nombre
+        self._mostrar_progreso()
+        self._cola_trabajos.put((tab, generacion, calcular, aplicar))
+    
+    def _trabajador_reportes(self):
+        """Hilo de trabajo: genera los reportes solicitados uno por uno"""
+        while True:
+            tab, generacion, calcular, aplicar = self._cola_trabajos.get()
+            cancelado = lambda: self._generaciones.get(tab) != generacion
+            if cancelado():
+                continue
+            try:
+                valor = calcular(cancelado)
+            except ReporteCancelado:
+                continue
+            except Exception as error:
+                self._cola_resultados.put((tab, generacion, None, error))
+                continue
+            self._cola_resultados.put((tab, generacion, aplicar, valor))
+    
+    def _revisar_resultados(self):
+        """Aplica en el hilo de Tk los reportes terminados y descarta los reemplazados"""
+        try:
+            while True:
+                tab, generacion, aplicar, valor = self._cola_resultados.get_nowait()
+                if self._generaciones.get(tab) != generacion:
+                    continue
+                del self._en_proceso[tab]
+                if aplicar is None:
+                    messagebox.showerror("Error", f"No se pudo generar el reporte: {valor}")
+                else:
+                    aplicar(valor)
+        except queue.Empty:
+            pass
+        self._mostrar_progreso()
+        self.root.after(50, self._revisar_resultados)
+    
+    def _mostrar_progreso(self):
+        """Muestra en la barra de estado los reportes que se están generando"""
+        if self._en_proceso:
+            self.estado_label.config(text="Generando: " + ", ".join(self._en_proceso.values()))
+            self.barra_progreso.start(10)
+        else:
+            self.estado_label.config(text="")
+            self.barra_progreso.stop()
+    
+    @staticmethod
+    def _unir(lineas, cancelado, lineas_por_revision=2000):
+        """Une las líneas de un reporte revisando periódicamente si la solicitud fue reemplazada"""
+        bloque = []
+        for i, linea in enumerate(lineas, 1):
+            bloque.append(linea)
+            if i % lineas_por_revision == 0 and cancelado():
+                raise ReporteCancelado()
+        return "".join(bloque)
+    
+    def actualizar_diario(self):
+        """Actualiza el libro diario agregando solo los asientos nuevos"""
+        # Sin copiar el almacén: el trabajador solo lee los asientos anteriores a num_asientos
+        vista = self.sistema.vista()
+        num_asientos = vista.almacen.num_asientos()
+        desde = self._diario_asientos
+        if desde is None or num_asientos < desde:
+            # Primera vez o el diario cambió por completo: se redibuja
+            desde = None
+        elif num_asientos == desde:
+            return
+        
+        def calcular(cancelado):
+            return self._unir(vista.iter_diario(inicio=desde or 0, fin=num_asientos), cancelado)
+        
+        def aplicar(texto):
+            text_area = self.tab_diario.text_area
+            if desde is None:
+                text_area.delete(1.0, tk.END)
+            text_area.insert(tk.END, texto)
+            self._diario_asientos = num_asientos
+        
+        self._enviar_trabajo(self.tab_diario, "Libro Diario", calcular, aplicar)
+    
+    def actualizar_mayor(self):
+        """Actualiza los esquemas de mayor agregando solo las líneas nuevas de cada cuenta"""
+        # Los saldos de la vista corresponden a las líneas anteriores a num_lineas
+        vista = self.sistema.vista()
+        almacen = vista.almacen
+        num_lineas = almacen.num_lineas()
+        desde = self._mayor_lineas
+        if desde is None or num_lineas < desde:
+            desde = None
+        elif num_lineas == desde:
+            return
+        
+        def calcular(cancelado):
+            # Agrupar las líneas nuevas por cuenta y lado, en orden de aparición
+            nuevas = {}
+            for linea in range(desde or 0, num_lineas):
+                if linea % 2000 == 0 and cancelado():
+                    raise ReporteCancelado()
+                id_cuenta = almacen.linea_cuenta[linea]
+                por_lado = nuevas.get(id_cuenta)
+                if por_lado is None:
+                    por_lado = nuevas[id_cuenta] = ([], [])
+                por_lado[almacen.linea_lado[linea]].append(vista.linea_mayor(linea))
+            
+            cambios = []
+            for id_cuenta, (cargos, abonos) in nuevas.items():
+                cuenta = almacen.nombres_cuentas[id_cuenta]
+                saldo = f"Saldo: ${pesos(vista.cuentas[cuenta]):,.2f}\n"
+                cambios.append((id_cuenta, cuenta, "".join(cargos), "".join(abonos), saldo))
+            return cambios
+        
+        def aplicar(cambios):
+            text_area = self.tab_mayor.text_area
+            if desde is None:
+                text_area.delete(1.0, tk.END)
+                text_area.insert(tk.END, "=== ESQUEMAS DE MAYOR ===\n")
+            
+            # Cada cuenta tiene etiquetada su línea "ABONOS:" y su línea de saldo; los cargos
+            # nuevos se insertan antes de "ABONOS:" y los abonos nuevos antes del saldo
+            for id_cuenta, cuenta, cargos, abonos, saldo in cambios:
+                etiqueta_abonos = f"abonos_{id_cuenta}"
+                etiqueta_saldo = f"saldo_{id_cuenta}"
+                if text_area.tag_ranges(etiqueta_saldo):
+                    if cargos:
+                        text_area.insert(f"{etiqueta_abonos}.first", cargos)
+                    if abonos:
+                        text_area.insert(f"{etiqueta_saldo}.first", abonos)
+                    inicio = text_area.index(f"{etiqueta_saldo}.first")
+                    text_area.delete(inicio, f"{etiqueta_saldo}.last")
+                    text_area.insert(inicio, saldo, etiqueta_saldo)
+                else:
+                    text_area.insert(tk.END, f"\nCuenta: {cuenta}\nCARGOS:\n" + cargos)
+                    text_area.insert(tk.END, "ABONOS:\n", etiqueta_abonos)
+                    text_area.insert(tk.END, abonos)
+                    text_area.insert(tk.END, saldo, etiqueta_saldo)
+            self._mayor_lineas = num_lineas
+        
+        self._enviar_trabajo(self.tab_mayor, "Esquemas de Mayor", calcular, aplicar)
+    
+    def _actualizar_resumen(self, tab, calcular_huella, generar):
+        """Vuelve a generar un reporte de resumen solo si cambiaron las cifras que muestra"""
+        huella = calcular_huella()
+        if self._huellas.get(tab) == huella:
+            return
+        tab.text_area.delete(1.0, tk.END)
+        tab.text_area.insert(tk.END, generar())
+        self._huellas[tab] = huella
+    
+    def _huella_saldos(self):
+        """Cifras de las que dependen los reportes de resumen"""
+        return tuple(self.sistema.cuentas.values())
+    
+    def actualizar_balanza(self):
+        """Actualiza la balanza de comprobación"""
+        self._actualizar_resumen(self.tab_balanza, self._huella_saldos, self.sistema.generar_balanza_comprobacion)
+    
+    def actualizar_balance(self):
+        """Actualiza el balance general"""
+        self._actualizar_resumen(self.tab_balance, self._huella_saldos, self.sistema.generar_balance_general)
+    
+    def actualizar_resultados(self):
+        """Actualiza el estado de resultados"""
+        self._actualizar_resumen(self.tab_resultados, self._huella_saldos, self.sistema.generar_estado_resultados)
+    
+    def actualizar_cambios_capital(self):
+        """Actualiza el estado de cambios en el capital contable"""
+        self._actualizar_resumen(self.tab_cambios_capital, self._huella_saldos, self.sistema.generar_estado_cambios_capital)
+    
+    def actualizar_flujos_efectivo(self):
+        """Actualiza el estado de flujos de efectivo"""
+        tab = self.tab_flujos_efectivo
+        huella = self._huella_flujos()
+        if self._huellas.get(tab) == huella:
+            return
+        # Las cifras se toman aquí con bisect; el trabajador solo escribe el detalle de los
+        # flujos que cuenta el resumen, sobre una vista que comparte el almacén
+        resumen = self.sistema.resumen_flujos()
+        vista = self.sistema.vista()
+        
+        def calcular(cancelado):
+            return self._unir(vista.iter_estado_flujos_efectivo(resumen=resumen), cancelado)
+        
+        def aplicar(texto):
+            tab.text_area.delete(1.0, tk.END)
+            tab.text_area.insert(tk.END, texto)
+            self._huellas[tab] = huella
+        
+        self._enviar_trabajo(tab, "Flujos de Efectivo", calcular, aplicar)
+    
+    def _huella_flujos(self):
+        """Cifras de las que depende el estado de flujos de efectivo"""
+        cuentas = self.sistema.cuentas
+        return (self.sistema.almacen.num_flujos(), cuentas["Caja"], cuentas["Bancos"])
+    
+    def actualizar_reporte(self, tab):
+        """Regenera el reporte de una pestaña y lo marca como actualizado"""
+        self._pendientes.discard(tab)
+        self._reportes[tab]()
+    
+    def marcar_reportes_pendientes(self):
+        """Marca todos los reportes como desactualizados y regenera solo el visible"""
+        self._pendientes.update(self._reportes)
+        self._actualizar_pestana_visible()
+    
+    def _actualizar_pestana_visible(self):
+        """Regenera el reporte de la pestaña visible si está desactualizado"""
+        tab = self.root.nametowidget(self.notebook.select())
+        if tab in self._pendientes:
+            self.actualizar_reporte(tab)
+    
+    def _al_cambiar_pestana(self, event):
+        """Al mostrar una pestaña se regenera su reporte si está desactualizado"""
+        self._actualizar_pestana_visible()
+    
+    def actualizar_todos_reportes(self):
+        """Actualiza todos los reportes"""
+        for tab in self._reportes:
+            self.actualizar_reporte(tab)
+
+
+# Función principal para ejecutar el programa
+def main(ruta_bitacora=RUTA_BITACORA, persistencia=None, puntos_control=None):
+    """Abre la interfaz; sin persistencia se usa la bitácora en ruta_bitacora"""
+    configurar_locale()
+    if persistencia is None:
+        persistencia = BitacoraJSONL(ruta_bitacora)
+    root = tk.Tk()
+    app = AplicacionContable(root, persistencia, puntos_control)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
+
@@ -0,0 +1,330 @@
+import tkinter as tk
+from tkinter import ttk, scrolledtext, messagebox
+from sistema_contable import SistemaContable, configurar_locale
+
+
+class AplicacionContable:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Sistema Contable")
+        self.root.geometry("900x700")
+        self.root.resizable(True, True)
+        
+        # Crear el sistema contable
+        self.sistema = SistemaContable()
+        
+        # Crear el cuaderno de pestañas
+        self.notebook = ttk.Notebook(root)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Crear las pestañas
+        self.tab_transacciones = ttk.Frame(self.notebook)
+        self.tab_diario = ttk.Frame(self.notebook)
+        self.tab_mayor = ttk.Frame(self.notebook)
+        self.tab_balanza = ttk.Frame(self.notebook)
+        self.tab_balance = ttk.Frame(self.notebook)
+        
+        self.notebook.add(self.tab_transacciones, text="Transacciones")
+        self.notebook.add(self.tab_diario, text="Libro Diario")
+        self.notebook.add(self.tab_mayor, text="Esquemas de Mayor")
+        self.notebook.add(self.tab_balanza, text="Balanza de Comprobación")
+        self.notebook.add(self.tab_balance, text="Balance General")
+        
+        # Configurar la pestaña de transacciones
+        self.configurar_tab_transacciones()
+        
+        # Configurar las pestañas de reportes
+        self.configurar_tab_reportes(self.tab_diario, self.actualizar_diario)
+        self.configurar_tab_reportes(self.tab_mayor, self.actualizar_mayor)
+        self.configurar_tab_reportes(self.tab_balanza, self.actualizar_balanza)
+        self.configurar_tab_reportes(self.tab_balance, self.actualizar_balance)
+        
+        # Actualizar todos los reportes
+        self.actualizar_todos_reportes()
+        
+        # Mostrar mensaje de bienvenida
+        messagebox.showinfo("Sistema Contable", "Sistema inicializado con saldos iniciales.\nSe ha registrado el asiento de apertura.")
+    
+    def configurar_tab_transacciones(self):
+        """Configura la pestaña de transacciones"""
+        # Frame principal
+        main_frame = ttk.Frame(self.tab_transacciones)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Frame para seleccionar tipo de transacción
+        tipo_frame = ttk.LabelFrame(main_frame, text="Tipo de Transacción")
+        tipo_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.tipo_transaccion = tk.StringVar(value="compra_efectivo")
+        
+        # Opciones de transacciones
+        opciones = [
+            ("Compra en Efectivo", "compra_efectivo"),
+            ("Compra a Crédito", "compra_credito"),
+            ("Compra Combinada", "compra_combinada"),
+            ("Anticipo de Cliente", "anticipo_cliente"),
+            ("Compra de Papelería", "compra_papeleria"),
+            ("Rentas Pagadas por Anticipado", "rentas_anticipadas")
+        ]
+        
+        # Crear los radio buttons
+        for i, (texto, valor) in enumerate(opciones):
+            rb = ttk.Radiobutton(tipo_frame, text=texto, value=valor, variable=self.tipo_transaccion)
+            rb.grid(row=i//3, column=i%3, sticky=tk.W, padx=10, pady=5)
+            rb.bind("<ButtonRelease-1>", lambda event: self.root.after(100, self.cambiar_formulario))
+        
+        # Frame para los formularios
+        self.form_frame = ttk.LabelFrame(main_frame, text="Datos de la Transacción")
+        self.form_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Frame para los resultados
+        self.resultado_frame = ttk.LabelFrame(main_frame, text="Resultado")
+        self.resultado_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.resultado_text = scrolledtext.ScrolledText(self.resultado_frame, wrap=tk.WORD, height=5)
+        self.resultado_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Inicializar el formulario
+        self.formulario_actual = None
+        self.cambiar_formulario()
+    
+    def configurar_tab_reportes(self, tab, actualizar_func):
+        """Configura una pestaña de reportes"""
+        # Frame principal
+        main_frame = ttk.Frame(tab)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Botón de actualizar
+        btn_actualizar = ttk.Button(main_frame, text="Actualizar", command=actualizar_func)
+        btn_actualizar.pack(anchor=tk.NE, padx=5, pady=5)
+        
+        # Área de texto
+        text_area = scrolledtext.ScrolledText(main_frame, wrap=tk.WORD)
+        text_area.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Guardar referencia al área de texto
+        tab.text_area = text_area
+    
+    def cambiar_formulario(self):
+        """Cambia el formulario según el tipo de transacción seleccionado"""
+        # Limpiar el formulario actual
+        if self.formulario_actual:
+            self.formulario_actual.destroy()
+        
+        # Crear un nuevo frame para el formulario
+        self.formulario_actual = ttk.Frame(self.form_frame)
+        self.formulario_actual.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        tipo = self.tipo_transaccion.get()
+        
+        # Función para crear el selector de cuenta de origen
+        def crear_selector_cuenta(row, default="Bancos"):
+            ttk.Label(self.formulario_actual, text="Cuenta de Origen:").grid(row=row, column=0, padx=5, pady=5, sticky=tk.W)
+            cuenta_var = tk.StringVar(value=default)
+            cuenta_combo = ttk.Combobox(self.formulario_actual, textvariable=cuenta_var, state="readonly")
+            cuenta_combo['values'] = ("Caja", "Bancos")
+            cuenta_combo.grid(row=row, column=1, padx=5, pady=5, sticky=tk.W)
+            return cuenta_var
+        
+        # Función para crear el selector de cuenta de destino (para anticipos)
+        def crear_selector_cuenta_destino(row, default="Bancos"):
+            ttk.Label(self.formulario_actual, text="Cuenta de Destino:").grid(row=row, column=0, padx=5, pady=5, sticky=tk.W)
+            cuenta_var = tk.StringVar(value=default)
+            cuenta_combo = ttk.Combobox(self.formulario_actual, textvariable=cuenta_var, state="readonly")
+            cuenta_combo['values'] = ("Caja", "Bancos")
+            cuenta_combo.grid(row=row, column=1, padx=5, pady=5, sticky=tk.W)
+            return cuenta_var
+        
+        if tipo == "compra_efectivo":
+            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            self.cuenta_origen_var = crear_selector_cuenta(1)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Compra", 
+                                      command=self.registrar_compra_efectivo)
+            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "compra_credito":
+            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Compra", 
+                                      command=self.registrar_compra_credito)
+            btn_registrar.grid(row=1, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "compra_combinada":
+            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            ttk.Label(self.formulario_actual, text="% en Efectivo:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+            self.porcentaje_entry = ttk.Entry(self.formulario_actual)
+            self.porcentaje_entry.grid(row=1, column=1, padx=5, pady=5)
+            self.porcentaje_entry.insert(0, "50")
+            
+            self.cuenta_origen_var = crear_selector_cuenta(2)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Compra", 
+                                      command=self.registrar_compra_combinada)
+            btn_registrar.grid(row=3, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "anticipo_cliente":
+            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            self.cuenta_destino_var = crear_selector_cuenta_destino(1)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Anticipo", 
+                                      command=self.registrar_anticipo_cliente)
+            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "compra_papeleria":
+            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            self.cuenta_origen_var = crear_selector_cuenta(1)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Compra", 
+                                      command=self.registrar_compra_papeleria)
+            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
+        
+        elif tipo == "rentas_anticipadas":
+            ttk.Label(self.formulario_actual, text="Monto Mensual (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+            self.monto_entry = ttk.Entry(self.formulario_actual)
+            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
+            
+            ttk.Label(self.formulario_actual, text="Número de Meses:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+            self.meses_entry = ttk.Entry(self.formulario_actual)
+            self.meses_entry.grid(row=1, column=1, padx=5, pady=5)
+            self.meses_entry.insert(0, "3")
+            
+            self.cuenta_origen_var = crear_selector_cuenta(2)
+            
+            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Pago", 
+                                      command=self.registrar_rentas_anticipadas)
+            btn_registrar.grid(row=3, column=0, columnspan=2, padx=5, pady=10)
+    
+    def registrar_compra_efectivo(self):
+        """Registra una compra en efectivo"""
+        try:
+            monto = float(self.monto_entry.get())
+            cuenta_origen = self.cuenta_origen_var.get()
+            resultado = self.sistema.compra_efectivo(monto, cuenta_origen)
+            self.mostrar_resultado(resultado)
+            self.actualizar_todos_reportes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
+    
+    def registrar_compra_credito(self):
+        """Registra una compra a crédito"""
+        try:
+            monto = float(self.monto_entry.get())
+            resultado = self.sistema.compra_credito(monto)
+            self.mostrar_resultado(resultado)
+            self.actualizar_todos_reportes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
+    
+    def registrar_compra_combinada(self):
+        """Registra una compra combinada"""
+        try:
+            monto = float(self.monto_entry.get())
+            porcentaje = float(self.porcentaje_entry.get())
+            cuenta_origen = self.cuenta_origen_var.get()
+            
+            if porcentaje < 0 or porcentaje > 100:
+                messagebox.showerror("Error", "El porcentaje debe estar entre 0 y 100.")
+                return
+            
+            resultado = self.sistema.compra_combinada(monto, porcentaje, cuenta_origen)
+            self.mostrar_resultado(resultado)
+            self.actualizar_todos_reportes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese valores válidos.")
+    
+    def registrar_anticipo_cliente(self):
+        """Registra un anticipo de cliente"""
+        try:
+            monto = float(self.monto_entry.get())
+            cuenta_destino = self.cuenta_destino_var.get()
+            resultado = self.sistema.anticipo_cliente(monto, cuenta_destino)
+            self.mostrar_resultado(resultado)
+            self.actualizar_todos_reportes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
+    
+    def registrar_compra_papeleria(self):
+        """Registra una compra de papelería"""
+        try:
+            monto = float(self.monto_entry.get())
+            cuenta_origen = self.cuenta_origen_var.get()
+            resultado = self.sistema.compra_papeleria(monto, cuenta_origen)
+            self.mostrar_resultado(resultado)
+            self.actualizar_todos_reportes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
+    
+    def registrar_rentas_anticipadas(self):
+        """Registra el pago de rentas anticipadas"""
+        try:
+            monto = float(self.monto_entry.get())
+            meses = int(self.meses_entry.get())
+            cuenta_origen = self.cuenta_origen_var.get()
+            
+            if meses <= 0:
+                messagebox.showerror("Error", "El número de meses debe ser mayor a 0.")
+                return
+            
+            resultado = self.sistema.pago_rentas_anticipadas(monto, meses, cuenta_origen)
+            self.mostrar_resultado(resultado)
+            self.actualizar_todos_reportes()
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese valores válidos.")
+    
+    def mostrar_resultado(self, texto):
+        """Muestra el resultado de una operación"""
+        self.resultado_text.delete(1.0, tk.END)
+        self.resultado_text.insert(tk.END, texto)
+    
+    def actualizar_diario(self):
+        """Actualiza el libro diario"""
+        self.tab_diario.text_area.delete(1.0, tk.END)
+        self.tab_diario.text_area.insert(tk.END, self.sistema.generar_diario())
+    
+    def actualizar_mayor(self):
+        """Actualiza los esquemas de mayor"""
+        self.tab_mayor.text_area.delete(1.0, tk.END)
+        self.tab_mayor.text_area.insert(tk.END, self.sistema.generar_mayor())
+    
+    def actualizar_balanza(self):
+        """Actualiza la balanza de comprobación"""
+        self.tab_balanza.text_area.delete(1.0, tk.END)
+        self.tab_balanza.text_area.insert(tk.END, self.sistema.generar_balanza_comprobacion())
+    
+    def actualizar_balance(self):
+        """Actualiza el balance general"""
+        self.tab_balance.text_area.delete(1.0, tk.END)
+        self.tab_balance.text_area.insert(tk.END, self.sistema.generar_balance_general())
+    
+    def actualizar_todos_reportes(self):
+        """Actualiza todos los reportes"""
+        self.actualizar_diario()
+        self.actualizar_mayor()
+        self.actualizar_balanza()
+        self.actualizar_balance()
+
+
+# Función principal para ejecutar el programa
+def main():
+    configurar_locale()
+    root = tk.Tk()
+    app = AplicacionContable(root)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
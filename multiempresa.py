@@ -0,0 +1,155 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from sistema_contable_completo import SistemaContable
+
+
+def _saldos_persistencia(fabrica, ruta, desde, hasta):
+    """Saldos por cuenta de una empresa leídos de su persistencia; se ejecuta en otro
+    proceso, que abre su propia conexión o archivo con fabrica(ruta)"""
+    persistencia = fabrica(ruta)
+    try:
+        return persistencia.saldos_por_cuenta(desde, hasta)
+    finally:
+        persistencia.cerrar()
+
+
+class GrupoEmpresas:
+    """Contabilidades de varias empresas (un SistemaContable por entidad) con reportes consolidados.
+    
+    Una empresa puede agregarse ya cargada o solo con su persistencia (BitacoraJSONL,
+    PersistenciaSQLite); en ese caso no ocupa memoria hasta que se pide con empresa(nombre)
+    para registrar asientos. Para consolidar, los saldos de las empresas no cargadas se
+    calculan en un ProcessPoolExecutor: cada proceso abre la persistencia de una empresa
+    y devuelve solo la suma por cuenta. Las cargadas se suman en este proceso con sus
+    saldos en memoria. A la suma se aplican los asientos de eliminación de las operaciones
+    entre empresas del grupo, que solo existen en el consolidado (si se da una persistencia
+    se guardan y recuperan en ella igual que los de una empresa).
+    """
+    
+    def __init__(self, procesos=None, persistencia=None):
+        self.procesos = procesos  # None: tantos procesos como núcleos
+        self.empresas = {}  # Nombre -> SistemaContable, o None si aún no se carga
+        self.eliminaciones = []  # (fecha ordinal, descripcion, cargos, abonos), montos en centavos
+        self._persistencias = {}  # Nombre -> persistencia de las empresas no cargadas
+        self._sistema_formato = None
+        self._ejecutor = None
+        self.persistencia = None
+        if persistencia is not None:
+            for registro in persistencia.leer():
+                self.eliminaciones.append((registro["fecha"], registro["descripcion"],
+                                           registro["cargos"], registro["abonos"]))
+        self.persistencia = persistencia
+    
+    def agregar_empresa(self, nombre, sistema=None, persistencia=None):
+        """Agrega al grupo una empresa ya cargada (sistema) o solo su persistencia"""
+        if nombre in self.empresas:
+            raise ValueError(f"La empresa '{nombre}' ya existe")
+        if (sistema is None) == (persistencia is None):
+            raise ValueError("Indique el sistema o la persistencia de la empresa")
+        self.empresas[nombre] = sistema
+        if persistencia is not None:
+            self._persistencias[nombre] = persistencia
+    
+    def empresa(self, nombre):
+        """SistemaContable de una empresa del grupo (se carga de su persistencia si hace falta)"""
+        if nombre not in self.empresas:
+            raise ValueError(f"La empresa '{nombre}' no existe")
+        if self.empresas[nombre] is None:
+            self.empresas[nombre] = SistemaContable(self._persistencias.pop(nombre))
+        return self.empresas[nombre]
+    
+    def _formato(self):
+        """Sistema cuyo catálogo de cuentas y formato se usan en los reportes consolidados"""
+        for sistema in self.empresas.values():
+            if sistema is not None:
+                return sistema
+        if self._sistema_formato is None:
+            # Sin persistencia: solo se usan su catálogo y su formato
+            self._sistema_formato = SistemaContable()
+        return self._sistema_formato
+    
+    def registrar_eliminacion(self, descripcion, cargos, abonos, fecha=None):
+        """Registra un asiento de eliminación (montos en centavos) para el consolidado.
+        
+        Por ejemplo, una venta entre empresas del grupo se elimina con un cargo a Ventas
+        y un abono a Costo de ventas, y la cuenta por cobrar con la por pagar.
+        """
+        formato = self._formato()
+        for movimientos in (cargos, abonos):
+            for cuenta, monto in movimientos.items():
+                if cuenta not in formato.cuentas:
+                    raise ValueError(f"La cuenta '{cuenta}' no existe")
+                if type(monto) is not int:
+                    raise ValueError(f"Los montos deben estar en centavos enteros: {monto!r}")
+        if sum(cargos.values()) != sum(abonos.values()):
+            raise ValueError(f"El asiento '{descripcion}' no está cuadrado")
+        fecha = formato.ordinal(fecha)
+        
+        if self.persistencia is not None:
+            self.persistencia.anexar(fecha, [(descripcion, cargos, abonos)])
+        self.eliminaciones.append((fecha, descripcion, cargos, abonos))
+    
+    def _ejecutor_procesos(self):
+        """Pool de procesos del grupo; se crea al usarse por primera vez"""
+        if self._ejecutor is None:
+            self._ejecutor = ProcessPoolExecutor(max_workers=self.procesos)
+        return self._ejecutor
+    
+    def saldos_por_empresa(self, desde=None, hasta=None):
+        """Saldo de cada cuenta por empresa ({empresa: {cuenta: centavos}}); con desde/hasta
+        (fechas ordinales o date, inclusive) el movimiento neto del periodo"""
+        desde, hasta = self._formato()._periodo(desde, hasta)
+        futuros = {}
+        for nombre, persistencia in self._persistencias.items():
+            futuros[nombre] = self._ejecutor_procesos().submit(
+                _saldos_persistencia, type(persistencia), persistencia.ruta, desde, hasta)
+        saldos = {}
+        for nombre, sistema in self.empresas.items():
+            if sistema is None:
+                saldos[nombre] = futuros[nombre].result()
+            else:
+                saldos[nombre] = sistema._saldos(None, desde, hasta)[0]
+        return saldos
+    
+    def saldos_consolidados(self, desde=None, hasta=None):
+        """Suma por cuenta de los saldos de todas las empresas más los asientos de eliminación"""
+        desde, hasta = self._formato()._periodo(desde, hasta)
+        consolidados = dict.fromkeys(self._formato().cuentas, 0)
+        for saldos in self.saldos_por_empresa(desde, hasta).values():
+            for cuenta, saldo in saldos.items():
+                consolidados[cuenta] += saldo
+        for fecha, _, cargos, abonos in self.eliminaciones:
+            if (desde is not None and fecha < desde) or (hasta is not None and fecha > hasta):
+                continue
+            for cuenta, monto in cargos.items():
+                consolidados[cuenta] += monto
+            for cuenta, monto in abonos.items():
+                consolidados[cuenta] -= monto
+        return consolidados
+    
+    def _encabezado(self):
+        """Encabezado de los reportes consolidados"""
+        return f"=== CONSOLIDADO DE {len(self.empresas)} EMPRESAS: {', '.join(self.empresas)} ===\n"
+    
+    def generar_balanza_consolidada(self, desde=None, hasta=None):
+        """Genera el texto de la balanza de comprobación consolidada"""
+        saldos = self.saldos_consolidados(desde, hasta)
+        return self._encabezado() + self._formato().generar_balanza_comprobacion(saldos, desde, hasta)
+    
+    def generar_balance_consolidado(self, desde=None, hasta=None):
+        """Genera el texto del balance general consolidado"""
+        saldos = self.saldos_consolidados(desde, hasta)
+        return self._encabezado() + self._formato().generar_balance_general(saldos, desde, hasta)
+    
+    def cerrar(self):
+        """Detiene el pool de procesos y cierra las persistencias del grupo"""
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown()
+            self._ejecutor = None
+        for sistema in self.empresas.values():
+            if sistema is not None and sistema.persistencia is not None:
+                sistema.persistencia.cerrar()
+        for persistencia in self._persistencias.values():
+            persistencia.cerrar()
+        if self.persistencia is not None:
+            self.persistencia.cerrar()
@@ -0,0 +1,64 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sistema_contable_completo import escribir_reporte
+
+# Reportes del paquete: nombre del archivo y método del sistema que lo genera. Los
+# iter_* se escriben por bloques; los más pesados van primero para repartir mejor
+REPORTES = (
+    ("libro_diario", "iter_diario"),
+    ("esquemas_mayor", "iter_mayor"),
+    ("flujos_efectivo", "iter_estado_flujos_efectivo"),
+    ("balanza_comprobacion", "generar_balanza_comprobacion"),
+    ("balance_general", "generar_balance_general"),
+    ("estado_resultados", "generar_estado_resultados"),
+    ("cambios_capital", "generar_estado_cambios_capital"),
+)
+
+# Instantánea del sistema en cada proceso del pool
+_instantanea = None
+
+
+def _iniciar_proceso(instantanea):
+    """Recibe la instantánea una sola vez por proceso (no una vez por reporte)"""
+    global _instantanea
+    _instantanea = instantanea
+
+
+def _escribir(metodo, ruta, desde, hasta):
+    """Genera un reporte de la instantánea y lo escribe en ruta; devuelve los segundos"""
+    inicio = time.perf_counter()
+    generar = getattr(_instantanea, metodo)
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        if metodo.startswith("iter_"):
+            escribir_reporte(generar(desde=desde, hasta=hasta), archivo)
+        else:
+            archivo.write(generar(desde=desde, hasta=hasta))
+    return time.perf_counter() - inicio
+
+
+def generar_paquete(sistema, directorio, desde=None, hasta=None, procesos=None):
+    """Genera los siete estados de cierre de mes en directorio, en paralelo.
+    
+    Todos los reportes salen de una misma instantánea del sistema, así que son
+    consistentes entre sí aunque se sigan registrando asientos. Cada proceso del pool
+    escribe sus reportes directamente en "<nombre>.txt"; solo regresan los tiempos.
+    Devuelve {nombre: segundos} con el tiempo de cada reporte y "total" con el tiempo
+    de todo el paquete.
+    """
+    inicio = time.perf_counter()
+    instantanea = sistema.instantanea()
+    os.makedirs(directorio, exist_ok=True)
+    if procesos is None:
+        procesos = min(len(REPORTES), os.cpu_count() or 1)
+    
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso,
+                             initargs=(instantanea,)) as ejecutor:
+        futuros = {
+            nombre: ejecutor.submit(_escribir, metodo, os.path.join(directorio, nombre + ".txt"), desde, hasta)
+            for nombre, metodo in REPORTES
+        }
+        tiempos = {nombre: futuro.result() for nombre, futuro in futuros.items()}
+    tiempos["total"] = time.perf_counter() - inicio
+    return tiempos
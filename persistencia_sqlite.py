@@ -0,0 +1,225 @@
+import sqlite3
+from datetime import date
+
+from almacen_asientos import AlmacenAsientos
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS cuentas (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS descripciones (
+    id INTEGER PRIMARY KEY,
+    texto TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS asientos (
+    id INTEGER PRIMARY KEY,
+    fecha INTEGER NOT NULL,
+    descripcion INTEGER NOT NULL REFERENCES descripciones(id),
+    actividad TEXT
+);
+CREATE TABLE IF NOT EXISTS lineas (
+    asiento INTEGER NOT NULL REFERENCES asientos(id),
+    orden INTEGER NOT NULL,
+    cuenta INTEGER NOT NULL REFERENCES cuentas(id),
+    fecha INTEGER NOT NULL,
+    lado INTEGER NOT NULL,
+    monto INTEGER NOT NULL,
+    PRIMARY KEY (asiento, orden)
+);
+CREATE INDEX IF NOT EXISTS lineas_cuenta_fecha ON lineas (cuenta, fecha, lado, monto);
+CREATE INDEX IF NOT EXISTS asientos_fecha ON asientos (fecha);
+"""
+
+
+class PersistenciaSQLite:
+    """Persistencia de los asientos en una base de datos SQLite.
+    
+    Tiene la misma interfaz que BitacoraJSONL (leer, anexar, reemplazar, posicion,
+    sincronizar y cerrar) y además permite calcular saldos y esquemas de mayor con consultas SQL
+    agrupadas por cuenta, sin recorrer los asientos en Python. La fecha se repite en
+    cada línea para que el índice (cuenta, fecha) sirva a las consultas por periodo; el
+    índice incluye lado y monto para que los saldos se calculen solo con el índice.
+    """
+    
+    def __init__(self, ruta):
+        self.ruta = ruta
+        # El servidor la crea en el hilo principal y registra desde su hilo escritor; solo un
+        # hilo la usa a la vez
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        # Con WAL y NORMAL las últimas transacciones se pueden perder en un corte de luz;
+        # con FULL cada lote confirmado ya está en disco, igual que con la bitácora
+        self._conexion.execute("PRAGMA synchronous=FULL")
+        self._conexion.execute("PRAGMA foreign_keys=ON")
+        self._conexion.executescript(ESQUEMA)
+        columnas = [fila[1] for fila in self._conexion.execute("PRAGMA table_info(asientos)")]
+        if "actividad" not in columnas:
+            # Bases creadas antes de guardar la actividad de los flujos de efectivo
+            self._conexion.execute("ALTER TABLE asientos ADD COLUMN actividad TEXT")
+        self.ultimo_id = self._conexion.execute("SELECT COALESCE(MAX(id), 0) FROM asientos").fetchone()[0]
+        self._cargar_catalogos()
+    
+    def _cargar_catalogos(self):
+        """Lee los ids de cuentas y descripciones ya guardados"""
+        self._ids_cuentas = dict(self._conexion.execute("SELECT nombre, id FROM cuentas"))
+        self._ids_descripciones = dict(self._conexion.execute("SELECT texto, id FROM descripciones"))
+    
+    def leer(self, posicion=0):
+        """Genera los asientos guardados con id mayor que posicion, en orden"""
+        filas = self._conexion.execute("""
+            SELECT a.id, a.fecha, d.texto, a.actividad, c.nombre, l.lado, l.monto
+            FROM asientos a
+            JOIN descripciones d ON d.id = a.descripcion
+            JOIN lineas l ON l.asiento = a.id
+            JOIN cuentas c ON c.id = l.cuenta
+            WHERE a.id > ?
+            ORDER BY a.id, l.orden
+        """, (posicion,))
+        registro = None
+        for id_asiento, fecha, descripcion, actividad, cuenta, lado, monto in filas:
+            if registro is None or registro["id"] != id_asiento:
+                if registro is not None:
+                    self.ultimo_id = registro["id"]
+                    yield registro
+                registro = {"id": id_asiento, "fecha": fecha, "descripcion": descripcion,
+                            "cargos": {}, "abonos": {}}
+                if actividad is not None:
+                    registro["actividad"] = actividad
+            registro["abonos" if lado else "cargos"][cuenta] = monto
+        if registro is not None:
+            self.ultimo_id = registro["id"]
+            yield registro
+    
+    def _id(self, ids, tabla, columna, valor):
+        """Id de una cuenta o descripción, dándola de alta si no existe"""
+        id_valor = ids.get(valor)
+        if id_valor is None:
+            id_valor = self._conexion.execute(f"INSERT INTO {tabla} ({columna}) VALUES (?)", (valor,)).lastrowid
+            ids[valor] = id_valor
+        return id_valor
+    
+    def anexar(self, fecha, asientos):
+        """Guarda un lote de asientos (descripcion, cargos, abonos[, actividad]) en una sola transacción"""
+        try:
+            with self._conexion:
+                ultimo_id = self._insertar(fecha, asientos, self.ultimo_id)
+        except sqlite3.Error:
+            # La transacción se deshizo: los ids dados de alta en ella ya no existen
+            self._cargar_catalogos()
+            raise
+        self.ultimo_id = ultimo_id
+    
+    def _insertar(self, fecha, asientos, id_asiento):
+        """Inserta los asientos y sus líneas (dentro de la transacción en curso); devuelve el id del último"""
+        filas_asientos = []
+        filas_lineas = []
+        for descripcion, cargos, abonos, *actividad in asientos:
+            id_asiento += 1
+            id_descripcion = self._id(self._ids_descripciones, "descripciones", "texto", descripcion)
+            filas_asientos.append((id_asiento, fecha, id_descripcion, actividad[0] if actividad else None))
+            orden = 0
+            for lado, movimientos in ((0, cargos), (1, abonos)):
+                for cuenta, monto in movimientos.items():
+                    id_cuenta = self._id(self._ids_cuentas, "cuentas", "nombre", cuenta)
+                    filas_lineas.append((id_asiento, orden, id_cuenta, fecha, lado, monto))
+                    orden += 1
+        self._conexion.executemany("INSERT INTO asientos (id, fecha, descripcion, actividad) VALUES (?, ?, ?, ?)", filas_asientos)
+        self._conexion.executemany(
+            "INSERT INTO lineas (asiento, orden, cuenta, fecha, lado, monto) VALUES (?, ?, ?, ?, ?, ?)", filas_lineas)
+        return id_asiento
+    
+    def reemplazar(self, registros):
+        """Reemplaza todos los asientos por los registros dados (fecha, descripcion, cargos,
+        abonos y opcionalmente actividad), numerados desde 1, en una sola transacción"""
+        try:
+            with self._conexion:
+                self._conexion.execute("DELETE FROM lineas")
+                self._conexion.execute("DELETE FROM asientos")
+                ultimo_id = 0
+                for fecha, lote in AlmacenAsientos.lotes_por_fecha(registros):
+                    ultimo_id = self._insertar(fecha, lote, ultimo_id)
+                # Nueva generación de la base en la misma transacción (ver huella)
+                generacion = self._conexion.execute("PRAGMA user_version").fetchone()[0]
+                self._conexion.execute(f"PRAGMA user_version = {generacion + 1}")
+        except sqlite3.Error:
+            self._cargar_catalogos()
+            raise
+        self.ultimo_id = ultimo_id
+    
+    def posicion(self):
+        """Id del último asiento guardado"""
+        return self.ultimo_id
+    
+    def huella(self, posicion):
+        """Generación de la base, que sube cada vez que se reemplazan los asientos; un punto
+        de control la guarda porque reemplazar vuelve a numerar los ids desde 1"""
+        return self._conexion.execute("PRAGMA user_version").fetchone()[0]
+    
+    def sincronizar(self):
+        """Cada lote se confirma en su propia transacción y con synchronous=FULL el commit
+        sincroniza el WAL en disco; no queda nada pendiente"""
+    
+    def cerrar(self):
+        """Cierra la conexión"""
+        self._conexion.close()
+    
+    @staticmethod
+    def _filtro_periodo(desde, hasta):
+        """Condición SQL y parámetros para un periodo de fechas ordinales (inclusivo)"""
+        condiciones = []
+        parametros = []
+        if desde is not None:
+            condiciones.append("l.fecha >= ?")
+            parametros.append(desde)
+        if hasta is not None:
+            condiciones.append("l.fecha <= ?")
+            parametros.append(hasta)
+        return ("WHERE " + " AND ".join(condiciones)) if condiciones else "", parametros
+    
+    def saldos_por_cuenta(self, desde=None, hasta=None):
+        """Saldo (cargos - abonos) de cada cuenta calculado con GROUP BY"""
+        where, parametros = self._filtro_periodo(desde, hasta)
+        return dict(self._conexion.execute(f"""
+            SELECT c.nombre, SUM(CASE l.lado WHEN 0 THEN l.monto ELSE -l.monto END)
+            FROM lineas l JOIN cuentas c ON c.id = l.cuenta
+            {where}
+            GROUP BY l.cuenta
+        """, parametros))
+    
+    def cuentas_mayor(self, desde=None, hasta=None):
+        """Genera (cuenta, cargos, abonos, saldo) por cuenta para los esquemas de mayor.
+        
+        Las cuentas salen en el orden de su primer movimiento (el de sus ids); cargos y abonos son generadores
+        de (fecha, descripcion, monto) que se leen con el índice (cuenta, fecha).
+        """
+        where, parametros = self._filtro_periodo(desde, hasta)
+        cuentas = self._conexion.execute(f"""
+            SELECT l.cuenta, c.nombre, SUM(CASE l.lado WHEN 0 THEN l.monto ELSE -l.monto END)
+            FROM lineas l JOIN cuentas c ON c.id = l.cuenta
+            {where}
+            GROUP BY l.cuenta
+            ORDER BY l.cuenta
+        """, parametros).fetchall()
+        for id_cuenta, nombre, saldo in cuentas:
+            yield (nombre, self._movimientos(id_cuenta, 0, desde, hasta),
+                   self._movimientos(id_cuenta, 1, desde, hasta), saldo)
+    
+    def _movimientos(self, id_cuenta, lado, desde, hasta):
+        """Genera (fecha, descripcion, monto) de una cuenta y lado, en orden de fecha"""
+        where, parametros = self._filtro_periodo(desde, hasta)
+        where = (where + " AND" if where else "WHERE") + " l.cuenta = ? AND l.lado = ?"
+        filas = self._conexion.execute(f"""
+            SELECT l.fecha, d.texto, l.monto
+            FROM lineas l
+            JOIN asientos a ON a.id = l.asiento
+            JOIN descripciones d ON d.id = a.descripcion
+            {where}
+            ORDER BY l.fecha, l.asiento, l.orden
+        """, parametros + [id_cuenta, lado])
+        fechas = {}
+        for fecha, descripcion, monto in filas:
+            texto = fechas.get(fecha)
+            if texto is None:
+                texto = fechas[fecha] = date.fromordinal(fecha).strftime("%d/%m/%Y")
+            yield texto, descripcion, monto
@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+import zlib
+from array import array
+
+from almacen_asientos import AlmacenAsientos
+
+# Columnas del almacén que se guardan en cada punto de control
+COLUMNAS = ("asiento_fecha", "asiento_descripcion", "asiento_inicio",
+            "asientos_por_fecha", "fechas_ordenadas",
+            "linea_asiento", "linea_cuenta", "linea_lado", "linea_monto",
+            "flujo_asiento", "flujo_monto", "flujo_actividad")
+
+# Índices por cuenta y por actividad de los flujos del almacén; cada arreglo se guarda
+# como "<prefijo>_<id de cuenta o actividad>"
+INDICES = (("mayor", "lineas_por_cuenta"), ("fechas", "fechas_por_cuenta"), ("acumulados", "acumulados_por_cuenta"),
+           ("ordenadas", "lineas_ordenadas_por_cuenta"), ("flujosfechas", "fechas_por_actividad"),
+           ("flujosacumulados", "acumulados_por_actividad"))
+
+# Versión del formato; los puntos de control de otra versión se ignoran
+VERSION = 9
+
+
+class PuntosControl:
+    """Puntos de control (checkpoints) del sistema contable en un directorio.
+    
+    Cada archivo tiene una primera línea JSON con los saldos de las cuentas, los totales
+    del mayor por cuenta y por actividad de los flujos de efectivo, el último asiento
+    aplicado, la fecha del último cierre de periodo y la posición y huella de la
+    persistencia; después van las columnas del almacén en binario. Al arrancar se carga
+    el punto de control válido más reciente (sus totales deben coincidir con los índices
+    leídos y su huella con la persistencia) y solo se vuelven a aplicar los asientos
+    posteriores.
+    """
+    
+    def __init__(self, directorio, cada=100000, conservar=2):
+        self.directorio = directorio
+        self.cada = cada
+        self.conservar = conservar
+        self.ultimo_escrito = 0  # Asientos aplicados en el último punto de control
+        self._hilo = None
+        os.makedirs(directorio, exist_ok=True)
+    
+    def notificar(self, sistema):
+        """Se llama después de cada lote; escribe un punto de control cada `cada` asientos"""
+        if sistema.asientos_aplicados - self.ultimo_escrito >= self.cada:
+            self.escribir_en_segundo_plano(sistema)
+    
+    def escribir_en_segundo_plano(self, sistema):
+        """Toma una instantánea y la escribe en otro hilo sin detener el registro de asientos.
+        
+        Si ya se está escribiendo un punto de control no se inicia otro; devuelve el hilo o None.
+        """
+        if self._hilo is not None and self._hilo.is_alive():
+            return None
+        estado = self._capturar(sistema)
+        self._hilo = threading.Thread(target=self._escribir, args=(estado,), daemon=True)
+        self._hilo.start()
+        return self._hilo
+    
+    def escribir(self, sistema):
+        """Escribe un punto de control en el hilo actual; devuelve la ruta del archivo"""
+        self.esperar()
+        return self._escribir(self._capturar(sistema))
+    
+    def esperar(self):
+        """Espera a que termine el punto de control que se está escribiendo"""
+        if self._hilo is not None:
+            self._hilo.join()
+    
+    def _capturar(self, sistema):
+        """Instantánea del sistema y posición y huella de la persistencia en el mismo instante"""
+        posicion = 0
+        huella = None
+        if sistema.persistencia is not None:
+            # El punto de control no debe cubrir asientos que aún no están en disco
+            sistema.persistencia.sincronizar()
+            posicion = sistema.persistencia.posicion()
+            huella = sistema.persistencia.huella(posicion)
+        self.ultimo_escrito = sistema.asientos_aplicados
+        return sistema.instantanea(), posicion, huella
+    
+    def _escribir(self, estado):
+        """Escribe el archivo de forma atómica (archivo temporal + os.replace)"""
+        instantanea, posicion, huella = estado
+        almacen = instantanea.almacen
+        almacen.ordenar_saldos()
+        columnas = [(nombre, getattr(almacen, nombre)) for nombre in COLUMNAS]
+        for prefijo, atributo in INDICES:
+            columnas.extend((f"{prefijo}_{id_cuenta}", indice) for id_cuenta, indice in getattr(almacen, atributo).items())
+        
+        crc = 0
+        for _, columna in columnas:
+            crc = zlib.crc32(memoryview(columna).cast("B"), crc)
+        
+        encabezado = {
+            "version": VERSION,
+            "asientos_aplicados": instantanea.asientos_aplicados,
+            "fecha_cierre": instantanea.fecha_cierre,
+            "posicion": posicion,
+            "huella": huella,
+            "cuentas": instantanea.cuentas,
+            "totales_mayor": self._totales_mayor(almacen),
+            "totales_flujos": self._totales_flujos(almacen),
+            "nombres_cuentas": almacen.nombres_cuentas,
+            "descripciones": almacen.descripciones,
+            "columnas": [[nombre, columna.typecode, len(columna)] for nombre, columna in columnas],
+            "crc": crc
+        }
+        
+        ruta = os.path.join(self.directorio, f"punto_control_{instantanea.asientos_aplicados:012d}.pc")
+        temporal = ruta + ".tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(json.dumps(encabezado, ensure_ascii=False).encode("utf-8") + b"\n")
+            for _, columna in columnas:
+                columna.tofile(archivo)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta)
+        self._limpiar()
+        return ruta
+    
+    @staticmethod
+    def _totales_mayor(almacen):
+        """Total del mayor (cargos - abonos) de cada cuenta: el último de sus saldos acumulados"""
+        return {almacen.nombres_cuentas[id_cuenta]: acumulados[-1] if acumulados else 0
+                for id_cuenta, acumulados in almacen.acumulados_por_cuenta.items()}
+    
+    @staticmethod
+    def _totales_flujos(almacen):
+        """Total de flujos de efectivo por actividad"""
+        return {nombre: almacen.total_flujos(actividad)[1] for actividad, nombre in enumerate(almacen.ACTIVIDADES)}
+    
+    def descartar(self):
+        """Borra todos los puntos de control (ya no corresponden a la persistencia, por
+        ejemplo después de compactarla en un cierre de periodo)"""
+        self.esperar()
+        for ruta in self._archivos():
+            os.remove(ruta)
+        self.ultimo_escrito = 0
+    
+    def _archivos(self):
+        """Puntos de control del directorio, del más reciente al más antiguo"""
+        nombres = [n for n in os.listdir(self.directorio) if n.startswith("punto_control_") and n.endswith(".pc")]
+        return [os.path.join(self.directorio, n) for n in sorted(nombres, reverse=True)]
+    
+    def _limpiar(self):
+        """Borra los puntos de control más antiguos que los `conservar` más recientes"""
+        for ruta in self._archivos()[self.conservar:]:
+            os.remove(ruta)
+    
+    def restaurar_ultimo(self, sistema, persistencia=None):
+        """Carga en el sistema el punto de control válido más reciente.
+        
+        Con persistencia se descartan los puntos de control cuya huella ya no coincide
+        con ella (se reemplazó después de escribirlos, por ejemplo en un cierre de periodo
+        interrumpido). Devuelve la posición de la persistencia desde la que hay que seguir
+        leyendo, o None si no hay ningún punto de control válido.
+        """
+        for ruta in self._archivos():
+            try:
+                encabezado, almacen = self._leer(ruta)
+                if persistencia is not None and persistencia.huella(encabezado["posicion"]) != encabezado["huella"]:
+                    continue
+            except (OSError, ValueError, EOFError):
+                continue
+            sistema.almacen = almacen
+            sistema.cuentas.update(encabezado["cuentas"])
+            sistema.resultados = sistema.calcular_resultados(sistema.cuentas)
+            sistema.asientos_aplicados = encabezado["asientos_aplicados"]
+            sistema.fecha_cierre = encabezado["fecha_cierre"]
+            self.ultimo_escrito = sistema.asientos_aplicados
+            return encabezado["posicion"]
+        return None
+    
+    @staticmethod
+    def _leer(ruta):
+        """Lee y valida un punto de control; lanza ValueError si está dañado"""
+        with open(ruta, "rb") as archivo:
+            encabezado = json.loads(archivo.readline())
+            if encabezado.get("version") != VERSION:
+                raise ValueError(f"Versión de punto de control no soportada: {ruta}")
+            almacen = AlmacenAsientos()
+            almacen.nombres_cuentas = encabezado["nombres_cuentas"]
+            almacen.ids_cuentas = {nombre: i for i, nombre in enumerate(almacen.nombres_cuentas)}
+            almacen.descripciones = encabezado["descripciones"]
+            almacen.ids_descripciones = {texto: i for i, texto in enumerate(almacen.descripciones)}
+            
+            indices = dict(INDICES)
+            crc = 0
+            for nombre, tipo, longitud in encabezado["columnas"]:
+                columna = array(tipo)
+                columna.fromfile(archivo, longitud)
+                crc = zlib.crc32(memoryview(columna).cast("B"), crc)
+                prefijo, _, id_cuenta = nombre.partition("_")
+                if prefijo in indices and id_cuenta.isdigit():
+                    getattr(almacen, indices[prefijo])[int(id_cuenta)] = columna
+                else:
+                    setattr(almacen, nombre, columna)
+            if crc != encabezado["crc"]:
+                raise ValueError(f"Punto de control dañado: {ruta}")
+        # Los totales del encabezado deben coincidir con los índices leídos y cuadrar
+        if (PuntosControl._totales_mayor(almacen) != encabezado["totales_mayor"]
+                or PuntosControl._totales_flujos(almacen) != encabezado["totales_flujos"]
+                or sum(encabezado["totales_mayor"].values()) != 0):
+            raise ValueError(f"Los totales no coinciden con el punto de control: {ruta}")
+        return encabezado, almacen
@@ -0,0 +1,378 @@
+"""Servicio HTTP/JSON (asyncio) sobre SistemaContable para varias terminales a la vez.
+
+Las operaciones que registran asientos pasan por una cola con un solo escritor: las
+peticiones que llegan mientras se guarda un lote se registran juntas en el siguiente
+(un solo registrar_asientos_lote y un solo fsync por fecha). Las consultas se sirven
+de lo publicado después de cada lote, en hilos lectores, sin esperar a una escritura.
+
+Uso: python servidor.py [--host 127.0.0.1] [--puerto 8080] [--bitacora diario_contable.jsonl | --sqlite RUTA]
+                        [--max-lote 1000]
+  
+  POST /operaciones/<operacion>     {"monto_sin_iva": "1000.00", "costo_venta": "400", "fecha": "AAAA-MM-DD", ...}
+                                    operaciones y parámetros de importador.OPERACIONES, montos en pesos
+  GET  /saldos                      saldos de todas las cuentas (centavos)
+  GET  /saldos/<cuenta>[?fecha=F]   saldo de una cuenta, a una fecha de corte si se indica
+  GET  /reportes/<tipo>[?desde=F&hasta=F]   reporte de texto (los tipos de comandos.py)
+  GET  /estado                      versión, asientos, lotes guardados y peticiones en cola
+"""
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from bitacora import BitacoraJSONL
+from comandos import REPORTES_ITERADOS, REPORTES_TEXTO
+from dinero import a_centavos
+from importador import OPERACIONES
+from sistema_contable_completo import RUTA_BITACORA, SistemaContable
+
+# Tamaño máximo del cuerpo de una petición (bytes)
+MAX_CUERPO = 1 << 20
+
+ESTADOS_HTTP = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class ErrorPeticion(Exception):
+    """Error que se responde al cliente con el estado HTTP indicado"""
+    
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+class SaldosPublicados:
+    """Saldos del sistema después de un lote; no se modifican, se reemplazan completos.
+    
+    La respuesta de /saldos se serializa una sola vez por versión. vista es una
+    vista_fija() del sistema con la que se generan los saldos a una fecha y los reportes
+    de esa versión: comparte el diario y la caché de reportes sin copiarlos.
+    """
+    
+    def __init__(self, sistema):
+        self.vista = sistema.vista_fija()
+        self.version = sistema.version
+        self.asientos = sistema.almacen.num_asientos()
+        self.fecha_cierre = sistema.fecha_cierre
+        self.saldos = dict(sistema.cuentas)
+        self.json_saldos = _json({"version": self.version, "asientos": self.asientos, "saldos": self.saldos})
+
+
+def _json(datos):
+    return json.dumps(datos, ensure_ascii=False).encode("utf-8")
+
+
+def _fecha(texto):
+    """Ordinal de una fecha AAAA-MM-DD de la petición (None si no se indicó)"""
+    if texto is None:
+        return None
+    try:
+        return date.fromisoformat(texto).toordinal()
+    except (TypeError, ValueError):
+        raise ErrorPeticion(400, f"Fecha no válida: {texto!r} (use AAAA-MM-DD)")
+
+
+class ServidorContable:
+    """Servicio HTTP/1.1 (con keep-alive) sobre un SistemaContable.
+    
+    Solo el hilo escritor modifica el sistema. Después de cada lote publica unos
+    SaldosPublicados nuevos con una vista fija del sistema. Los saldos a una fecha y
+    todos los reportes se generan en los hilos lectores sobre la vista publicada al
+    recibir la petición, así que un reporte largo no retrasa el siguiente lote.
+    """
+    
+    def __init__(self, sistema, max_lote=1000):
+        self.sistema = sistema
+        self.max_lote = max_lote
+        self.publicados = SaldosPublicados(sistema)
+        self.lotes = 0  # Lotes guardados desde que arrancó el servidor
+        self.registrados = 0  # Asientos registrados en esos lotes
+        self._cola = None
+        self._escritor = ThreadPoolExecutor(1, thread_name_prefix="escritor")
+        self._lectores = ThreadPoolExecutor(2, thread_name_prefix="lector")
+        self._tarea_escritor = None
+        self._servidor = None
+        self._conexiones = {}  # Escritor (stream) de cada conexión abierta -> su tarea
+    
+    async def iniciar(self, host="127.0.0.1", puerto=8080):
+        """Empieza a aceptar conexiones; devuelve el puerto (útil con puerto 0)"""
+        self._cola = asyncio.Queue()
+        self._tarea_escritor = asyncio.create_task(self._escribir())
+        self._servidor = await asyncio.start_server(self._atender, host, puerto, backlog=4096)
+        return self._servidor.sockets[0].getsockname()[1]
+    
+    async def cerrar(self):
+        """Deja de aceptar conexiones, registra lo que quedaba en la cola y libera los hilos"""
+        self._servidor.close()
+        await self._servidor.wait_closed()
+        await self._cola.join()
+        # Las conexiones que esperan otra petición (keep-alive) terminan al cerrarlas
+        tareas = list(self._conexiones.values())
+        for escritor in list(self._conexiones):
+            escritor.close()
+        await asyncio.gather(*tareas, return_exceptions=True)
+        self._tarea_escritor.cancel()
+        self._escritor.shutdown()
+        self._lectores.shutdown()
+    
+    # --- Escritura -------------------------------------------------------------------
+    
+    async def _escribir(self):
+        """Único escritor: toma todo lo que hay en la cola (hasta max_lote) y lo registra
+        en el hilo escritor; lo que llega mientras tanto forma el siguiente lote"""
+        loop = asyncio.get_running_loop()
+        cola = self._cola
+        while True:
+            pendientes = [await cola.get()]
+            while len(pendientes) < self.max_lote and not cola.empty():
+                pendientes.append(cola.get_nowait())
+            try:
+                resultados = await loop.run_in_executor(self._escritor, self._registrar,
+                                                        [(fecha, asiento) for fecha, asiento, _ in pendientes])
+            except Exception as error:
+                resultados = [error] * len(pendientes)
+            for (_, _, futuro), resultado in zip(pendientes, resultados):
+                if not futuro.done():
+                    if isinstance(resultado, Exception):
+                        futuro.set_exception(resultado)
+                    else:
+                        futuro.set_result(resultado)
+                cola.task_done()
+    
+    def _registrar(self, pendientes):
+        """Registra (fecha, asiento) con un registrar_asientos_lote por fecha (hilo escritor).
+        
+        Si el lote de una fecha es rechazado se registran sus asientos uno por uno, para
+        que solo fallen los inválidos. Devuelve, en el orden recibido, el número de cada
+        asiento o el error que lo rechazó. Cualquier otro error (por ejemplo un OSError al
+        guardar) detiene el registro: los asientos ya guardados conservan su número, los
+        del lote que falló reciben ese error y los que faltaban un ErrorPeticion 503.
+        """
+        sistema = self.sistema
+        por_fecha = {}
+        for posicion, (fecha, asiento) in enumerate(pendientes):
+            por_fecha.setdefault(sistema.ordinal(fecha), []).append(posicion)
+        resultados = [None] * len(pendientes)
+        intento = []  # Posiciones del lote que se está guardando
+        try:
+            for fecha, posiciones in por_fecha.items():
+                primero = sistema.almacen.num_asientos() + 1
+                intento = posiciones
+                try:
+                    sistema.registrar_asientos_lote([pendientes[posicion][1] for posicion in posiciones], fecha)
+                    self.lotes += 1
+                    for numero, posicion in enumerate(posiciones, primero):
+                        resultados[posicion] = numero
+                except ValueError:
+                    for posicion in posiciones:
+                        numero = sistema.almacen.num_asientos() + 1
+                        intento = [posicion]
+                        try:
+                            sistema.registrar_asientos_lote([pendientes[posicion][1]], fecha)
+                            self.lotes += 1
+                            resultados[posicion] = numero
+                        except ValueError as error:
+                            resultados[posicion] = error
+        except Exception as error:
+            sin_intentar = ErrorPeticion(503, f"No se registró: falló la persistencia ({type(error).__name__}: {error})")
+            for posicion in intento:
+                resultados[posicion] = error
+            for posicion, resultado in enumerate(resultados):
+                if resultado is None:
+                    resultados[posicion] = sin_intentar
+        self.registrados += sum(1 for resultado in resultados if type(resultado) is int)
+        self.publicados = SaldosPublicados(sistema)
+        return resultados
+    
+    # --- Peticiones ------------------------------------------------------------------
+    
+    async def registrar_operacion(self, operacion, datos):
+        """Valida una operación del sistema, obtiene su asiento y lo encola; devuelve el
+        número del asiento cuando ya está guardado"""
+        if operacion not in OPERACIONES:
+            raise ErrorPeticion(404, f"Operación desconocida: {operacion!r}")
+        if not isinstance(datos, dict):
+            raise ErrorPeticion(400, "El cuerpo debe ser un objeto JSON")
+        parametros = dict(datos)
+        fecha = _fecha(parametros.pop("fecha", None))
+        desconocidos = set(parametros) - set(OPERACIONES[operacion])
+        if desconocidos:
+            raise ErrorPeticion(400, f"Parámetros desconocidos: {', '.join(sorted(desconocidos))}")
+        
+        # El mismo asiento que registraría la operación, sin tocar el sistema
+        try:
+            asiento, mensaje = self.sistema.asiento_operacion(operacion, **parametros)
+        except (TypeError, ValueError) as error:
+            raise ErrorPeticion(400, f"Parámetros no válidos: {error}")
+        except ArithmeticError:
+            raise ErrorPeticion(400, "Monto no válido")
+        # La operación ya convirtió los montos, así que son válidos
+        for parametro in ("monto_sin_iva", "monto"):
+            if parametro in parametros and a_centavos(parametros[parametro]) <= 0:
+                raise ErrorPeticion(400, f"{parametro} debe ser mayor que cero")
+        if "costo_venta" in parametros and a_centavos(parametros["costo_venta"]) < 0:
+            raise ErrorPeticion(400, "costo_venta no puede ser negativo")
+        publicados = self.publicados
+        for cuenta in (*asiento[1], *asiento[2]):
+            if cuenta not in publicados.saldos:
+                raise ErrorPeticion(400, f"La cuenta '{cuenta}' no existe")
+        # Se revisa antes de encolar para no hacer que se rechace el lote de otras terminales
+        cierre = publicados.fecha_cierre
+        if cierre is not None and self.sistema.ordinal(fecha) <= cierre:
+            raise ErrorPeticion(400, f"El periodo al {date.fromordinal(cierre):%d/%m/%Y} está cerrado")
+        
+        futuro = asyncio.get_running_loop().create_future()
+        self._cola.put_nowait((fecha, asiento, futuro))
+        try:
+            numero = await futuro
+        except ValueError as error:
+            raise ErrorPeticion(400, str(error))
+        return {"asiento": numero, "cargos": asiento[1], "abonos": asiento[2], "mensaje": mensaje}
+    
+    async def saldo(self, cuenta, fecha):
+        """Saldo de una cuenta (centavos), actual o a una fecha de corte (con bisect en el
+        índice de la cuenta de la vista publicada, en un hilo lector)"""
+        publicados = self.publicados
+        if cuenta not in publicados.saldos:
+            raise ErrorPeticion(404, f"La cuenta '{cuenta}' no existe")
+        if fecha is None:
+            return {"version": publicados.version, "cuenta": cuenta, "saldo": publicados.saldos[cuenta]}
+        saldo = await asyncio.get_running_loop().run_in_executor(self._lectores, publicados.vista.saldo, cuenta, fecha)
+        return {"version": publicados.version, "cuenta": cuenta, "fecha": date.fromordinal(fecha).isoformat(),
+                "saldo": saldo}
+    
+    async def reporte(self, tipo, desde, hasta):
+        """Texto de un reporte generado en un hilo lector sobre la vista publicada; los de
+        saldos pasan por la caché de reportes del sistema"""
+        loop = asyncio.get_running_loop()
+        vista = self.publicados.vista
+        if tipo in REPORTES_TEXTO:
+            generar = getattr(vista, REPORTES_TEXTO[tipo])
+            return await loop.run_in_executor(self._lectores, lambda: generar(desde=desde, hasta=hasta))
+        if tipo not in REPORTES_ITERADOS:
+            raise ErrorPeticion(404, f"Reporte desconocido: {tipo!r}")
+        return await loop.run_in_executor(self._lectores, lambda: "".join(REPORTES_ITERADOS[tipo](vista, desde, hasta)))
+    
+    def estado(self):
+        """Versión publicada, lotes guardados y peticiones esperando en la cola"""
+        publicados = self.publicados
+        return {"version": publicados.version, "asientos": publicados.asientos, "lotes": self.lotes,
+                "registrados": self.registrados, "en_cola": self._cola.qsize()}
+    
+    async def _despachar(self, metodo, destino, cuerpo):
+        """(estado, tipo de contenido, cuerpo) de la respuesta a una petición"""
+        url = urlsplit(destino)
+        partes = [unquote(parte) for parte in url.path.strip("/").split("/")]
+        consulta = {nombre: valores[-1] for nombre, valores in parse_qs(url.query).items()}
+        recurso = partes[0]
+        if recurso == "operaciones" and len(partes) == 2:
+            if metodo != "POST":
+                raise ErrorPeticion(405, "Use POST")
+            try:
+                datos = json.loads(cuerpo or b"{}")
+            except ValueError:
+                raise ErrorPeticion(400, "JSON no válido")
+            return 200, "application/json", _json(await self.registrar_operacion(partes[1], datos))
+        if metodo != "GET":
+            raise ErrorPeticion(405 if recurso in ("saldos", "reportes", "estado") else 404, "Use GET")
+        if recurso == "saldos" and len(partes) == 1:
+            return 200, "application/json", self.publicados.json_saldos
+        if recurso == "saldos" and len(partes) == 2:
+            return 200, "application/json", _json(await self.saldo(partes[1], _fecha(consulta.get("fecha"))))
+        if recurso == "reportes" and len(partes) == 2:
+            texto = await self.reporte(partes[1], _fecha(consulta.get("desde")), _fecha(consulta.get("hasta")))
+            return 200, "text/plain; charset=utf-8", texto.encode("utf-8")
+        if recurso == "estado" and len(partes) == 1:
+            return 200, "application/json", _json(self.estado())
+        raise ErrorPeticion(404, f"Ruta desconocida: {url.path}")
+    
+    async def _atender(self, lector, escritor):
+        """Atiende las peticiones de una conexión hasta que el cliente la cierre"""
+        self._conexiones[escritor] = asyncio.current_task()
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                encabezados = {}
+                while True:
+                    encabezado = await lector.readline()
+                    if encabezado in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = encabezado.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+                try:
+                    metodo, destino, version = linea.decode("latin-1").split()
+                    longitud = int(encabezados.get("content-length", 0))
+                except ValueError:
+                    escritor.write(_respuesta(400, _json({"error": "Petición no válida"}), mantener=False))
+                    break
+                if longitud > MAX_CUERPO:
+                    escritor.write(_respuesta(413, _json({"error": "Cuerpo demasiado grande"}), mantener=False))
+                    break
+                cuerpo = await lector.readexactly(longitud) if longitud else b""
+                mantener = version == "HTTP/1.1" and encabezados.get("connection", "").lower() != "close"
+                try:
+                    estado, tipo, datos = await self._despachar(metodo, destino, cuerpo)
+                except ErrorPeticion as error:
+                    estado, tipo, datos = error.estado, "application/json", _json({"error": str(error)})
+                except Exception as error:
+                    estado, tipo, datos = 500, "application/json", _json({"error": f"{type(error).__name__}: {error}"})
+                escritor.write(_respuesta(estado, datos, tipo, mantener))
+                await escritor.drain()
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError:
+            pass  # Línea más larga que el límite del stream
+        finally:
+            self._conexiones.pop(escritor, None)
+            escritor.close()
+
+
+def _respuesta(estado, cuerpo, tipo="application/json", mantener=True):
+    encabezado = (f"HTTP/1.1 {estado} {ESTADOS_HTTP[estado]}\r\nContent-Type: {tipo}\r\n"
+                  f"Content-Length: {len(cuerpo)}\r\nConnection: {'keep-alive' if mantener else 'close'}\r\n\r\n")
+    return encabezado.encode("latin-1") + cuerpo
+
+
+async def servir(sistema, host="127.0.0.1", puerto=8080, max_lote=1000):
+    """Atiende peticiones hasta que se interrumpa (Ctrl+C)"""
+    servidor = ServidorContable(sistema, max_lote)
+    puerto = await servidor.iniciar(host, puerto)
+    print(f"Escuchando en http://{host}:{puerto}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servidor.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON del sistema contable")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--bitacora", default=RUTA_BITACORA)
+    parser.add_argument("--sqlite", help="Usar una base SQLite como persistencia en lugar de la bitácora")
+    parser.add_argument("--max-lote", type=int, default=1000, help="Máximo de asientos por lote guardado")
+    argumentos = parser.parse_args()
+    
+    if argumentos.sqlite:
+        from persistencia_sqlite import PersistenciaSQLite
+        persistencia = PersistenciaSQLite(argumentos.sqlite)
+    else:
+        # Un fsync por lote: cada respuesta se envía cuando su asiento ya está en disco
+        persistencia = BitacoraJSONL(argumentos.bitacora, fsync_cada=1)
+    sistema = SistemaContable(persistencia)
+    try:
+        asyncio.run(servir(sistema, argumentos.host, argumentos.puerto, argumentos.max_lote))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        persistencia.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,1131 +1,1227 @@
-import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
-from datetime import datetime
-import locale
-
-# Configurar el formato de moneda para mostrar pesos mexicanos
-try:
-    locale.setlocale(locale.LC_ALL, 'es_MX.UTF-8')  # Para sistemas Unix/Linux
-except:
-    try:
-        locale.setlocale(locale.LC_ALL, 'Spanish_Mexico')  # Para Windows
-    except:
-        locale.setlocale(locale.LC_ALL, '')  # Fallback a la configuración por defecto
-
-class SistemaContable:
-    def __init__(self):
-        # Inicializar el diario, mayor, y estados financieros
-        self.diario = []
-        self.mayor = {}
-        self.fecha_actual = datetime.now().strftime("%d/%m/%Y")
-        
-        # Historial de flujos de efectivo
-        self.flujos_efectivo = []
-        
-        # Inicializar cuentas con saldos en cero
-        self.cuentas = {
-            # Activos
-            "Caja": 0,
-            "Bancos": 0,
-            "Mercancía": 0,
-            "IVA acreditable": 0,
-            "IVA por acreditar": 0,
-            "Papelería y útiles": 0,
-            "Rentas pagadas por anticipado": 0,
-            "Edificios": 0,
-            "Terrenos": 0,
-            "Equipo de computo": 0,
-            "Muebles y enseres": 0,
-            "Mobiliaria y equipo": 0,
-            "Equipo de reparto": 0,
-            
-            # Pasivos
-            "Proveedores": 0,
-            "IVA trasladado": 0,
-            "IVA por trasladar": 0,
-            "Anticipo de clientes": 0,
-            
-            # Capital
-            "Capital social": 0,
-            "Utilidad del ejercicio": 0,
-            "Utilidades retenidas": 0,
-            
-            # Ingresos
-            "Ventas": 0,
-            "Productos financieros": 0,
-            "Otros ingresos": 0,
-            
-            # Costos
-            "Costo de ventas": 0,
-            
-            # Gastos
-            "Gastos de venta": 0,
-            "Gastos de administración": 0,
-            "Gastos financieros": 0
-        }
-        
-        # Realizar asiento de apertura
-        self.asiento_apertura()
-    
-    def registrar_asiento(self, descripcion, cargos, abonos):
-        """Registra un asiento en el diario y actualiza el mayor"""
-        asiento = {
-            "fecha": self.fecha_actual,
-            "descripcion": descripcion,
-            "cargos": cargos,
-            "abonos": abonos
-        }
-        self.diario.append(asiento)
-        
-        # Actualizar el mayor
-        for cuenta, monto in cargos.items():
-            if cuenta not in self.mayor:
-                self.mayor[cuenta] = {"cargos": [], "abonos": []}
-            self.mayor[cuenta]["cargos"].append({"fecha": self.fecha_actual, "descripcion": descripcion, "monto": monto})
-            self.cuentas[cuenta] += monto
-            
-        for cuenta, monto in abonos.items():
-            if cuenta not in self.mayor:
-                self.mayor[cuenta] = {"cargos": [], "abonos": []}
-            self.mayor[cuenta]["abonos"].append({"fecha": self.fecha_actual, "descripcion": descripcion, "monto": monto})
-            self.cuentas[cuenta] -= monto
-        
-        # Registrar flujos de efectivo si involucra Caja o Bancos
-        flujo = 0
-        for cuenta, monto in cargos.items():
-            if cuenta in ["Caja", "Bancos"]:
-                flujo += monto
-        
-        for cuenta, monto in abonos.items():
-            if cuenta in ["Caja", "Bancos"]:
-                flujo -= monto
-        
-        if flujo != 0:
-            self.flujos_efectivo.append({
-                "fecha": self.fecha_actual,
-                "descripcion": descripcion,
-                "monto": flujo
-            })
-    
-    def asiento_apertura(self):
-        """Registra el asiento de apertura"""
-        cargos = {
-            "Caja": 30000,
-            "Bancos": 100000,
-            "Mercancía": 10000,
-            "Edificios": 1500000,
-            "Terrenos": 2800000,
-            "Equipo de computo": 20000,
-            "Muebles y enseres": 100000,
-            "Mobiliaria y equipo": 20000,
-            "Equipo de reparto": 400000
-        }
-        
-        abonos = {
-            "Capital social": 4980000
-        }
-        
-        self.registrar_asiento("Asiento de apertura", cargos, abonos)
-        return "1. Asiento de apertura registrado con éxito."
-    
-    def compra_efectivo(self, monto_sin_iva, cuenta_origen="Bancos"):
-        """Registra una compra en efectivo"""
-        iva = monto_sin_iva * 0.16
-        total = monto_sin_iva + iva
-        
-        cargos = {
-            "Mercancía": monto_sin_iva,
-            "IVA acreditable": iva  # Cambiado a IVA acreditable
-        }
-        
-        abonos = {
-            cuenta_origen: total
-        }
-        
-        self.registrar_asiento(f"Compra de mercancía en efectivo (pagado con {cuenta_origen})", cargos, abonos)
-        return f"2. Compra en efectivo por ${monto_sin_iva:.2f} + IVA ${iva:.2f} = ${total:.2f} registrada con éxito.\nPagado desde: {cuenta_origen}"
-    
-    def compra_credito(self, monto_sin_iva):
-        """Registra una compra a crédito"""
-        iva = monto_sin_iva * 0.16
-        total = monto_sin_iva + iva
-        
-        cargos = {
-            "Mercancía": monto_sin_iva,
-            "IVA por acreditar": iva  # Usamos IVA por acreditar para compras a crédito
-        }
-        
-        abonos = {
-            "Proveedores": total
-        }
-        
-        self.registrar_asiento("Compra de mercancía a crédito", cargos, abonos)
-        return f"3. Compra a crédito por ${monto_sin_iva:.2f} + IVA ${iva:.2f} = ${total:.2f} registrada con éxito."
-    
-    def compra_combinada(self, monto_sin_iva, porcentaje_efectivo, cuenta_origen="Bancos"):
-        """Registra una compra combinada (parte en efectivo, parte a crédito)"""
-        iva = monto_sin_iva * 0.16
-        total = monto_sin_iva + iva
-        
-        monto_efectivo = total * (porcentaje_efectivo / 100)
-        monto_credito = total - monto_efectivo
-        
-        # Calculamos la proporción del IVA para cada parte
-        iva_efectivo = iva * (porcentaje_efectivo / 100)
-        iva_credito = iva - iva_efectivo
-        
-        # Calculamos la proporción del monto sin IVA para cada parte
-        monto_sin_iva_efectivo = monto_sin_iva * (porcentaje_efectivo / 100)
-        monto_sin_iva_credito = monto_sin_iva - monto_sin_iva_efectivo
-        
-        cargos = {
-            "Mercancía": monto_sin_iva,
-            "IVA acreditable": iva_efectivo,  # IVA acreditable para la parte en efectivo
-            "IVA por acreditar": iva_credito  # IVA por acreditar para la parte a crédito
-        }
-        
-        abonos = {
-            cuenta_origen: monto_efectivo,
-            "Proveedores": monto_credito
-        }
-        
-        self.registrar_asiento(f"Compra de mercancía combinada (parte pagada con {cuenta_origen})", cargos, abonos)
-        return (f"4. Compra combinada por ${monto_sin_iva:.2f} + IVA ${iva:.2f} = ${total:.2f}\n"
-                f"   Pago en efectivo desde {cuenta_origen}: ${monto_efectivo:.2f} ({porcentaje_efectivo}%)\n"
-                f"   Pago a crédito: ${monto_credito:.2f} ({100-porcentaje_efectivo}%)")
-    
-    def anticipo_cliente(self, monto_sin_iva, cuenta_destino="Bancos"):
-        """Registra un anticipo de cliente con IVA"""
-        iva = monto_sin_iva * 0.16
-        total = monto_sin_iva + iva
-        
-        cargos = {
-            cuenta_destino: total
-        }
-        
-        abonos = {
-            "Anticipo de clientes": monto_sin_iva,
-            "IVA trasladado": iva  # Usamos IVA trasladado para los anticipos
-        }
-        
-        self.registrar_asiento(f"Anticipo recibido de cliente (depositado en {cuenta_destino})", cargos, abonos)
-        return f"5. Anticipo de cliente por ${monto_sin_iva:.2f} + IVA ${iva:.2f} = ${total:.2f} registrado con éxito.\nDepositado en: {cuenta_destino}"
-    
-    def compra_papeleria(self, monto_sin_iva, cuenta_origen="Bancos"):
-        """Registra una compra de papelería"""
-        iva = monto_sin_iva * 0.16
-        total = monto_sin_iva + iva
-        
-        cargos = {
-            "Papelería y útiles": monto_sin_iva,
-            "IVA acreditable": iva  # Cambiado a IVA acreditable
-        }
-        
-        abonos = {
-            cuenta_origen: total
-        }
-        
-        self.registrar_asiento(f"Compra de papelería (pagado con {cuenta_origen})", cargos, abonos)
-        return f"6. Compra de papelería por ${monto_sin_iva:.2f} + IVA ${iva:.2f} = ${total:.2f} registrada con éxito.\nPagado desde: {cuenta_origen}"
-    
-    def pago_rentas_anticipadas(self, monto_sin_iva, meses, cuenta_origen="Bancos"):
-        """Registra el pago de rentas anticipadas"""
-        iva = monto_sin_iva * 0.16
-        total = monto_sin_iva + iva
-        
-        cargos = {
-            "Rentas pagadas por anticipado": monto_sin_iva,
-            "IVA acreditable": iva  # Cambiado a IVA acreditable
-        }
-        
-        abonos = {
-            cuenta_origen: total
-        }
-        
-        self.registrar_asiento(f"Pago de rentas anticipadas por {meses} meses (pagado con {cuenta_origen})", cargos, abonos)
-        return f"7. Pago de rentas anticipadas por {meses} meses: ${monto_sin_iva:.2f} + IVA ${iva:.2f} = ${total:.2f} registrado con éxito.\nPagado desde: {cuenta_origen}"
-    
-    def venta_efectivo(self, monto_sin_iva, costo_venta, cuenta_destino="Bancos"):
-        """Registra una venta en efectivo"""
-        iva = monto_sin_iva * 0.16
-        total = monto_sin_iva + iva
-        
-        cargos = {
-            cuenta_destino: total,
-            "Costo de ventas": costo_venta
-        }
-        
-        abonos = {
-            "Ventas": monto_sin_iva,
-            "IVA trasladado": iva,
-            "Mercancía": costo_venta
-        }
-        
-        self.registrar_asiento(f"Venta de mercancía en efectivo (depositado en {cuenta_destino})", cargos, abonos)
-        return f"Venta en efectivo por ${monto_sin_iva:.2f} + IVA ${iva:.2f} = ${total:.2f} registrada con éxito.\nDepositado en: {cuenta_destino}"
-    
-    def venta_credito(self, monto_sin_iva, costo_venta):
-        """Registra una venta a crédito"""
-        iva = monto_sin_iva * 0.16
-        total = monto_sin_iva + iva
-        
-        cargos = {
-            "Clientes": total,
-            "Costo de ventas": costo_venta
-        }
-        
-        abonos = {
-            "Ventas": monto_sin_iva,
-            "IVA trasladado": iva,
-            "Mercancía": costo_venta
-        }
-        
-        self.registrar_asiento("Venta de mercancía a crédito", cargos, abonos)
-        return f"Venta a crédito por ${monto_sin_iva:.2f} + IVA ${iva:.2f} = ${total:.2f} registrada con éxito."
-    
-    def gasto_administracion(self, monto_sin_iva, cuenta_origen="Bancos"):
-        """Registra un gasto de administración"""
-        iva = monto_sin_iva * 0.16
-        total = monto_sin_iva + iva
-        
-        cargos = {
-            "Gastos de administración": monto_sin_iva,
-            "IVA acreditable": iva
-        }
-        
-        abonos = {
-            cuenta_origen: total
-        }
-        
-        self.registrar_asiento(f"Gasto de administración (pagado con {cuenta_origen})", cargos, abonos)
-        return f"Gasto de administración por ${monto_sin_iva:.2f} + IVA ${iva:.2f} = ${total:.2f} registrado con éxito.\nPagado desde: {cuenta_origen}"
-    
-    def gasto_venta(self, monto_sin_iva, cuenta_origen="Bancos"):
-        """Registra un gasto de venta"""
-        iva = monto_sin_iva * 0.16
-        total = monto_sin_iva + iva
-        
-        cargos = {
-            "Gastos de venta": monto_sin_iva,
-            "IVA acreditable": iva
-        }
-        
-        abonos = {
-            cuenta_origen: total
-        }
-        
-        self.registrar_asiento(f"Gasto de venta (pagado con {cuenta_origen})", cargos, abonos)
-        return f"Gasto de venta por ${monto_sin_iva:.2f} + IVA ${iva:.2f} = ${total:.2f} registrado con éxito.\nPagado desde: {cuenta_origen}"
-    
-    def gasto_financiero(self, monto, cuenta_origen="Bancos"):
-        """Registra un gasto financiero (sin IVA)"""
-        cargos = {
-            "Gastos financieros": monto
-        }
-        
-        abonos = {
-            cuenta_origen: monto
-        }
-        
-        self.registrar_asiento(f"Gasto financiero (pagado con {cuenta_origen})", cargos, abonos)
-        return f"Gasto financiero por ${monto:.2f} registrado con éxito.\nPagado desde: {cuenta_origen}"
-    
-    def generar_diario(self):
-        """Genera el texto del libro diario"""
-        resultado = "=== LIBRO DIARIO ===\n"
-        for i, asiento in enumerate(self.diario, 1):
-            resultado += f"\nAsiento {i} - {asiento['fecha']} - {asiento['descripcion']}\n"
-            resultado += "CARGOS:\n"
-            for cuenta, monto in asiento['cargos'].items():
-                resultado += f"  {cuenta}: ${monto:,.2f}\n"
-            resultado += "ABONOS:\n"
-            for cuenta, monto in asiento['abonos'].items():
-                resultado += f"  {cuenta}: ${monto:,.2f}\n"
-        return resultado
-    
-    def generar_mayor(self):
-        """Genera el texto de los esquemas de mayor"""
-        resultado = "=== ESQUEMAS DE MAYOR ===\n"
-        for cuenta, movimientos in self.mayor.items():
-            resultado += f"\nCuenta: {cuenta}\n"
-            resultado += "CARGOS:\n"
-            total_cargos = 0
-            for cargo in movimientos["cargos"]:
-                resultado += f"  {cargo['fecha']} - {cargo['descripcion']}: ${cargo['monto']:,.2f}\n"
-                total_cargos += cargo['monto']
-            
-            resultado += "ABONOS:\n"
-            total_abonos = 0
-            for abono in movimientos["abonos"]:
-                resultado += f"  {abono['fecha']} - {abono['descripcion']}: ${abono['monto']:,.2f}\n"
-                total_abonos += abono['monto']
-            
-            saldo = total_cargos - total_abonos
-            resultado += f"Saldo: ${saldo:,.2f}\n"
-        return resultado
-    
-    def generar_balanza_comprobacion(self):
-        """Genera el texto de la balanza de comprobación"""
-        resultado = "=== BALANZA DE COMPROBACIÓN ===\n"
-        resultado += f"Fecha: {self.fecha_actual}\n\n"
-        
-        # Mostrar la balanza completa
-        resultado += f"{'Cuenta':<30} {'Debe':>15} {'Haber':>15}\n"
-        resultado += "-" * 60 + "\n"
-        
-        total_debe = 0
-        total_haber = 0
-        
-        # Ordenamos las cuentas para una mejor presentación
-        cuentas_ordenadas = sorted(self.cuentas.keys())
-        
-        for cuenta in cuentas_ordenadas:
-            saldo = self.cuentas[cuenta]
-            
-            # Las cuentas de activo y gasto normalmente tienen saldo deudor (positivo)
-            # Las cuentas de pasivo, capital e ingreso normalmente tienen saldo acreedor (negativo)
-            if cuenta in ["Proveedores", "IVA trasladado", "IVA por trasladar", "Anticipo de clientes", 
-                          "Capital social", "Utilidad del ejercicio", "Utilidades retenidas", 
-                          "Ventas", "Productos financieros", "Otros ingresos"]:
-                # Para estas cuentas, el saldo normal es acreedor (negativo)
-                if saldo < 0:
-                    debe = 0
-                    haber = abs(saldo)
-                else:
-                    debe = saldo
-                    haber = 0
-            else:
-                # Para el resto de cuentas, el saldo normal es deudor (positivo)
-                if saldo > 0:
-                    debe = saldo
-                    haber = 0
-                else:
-                    debe = 0
-                    haber = abs(saldo)
-            
-            # Mostrar la cuenta solo si tiene un saldo diferente de cero
-            if debe > 0 or haber > 0:
-                resultado += f"{cuenta:<30} {debe:>15,.2f} {haber:>15,.2f}\n"
-                total_debe += debe
-                total_haber += haber
-        
-        resultado += "-" * 60 + "\n"
-        resultado += f"{'TOTAL':<30} {total_debe:>15,.2f} {total_haber:>15,.2f}\n"
-        
-        # Verificar si la balanza está cuadrada
-        if total_debe == total_haber:
-            resultado += "\nLa balanza de comprobación está cuadrada."
-        else:
-            resultado += f"\nLa balanza de comprobación NO está cuadrada. Diferencia: ${abs(total_debe - total_haber):,.2f}"
-        
-        return resultado
-    
-    def generar_balance_general(self):
-        """Genera el texto del balance general"""
-        resultado = "=== BALANCE GENERAL ===\n"
-        resultado += f"Fecha: {self.fecha_actual}\n\n"
-        
-        # Activos
-        resultado += "ACTIVO\n"
-        resultado += "\nCIRCULANTE\n"
-        activo_circulante = 0
-        for cuenta in ["Caja", "Bancos", "Mercancía", "IVA acreditable", "IVA por acreditar", "Papelería y útiles", "Rentas pagadas por anticipado"]:
-            if self.cuentas[cuenta] > 0:
-                resultado += f"{cuenta:<30} ${self.cuentas[cuenta]:>15,.2f}\n"
-                activo_circulante += self.cuentas[cuenta]
-        resultado += f"{'Total Activo Circulante':<30} ${activo_circulante:>15,.2f}\n"
-        
-        resultado += "\nNO CIRCULANTE\n"
-        activo_no_circulante = 0
-        for cuenta in ["Edificios", "Terrenos", "Equipo de computo", "Muebles y enseres", "Mobiliaria y equipo", "Equipo de reparto"]:
-            if self.cuentas[cuenta] > 0:
-                resultado += f"{cuenta:<30} ${self.cuentas[cuenta]:>15,.2f}\n"
-                activo_no_circulante += self.cuentas[cuenta]
-        resultado += f"{'Total Activo No Circulante':<30} ${activo_no_circulante:>15,.2f}\n"
-        
-        total_activo = activo_circulante + activo_no_circulante
-        resultado += f"\n{'TOTAL ACTIVO':<30} ${total_activo:>15,.2f}\n"
-        
-        # Pasivos
-        resultado += "\nPASIVO\n"
-        resultado += "\nCORTO PLAZO\n"
-        pasivo_corto_plazo = 0
-        for cuenta in ["Proveedores", "IVA trasladado", "IVA por trasladar", "Anticipo de clientes"]:
-            if self.cuentas[cuenta] < 0:  # Los pasivos tienen saldo acreedor (negativo)
-                valor_absoluto = abs(self.cuentas[cuenta])
-                resultado += f"{cuenta:<30} ${valor_absoluto:>15,.2f}\n"
-                pasivo_corto_plazo += valor_absoluto
-        resultado += f"{'Total Pasivo Corto Plazo':<30} ${pasivo_corto_plazo:>15,.2f}\n"
-        
-        total_pasivo = pasivo_corto_plazo
-        resultado += f"\n{'TOTAL PASIVO':<30} ${total_pasivo:>15,.2f}\n"
-        
-        # Capital
-        resultado += "\nCAPITAL CONTABLE\n"
-        # El Capital Social debe tener saldo acreedor (negativo)
-        capital_social = abs(self.cuentas["Capital social"]) if self.cuentas["Capital social"] < 0 else self.cuentas["Capital social"]
-        utilidad_ejercicio = abs(self.cuentas["Utilidad del ejercicio"]) if self.cuentas["Utilidad del ejercicio"] < 0 else 0
-        utilidades_retenidas = abs(self.cuentas["Utilidades retenidas"]) if self.cuentas["Utilidades retenidas"] < 0 else 0
-        
-        resultado += f"{'Capital social':<30} ${capital_social:>15,.2f}\n"
-        if utilidad_ejercicio > 0:
-            resultado += f"{'Utilidad del ejercicio':<30} ${utilidad_ejercicio:>15,.2f}\n"
-        if utilidades_retenidas > 0:
-            resultado += f"{'Utilidades retenidas':<30} ${utilidades_retenidas:>15,.2f}\n"
-        
-        total_capital = capital_social + utilidad_ejercicio + utilidades_retenidas
-        resultado += f"{'Total Capital Contable':<30} ${total_capital:>15,.2f}\n"
-        
-        resultado += f"\n{'TOTAL PASIVO + CAPITAL':<30} ${(total_pasivo + total_capital):>15,.2f}\n"
-        
-        # Verificar si el balance está cuadrado
-        if total_activo == (total_pasivo + total_capital):
-            resultado += "\nEl balance general está cuadrado."
-        else:
-            resultado += f"\nEl balance general NO está cuadrado. Diferencia: ${abs(total_activo - (total_pasivo + total_capital)):,.2f}"
-        
-        return resultado
-    
-    def generar_estado_resultados(self):
-        """Genera el texto del estado de resultados"""
-        resultado = "=== ESTADO DE RESULTADOS ===\n"
-        resultado += f"Fecha: {self.fecha_actual}\n\n"
-        
-        # Ingresos
-        ventas = abs(self.cuentas["Ventas"]) if self.cuentas["Ventas"] < 0 else 0
-        productos_financieros = abs(self.cuentas["Productos financieros"]) if self.cuentas["Productos financieros"] < 0 else 0
-        otros_ingresos = abs(self.cuentas["Otros ingresos"]) if self.cuentas["Otros ingresos"] < 0 else 0
-        
-        total_ingresos = ventas + productos_financieros + otros_ingresos
-        
-        resultado += "INGRESOS\n"
-        resultado += f"{'Ventas':<30} ${ventas:>15,.2f}\n"
-        if productos_financieros > 0:
-            resultado += f"{'Productos financieros':<30} ${productos_financieros:>15,.2f}\n"
-        if otros_ingresos > 0:
-            resultado += f"{'Otros ingresos':<30} ${otros_ingresos:>15,.2f}\n"
-        resultado += f"{'Total Ingresos':<30} ${total_ingresos:>15,.2f}\n\n"
-        
-        # Costo de ventas
-        costo_ventas = self.cuentas["Costo de ventas"] if self.cuentas["Costo de ventas"] > 0 else 0
-        resultado += f"{'Costo de ventas':<30} ${costo_ventas:>15,.2f}\n\n"
-        
-        # Utilidad bruta
-        utilidad_bruta = total_ingresos - costo_ventas
-        resultado += f"{'UTILIDAD BRUTA':<30} ${utilidad_bruta:>15,.2f}\n\n"
-        
-        # Gastos
-        gastos_venta = self.cuentas["Gastos de venta"] if self.cuentas["Gastos de venta"] > 0 else 0
-        gastos_admin = self.cuentas["Gastos de administración"] if self.cuentas["Gastos de administración"] > 0 else 0
-        gastos_financieros = self.cuentas["Gastos financieros"] if self.cuentas["Gastos financieros"] > 0 else 0
-        
-        total_gastos = gastos_venta + gastos_admin + gastos_financieros
-        
-        resultado += "GASTOS\n"
-        if gastos_venta > 0:
-            resultado += f"{'Gastos de venta':<30} ${gastos_venta:>15,.2f}\n"
-        if gastos_admin > 0:
-            resultado += f"{'Gastos de administración':<30} ${gastos_admin:>15,.2f}\n"
-        if gastos_financieros > 0:
-            resultado += f"{'Gastos financieros':<30} ${gastos_financieros:>15,.2f}\n"
-        resultado += f"{'Total Gastos':<30} ${total_gastos:>15,.2f}\n\n"
-        
-        # Utilidad neta
-        utilidad_neta = utilidad_bruta - total_gastos
-        resultado += f"{'UTILIDAD NETA':<30} ${utilidad_neta:>15,.2f}\n"
-        
-        # Actualizar la cuenta de utilidad del ejercicio
-        self.cuentas["Utilidad del ejercicio"] = -utilidad_neta  # Negativo porque es acreedor
-        
-        return resultado
-    
-    def generar_estado_cambios_capital(self):
-        """Genera el texto del estado de cambios en el capital contable"""
-        resultado = "=== ESTADO DE CAMBIOS EN EL CAPITAL CONTABLE ===\n"
-        resultado += f"Fecha: {self.fecha_actual}\n\n"
-        
-        # Capital inicial
-        capital_inicial = abs(self.cuentas["Capital social"])
-        utilidades_retenidas = abs(self.cuentas["Utilidades retenidas"]) if self.cuentas["Utilidades retenidas"] < 0 else 0
-        
-        resultado += f"{'Capital social inicial':<30} ${capital_inicial:>15,.2f}\n"
-        if utilidades_retenidas > 0:
-            resultado += f"{'Utilidades retenidas':<30} ${utilidades_retenidas:>15,.2f}\n"
-        
-        capital_contable_inicial = capital_inicial + utilidades_retenidas
-        resultado += f"{'Capital contable inicial':<30} ${capital_contable_inicial:>15,.2f}\n\n"
-        
-        # Movimientos del capital
-        # Aquí se podrían agregar otros movimientos como aumentos o disminuciones de capital
-        
-        # Utilidad del ejercicio
-        utilidad_ejercicio = abs(self.cuentas["Utilidad del ejercicio"]) if self.cuentas["Utilidad del ejercicio"] < 0 else 0
-        resultado += f"{'Utilidad del ejercicio':<30} ${utilidad_ejercicio:>15,.2f}\n\n"
-        
-        # Capital final
-        capital_contable_final = capital_contable_inicial + utilidad_ejercicio
-        resultado += f"{'Capital contable final':<30} ${capital_contable_final:>15,.2f}\n"
-        
-        return resultado
-    
-    def generar_estado_flujos_efectivo(self):
-        """Genera el texto del estado de flujos de efectivo"""
-        resultado = "=== ESTADO DE FLUJOS DE EFECTIVO ===\n"
-        resultado += f"Fecha: {self.fecha_actual}\n\n"
-        
-        # Saldo inicial de efectivo
-        saldo_inicial_caja = 30000  # Del asiento de apertura
-        saldo_inicial_bancos = 100000  # Del asiento de apertura
-        saldo_inicial_efectivo = saldo_inicial_caja + saldo_inicial_bancos
-        
-        resultado += f"{'Saldo inicial de efectivo':<30} ${saldo_inicial_efectivo:>15,.2f}\n\n"
-        
-        # Flujos de efectivo de actividades de operación
-        resultado += "FLUJOS DE EFECTIVO DE ACTIVIDADES DE OPERACIÓN\n"
-        
-        # Clasificar los flujos por tipo de actividad
-        flujos_operacion = []
-        flujos_inversion = []
-        flujos_financiamiento = []
-        
-        for flujo in self.flujos_efectivo:
-            # Excluir el asiento de apertura
-            if "asiento de apertura" in flujo["descripcion"].lower():
-                continue
-                
-            # Simplificación: clasificamos según la descripción
-            desc = flujo["descripcion"].lower()
-            if "venta" in desc or "compra" in desc or "gasto" in desc or "anticipo" in desc:
-                flujos_operacion.append(flujo)
-            elif "equipo" in desc or "edificio" in desc or "terreno" in desc:
-                flujos_inversion.append(flujo)
-            elif "capital" in desc or "préstamo" in desc or "dividendo" in desc:
-                flujos_financiamiento.append(flujo)
-            else:
-                # Por defecto, lo consideramos operación
-                flujos_operacion.append(flujo)
-        
-        # Mostrar flujos de operación
-        total_operacion = 0
-        for flujo in flujos_operacion:
-            resultado += f"{flujo['descripcion']:<30} ${flujo['monto']:>15,.2f}\n"
-            total_operacion += flujo['monto']
-        
-        resultado += f"{'Total flujos de operación':<30} ${total_operacion:>15,.2f}\n\n"
-        
-        # Flujos de efectivo de actividades de inversión
-        if flujos_inversion:
-            resultado += "FLUJOS DE EFECTIVO DE ACTIVIDADES DE INVERSIÓN\n"
-            total_inversion = 0
-            for flujo in flujos_inversion:
-                resultado += f"{flujo['descripcion']:<30} ${flujo['monto']:>15,.2f}\n"
-                total_inversion += flujo['monto']
-            
-            resultado += f"{'Total flujos de inversión':<30} ${total_inversion:>15,.2f}\n\n"
-        else:
-            total_inversion = 0
-        
-        # Flujos de efectivo de actividades de financiamiento
-        if flujos_financiamiento:
-            resultado += "FLUJOS DE EFECTIVO DE ACTIVIDADES DE FINANCIAMIENTO\n"
-            total_financiamiento = 0
-            for flujo in flujos_financiamiento:
-                resultado += f"{flujo['descripcion']:<30} ${flujo['monto']:>15,.2f}\n"
-                total_financiamiento += flujo['monto']
-            
-            resultado += f"{'Total flujos de financiamiento':<30} ${total_financiamiento:>15,.2f}\n\n"
-        else:
-            total_financiamiento = 0
-        
-        # Incremento neto de efectivo
-        incremento_neto = total_operacion + total_inversion + total_financiamiento
-        resultado += f"{'Incremento neto de efectivo':<30} ${incremento_neto:>15,.2f}\n\n"
-        
-        # Saldo final de efectivo
-        saldo_final_efectivo = saldo_inicial_efectivo + incremento_neto
-        resultado += f"{'Saldo final de efectivo':<30} ${saldo_final_efectivo:>15,.2f}\n"
-        
-        # Verificar si coincide con el saldo actual
-        saldo_actual_caja = self.cuentas["Caja"] if self.cuentas["Caja"] > 0 else 0
-        saldo_actual_bancos = self.cuentas["Bancos"] if self.cuentas["Bancos"] > 0 else 0
-        saldo_actual_efectivo = saldo_actual_caja + saldo_actual_bancos
-        
-        if saldo_final_efectivo == saldo_actual_efectivo:
-            resultado += "\nEl saldo final de efectivo coincide con el saldo actual en Caja y Bancos."
-        else:
-            resultado += f"\nEl saldo final de efectivo NO coincide con el saldo actual en Caja y Bancos (${saldo_actual_efectivo:,.2f})."
-            resultado += f"\nDiferencia: ${abs(saldo_final_efectivo - saldo_actual_efectivo):,.2f}"
-        
-        return resultado
-
-
-class AplicacionContable:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Sistema Contable Completo")
-        self.root.geometry("1000x700")
-        self.root.resizable(True, True)
-        
-        # Crear el sistema contable
-        self.sistema = SistemaContable()
-        
-        # Crear el cuaderno de pestañas
-        self.notebook = ttk.Notebook(root)
-        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Crear las pestañas
-        self.tab_transacciones = ttk.Frame(self.notebook)
-        self.tab_diario = ttk.Frame(self.notebook)
-        self.tab_mayor = ttk.Frame(self.notebook)
-        self.tab_balanza = ttk.Frame(self.notebook)
-        self.tab_balance = ttk.Frame(self.notebook)
-        self.tab_resultados = ttk.Frame(self.notebook)
-        self.tab_cambios_capital = ttk.Frame(self.notebook)
-        self.tab_flujos_efectivo = ttk.Frame(self.notebook)
-        
-        self.notebook.add(self.tab_transacciones, text="Transacciones")
-        self.notebook.add(self.tab_diario, text="Libro Diario")
-        self.notebook.add(self.tab_mayor, text="Esquemas de Mayor")
-        self.notebook.add(self.tab_balanza, text="Balanza de Comprobación")
-        self.notebook.add(self.tab_balance, text="Balance General")
-        self.notebook.add(self.tab_resultados, text="Estado de Resultados")
-        self.notebook.add(self.tab_cambios_capital, text="Cambios en Capital")
-        self.notebook.add(self.tab_flujos_efectivo, text="Flujos de Efectivo")
-        
-        # Configurar la pestaña de transacciones
-        self.configurar_tab_transacciones()
-        
-        # Configurar las pestañas de reportes
-        self.configurar_tab_reportes(self.tab_diario, self.actualizar_diario)
-        self.configurar_tab_reportes(self.tab_mayor, self.actualizar_mayor)
-        self.configurar_tab_reportes(self.tab_balanza, self.actualizar_balanza)
-        self.configurar_tab_reportes(self.tab_balance, self.actualizar_balance)
-        self.configurar_tab_reportes(self.tab_resultados, self.actualizar_resultados)
-        self.configurar_tab_reportes(self.tab_cambios_capital, self.actualizar_cambios_capital)
-        self.configurar_tab_reportes(self.tab_flujos_efectivo, self.actualizar_flujos_efectivo)
-        
-        # Actualizar todos los reportes
-        self.actualizar_todos_reportes()
-        
-        # Mostrar mensaje de bienvenida
-        messagebox.showinfo("Sistema Contable", "Sistema inicializado con saldos iniciales.\nSe ha registrado el asiento de apertura.")
-    
-    def configurar_tab_transacciones(self):
-        """Configura la pestaña de transacciones"""
-        # Frame principal
-        main_frame = ttk.Frame(self.tab_transacciones)
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Frame para seleccionar tipo de transacción
-        tipo_frame = ttk.LabelFrame(main_frame, text="Tipo de Transacción")
-        tipo_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        self.tipo_transaccion = tk.StringVar(value="compra_efectivo")
-        
-        # Opciones de transacciones
-        opciones = [
-            ("Compra en Efectivo", "compra_efectivo"),
-            ("Compra a Crédito", "compra_credito"),
-            ("Compra Combinada", "compra_combinada"),
-            ("Anticipo de Cliente", "anticipo_cliente"),
-            ("Compra de Papelería", "compra_papeleria"),
-            ("Rentas Pagadas por Anticipado", "rentas_anticipadas"),
-            ("Venta en Efectivo", "venta_efectivo"),
-            ("Venta a Crédito", "venta_credito"),
-            ("Gasto de Administración", "gasto_administracion"),
-            ("Gasto de Venta", "gasto_venta"),
-            ("Gasto Financiero", "gasto_financiero")
-        ]
-        
-        # Crear los radio buttons en una cuadrícula
-        for i, (texto, valor) in enumerate(opciones):
-            rb = ttk.Radiobutton(tipo_frame, text=texto, value=valor, variable=self.tipo_transaccion)
-            rb.grid(row=i//4, column=i%4, sticky=tk.W, padx=10, pady=5)
-            rb.bind("<ButtonRelease-1>", lambda event: self.root.after(100, self.cambiar_formulario))
-        
-        # Frame para los formularios
-        self.form_frame = ttk.LabelFrame(main_frame, text="Datos de la Transacción")
-        self.form_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Frame para los resultados
-        self.resultado_frame = ttk.LabelFrame(main_frame, text="Resultado")
-        self.resultado_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        self.resultado_text = scrolledtext.ScrolledText(self.resultado_frame, wrap=tk.WORD, height=5)
-        self.resultado_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Inicializar el formulario
-        self.formulario_actual = None
-        self.cambiar_formulario()
-    
-    def configurar_tab_reportes(self, tab, actualizar_func):
-        """Configura una pestaña de reportes"""
-        # Frame principal
-        main_frame = ttk.Frame(tab)
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Botón de actualizar
-        btn_actualizar = ttk.Button(main_frame, text="Actualizar", command=actualizar_func)
-        btn_actualizar.pack(anchor=tk.NE, padx=5, pady=5)
-        
-        # Área de texto
-        text_area = scrolledtext.ScrolledText(main_frame, wrap=tk.WORD)
-        text_area.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Guardar referencia al área de texto
-        tab.text_area = text_area
-    
-    def cambiar_formulario(self):
-        """Cambia el formulario según el tipo de transacción seleccionado"""
-        # Limpiar el formulario actual
-        if self.formulario_actual:
-            self.formulario_actual.destroy()
-        
-        # Crear un nuevo frame para el formulario
-        self.formulario_actual = ttk.Frame(self.form_frame)
-        self.formulario_actual.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        tipo = self.tipo_transaccion.get()
-        
-        # Función para crear el selector de cuenta de origen
-        def crear_selector_cuenta(row, default="Bancos", label="Cuenta de Origen:"):
-            ttk.Label(self.formulario_actual, text=label).grid(row=row, column=0, padx=5, pady=5, sticky=tk.W)
-            cuenta_var = tk.StringVar(value=default)
-            cuenta_combo = ttk.Combobox(self.formulario_actual, textvariable=cuenta_var, state="readonly")
-            cuenta_combo['values'] = ("Caja", "Bancos")
-            cuenta_combo.grid(row=row, column=1, padx=5, pady=5, sticky=tk.W)
-            return cuenta_var
-        
-        if tipo == "compra_efectivo":
-            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-            self.monto_entry = ttk.Entry(self.formulario_actual)
-            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
-            
-            self.cuenta_origen_var = crear_selector_cuenta(1)
-            
-            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Compra", 
-                                      command=self.registrar_compra_efectivo)
-            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
-            
-        elif tipo == "compra_credito":
-            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-            self.monto_entry = ttk.Entry(self.formulario_actual)
-            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
-            
-            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Compra", 
-                                      command=self.registrar_compra_credito)
-            btn_registrar.grid(row=1, column=0, columnspan=2, padx=5, pady=10)
-            
-        elif tipo == "compra_combinada":
-            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-            self.monto_entry = ttk.Entry(self.formulario_actual)
-            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
-            
-            ttk.Label(self.formulario_actual, text="% en Efectivo:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
-            self.porcentaje_entry = ttk.Entry(self.formulario_actual)
-            self.porcentaje_entry.grid(row=1, column=1, padx=5, pady=5)
-            self.porcentaje_entry.insert(0, "50")
-            
-            self.cuenta_origen_var = crear_selector_cuenta(2)
-            
-            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Compra", 
-                                      command=self.registrar_compra_combinada)
-            btn_registrar.grid(row=3, column=0, columnspan=2, padx=5, pady=10)
-            
-        elif tipo == "anticipo_cliente":
-            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-            self.monto_entry = ttk.Entry(self.formulario_actual)
-            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
-            
-            self.cuenta_destino_var = crear_selector_cuenta(1, label="Cuenta de Destino:")
-            
-            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Anticipo", 
-                                      command=self.registrar_anticipo_cliente)
-            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
-            
-        elif tipo == "compra_papeleria":
-            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-            self.monto_entry = ttk.Entry(self.formulario_actual)
-            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
-            
-            self.cuenta_origen_var = crear_selector_cuenta(1)
-            
-            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Compra", 
-                                      command=self.registrar_compra_papeleria)
-            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
-            
-        elif tipo == "rentas_anticipadas":
-            ttk.Label(self.formulario_actual, text="Monto Mensual (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-            self.monto_entry = ttk.Entry(self.formulario_actual)
-            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
-            
-            ttk.Label(self.formulario_actual, text="Número de Meses:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
-            self.meses_entry = ttk.Entry(self.formulario_actual)
-            self.meses_entry.grid(row=1, column=1, padx=5, pady=5)
-            self.meses_entry.insert(0, "3")
-            
-            self.cuenta_origen_var = crear_selector_cuenta(2)
-            
-            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Pago", 
-                                      command=self.registrar_rentas_anticipadas)
-            btn_registrar.grid(row=3, column=0, columnspan=2, padx=5, pady=10)
-            
-        elif tipo == "venta_efectivo":
-            ttk.Label(self.formulario_actual, text="Monto de Venta (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-            self.monto_entry = ttk.Entry(self.formulario_actual)
-            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
-            
-            ttk.Label(self.formulario_actual, text="Costo de la Mercancía:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
-            self.costo_entry = ttk.Entry(self.formulario_actual)
-            self.costo_entry.grid(row=1, column=1, padx=5, pady=5)
-            
-            self.cuenta_destino_var = crear_selector_cuenta(2, label="Cuenta de Destino:")
-            
-            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Venta", 
-                                      command=self.registrar_venta_efectivo)
-            btn_registrar.grid(row=3, column=0, columnspan=2, padx=5, pady=10)
-            
-        elif tipo == "venta_credito":
-            ttk.Label(self.formulario_actual, text="Monto de Venta (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-            self.monto_entry = ttk.Entry(self.formulario_actual)
-            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
-            
-            ttk.Label(self.formulario_actual, text="Costo de la Mercancía:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
-            self.costo_entry = ttk.Entry(self.formulario_actual)
-            self.costo_entry.grid(row=1, column=1, padx=5, pady=5)
-            
-            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Venta", 
-                                      command=self.registrar_venta_credito)
-            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
-            
-        elif tipo == "gasto_administracion":
-            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-            self.monto_entry = ttk.Entry(self.formulario_actual)
-            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
-            
-            self.cuenta_origen_var = crear_selector_cuenta(1)
-            
-            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Gasto", 
-                                      command=self.registrar_gasto_administracion)
-            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
-            
-        elif tipo == "gasto_venta":
-            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-            self.monto_entry = ttk.Entry(self.formulario_actual)
-            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
-            
-            self.cuenta_origen_var = crear_selector_cuenta(1)
-            
-            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Gasto", 
-                                      command=self.registrar_gasto_venta)
-            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
-            
-        elif tipo == "gasto_financiero":
-            ttk.Label(self.formulario_actual, text="Monto (sin IVA):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-            self.monto_entry = ttk.Entry(self.formulario_actual)
-            self.monto_entry.grid(row=0, column=1, padx=5, pady=5)
-            
-            self.cuenta_origen_var = crear_selector_cuenta(1)
-            
-            btn_registrar = ttk.Button(self.formulario_actual, text="Registrar Gasto", 
-                                      command=self.registrar_gasto_financiero)
-            btn_registrar.grid(row=2, column=0, columnspan=2, padx=5, pady=10)
-    
-    def registrar_compra_efectivo(self):
-        """Registra una compra en efectivo"""
-        try:
-            monto = float(self.monto_entry.get())
-            cuenta_origen = self.cuenta_origen_var.get()
-            resultado = self.sistema.compra_efectivo(monto, cuenta_origen)
-            self.mostrar_resultado(resultado)
-            self.actualizar_todos_reportes()
-        except ValueError:
-            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
-    
-    def registrar_compra_credito(self):
-        """Registra una compra a crédito"""
-        try:
-            monto = float(self.monto_entry.get())
-            resultado = self.sistema.compra_credito(monto)
-            self.mostrar_resultado(resultado)
-            self.actualizar_todos_reportes()
-        except ValueError:
-            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
-    
-    def registrar_compra_combinada(self):
-        """Registra una compra combinada"""
-        try:
-            monto = float(self.monto_entry.get())
-            porcentaje = float(self.porcentaje_entry.get())
-            cuenta_origen = self.cuenta_origen_var.get()
-            
-            if porcentaje < 0 or porcentaje > 100:
-                messagebox.showerror("Error", "El porcentaje debe estar entre 0 y 100.")
-                return
-                
-            resultado = self.sistema.compra_combinada(monto, porcentaje, cuenta_origen)
-            self.mostrar_resultado(resultado)
-            self.actualizar_todos_reportes()
-        except ValueError:
-            messagebox.showerror("Error", "Por favor ingrese valores válidos.")
-    
-    def registrar_anticipo_cliente(self):
-        """Registra un anticipo de cliente"""
-        try:
-            monto = float(self.monto_entry.get())
-            cuenta_destino = self.cuenta_destino_var.get()
-            resultado = self.sistema.anticipo_cliente(monto, cuenta_destino)
-            self.mostrar_resultado(resultado)
-            self.actualizar_todos_reportes()
-        except ValueError:
-            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
-    
-    def registrar_compra_papeleria(self):
-        """Registra una compra de papelería"""
-        try:
-            monto = float(self.monto_entry.get())
-            cuenta_origen = self.cuenta_origen_var.get()
-            resultado = self.sistema.compra_papeleria(monto, cuenta_origen)
-            self.mostrar_resultado(resultado)
-            self.actualizar_todos_reportes()
-        except ValueError:
-            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
-    
-    def registrar_rentas_anticipadas(self):
-        """Registra el pago de rentas anticipadas"""
-        try:
-            monto = float(self.monto_entry.get())
-            meses = int(self.meses_entry.get())
-            cuenta_origen = self.cuenta_origen_var.get()
-            
-            if meses <= 0:
-                messagebox.showerror("Error", "El número de meses debe ser mayor a 0.")
-                return
-                
-            resultado = self.sistema.pago_rentas_anticipadas(monto, meses, cuenta_origen)
-            self.mostrar_resultado(resultado)
-            self.actualizar_todos_reportes()
-        except ValueError:
-            messagebox.showerror("Error", "Por favor ingrese valores válidos.")
-    
-    def registrar_venta_efectivo(self):
-        """Registra una venta en efectivo"""
-        try:
-            monto = float(self.monto_entry.get())
-            costo = float(self.costo_entry.get())
-            cuenta_destino = self.cuenta_destino_var.get()
-            
-            resultado = self.sistema.venta_efectivo(monto, costo, cuenta_destino)
-            self.mostrar_resultado(resultado)
-            self.actualizar_todos_reportes()
-        except ValueError:
-            messagebox.showerror("Error", "Por favor ingrese valores válidos.")
-    
-    def registrar_venta_credito(self):
-        """Registra una venta a crédito"""
-        try:
-            monto = float(self.monto_entry.get())
-            costo = float(self.costo_entry.get())
-            
-            resultado = self.sistema.venta_credito(monto, costo)
-            self.mostrar_resultado(resultado)
-            self.actualizar_todos_reportes()
-        except ValueError:
-            messagebox.showerror("Error", "Por favor ingrese valores válidos.")
-    
-    def registrar_gasto_administracion(self):
-        """Registra un gasto de administración"""
-        try:
-            monto = float(self.monto_entry.get())
-            cuenta_origen = self.cuenta_origen_var.get()
-        
-            resultado = self.sistema.gasto_administracion(monto, cuenta_origen)
-            self.mostrar_resultado(resultado)
-            self.actualizar_todos_reportes()
-        except ValueError:
-            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
-    
-    def registrar_gasto_venta(self):
-        """Registra un gasto de venta"""
-        try:
-            monto = float(self.monto_entry.get())
-            cuenta_origen = self.cuenta_origen_var.get()
-            
-            resultado = self.sistema.gasto_venta(monto, cuenta_origen)
-            self.mostrar_resultado(resultado)
-            self.actualizar_todos_reportes()
-        except ValueError:
-            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
-    
-    def registrar_gasto_financiero(self):
-        """Registra un gasto financiero"""
-        try:
-            monto = float(self.monto_entry.get())
-            cuenta_origen = self.cuenta_origen_var.get()
-            
-            resultado = self.sistema.gasto_financiero(monto, cuenta_origen)
-            self.mostrar_resultado(resultado)
-            self.actualizar_todos_reportes()
-        except ValueError:
-            messagebox.showerror("Error", "Por favor ingrese un monto válido.")
-    
-    def mostrar_resultado(self, texto):
-        """Muestra el resultado de una operación"""
-        self.resultado_text.delete(1.0, tk.END)
-        self.resultado_text.insert(tk.END, texto)
-    
-    def actualizar_diario(self):
-        """Actualiza el libro diario"""
-        self.tab_diario.text_area.delete(1.0, tk.END)
-        self.tab_diario.text_area.insert(tk.END, self.sistema.generar_diario())
-    
-    def actualizar_mayor(self):
-        """Actualiza los esquemas de mayor"""
-        self.tab_mayor.text_area.delete(1.0, tk.END)
-        self.tab_mayor.text_area.insert(tk.END, self.sistema.generar_mayor())
-    
-    def actualizar_balanza(self):
-        """Actualiza la balanza de comprobación"""
-        self.tab_balanza.text_area.delete(1.0, tk.END)
-        self.tab_balanza.text_area.insert(tk.END, self.sistema.generar_balanza_comprobacion())
-    
-    def actualizar_balance(self):
-        """Actualiza el balance general"""
-        self.tab_balance.text_area.delete(1.0, tk.END)
-        self.tab_balance.text_area.insert(tk.END, self.sistema.generar_balance_general())
-    
-    def actualizar_resultados(self):
-        """Actualiza el estado de resultados"""
-        self.tab_resultados.text_area.delete(1.0, tk.END)
-        self.tab_resultados.text_area.insert(tk.END, self.sistema.generar_estado_resultados())
-    
-    def actualizar_cambios_capital(self):
-        """Actualiza el estado de cambios en el capital contable"""
-        self.tab_cambios_capital.text_area.delete(1.0, tk.END)
-        self.tab_cambios_capital.text_area.insert(tk.END, self.sistema.generar_estado_cambios_capital())
-    
-    def actualizar_flujos_efectivo(self):
-        """Actualiza el estado de flujos de efectivo"""
-        self.tab_flujos_efectivo.text_area.delete(1.0, tk.END)
-        self.tab_flujos_efectivo.text_area.insert(tk.END, self.sistema.generar_estado_flujos_efectivo())
-    
-    def actualizar_todos_reportes(self):
-        """Actualiza todos los reportes"""
-        self.actualizar_diario()
-        self.actualizar_mayor()
-        self.actualizar_balanza()
-        self.actualizar_balance()
-        self.actualizar_resultados()
-        self.actualizar_cambios_capital()
-        self.actualizar_flujos_efectivo()
-
-
-# Función principal para ejecutar el programa
-def main():
-    root = tk.Tk()
-    app = AplicacionContable(root)
-    root.mainloop()
-
-if __name__ == "__main__":
-    main()
-
+from datetime import date, datetime
+import os
+from array import array
+from almacen_asientos import AlmacenAsientos
+from dinero import a_centavos, calcular_iva, proporcion, pesos
+
+
+def configurar_locale():
+    """Configura el formato de moneda para mostrar pesos mexicanos.
+    
+    Se llama al arrancar la aplicación o la línea de comandos, no al importar el módulo,
+    para no cambiar el locale de quien solo usa el motor contable.
+    """
+    import locale  # Solo se necesita al arrancar; importarlo cuesta más que el resto del módulo
+    try:
+        locale.setlocale(locale.LC_ALL, 'es_MX.UTF-8')  # Para sistemas Unix/Linux
+    except locale.Error:
+        try:
+            locale.setlocale(locale.LC_ALL, 'Spanish_Mexico')  # Para Windows
+        except locale.Error:
+            locale.setlocale(locale.LC_ALL, '')  # Fallback a la configuración por defecto
+
+# Archivo donde la aplicación guarda los asientos registrados
+RUTA_BITACORA = "diario_contable.jsonl"
+
+# Directorio donde se archivan los asientos de los periodos cerrados (diario binario)
+DIRECTORIO_ARCHIVO = "archivo_contable"
+
+# Cuentas de efectivo que generan movimientos en el estado de flujos de efectivo
+CUENTAS_EFECTIVO = ("Caja", "Bancos")
+
+# Actividad del flujo de efectivo según la contrapartida; un asiento que mueve efectivo
+# sin ninguna de estas cuentas es de operación
+ACTIVIDAD_CUENTAS = {
+    "Edificios": "inversion",
+    "Terrenos": "inversion",
+    "Equipo de computo": "inversion",
+    "Muebles y enseres": "inversion",
+    "Mobiliaria y equipo": "inversion",
+    "Equipo de reparto": "inversion",
+    "Capital social": "financiamiento",
+    "Utilidades retenidas": "financiamiento",
+}
+
+# Cuentas de resultados que se saldan en el asiento de cierre
+CUENTAS_RESULTADOS = ("Ventas", "Productos financieros", "Otros ingresos", "Costo de ventas",
+                      "Gastos de venta", "Gastos de administración", "Gastos financieros")
+
+# Los mismos catálogos como conjuntos, para revisar un asiento completo con una operación
+_EFECTIVO = frozenset(CUENTAS_EFECTIVO)
+_RESULTADOS = frozenset(CUENTAS_RESULTADOS)
+
+# Descripción del asiento con los saldos iniciales que deja un cierre de periodo
+APERTURA_CIERRE = "Asiento de apertura (saldos al {})"
+
+class SistemaContable:
+    def __init__(self, persistencia=None, puntos_control=None):
+        # Inicializar el almacén columnar que contiene el diario, el mayor y los flujos de efectivo
+        self.almacen = AlmacenAsientos()
+        hoy = datetime.now()
+        self.fecha_actual = hoy.strftime("%d/%m/%Y")
+        self.fecha_ordinal = hoy.toordinal()
+        
+        # Inicializar cuentas con saldos en cero
+        self.cuentas = {
+            # Activos
+            "Caja": 0,
+            "Bancos": 0,
+            "Clientes": 0,
+            "Mercancía": 0,
+            "IVA acreditable": 0,
+            "IVA por acreditar": 0,
+            "Papelería y útiles": 0,
+            "Rentas pagadas por anticipado": 0,
+            "Edificios": 0,
+            "Terrenos": 0,
+            "Equipo de computo": 0,
+            "Muebles y enseres": 0,
+            "Mobiliaria y equipo": 0,
+            "Equipo de reparto": 0,
+            
+            # Pasivos
+            "Proveedores": 0,
+            "IVA trasladado": 0,
+            "IVA por trasladar": 0,
+            "Anticipo de clientes": 0,
+            
+            # Capital
+            "Capital social": 0,
+            "Utilidad del ejercicio": 0,
+            "Utilidades retenidas": 0,
+            
+            # Ingresos
+            "Ventas": 0,
+            "Productos financieros": 0,
+            "Otros ingresos": 0,
+            
+            # Costos
+            "Costo de ventas": 0,
+            
+            # Gastos
+            "Gastos de venta": 0,
+            "Gastos de administración": 0,
+            "Gastos financieros": 0
+        }
+        
+        # Totales del estado de resultados; se recalculan al registrar asientos que tocan
+        # cuentas de resultados y los reportes solo los leen
+        self.resultados = self.calcular_resultados(self.cuentas)
+        
+        # Versión del diario (sube con cada lote registrado) y reportes ya generados
+        self.version = 0
+        from cache_reportes import CacheReportes  # Se importa al crear el sistema, no con el módulo
+        self.cache_reportes = CacheReportes()
+        
+        # Recuperar los asientos guardados: primero el punto de control más reciente y
+        # luego los asientos posteriores de la persistencia. La persistencia se asigna
+        # después para no volver a escribir los asientos que se están recuperando.
+        # Cualquier persistencia sirve si tiene leer(posicion), anexar(fecha, asientos),
+        # reemplazar(registros), posicion(), huella(posicion), sincronizar(), cerrar() y ultimo_id
+        # (BitacoraJSONL, PersistenciaSQLite)
+        self.persistencia = None
+        self.puntos_control = None
+        self.asientos_aplicados = 0  # Id del último asiento aplicado
+        self.fecha_cierre = None  # Último día (ordinal) del último periodo cerrado
+        posicion = 0
+        if puntos_control is not None:
+            posicion = puntos_control.restaurar_ultimo(self, persistencia) or 0
+        if persistencia is not None:
+            persistencia.ultimo_id = self.asientos_aplicados
+            self.recuperar(persistencia.leer(posicion))
+        self.asientos_recuperados = self.asientos_aplicados
+        self.persistencia = persistencia
+        self.puntos_control = puntos_control
+        
+        # Realizar asiento de apertura solo si el diario está vacío
+        if self.asientos_recuperados == 0:
+            self.asiento_apertura()
+    
+    def recuperar(self, registros, tamano_lote=10000):
+        """Vuelve a aplicar asientos guardados (dicts con fecha, descripcion, cargos y abonos).
+        
+        Los asientos consecutivos con la misma fecha se aplican en lotes. El asiento de
+        apertura que deja un cierre de periodo vuelve a fijar la fecha de cierre. Devuelve
+        cuántos se aplicaron.
+        """
+        total = 0
+        apertura = APERTURA_CIERRE.format("")[:-1]
+        for fecha, lote in AlmacenAsientos.lotes_por_fecha(self._con_actividad(registros), tamano_lote):
+            self.registrar_asientos_lote(lote, fecha)
+            total += len(lote)
+            # Es el único asiento en la fecha de cierre, así que siempre abre su lote
+            if lote[0][0].startswith(apertura):
+                self.fecha_cierre = fecha
+        return total
+    
+    @staticmethod
+    def _con_actividad(registros):
+        """Las bitácoras anteriores no guardan la actividad de los flujos: su asiento de
+        apertura se reconoce por la descripción"""
+        for registro in registros:
+            if "actividad" not in registro and registro["descripcion"] == "Asiento de apertura":
+                registro["actividad"] = "apertura"
+            yield registro
+    
+    def registrar_asiento(self, descripcion, cargos, abonos, fecha=None, actividad=None):
+        """Registra un asiento en el diario y actualiza el mayor (montos en centavos).
+        
+        actividad ("operacion", "inversion", "financiamiento" o "apertura") clasifica el
+        flujo de efectivo del asiento; si no se indica se deduce de sus cuentas.
+        """
+        asiento = (descripcion, cargos, abonos) if actividad is None else (descripcion, cargos, abonos, actividad)
+        self.registrar_asientos_lote((asiento,), fecha)
+    
+    def ordinal(self, fecha):
+        """Convierte una fecha (date, datetime u ordinal) a ordinal; None es la fecha de hoy"""
+        if fecha is None:
+            return self.fecha_ordinal
+        if isinstance(fecha, date):
+            return fecha.toordinal()
+        return fecha
+    
+    def registrar_asientos_lote(self, asientos, fecha=None):
+        """Registra un lote de asientos (descripcion, cargos, abonos[, actividad]) en una sola operación.
+        
+        Primero se validan todos los asientos y se acumulan los cambios de saldo por cuenta;
+        si alguno es inválido se lanza ValueError y no se registra ninguno. Un lote válido
+        se escribe en la persistencia antes de aplicarse. La actividad de cada flujo de
+        efectivo se asigna aquí una sola vez (ver registrar_asiento). fecha es un date o
+        un ordinal (hoy por omisión) y puede ser anterior a la de asientos ya registrados,
+        pero no caer en un periodo cerrado.
+        """
+        asientos = list(asientos)
+        fecha = self.ordinal(fecha)
+        if self.fecha_cierre is not None and fecha <= self.fecha_cierre:
+            raise ValueError(f"El periodo al {self.almacen.fecha_texto(self.fecha_cierre)} está cerrado")
+        cuentas = self.cuentas
+        catalogo = cuentas.keys()
+        flujos_asiento = []
+        flujos_monto = []
+        flujos_actividad = []
+        codigos_actividad = {nombre: codigo for codigo, nombre in enumerate(AlmacenAsientos.ACTIVIDADES)}
+        
+        # Las sumas y las comparaciones de cuentas se hacen en C por asiento; solo un asiento
+        # que no pasa la revisión rápida se recorre línea por línea para explicar el error
+        for posicion, asiento in enumerate(asientos):
+            cargos, abonos = asiento[1], asiento[2]
+            total_cargos = sum(cargos.values())
+            total_abonos = sum(abonos.values())
+            if (total_cargos != total_abonos or type(total_cargos) is not int or type(total_abonos) is not int
+                    or not (catalogo >= cargos.keys() and catalogo >= abonos.keys())):
+                self._validar_asiento(asiento)
+            actividad = asiento[3] if len(asiento) > 3 else None
+            if actividad is not None and actividad not in codigos_actividad:
+                raise ValueError(f"Actividad de flujo de efectivo desconocida: {actividad!r}")
+            if _EFECTIVO.isdisjoint(cargos) and _EFECTIVO.isdisjoint(abonos):
+                continue
+            
+            # Registrar flujos de efectivo si involucra Caja o Bancos, ya clasificados
+            flujo = 0
+            for cuenta in CUENTAS_EFECTIVO:
+                flujo += cargos.get(cuenta, 0) - abonos.get(cuenta, 0)
+            if flujo != 0:
+                if actividad is None:
+                    # La primera contrapartida de ACTIVIDAD_CUENTAS indica la actividad
+                    actividad = "operacion"
+                    for cuenta in (*cargos, *abonos):
+                        if cuenta in ACTIVIDAD_CUENTAS:
+                            actividad = ACTIVIDAD_CUENTAS[cuenta]
+                            break
+                flujos_asiento.append(posicion)
+                flujos_monto.append(flujo)
+                flujos_actividad.append(codigos_actividad[actividad])
+        
+        # El lote es válido: primero se guarda y luego se aplica
+        if self.persistencia is not None:
+            self.persistencia.anexar(fecha, asientos)
+        
+        # El almacén guarda el diario y el índice del mayor en columnas, y devuelve el
+        # cambio neto de cada cuenta: los saldos se actualizan con un solo cambio por cuenta
+        primero, cambios = self.almacen.agregar_asientos(fecha, asientos)
+        for cuenta, cambio in cambios.items():
+            cuentas[cuenta] += cambio
+        if not _RESULTADOS.isdisjoint(cambios):
+            self.resultados = self.calcular_resultados(cuentas)
+        
+        # Los flujos solo guardan el asiento y el monto; la descripción se lee del diario
+        self.almacen.agregar_flujos(fecha, [primero + posicion for posicion in flujos_asiento], flujos_monto,
+                                    flujos_actividad)
+        self.asientos_aplicados += len(asientos)
+        
+        # Solo se descartan los reportes cuyo periodo incluye la fecha del lote
+        self.version += 1
+        self.cache_reportes.invalidar(fecha, self.version)
+        
+        if self.puntos_control is not None:
+            self.puntos_control.notificar(self)
+    
+    def _validar_asiento(self, asiento):
+        """Revisa un asiento línea por línea y lanza ValueError con el primer problema"""
+        descripcion, cargos, abonos = asiento[0], asiento[1], asiento[2]
+        totales = []
+        for movimientos in (cargos, abonos):
+            total = 0
+            for cuenta, monto in movimientos.items():
+                if cuenta not in self.cuentas:
+                    raise ValueError(f"La cuenta '{cuenta}' no existe")
+                if type(monto) is not int:
+                    raise ValueError(f"Los montos deben estar en centavos enteros: {monto!r}")
+                total += monto
+            totales.append(total)
+        if totales[0] != totales[1]:
+            raise ValueError(f"El asiento '{descripcion}' no está cuadrado")
+    
+    def instantanea(self):
+        """Copia del estado actual para generar reportes sin mezclar registros posteriores"""
+        copia = SistemaContable.__new__(SistemaContable)
+        copia.__dict__.update(self.__dict__)
+        copia.almacen = self.almacen.copia()
+        copia.cuentas = dict(self.cuentas)
+        copia.persistencia = None  # La instantánea es de solo lectura
+        copia.puntos_control = None
+        return copia
+    
+    def vista(self):
+        """Copia ligera para leer desde otro hilo lo ya registrado: comparte el almacén y
+        solo copia los saldos. Las columnas del diario (asientos y líneas) solo crecen, así
+        que los asientos y líneas anteriores al momento de la vista no cambian; un cierre
+        de periodo reemplaza el almacén del sistema, no el de la vista."""
+        copia = SistemaContable.__new__(SistemaContable)
+        copia.__dict__.update(self.__dict__)
+        copia.cuentas = dict(self.cuentas)
+        copia.persistencia = None
+        copia.puntos_control = None
+        return copia
+    
+    def vista_fija(self):
+        """Como vista(), pero sobre almacen.vista(): no ve los asientos que se registren
+        después, aunque tengan fecha anterior, así que cualquier reporte (con periodo o a
+        una fecha de corte) se puede generar desde otro hilo sin copiar el diario. Se toma
+        en el hilo que registra."""
+        copia = self.vista()
+        copia.almacen = self.almacen.vista()
+        return copia
+    
+    def cerrar_periodo(self, hasta, anual=False, directorio_archivo=DIRECTORIO_ARCHIVO):
+        """Cierra el periodo que termina en hasta (date u ordinal, inclusive).
+        
+        1. Registra el asiento de cierre, que salda las cuentas de resultados contra
+           Utilidad del ejercicio (en un cierre anual también esta contra Utilidades retenidas).
+        2. Archiva los asientos del periodo en un diario binario en directorio_archivo.
+        3. Deja en el diario un asiento de apertura con el saldo de cada cuenta a esa fecha
+           seguido de los asientos posteriores, y reemplaza con ellos la persistencia.
+        
+        Después ya no se aceptan asientos con fecha hasta o anterior y los reportes solo
+        recorren el periodo abierto. Devuelve la ruta del archivo. Un periodo que termina
+        en el último cierre o antes ya está cerrado y lanza ValueError.
+        """
+        hasta = self.ordinal(hasta)
+        if self.fecha_cierre is not None and hasta <= self.fecha_cierre:
+            raise ValueError(f"El periodo al {self.almacen.fecha_texto(self.fecha_cierre)} ya está cerrado")
+        destino = "Utilidades retenidas" if anual else "Utilidad del ejercicio"
+        cuentas_cierre = CUENTAS_RESULTADOS + (("Utilidad del ejercicio",) if anual else ())
+        
+        # Asiento de cierre: cada cuenta se salda por su lado contrario
+        saldos = self.saldos_al(hasta)
+        cargos = {}
+        abonos = {}
+        for cuenta in cuentas_cierre:
+            if saldos[cuenta] > 0:
+                abonos[cuenta] = saldos[cuenta]
+            elif saldos[cuenta] < 0:
+                cargos[cuenta] = -saldos[cuenta]
+        neto = sum(abonos.values()) - sum(cargos.values())
+        if neto > 0:
+            cargos[destino] = neto
+        elif neto < 0:
+            abonos[destino] = -neto
+        fecha_texto = self.almacen.fecha_texto(hasta)
+        if cargos:
+            self.registrar_asiento(f"Asiento de cierre al {fecha_texto}", cargos, abonos, hasta)
+        
+        # Archivar el detalle del periodo
+        almacen = self.almacen
+        cerrados = almacen.asientos_entre(None, hasta)
+        os.makedirs(directorio_archivo, exist_ok=True)
+        ruta = os.path.join(directorio_archivo, f"diario_{date.fromordinal(hasta):%Y%m%d}.bin")
+        from diario_binario import escribir_diario_binario  # Solo lo usan los cierres de periodo
+        escribir_diario_binario(almacen.subconjunto(cerrados), ruta)
+        
+        # Diario compactado: saldos iniciales y asientos del periodo abierto
+        saldos = self.saldos_al(hasta)
+        apertura = {
+            "fecha": hasta,
+            "descripcion": APERTURA_CIERRE.format(fecha_texto),
+            "cargos": {cuenta: saldo for cuenta, saldo in saldos.items() if saldo > 0},
+            "abonos": {cuenta: -saldo for cuenta, saldo in saldos.items() if saldo < 0},
+            "actividad": "apertura"
+        }
+        registros = [apertura]
+        registros.extend(almacen.iter_registros(almacen.asientos_entre(hasta + 1, None)))
+        
+        # Volver a aplicar el diario compactado sin escribirlo en la persistencia
+        persistencia = self.persistencia
+        puntos_control = self.puntos_control
+        self.persistencia = None
+        self.puntos_control = None
+        self.almacen = AlmacenAsientos()
+        self.cuentas = dict.fromkeys(self.cuentas, 0)
+        self.resultados = self.calcular_resultados(self.cuentas)
+        self.asientos_aplicados = 0
+        self.fecha_cierre = None
+        self.recuperar(registros)
+        self.persistencia = persistencia
+        self.puntos_control = puntos_control
+        # Los periodos cerrados ya no tienen detalle: ningún reporte anterior sirve
+        self.version += 1
+        self.cache_reportes.limpiar(self.version)
+        
+        # Los puntos de control anteriores apuntan a la persistencia sin compactar: se
+        # borran antes de reemplazarla para que una caída entre los dos pasos no deje
+        # ninguno que la contradiga (de todos modos su huella ya no coincidiría)
+        if puntos_control is not None:
+            puntos_control.descartar()
+        if persistencia is not None:
+            persistencia.reemplazar(registros)
+        if puntos_control is not None:
+            puntos_control.escribir(self)
+        return ruta
+    
+    def asiento_apertura(self, fecha=None):
+        """Registra el asiento de apertura"""
+        cargos = {
+            "Caja": a_centavos(30000),
+            "Bancos": a_centavos(100000),
+            "Mercancía": a_centavos(10000),
+            "Edificios": a_centavos(1500000),
+            "Terrenos": a_centavos(2800000),
+            "Equipo de computo": a_centavos(20000),
+            "Muebles y enseres": a_centavos(100000),
+            "Mobiliaria y equipo": a_centavos(20000),
+            "Equipo de reparto": a_centavos(400000)
+        }
+        
+        abonos = {
+            "Capital social": a_centavos(4980000)
+        }
+        
+        self.registrar_asiento("Asiento de apertura", cargos, abonos, fecha, actividad="apertura")
+        return "1. Asiento de apertura registrado con éxito."
+    
+    def compra_efectivo(self, monto_sin_iva, cuenta_origen="Bancos", fecha=None):
+        """Registra una compra en efectivo"""
+        return self._registrar_operacion("compra_efectivo", fecha, monto_sin_iva=monto_sin_iva,
+                                         cuenta_origen=cuenta_origen)
+    
+    def compra_credito(self, monto_sin_iva, fecha=None):
+        """Registra una compra a crédito"""
+        return self._registrar_operacion("compra_credito", fecha, monto_sin_iva=monto_sin_iva)
+    
+    def compra_combinada(self, monto_sin_iva, porcentaje_efectivo, cuenta_origen="Bancos", fecha=None):
+        """Registra una compra combinada (parte en efectivo, parte a crédito)"""
+        return self._registrar_operacion("compra_combinada", fecha, monto_sin_iva=monto_sin_iva,
+                                         porcentaje_efectivo=porcentaje_efectivo, cuenta_origen=cuenta_origen)
+    
+    def anticipo_cliente(self, monto_sin_iva, cuenta_destino="Bancos", fecha=None):
+        """Registra un anticipo de cliente con IVA"""
+        return self._registrar_operacion("anticipo_cliente", fecha, monto_sin_iva=monto_sin_iva,
+                                         cuenta_destino=cuenta_destino)
+    
+    def compra_papeleria(self, monto_sin_iva, cuenta_origen="Bancos", fecha=None):
+        """Registra una compra de papelería"""
+        return self._registrar_operacion("compra_papeleria", fecha, monto_sin_iva=monto_sin_iva,
+                                         cuenta_origen=cuenta_origen)
+    
+    def pago_rentas_anticipadas(self, monto_sin_iva, meses, cuenta_origen="Bancos", fecha=None):
+        """Registra el pago de rentas anticipadas"""
+        return self._registrar_operacion("pago_rentas_anticipadas", fecha, monto_sin_iva=monto_sin_iva, meses=meses,
+                                         cuenta_origen=cuenta_origen)
+    
+    def venta_efectivo(self, monto_sin_iva, costo_venta, cuenta_destino="Bancos", fecha=None):
+        """Registra una venta en efectivo"""
+        return self._registrar_operacion("venta_efectivo", fecha, monto_sin_iva=monto_sin_iva, costo_venta=costo_venta,
+                                         cuenta_destino=cuenta_destino)
+    
+    def venta_credito(self, monto_sin_iva, costo_venta, fecha=None):
+        """Registra una venta a crédito"""
+        return self._registrar_operacion("venta_credito", fecha, monto_sin_iva=monto_sin_iva, costo_venta=costo_venta)
+    
+    def gasto_administracion(self, monto_sin_iva, cuenta_origen="Bancos", fecha=None):
+        """Registra un gasto de administración"""
+        return self._registrar_operacion("gasto_administracion", fecha, monto_sin_iva=monto_sin_iva,
+                                         cuenta_origen=cuenta_origen)
+    
+    def gasto_venta(self, monto_sin_iva, cuenta_origen="Bancos", fecha=None):
+        """Registra un gasto de venta"""
+        return self._registrar_operacion("gasto_venta", fecha, monto_sin_iva=monto_sin_iva, cuenta_origen=cuenta_origen)
+    
+    def gasto_financiero(self, monto, cuenta_origen="Bancos", fecha=None):
+        """Registra un gasto financiero (sin IVA)"""
+        return self._registrar_operacion("gasto_financiero", fecha, monto=monto, cuenta_origen=cuenta_origen)
+    
+    def _registrar_operacion(self, operacion, fecha, **parametros):
+        """Registra el asiento de una operación y devuelve su mensaje"""
+        asiento, mensaje = self.asiento_operacion(operacion, **parametros)
+        self.registrar_asiento(*asiento, fecha)
+        return mensaje
+    
+    def asiento_operacion(self, operacion, total=None, **parametros):
+        """Asiento (descripcion, cargos, abonos) que registraría una operación y su mensaje,
+        sin registrarlo; parametros son los de la operación (montos en pesos), sin fecha.
+        
+        En las operaciones con IVA, total (centavos) es el importe con IVA ya conocido,
+        por ejemplo el de un estado de cuenta: el IVA es total menos el monto sin IVA en
+        lugar de calcularse con la tasa, así que el movimiento de efectivo es exactamente
+        total aunque monto sin IVA + IVA redondeado no lo dé.
+        """
+        construir = getattr(self, "_asiento_" + operacion, None)
+        if construir is None:
+            raise ValueError(f"Operación desconocida: {operacion!r}")
+        if "monto_sin_iva" not in parametros:
+            return construir(**parametros)
+        monto_sin_iva = a_centavos(parametros.pop("monto_sin_iva"))
+        iva = calcular_iva(monto_sin_iva) if total is None else total - monto_sin_iva
+        return construir(monto_sin_iva, iva, monto_sin_iva + iva, **parametros)
+    
+    def _asiento_compra_efectivo(self, monto_sin_iva, iva, total, cuenta_origen="Bancos"):
+        """Asiento y mensaje de una compra en efectivo"""
+        cargos = {
+            "Mercancía": monto_sin_iva,
+            "IVA acreditable": iva  # Cambiado a IVA acreditable
+        }
+        
+        abonos = {
+            cuenta_origen: total
+        }
+        
+        return ((f"Compra de mercancía en efectivo (pagado con {cuenta_origen})", cargos, abonos),
+                f"2. Compra en efectivo por ${pesos(monto_sin_iva):.2f} + IVA ${pesos(iva):.2f} = ${pesos(total):.2f} registrada con éxito.\nPagado desde: {cuenta_origen}")
+    
+    def _asiento_compra_credito(self, monto_sin_iva, iva, total):
+        """Asiento y mensaje de una compra a crédito"""
+        cargos = {
+            "Mercancía": monto_sin_iva,
+            "IVA por acreditar": iva  # Usamos IVA por acreditar para compras a crédito
+        }
+        
+        abonos = {
+            "Proveedores": total
+        }
+        
+        return (("Compra de mercancía a crédito", cargos, abonos),
+                f"3. Compra a crédito por ${pesos(monto_sin_iva):.2f} + IVA ${pesos(iva):.2f} = ${pesos(total):.2f} registrada con éxito.")
+    
+    def _asiento_compra_combinada(self, monto_sin_iva, iva, total, porcentaje_efectivo, cuenta_origen="Bancos"):
+        """Asiento y mensaje de una compra combinada"""
+        # La parte en efectivo se redondea al centavo y la parte a crédito es el resto,
+        # así la suma de ambas es exactamente el total
+        monto_efectivo = proporcion(total, porcentaje_efectivo)
+        monto_credito = total - monto_efectivo
+        
+        # Calculamos la proporción del IVA para cada parte con la misma regla
+        iva_efectivo = proporcion(iva, porcentaje_efectivo)
+        iva_credito = iva - iva_efectivo
+        
+        cargos = {
+            "Mercancía": monto_sin_iva,
+            "IVA acreditable": iva_efectivo,  # IVA acreditable para la parte en efectivo
+            "IVA por acreditar": iva_credito  # IVA por acreditar para la parte a crédito
+        }
+        
+        abonos = {
+            cuenta_origen: monto_efectivo,
+            "Proveedores": monto_credito
+        }
+        
+        return ((f"Compra de mercancía combinada (parte pagada con {cuenta_origen})", cargos, abonos),
+                f"4. Compra combinada por ${pesos(monto_sin_iva):.2f} + IVA ${pesos(iva):.2f} = ${pesos(total):.2f}\n"
+                f"   Pago en efectivo desde {cuenta_origen}: ${pesos(monto_efectivo):.2f} ({porcentaje_efectivo}%)\n"
+                f"   Pago a crédito: ${pesos(monto_credito):.2f} ({100-porcentaje_efectivo}%)")
+    
+    def _asiento_anticipo_cliente(self, monto_sin_iva, iva, total, cuenta_destino="Bancos"):
+        """Asiento y mensaje de un anticipo de cliente"""
+        cargos = {
+            cuenta_destino: total
+        }
+        
+        abonos = {
+            "Anticipo de clientes": monto_sin_iva,
+            "IVA trasladado": iva  # Usamos IVA trasladado para los anticipos
+        }
+        
+        return ((f"Anticipo recibido de cliente (depositado en {cuenta_destino})", cargos, abonos),
+                f"5. Anticipo de cliente por ${pesos(monto_sin_iva):.2f} + IVA ${pesos(iva):.2f} = ${pesos(total):.2f} registrado con éxito.\nDepositado en: {cuenta_destino}")
+    
+    def _asiento_compra_papeleria(self, monto_sin_iva, iva, total, cuenta_origen="Bancos"):
+        """Asiento y mensaje de una compra de papelería"""
+        cargos = {
+            "Papelería y útiles": monto_sin_iva,
+            "IVA acreditable": iva  # Cambiado a IVA acreditable
+        }
+        
+        abonos = {
+            cuenta_origen: total
+        }
+        
+        return ((f"Compra de papelería (pagado con {cuenta_origen})", cargos, abonos),
+                f"6. Compra de papelería por ${pesos(monto_sin_iva):.2f} + IVA ${pesos(iva):.2f} = ${pesos(total):.2f} registrada con éxito.\nPagado desde: {cuenta_origen}")
+    
+    def _asiento_pago_rentas_anticipadas(self, monto_sin_iva, iva, total, meses, cuenta_origen="Bancos"):
+        """Asiento y mensaje de un pago de rentas anticipadas"""
+        cargos = {
+            "Rentas pagadas por anticipado": monto_sin_iva,
+            "IVA acreditable": iva  # Cambiado a IVA acreditable
+        }
+        
+        abonos = {
+            cuenta_origen: total
+        }
+        
+        return ((f"Pago de rentas anticipadas por {meses} meses (pagado con {cuenta_origen})", cargos, abonos),
+                f"7. Pago de rentas anticipadas por {meses} meses: ${pesos(monto_sin_iva):.2f} + IVA ${pesos(iva):.2f} = ${pesos(total):.2f} registrado con éxito.\nPagado desde: {cuenta_origen}")
+    
+    def _asiento_venta_efectivo(self, monto_sin_iva, iva, total, costo_venta, cuenta_destino="Bancos"):
+        """Asiento y mensaje de una venta en efectivo"""
+        costo_venta = a_centavos(costo_venta)
+        
+        cargos = {
+            cuenta_destino: total,
+            "Costo de ventas": costo_venta
+        }
+        
+        abonos = {
+            "Ventas": monto_sin_iva,
+            "IVA trasladado": iva,
+            "Mercancía": costo_venta
+        }
+        
+        return ((f"Venta de mercancía en efectivo (depositado en {cuenta_destino})", cargos, abonos),
+                f"Venta en efectivo por ${pesos(monto_sin_iva):.2f} + IVA ${pesos(iva):.2f} = ${pesos(total):.2f} registrada con éxito.\nDepositado en: {cuenta_destino}")
+    
+    def _asiento_venta_credito(self, monto_sin_iva, iva, total, costo_venta):
+        """Asiento y mensaje de una venta a crédito"""
+        costo_venta = a_centavos(costo_venta)
+        
+        cargos = {
+            "Clientes": total,
+            "Costo de ventas": costo_venta
+        }
+        
+        abonos = {
+            "Ventas": monto_sin_iva,
+            "IVA trasladado": iva,
+            "Mercancía": costo_venta
+        }
+        
+        return (("Venta de mercancía a crédito", cargos, abonos),
+                f"Venta a crédito por ${pesos(monto_sin_iva):.2f} + IVA ${pesos(iva):.2f} = ${pesos(total):.2f} registrada con éxito.")
+    
+    def _asiento_gasto_administracion(self, monto_sin_iva, iva, total, cuenta_origen="Bancos"):
+        """Asiento y mensaje de un gasto de administración"""
+        cargos = {
+            "Gastos de administración": monto_sin_iva,
+            "IVA acreditable": iva
+        }
+        
+        abonos = {
+            cuenta_origen: total
+        }
+        
+        return ((f"Gasto de administración (pagado con {cuenta_origen})", cargos, abonos),
+                f"Gasto de administración por ${pesos(monto_sin_iva):.2f} + IVA ${pesos(iva):.2f} = ${pesos(total):.2f} registrado con éxito.\nPagado desde: {cuenta_origen}")
+    
+    def _asiento_gasto_venta(self, monto_sin_iva, iva, total, cuenta_origen="Bancos"):
+        """Asiento y mensaje de un gasto de venta"""
+        cargos = {
+            "Gastos de venta": monto_sin_iva,
+            "IVA acreditable": iva
+        }
+        
+        abonos = {
+            cuenta_origen: total
+        }
+        
+        return ((f"Gasto de venta (pagado con {cuenta_origen})", cargos, abonos),
+                f"Gasto de venta por ${pesos(monto_sin_iva):.2f} + IVA ${pesos(iva):.2f} = ${pesos(total):.2f} registrado con éxito.\nPagado desde: {cuenta_origen}")
+    
+    def _asiento_gasto_financiero(self, monto, cuenta_origen="Bancos"):
+        """Asiento y mensaje de un gasto financiero (sin IVA)"""
+        monto = a_centavos(monto)
+        
+        cargos = {
+            "Gastos financieros": monto
+        }
+        
+        abonos = {
+            cuenta_origen: monto
+        }
+        
+        return ((f"Gasto financiero (pagado con {cuenta_origen})", cargos, abonos),
+                f"Gasto financiero por ${pesos(monto):.2f} registrado con éxito.\nPagado desde: {cuenta_origen}")
+    
+    def iter_diario(self, inicio=0, fuente=None, desde=None, hasta=None, fin=None):
+        """Genera el libro diario línea por línea.
+        
+        Con inicio > 0 solo se generan los asientos a partir de ese índice, sin encabezado,
+        y con fin solo hasta el anterior a ese índice.
+        Con desde/hasta (fechas ordinales o date, inclusive) solo los asientos de ese
+        periodo, en orden de fecha, buscados con bisect en el índice por fecha.
+        Con fuente (por ejemplo DiarioBinario) los asientos se leen de fuente.iter_asientos().
+        """
+        desde, hasta = self._periodo(desde, hasta)
+        if fuente is not None:
+            yield from self._iter_diario_fuente(fuente, desde, hasta)
+            return
+        almacen = self.almacen
+        if inicio == 0:
+            yield "=== LIBRO DIARIO ===\n"
+        if desde is None and hasta is None:
+            asientos = range(inicio, almacen.num_asientos() if fin is None else fin)
+        else:
+            asientos = almacen.asientos_entre(desde, hasta)
+        for asiento in asientos:
+            fecha = almacen.fecha_texto(almacen.asiento_fecha[asiento])
+            descripcion = almacen.descripciones[almacen.asiento_descripcion[asiento]]
+            lineas = almacen.lineas_asiento(asiento)
+            yield f"\nAsiento {asiento + 1} - {fecha} - {descripcion}\n"
+            yield "CARGOS:\n"
+            for linea in lineas:
+                if almacen.linea_lado[linea] == almacen.CARGO:
+                    cuenta = almacen.nombres_cuentas[almacen.linea_cuenta[linea]]
+                    yield f"  {cuenta}: ${pesos(almacen.linea_monto[linea]):,.2f}\n"
+            yield "ABONOS:\n"
+            for linea in lineas:
+                if almacen.linea_lado[linea] == almacen.ABONO:
+                    cuenta = almacen.nombres_cuentas[almacen.linea_cuenta[linea]]
+                    yield f"  {cuenta}: ${pesos(almacen.linea_monto[linea]):,.2f}\n"
+    
+    def _iter_diario_fuente(self, fuente, desde, hasta):
+        """Libro diario a partir de fuente.iter_asientos() (numero, fecha, descripcion, cargos, abonos)"""
+        yield "=== LIBRO DIARIO ===\n"
+        for numero, fecha, descripcion, cargos, abonos in fuente.iter_asientos(desde, hasta):
+            yield f"\nAsiento {numero} - {fecha} - {descripcion}\n"
+            for titulo, movimientos in (("CARGOS:\n", cargos), ("ABONOS:\n", abonos)):
+                yield titulo
+                for cuenta, monto in movimientos:
+                    yield f"  {cuenta}: ${pesos(monto):,.2f}\n"
+    
+    def generar_diario(self, fuente=None, desde=None, hasta=None):
+        """Genera el texto del libro diario"""
+        return "".join(self.iter_diario(fuente=fuente, desde=desde, hasta=hasta))
+    
+    def _periodo(self, desde, hasta):
+        """Convierte los límites de un periodo a ordinales (None es sin límite)"""
+        return (None if desde is None else self.ordinal(desde),
+                None if hasta is None else self.ordinal(hasta))
+    
+    def _texto_periodo(self, desde, hasta):
+        """Fecha para el encabezado de un reporte: la de corte o el periodo"""
+        fin = self.fecha_actual if hasta is None else self.almacen.fecha_texto(hasta)
+        if desde is None:
+            return fin
+        return f"del {self.almacen.fecha_texto(desde)} al {fin}"
+    
+    def iter_mayor(self, fuente=None, desde=None, hasta=None):
+        """Genera los esquemas de mayor línea por línea.
+        
+        Con desde/hasta solo se incluyen los movimientos de ese periodo; el saldo es el
+        del periodo. Con fuente (PersistenciaSQLite o DiarioBinario) los movimientos y
+        saldos se leen de fuente.cuentas_mayor() en lugar del almacén en memoria.
+        """
+        desde, hasta = self._periodo(desde, hasta)
+        if fuente is not None:
+            yield from self._iter_mayor_fuente(fuente, desde, hasta)
+            return
+        almacen = self.almacen
+        if desde is None and hasta is None:
+            indices = almacen.lineas_por_cuenta.items()
+        else:
+            indices = self._lineas_periodo(desde, hasta)
+        yield "=== ESQUEMAS DE MAYOR ===\n"
+        for id_cuenta, indice in indices:
+            yield f"\nCuenta: {almacen.nombres_cuentas[id_cuenta]}\n"
+            totales = [0, 0]
+            for lado, titulo in ((almacen.CARGO, "CARGOS:\n"), (almacen.ABONO, "ABONOS:\n")):
+                yield titulo
+                for linea in indice:
+                    if almacen.linea_lado[linea] != lado:
+                        continue
+                    yield self.linea_mayor(linea)
+                    totales[lado] += almacen.linea_monto[linea]
+            
+            saldo = totales[almacen.CARGO] - totales[almacen.ABONO]
+            yield f"Saldo: ${pesos(saldo):,.2f}\n"
+    
+    def _lineas_periodo(self, desde, hasta):
+        """Genera (id de cuenta, líneas) con las líneas de cada cuenta en un periodo.
+        
+        Solo se recorren los asientos del periodo; las cuentas salen en el mismo orden
+        que en el mayor completo y sus líneas en orden de fecha.
+        """
+        almacen = self.almacen
+        por_cuenta = {}
+        for asiento in almacen.asientos_entre(desde, hasta):
+            for linea in almacen.lineas_asiento(asiento):
+                id_cuenta = almacen.linea_cuenta[linea]
+                lineas = por_cuenta.get(id_cuenta)
+                if lineas is None:
+                    lineas = por_cuenta[id_cuenta] = array("q")
+                lineas.append(linea)
+        for id_cuenta in almacen.lineas_por_cuenta:
+            if id_cuenta in por_cuenta:
+                yield id_cuenta, por_cuenta[id_cuenta]
+    
+    def _iter_mayor_fuente(self, fuente, desde, hasta):
+        """Esquemas de mayor a partir de fuente.cuentas_mayor() (cuenta, cargos, abonos, saldo)"""
+        yield "=== ESQUEMAS DE MAYOR ===\n"
+        for cuenta, cargos, abonos, saldo in fuente.cuentas_mayor(desde, hasta):
+            yield f"\nCuenta: {cuenta}\n"
+            for titulo, movimientos in (("CARGOS:\n", cargos), ("ABONOS:\n", abonos)):
+                yield titulo
+                for fecha, descripcion, monto in movimientos:
+                    yield f"  {fecha} - {descripcion}: ${pesos(monto):,.2f}\n"
+            yield f"Saldo: ${pesos(saldo):,.2f}\n"
+    
+    def linea_mayor(self, linea):
+        """Texto de una línea (cargo o abono) de los esquemas de mayor"""
+        almacen = self.almacen
+        asiento = almacen.linea_asiento[linea]
+        fecha = almacen.fecha_texto(almacen.asiento_fecha[asiento])
+        descripcion = almacen.descripciones[almacen.asiento_descripcion[asiento]]
+        return f"  {fecha} - {descripcion}: ${pesos(almacen.linea_monto[linea]):,.2f}\n"
+    
+    def generar_mayor(self, fuente=None, desde=None, hasta=None):
+        """Genera el texto de los esquemas de mayor"""
+        return "".join(self.iter_mayor(fuente, desde, hasta))
+    
+    def saldo(self, cuenta, fecha=None):
+        """Saldo de una cuenta (cargos - abonos, en centavos) a una fecha inclusive.
+        
+        Se busca con bisect en el saldo acumulado de la cuenta, sin recorrer sus movimientos.
+        """
+        if cuenta not in self.cuentas:
+            raise ValueError(f"La cuenta '{cuenta}' no existe")
+        if fecha is None:
+            return self.cuentas[cuenta]
+        id_cuenta = self.almacen.ids_cuentas.get(cuenta)
+        return 0 if id_cuenta is None else self.almacen.saldo_al(id_cuenta, self.ordinal(fecha))
+    
+    def saldos_al(self, fecha):
+        """Saldos de todas las cuentas a una fecha de corte"""
+        return {cuenta: self.saldo(cuenta, fecha) for cuenta in self.cuentas}
+    
+    def saldos_periodo(self, desde, hasta=None):
+        """Movimiento neto de cada cuenta entre dos fechas (inclusive): saldo a hasta menos
+        saldo al día anterior a desde"""
+        desde, hasta = self._periodo(desde, hasta)
+        finales = self.saldos_al(hasta) if hasta is not None else dict(self.cuentas)
+        iniciales = self.saldos_al(desde - 1)
+        return {cuenta: finales[cuenta] - iniciales[cuenta] for cuenta in self.cuentas}
+    
+    def _saldos(self, saldos, desde, hasta):
+        """Saldos y fecha a usar en un reporte: los del sistema, los de un periodo o fecha
+        de corte, o los dados (por ejemplo los de saldos_por_cuenta de la persistencia, ya
+        calculados para el periodo desde/hasta, que entonces solo se usa en el encabezado)"""
+        desde, hasta = self._periodo(desde, hasta)
+        fecha_corte = self._texto_periodo(desde, hasta)
+        if saldos is not None:
+            cuentas = dict.fromkeys(self.cuentas, 0)
+            cuentas.update(saldos)
+            return cuentas, fecha_corte
+        if desde is not None:
+            return self.saldos_periodo(desde, hasta), fecha_corte
+        if hasta is not None:
+            return self.saldos_al(hasta), fecha_corte
+        return self.cuentas, fecha_corte
+    
+    def _reporte(self, tipo, generar, saldos, desde, hasta, *opciones, acumulado=False):
+        """Reporte de texto tomado de la caché o generado y guardado en ella.
+        
+        Con saldos dados no se usa la caché. Lo afectan los asientos del periodo
+        desde/hasta, o todos los hasta la fecha de corte si acumulado.
+        """
+        if saldos is not None:
+            return generar(saldos, desde, hasta, *opciones)
+        desde, hasta = self._periodo(desde, hasta)
+        clave = (tipo, desde, hasta) + opciones
+        version = self.version
+        texto = self.cache_reportes.obtener(clave, version)
+        if texto is None:
+            texto = generar(None, desde, hasta, *opciones)
+            self.cache_reportes.guardar(clave, version, texto, None if acumulado else desde, hasta)
+        return texto
+    
+    def generar_balanza_comprobacion(self, saldos=None, desde=None, hasta=None):
+        """Genera el texto de la balanza de comprobación"""
+        return self._reporte("balanza", self._balanza_comprobacion, saldos, desde, hasta)
+    
+    def _balanza_comprobacion(self, saldos, desde, hasta):
+        """Genera el reporte sin usar la caché"""
+        cuentas, fecha_corte = self._saldos(saldos, desde, hasta)
+        resultado = "=== BALANZA DE COMPROBACIÓN ===\n"
+        resultado += f"Fecha: {fecha_corte}\n\n"
+        
+        # Mostrar la balanza completa
+        resultado += f"{'Cuenta':<30} {'Debe':>15} {'Haber':>15}\n"
+        resultado += "-" * 60 + "\n"
+        
+        total_debe = 0
+        total_haber = 0
+        
+        # Ordenamos las cuentas para una mejor presentación
+        cuentas_ordenadas = sorted(cuentas.keys())
+        
+        for cuenta in cuentas_ordenadas:
+            saldo = cuentas[cuenta]
+            
+            # Las cuentas de activo y gasto normalmente tienen saldo deudor (positivo)
+            # Las cuentas de pasivo, capital e ingreso normalmente tienen saldo acreedor (negativo)
+            if cuenta in ["Proveedores", "IVA trasladado", "IVA por trasladar", "Anticipo de clientes", 
+                          "Capital social", "Utilidad del ejercicio", "Utilidades retenidas", 
+                          "Ventas", "Productos financieros", "Otros ingresos"]:
+                # Para estas cuentas, el saldo normal es acreedor (negativo)
+                if saldo < 0:
+                    debe = 0
+                    haber = abs(saldo)
+                else:
+                    debe = saldo
+                    haber = 0
+            else:
+                # Para el resto de cuentas, el saldo normal es deudor (positivo)
+                if saldo > 0:
+                    debe = saldo
+                    haber = 0
+                else:
+                    debe = 0
+                    haber = abs(saldo)
+            
+            # Mostrar la cuenta solo si tiene un saldo diferente de cero
+            if debe > 0 or haber > 0:
+                resultado += f"{cuenta:<30} {pesos(debe):>15,.2f} {pesos(haber):>15,.2f}\n"
+                total_debe += debe
+                total_haber += haber
+        
+        resultado += "-" * 60 + "\n"
+        resultado += f"{'TOTAL':<30} {pesos(total_debe):>15,.2f} {pesos(total_haber):>15,.2f}\n"
+        
+        # Verificar si la balanza está cuadrada
+        if total_debe == total_haber:
+            resultado += "\nLa balanza de comprobación está cuadrada."
+        else:
+            resultado += f"\nLa balanza de comprobación NO está cuadrada. Diferencia: ${pesos(abs(total_debe - total_haber)):,.2f}"
+        
+        return resultado
+    
+    def generar_balance_general(self, saldos=None, desde=None, hasta=None):
+        """Genera el texto del balance general"""
+        return self._reporte("balance", self._balance_general, saldos, desde, hasta)
+    
+    def _balance_general(self, saldos, desde, hasta):
+        """Genera el reporte sin usar la caché"""
+        cuentas, fecha_corte = self._saldos(saldos, desde, hasta)
+        resultado = "=== BALANCE GENERAL ===\n"
+        resultado += f"Fecha: {fecha_corte}\n\n"
+        
+        # Activos
+        resultado += "ACTIVO\n"
+        resultado += "\nCIRCULANTE\n"
+        activo_circulante = 0
+        for cuenta in ["Caja", "Bancos", "Clientes", "Mercancía", "IVA acreditable", "IVA por acreditar", "Papelería y útiles", "Rentas pagadas por anticipado"]:
+            if cuentas[cuenta] > 0:
+                resultado += f"{cuenta:<30} ${pesos(cuentas[cuenta]):>15,.2f}\n"
+                activo_circulante += cuentas[cuenta]
+        resultado += f"{'Total Activo Circulante':<30} ${pesos(activo_circulante):>15,.2f}\n"
+        
+        resultado += "\nNO CIRCULANTE\n"
+        activo_no_circulante = 0
+        for cuenta in ["Edificios", "Terrenos", "Equipo de computo", "Muebles y enseres", "Mobiliaria y equipo", "Equipo de reparto"]:
+            if cuentas[cuenta] > 0:
+                resultado += f"{cuenta:<30} ${pesos(cuentas[cuenta]):>15,.2f}\n"
+                activo_no_circulante += cuentas[cuenta]
+        resultado += f"{'Total Activo No Circulante':<30} ${pesos(activo_no_circulante):>15,.2f}\n"
+        
+        total_activo = activo_circulante + activo_no_circulante
+        resultado += f"\n{'TOTAL ACTIVO':<30} ${pesos(total_activo):>15,.2f}\n"
+        
+        # Pasivos
+        resultado += "\nPASIVO\n"
+        resultado += "\nCORTO PLAZO\n"
+        pasivo_corto_plazo = 0
+        for cuenta in ["Proveedores", "IVA trasladado", "IVA por trasladar", "Anticipo de clientes"]:
+            if cuentas[cuenta] < 0:  # Los pasivos tienen saldo acreedor (negativo)
+                valor_absoluto = abs(cuentas[cuenta])
+                resultado += f"{cuenta:<30} ${pesos(valor_absoluto):>15,.2f}\n"
+                pasivo_corto_plazo += valor_absoluto
+        resultado += f"{'Total Pasivo Corto Plazo':<30} ${pesos(pasivo_corto_plazo):>15,.2f}\n"
+        
+        total_pasivo = pasivo_corto_plazo
+        resultado += f"\n{'TOTAL PASIVO':<30} ${pesos(total_pasivo):>15,.2f}\n"
+        
+        # Capital
+        resultado += "\nCAPITAL CONTABLE\n"
+        # El Capital Social debe tener saldo acreedor (negativo)
+        capital_social = abs(cuentas["Capital social"]) if cuentas["Capital social"] < 0 else cuentas["Capital social"]
+        utilidad_ejercicio = self._utilidad_ejercicio(cuentas)
+        utilidades_retenidas = abs(cuentas["Utilidades retenidas"]) if cuentas["Utilidades retenidas"] < 0 else 0
+        
+        resultado += f"{'Capital social':<30} ${pesos(capital_social):>15,.2f}\n"
+        if utilidad_ejercicio != 0:
+            resultado += f"{'Utilidad del ejercicio':<30} ${pesos(utilidad_ejercicio):>15,.2f}\n"
+        if utilidades_retenidas > 0:
+            resultado += f"{'Utilidades retenidas':<30} ${pesos(utilidades_retenidas):>15,.2f}\n"
+        
+        total_capital = capital_social + utilidad_ejercicio + utilidades_retenidas
+        resultado += f"{'Total Capital Contable':<30} ${pesos(total_capital):>15,.2f}\n"
+        
+        resultado += f"\n{'TOTAL PASIVO + CAPITAL':<30} ${pesos(total_pasivo + total_capital):>15,.2f}\n"
+        
+        # Verificar si el balance está cuadrado
+        if total_activo == (total_pasivo + total_capital):
+            resultado += "\nEl balance general está cuadrado."
+        else:
+            resultado += f"\nEl balance general NO está cuadrado. Diferencia: ${pesos(abs(total_activo - (total_pasivo + total_capital))):,.2f}"
+        
+        return resultado
+    
+    @staticmethod
+    def calcular_resultados(cuentas):
+        """Totales del estado de resultados a partir de unos saldos, sin modificarlos.
+        
+        Los ingresos tienen saldo acreedor (negativo) y los costos y gastos deudor; una
+        cuenta con saldo contrario resta en lugar de sumar.
+        """
+        ventas = -cuentas["Ventas"]
+        productos_financieros = -cuentas["Productos financieros"]
+        otros_ingresos = -cuentas["Otros ingresos"]
+        total_ingresos = ventas + productos_financieros + otros_ingresos
+        costo_ventas = cuentas["Costo de ventas"]
+        utilidad_bruta = total_ingresos - costo_ventas
+        gastos_venta = cuentas["Gastos de venta"]
+        gastos_admin = cuentas["Gastos de administración"]
+        gastos_financieros = cuentas["Gastos financieros"]
+        total_gastos = gastos_venta + gastos_admin + gastos_financieros
+        return {
+            "ventas": ventas,
+            "productos_financieros": productos_financieros,
+            "otros_ingresos": otros_ingresos,
+            "total_ingresos": total_ingresos,
+            "costo_ventas": costo_ventas,
+            "utilidad_bruta": utilidad_bruta,
+            "gastos_venta": gastos_venta,
+            "gastos_admin": gastos_admin,
+            "gastos_financieros": gastos_financieros,
+            "total_gastos": total_gastos,
+            "utilidad_neta": utilidad_bruta - total_gastos
+        }
+    
+    def _resultados(self, cuentas):
+        """Totales de resultados de unos saldos; los del sistema ya están calculados"""
+        return self.resultados if cuentas is self.cuentas else self.calcular_resultados(cuentas)
+    
+    def _utilidad_ejercicio(self, cuentas):
+        """Utilidad del ejercicio para el capital: la ya cerrada en su cuenta (saldo
+        acreedor) más la de las cuentas de resultados aún sin cerrar"""
+        return -cuentas["Utilidad del ejercicio"] + self._resultados(cuentas)["utilidad_neta"]
+    
+    def generar_estado_resultados(self, saldos=None, desde=None, hasta=None):
+        """Genera el texto del estado de resultados"""
+        return self._reporte("resultados", self._estado_resultados, saldos, desde, hasta)
+    
+    def _estado_resultados(self, saldos, desde, hasta):
+        """Genera el reporte sin usar la caché"""
+        cuentas, fecha_corte = self._saldos(saldos, desde, hasta)
+        totales = self._resultados(cuentas)
+        resultado = "=== ESTADO DE RESULTADOS ===\n"
+        resultado += f"Fecha: {fecha_corte}\n\n"
+        
+        # Ingresos
+        resultado += "INGRESOS\n"
+        resultado += f"{'Ventas':<30} ${pesos(totales['ventas']):>15,.2f}\n"
+        if totales["productos_financieros"] != 0:
+            resultado += f"{'Productos financieros':<30} ${pesos(totales['productos_financieros']):>15,.2f}\n"
+        if totales["otros_ingresos"] != 0:
+            resultado += f"{'Otros ingresos':<30} ${pesos(totales['otros_ingresos']):>15,.2f}\n"
+        resultado += f"{'Total Ingresos':<30} ${pesos(totales['total_ingresos']):>15,.2f}\n\n"
+        
+        # Costo de ventas
+        resultado += f"{'Costo de ventas':<30} ${pesos(totales['costo_ventas']):>15,.2f}\n\n"
+        
+        # Utilidad bruta
+        resultado += f"{'UTILIDAD BRUTA':<30} ${pesos(totales['utilidad_bruta']):>15,.2f}\n\n"
+        
+        # Gastos
+        resultado += "GASTOS\n"
+        if totales["gastos_venta"] != 0:
+            resultado += f"{'Gastos de venta':<30} ${pesos(totales['gastos_venta']):>15,.2f}\n"
+        if totales["gastos_admin"] != 0:
+            resultado += f"{'Gastos de administración':<30} ${pesos(totales['gastos_admin']):>15,.2f}\n"
+        if totales["gastos_financieros"] != 0:
+            resultado += f"{'Gastos financieros':<30} ${pesos(totales['gastos_financieros']):>15,.2f}\n"
+        resultado += f"{'Total Gastos':<30} ${pesos(totales['total_gastos']):>15,.2f}\n\n"
+        
+        # Utilidad neta
+        resultado += f"{'UTILIDAD NETA':<30} ${pesos(totales['utilidad_neta']):>15,.2f}\n"
+        
+        return resultado
+    
+    def generar_estado_cambios_capital(self, saldos=None, desde=None, hasta=None):
+        """Genera el texto del estado de cambios en el capital contable"""
+        return self._reporte("cambios_capital", self._estado_cambios_capital, saldos, desde, hasta)
+    
+    def _estado_cambios_capital(self, saldos, desde, hasta):
+        """Genera el reporte sin usar la caché"""
+        cuentas, fecha_corte = self._saldos(saldos, desde, hasta)
+        resultado = "=== ESTADO DE CAMBIOS EN EL CAPITAL CONTABLE ===\n"
+        resultado += f"Fecha: {fecha_corte}\n\n"
+        
+        # Capital inicial
+        capital_inicial = abs(cuentas["Capital social"])
+        utilidades_retenidas = abs(cuentas["Utilidades retenidas"]) if cuentas["Utilidades retenidas"] < 0 else 0
+        
+        resultado += f"{'Capital social inicial':<30} ${pesos(capital_inicial):>15,.2f}\n"
+        if utilidades_retenidas > 0:
+            resultado += f"{'Utilidades retenidas':<30} ${pesos(utilidades_retenidas):>15,.2f}\n"
+        
+        capital_contable_inicial = capital_inicial + utilidades_retenidas
+        resultado += f"{'Capital contable inicial':<30} ${pesos(capital_contable_inicial):>15,.2f}\n\n"
+        
+        # Movimientos del capital
+        # Aquí se podrían agregar otros movimientos como aumentos o disminuciones de capital
+        
+        # Utilidad del ejercicio
+        utilidad_ejercicio = self._utilidad_ejercicio(cuentas)
+        resultado += f"{'Utilidad del ejercicio':<30} ${pesos(utilidad_ejercicio):>15,.2f}\n\n"
+        
+        # Capital final
+        capital_contable_final = capital_contable_inicial + utilidad_ejercicio
+        resultado += f"{'Capital contable final':<30} ${pesos(capital_contable_final):>15,.2f}\n"
+        
+        return resultado
+    
+    def _iter_seccion_flujos(self, actividad, titulo, etiqueta_total, resumen, siempre=False, desde=None,
+                             hasta=None, detalle=True):
+        """Genera una sección del estado de flujos; el total se devuelve al terminar.
+        
+        El número de flujos y el total salen del resumen (ver resumen_flujos); el detalle
+        solo recorre los flujos ya clasificados en la actividad que cuenta el resumen. Si
+        la sección no es obligatoria, solo se escribe cuando la actividad tiene flujos en
+        el periodo.
+        """
+        codigo = AlmacenAsientos.ACTIVIDADES.index(actividad)
+        cantidad, total = resumen["totales"][codigo]
+        if not siempre and cantidad == 0:
+            return 0
+        yield titulo
+        if detalle:
+            for descripcion, monto in self.almacen.iter_flujos(desde, hasta, codigo, resumen["num_flujos"]):
+                yield f"{descripcion:<30} ${pesos(monto):>15,.2f}\n"
+        yield f"{etiqueta_total:<30} ${pesos(total):>15,.2f}\n\n"
+        return total
+    
+    def resumen_flujos(self, desde=None, hasta=None):
+        """Cifras del estado de flujos de efectivo: número de flujos registrados, número y
+        total por actividad (en el orden de ACTIVIDADES) y efectivo inicial y actual.
+        
+        Todo sale de los totales acumulados con bisect, así que se puede tomar en el hilo
+        que registra y dibujar el reporte en otro con iter_estado_flujos_efectivo(resumen=...)
+        sin copiar el almacén.
+        """
+        desde, hasta = self._periodo(desde, hasta)
+        almacen = self.almacen
+        totales = tuple(almacen.total_flujos(codigo, desde, hasta) for codigo in range(len(AlmacenAsientos.ACTIVIDADES)))
+        
+        # Los asientos de apertura no son flujos de una actividad: su efectivo es el saldo inicial
+        efectivo_inicial = totales[AlmacenAsientos.ACTIVIDADES.index("apertura")][1]
+        if desde is not None:
+            efectivo_inicial += max(self.saldo("Caja", desde - 1), 0) + max(self.saldo("Bancos", desde - 1), 0)
+        efectivo_actual = max(self.saldo("Caja", hasta), 0) + max(self.saldo("Bancos", hasta), 0)
+        return {"num_flujos": almacen.num_flujos(), "totales": totales,
+                "efectivo_inicial": efectivo_inicial, "efectivo_actual": efectivo_actual}
+    
+    def iter_estado_flujos_efectivo(self, desde=None, hasta=None, detalle=True, resumen=None):
+        """Genera el estado de flujos de efectivo línea por línea.
+        
+        Con desde/hasta solo se incluyen los flujos de ese periodo; el saldo inicial es el
+        de Caja y Bancos al día anterior a desde y el final se compara con el de hasta.
+        Los asientos de apertura no son flujos de una actividad: su efectivo se suma al
+        saldo inicial. Con detalle=False solo se escriben los totales por actividad, que
+        no dependen del número de flujos. resumen es el de resumen_flujos(desde, hasta)
+        ya tomado (por omisión se toma al empezar).
+        """
+        if resumen is None:
+            resumen = self.resumen_flujos(desde, hasta)
+        desde, hasta = self._periodo(desde, hasta)
+        yield "=== ESTADO DE FLUJOS DE EFECTIVO ===\n"
+        yield f"Fecha: {self._texto_periodo(desde, hasta)}\n\n"
+        
+        # Saldo inicial de efectivo
+        saldo_inicial_efectivo = resumen["efectivo_inicial"]
+        yield f"{'Saldo inicial de efectivo':<30} ${pesos(saldo_inicial_efectivo):>15,.2f}\n\n"
+        
+        # Cada sección toma su total de los acumulados de su actividad
+        total_operacion = yield from self._iter_seccion_flujos(
+            "operacion", "FLUJOS DE EFECTIVO DE ACTIVIDADES DE OPERACIÓN\n", "Total flujos de operación", resumen,
+            siempre=True, desde=desde, hasta=hasta, detalle=detalle)
+        total_inversion = yield from self._iter_seccion_flujos(
+            "inversion", "FLUJOS DE EFECTIVO DE ACTIVIDADES DE INVERSIÓN\n", "Total flujos de inversión", resumen,
+            desde=desde, hasta=hasta, detalle=detalle)
+        total_financiamiento = yield from self._iter_seccion_flujos(
+            "financiamiento", "FLUJOS DE EFECTIVO DE ACTIVIDADES DE FINANCIAMIENTO\n", "Total flujos de financiamiento",
+            resumen, desde=desde, hasta=hasta, detalle=detalle)
+        
+        # Incremento neto de efectivo
+        incremento_neto = total_operacion + total_inversion + total_financiamiento
+        yield f"{'Incremento neto de efectivo':<30} ${pesos(incremento_neto):>15,.2f}\n\n"
+        
+        # Saldo final de efectivo
+        saldo_final_efectivo = saldo_inicial_efectivo + incremento_neto
+        yield f"{'Saldo final de efectivo':<30} ${pesos(saldo_final_efectivo):>15,.2f}\n"
+        
+        # Verificar si coincide con el saldo actual
+        saldo_actual_efectivo = resumen["efectivo_actual"]
+        if saldo_final_efectivo == saldo_actual_efectivo:
+            yield "\nEl saldo final de efectivo coincide con el saldo actual en Caja y Bancos."
+        else:
+            yield f"\nEl saldo final de efectivo NO coincide con el saldo actual en Caja y Bancos (${pesos(saldo_actual_efectivo):,.2f})."
+            yield f"\nDiferencia: ${pesos(abs(saldo_final_efectivo - saldo_actual_efectivo)):,.2f}"
+    
+    def generar_estado_flujos_efectivo(self, desde=None, hasta=None, detalle=True):
+        """Genera el texto del estado de flujos de efectivo"""
+        # El saldo inicial depende de los asientos anteriores a desde
+        return self._reporte("flujos", self._estado_flujos_efectivo, None, desde, hasta, detalle, acumulado=True)
+    
+    def _estado_flujos_efectivo(self, saldos, desde, hasta, detalle):
+        """Genera el reporte sin usar la caché"""
+        return "".join(self.iter_estado_flujos_efectivo(desde, hasta, detalle))
+
+
+def escribir_reporte(lineas, destino, lineas_por_bloque=1000):
+    """Escribe un reporte generado por un iter_* en cualquier objeto con write()
+    (archivo, socket.makefile(), etc.) en bloques de lineas_por_bloque líneas"""
+    bloque = []
+    for linea in lineas:
+        bloque.append(linea)
+        if len(bloque) >= lineas_por_bloque:
+            destino.write("".join(bloque))
+            bloque.clear()
+    if bloque:
+        destino.write("".join(bloque))
+
+
+def __getattr__(nombre):
+    """La interfaz gráfica está en interfaz_contable; se importa (con tkinter) solo si se pide"""
+    if nombre in ("AplicacionContable", "ReporteCancelado"):
+        import interfaz_contable
+        return getattr(interfaz_contable, nombre)
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+
+# Función principal para ejecutar el programa
+def main():
+    from interfaz_contable import main as main_interfaz
+    main_interfaz()
+
+if __name__ == "__main__":
+    main()
+
@@ -0,0 +1,114 @@
+"""Pruebas del almacén columnar de asientos: columnas, catálogos, memoria y reportes que lo leen.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import tracemalloc
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import sistema_contable
+from almacen_asientos import AlmacenAsientos
+from sistema_contable_completo import SistemaContable
+
+FECHA = date(2025, 1, 15).toordinal()
+ASIENTOS = [
+    ("Venta", {"Bancos": 11600}, {"Ventas": 10000, "IVA trasladado": 1600}),
+    ("Compra", {"Mercancía": 5000, "IVA acreditable": 800}, {"Proveedores": 5800}),
+    ("Venta", {"Caja": 2320}, {"Ventas": 2000, "IVA trasladado": 320}),
+]
+
+
+class PruebasAlmacenAsientos(unittest.TestCase):
+    
+    def setUp(self):
+        self.almacen = AlmacenAsientos()
+        self.primero, self.cambios = self.almacen.agregar_asientos(FECHA, ASIENTOS)
+    
+    def test_columnas_por_asiento_y_por_linea(self):
+        almacen = self.almacen
+        self.assertEqual(self.primero, 0)
+        self.assertEqual(almacen.num_asientos(), 3)
+        self.assertEqual(almacen.num_lineas(), 9)
+        self.assertEqual(list(almacen.asiento_inicio), [0, 3, 6])
+        self.assertEqual(list(almacen.lineas_asiento(1)), [3, 4, 5])
+        self.assertEqual(list(almacen.lineas_asiento(2)), [6, 7, 8])
+        self.assertEqual(list(almacen.linea_lado), [0, 1, 1, 0, 0, 1, 0, 1, 1])
+        self.assertEqual(list(almacen.linea_asiento), [0, 0, 0, 1, 1, 1, 2, 2, 2])
+        self.assertEqual(almacen.linea_monto[4], 800)
+        self.assertEqual(almacen.nombres_cuentas[almacen.linea_cuenta[4]], "IVA acreditable")
+    
+    def test_catalogos_guardan_cada_texto_una_vez(self):
+        almacen = self.almacen
+        self.assertEqual(almacen.descripciones, ["Venta", "Compra"])
+        self.assertEqual(almacen.asiento_descripcion[0], almacen.asiento_descripcion[2])
+        self.assertEqual(len(almacen.nombres_cuentas), 7)
+        ventas = almacen.ids_cuentas["Ventas"]
+        self.assertEqual(list(almacen.lineas_por_cuenta[ventas]), [1, 7])
+    
+    def test_cambio_neto_por_cuenta(self):
+        self.assertEqual(self.cambios, {"Bancos": 11600, "Ventas": -12000, "IVA trasladado": -1920,
+                                        "Mercancía": 5000, "IVA acreditable": 800, "Proveedores": -5800,
+                                        "Caja": 2320})
+    
+    def test_iter_registros_y_subconjunto(self):
+        registros = list(self.almacen.iter_registros(range(3)))
+        self.assertEqual([(registro["descripcion"], registro["cargos"], registro["abonos"]) for registro in registros],
+                         ASIENTOS)
+        self.assertTrue(all(registro["fecha"] == FECHA for registro in registros))
+        subconjunto = self.almacen.subconjunto([2, 0])
+        self.assertEqual([registro["descripcion"] for registro in subconjunto.iter_registros(range(2))],
+                         ["Venta", "Venta"])
+        self.assertEqual(subconjunto.linea_monto[0], 2320)
+    
+    def test_memoria_por_millon_de_lineas(self):
+        almacen = AlmacenAsientos()
+        for _ in range(100):
+            almacen.agregar_asientos(FECHA, ASIENTOS * 100)
+        memoria = almacen.memoria_por_millon_lineas()
+        self.assertGreater(memoria, 0)
+        # Columnas tipadas: unas decenas de bytes por línea, no un dict por línea
+        self.assertLess(memoria, 80 * 1_000_000)
+    
+    def test_memoria_contra_un_diccionario_por_linea(self):
+        def memoria_agregada(sistema):
+            # Solo la memoria que agregan las operaciones, sin la del sistema vacío
+            tracemalloc.start()
+            try:
+                for i in range(2000):
+                    sistema.compra_efectivo(100 + i % 500, "Bancos" if i % 2 else "Caja")
+                    sistema.compra_credito(100 + i % 300)
+                return tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+        
+        anterior = memoria_agregada(sistema_contable.SistemaContable())
+        actual = memoria_agregada(SistemaContable())
+        self.assertGreater(anterior / actual, 5)
+    
+    def test_flujos_apuntan_al_asiento(self):
+        sistema = SistemaContable()
+        sistema.registrar_asientos_lote(ASIENTOS, FECHA)
+        almacen = sistema.almacen
+        # Las descripciones se guardan una vez y los flujos solo guardan el número de asiento
+        self.assertEqual(almacen.descripciones.count("Venta"), 1)
+        primero = almacen.num_asientos() - len(ASIENTOS)
+        self.assertEqual(list(almacen.flujo_asiento)[-2:], [primero, primero + 2])
+        self.assertEqual(list(almacen.iter_flujos())[-2:], [("Venta", 11600), ("Venta", 2320)])
+    
+    def test_diario_y_mayor_se_leen_del_almacen(self):
+        sistema = SistemaContable()
+        sistema.registrar_asientos_lote(ASIENTOS, FECHA)
+        diario = sistema.generar_diario()
+        self.assertIn("Compra\nCARGOS:\n  Mercancía: $50.00\n  IVA acreditable: $8.00\nABONOS:\n  Proveedores: $58.00\n",
+                      diario)
+        mayor = sistema.generar_mayor()
+        self.assertIn("\nCuenta: Ventas\nCARGOS:\nABONOS:\n  15/01/2025 - Venta: $100.00\n"
+                      "  15/01/2025 - Venta: $20.00\nSaldo: $-120.00\n", mayor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""Pruebas de la bitácora JSONL: fsync agrupado, cola dañada, posiciones inválidas y
+recuperación del sistema.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bitacora import BitacoraJSONL
+from sistema_contable_completo import SistemaContable
+
+ASIENTO = ("Venta", {"Bancos": 116}, {"Ventas": 100, "IVA trasladado": 16})
+
+
+class PruebasBitacora(unittest.TestCase):
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "diario.jsonl")
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def escribir(self, cantidad, **opciones):
+        """Bitácora cerrada con `cantidad` asientos de uno por lote; devuelve el tamaño de cada línea"""
+        bitacora = BitacoraJSONL(self.ruta, **opciones)
+        tamanos = []
+        for _ in range(cantidad):
+            antes = bitacora.posicion()
+            bitacora.anexar(738000, [ASIENTO])
+            tamanos.append(bitacora.posicion() - antes)
+        bitacora.cerrar()
+        return tamanos
+    
+    def test_fsync_agrupado_por_numero_de_asientos(self):
+        bitacora = BitacoraJSONL(self.ruta, fsync_cada=3)
+        with mock.patch("bitacora.os.fsync") as fsync:
+            bitacora.anexar(738000, [ASIENTO])
+            bitacora.anexar(738000, [ASIENTO])
+            self.assertEqual(fsync.call_count, 1)  # Solo el del directorio al crear el archivo
+            bitacora.anexar(738000, [ASIENTO])
+            self.assertEqual(fsync.call_count, 2)
+            bitacora.anexar(738000, [ASIENTO] * 5)  # Un lote grande es un solo fsync
+            self.assertEqual(fsync.call_count, 3)
+            bitacora.anexar(738000, [ASIENTO])
+            bitacora.cerrar()  # Sincroniza el asiento pendiente
+            self.assertEqual(fsync.call_count, 4)
+        self.assertEqual(len(list(BitacoraJSONL(self.ruta).leer())), 9)
+    
+    def test_sin_fsync_por_asiento_solo_al_cerrar(self):
+        bitacora = BitacoraJSONL(self.ruta, fsync_cada=None)
+        with mock.patch("bitacora.os.fsync") as fsync:
+            for _ in range(100):
+                bitacora.anexar(738000, [ASIENTO])
+            self.assertEqual(fsync.call_count, 1)
+            bitacora.cerrar()
+            self.assertEqual(fsync.call_count, 2)
+    
+    def test_fsync_por_tiempo(self):
+        bitacora = BitacoraJSONL(self.ruta, fsync_cada=None, fsync_ms=10)
+        bitacora.anexar(738000, [ASIENTO])
+        limite = time.monotonic() + 5
+        while bitacora._pendientes and time.monotonic() < limite:
+            time.sleep(0.01)
+        self.assertEqual(bitacora._pendientes, 0)
+        bitacora.cerrar()
+    
+    def test_linea_incompleta_al_final_se_trunca(self):
+        self.escribir(3)
+        tamano = os.path.getsize(self.ruta)
+        with open(self.ruta, "ab") as archivo:
+            archivo.write(b'0badc0de {"id":4,"fecha":738000,"descr')  # Caída a media escritura
+        
+        bitacora = BitacoraJSONL(self.ruta)
+        self.assertEqual([registro["id"] for registro in bitacora.leer()], [1, 2, 3])
+        self.assertEqual(os.path.getsize(self.ruta), tamano)
+        # Lo que se anexa después sigue la numeración y queda legible
+        bitacora.anexar(738001, [ASIENTO])
+        bitacora.cerrar()
+        self.assertEqual([registro["id"] for registro in BitacoraJSONL(self.ruta).leer()], [1, 2, 3, 4])
+    
+    def test_suma_de_verificacion_incorrecta_trunca_desde_esa_linea(self):
+        tamanos = self.escribir(3)
+        with open(self.ruta, "r+b") as archivo:
+            archivo.seek(tamanos[0] + 10)
+            archivo.write(b"X")  # Daña el cuerpo de la segunda línea
+        self.assertEqual([registro["id"] for registro in BitacoraJSONL(self.ruta).leer()], [1])
+        self.assertEqual(os.path.getsize(self.ruta), tamanos[0])
+    
+    def test_leer_desde_una_posicion(self):
+        tamanos = self.escribir(3)
+        registros = list(BitacoraJSONL(self.ruta).leer(tamanos[0]))
+        self.assertEqual([registro["id"] for registro in registros], [2, 3])
+        self.assertEqual(list(BitacoraJSONL(self.ruta).leer(sum(tamanos))), [])
+    
+    def test_posicion_despues_del_final_es_un_error(self):
+        tamanos = self.escribir(3)
+        with self.assertRaises(ValueError):
+            list(BitacoraJSONL(self.ruta).leer(sum(tamanos) + 100))
+    
+    def test_posicion_a_media_linea_es_un_error_y_no_trunca(self):
+        tamanos = self.escribir(3)
+        tamano = os.path.getsize(self.ruta)
+        with self.assertRaises(ValueError):
+            list(BitacoraJSONL(self.ruta).leer(tamanos[0] + 5))
+        self.assertEqual(os.path.getsize(self.ruta), tamano)
+        self.assertEqual(len(list(BitacoraJSONL(self.ruta).leer())), 3)
+    
+    def test_reemplazar_numera_desde_uno_y_sincroniza_el_directorio(self):
+        self.escribir(5)
+        bitacora = BitacoraJSONL(self.ruta)
+        list(bitacora.leer())
+        registros = [{"fecha": 738002, "descripcion": "Apertura", "cargos": {"Bancos": 10}, "abonos": {"Capital social": 10}}]
+        with mock.patch("bitacora.os.fsync") as fsync:
+            bitacora.reemplazar(registros)
+            self.assertEqual(fsync.call_count, 2)  # El archivo temporal y el directorio
+        bitacora.anexar(738003, [ASIENTO])
+        bitacora.cerrar()
+        self.assertEqual([(registro["id"], registro["descripcion"]) for registro in BitacoraJSONL(self.ruta).leer()],
+                         [(1, "Apertura"), (2, "Venta")])
+        self.assertFalse(os.path.exists(self.ruta + ".tmp"))
+    
+    def test_el_sistema_se_recupera_de_la_bitacora_sin_cerrarla(self):
+        # Con fsync por asiento cada lote ya está en disco al regresar de registrarlo
+        sistema = SistemaContable(BitacoraJSONL(self.ruta))
+        sistema.registrar_asiento(*ASIENTO, fecha=738000)
+        sistema.registrar_asientos_lote([ASIENTO] * 20, 738001)
+        sistema.registrar_asiento("Compra de equipo", {"Equipo de computo": 500}, {"Bancos": 500}, 738002,
+                                  actividad="inversion")
+        recuperado = SistemaContable(BitacoraJSONL(self.ruta))
+        self.assertEqual(recuperado.asientos_recuperados, sistema.asientos_aplicados)
+        self.assertEqual(recuperado.cuentas, sistema.cuentas)
+        self.assertEqual(recuperado.generar_diario(), sistema.generar_diario())
+        self.assertEqual(recuperado.generar_estado_flujos_efectivo(), sistema.generar_estado_flujos_efectivo())
+        saldos = BitacoraJSONL(self.ruta).saldos_por_cuenta()
+        self.assertEqual({cuenta: saldo for cuenta, saldo in sistema.cuentas.items() if saldo},
+                         {cuenta: saldo for cuenta, saldo in saldos.items() if saldo})
+        sistema.persistencia.cerrar()
+        recuperado.persistencia.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
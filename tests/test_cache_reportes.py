@@ -0,0 +1,90 @@
+"""Pruebas de la caché de reportes: aciertos por fecha de corte y periodo, invalidación
+al registrar asientos con fecha anterior y desalojo LRU.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cache_reportes import CacheReportes
+from sistema_contable_completo import SistemaContable
+
+INICIO = date(2025, 1, 1)
+CORTE = INICIO + timedelta(days=30)
+VENTA = ({"Bancos": 11600}, {"Ventas": 10000, "IVA trasladado": 1600})
+
+
+class PruebasCacheReportes(unittest.TestCase):
+    
+    def setUp(self):
+        self.sistema = SistemaContable()
+        for dia in range(60):
+            self.sistema.registrar_asiento("Venta", *VENTA, INICIO + timedelta(days=dia))
+        self.cache = self.sistema.cache_reportes
+    
+    def registrar(self, fecha):
+        self.sistema.registrar_asiento("Venta", *VENTA, fecha)
+    
+    def recalculado(self, generar, **periodo):
+        """Reporte generado sin la caché, para comparar con el guardado"""
+        self.cache.limpiar(self.sistema.version)
+        return generar(**periodo)
+    
+    def test_reporte_repetido_sale_de_la_cache(self):
+        balanza = self.sistema.generar_balanza_comprobacion(hasta=CORTE)
+        aciertos = self.cache.aciertos
+        self.assertIs(self.sistema.generar_balanza_comprobacion(hasta=CORTE), balanza)
+        self.assertEqual(self.cache.aciertos, aciertos + 1)
+        self.assertGreater(self.cache.estadisticas()["tasa_aciertos"], 0)
+    
+    def test_asientos_posteriores_al_corte_no_invalidan(self):
+        balance = self.sistema.generar_balance_general(hasta=CORTE)
+        resultados = self.sistema.generar_estado_resultados(desde=INICIO, hasta=CORTE)
+        self.registrar(CORTE + timedelta(days=1))
+        self.assertIs(self.sistema.generar_balance_general(hasta=CORTE), balance)
+        self.assertIs(self.sistema.generar_estado_resultados(desde=INICIO, hasta=CORTE), resultados)
+        self.assertEqual(self.cache.invalidadas, 0)
+    
+    def test_asientos_con_fecha_anterior_invalidan(self):
+        generar = self.sistema.generar_balanza_comprobacion
+        balanza = generar(hasta=CORTE)
+        periodo = self.sistema.generar_estado_resultados(desde=CORTE, hasta=CORTE + timedelta(days=5))
+        flujos = self.sistema.generar_estado_flujos_efectivo(desde=CORTE, hasta=CORTE + timedelta(days=5))
+        self.registrar(INICIO + timedelta(days=3))
+        # Un periodo posterior sigue en la caché; el estado de flujos depende del saldo inicial y no
+        self.assertIs(self.sistema.generar_estado_resultados(desde=CORTE, hasta=CORTE + timedelta(days=5)), periodo)
+        self.assertNotEqual(self.sistema.generar_estado_flujos_efectivo(desde=CORTE, hasta=CORTE + timedelta(days=5)),
+                            flujos)
+        nueva = generar(hasta=CORTE)
+        self.assertNotEqual(nueva, balanza)
+        self.assertEqual(nueva, self.recalculado(generar, hasta=CORTE))
+    
+    def test_version_atrasada_no_lee_ni_guarda(self):
+        cache = CacheReportes()
+        cache.invalidar(INICIO.toordinal(), 2)
+        cache.guardar(("balanza", None, None), 1, "atrasado")
+        self.assertIsNone(cache.obtener(("balanza", None, None), 2))
+        cache.guardar(("balanza", None, None), 2, "vigente")
+        self.assertIsNone(cache.obtener(("balanza", None, None), 1))
+        self.assertEqual(cache.obtener(("balanza", None, None), 2), "vigente")
+    
+    def test_desalojo_lru(self):
+        cache = CacheReportes(max_caracteres=30)
+        for nombre in "abc":
+            cache.guardar((nombre,), 0, nombre * 10)
+        cache.obtener(("a",), 0)  # "a" pasa a ser la más reciente
+        cache.guardar(("d",), 0, "d" * 10)
+        self.assertIsNone(cache.obtener(("b",), 0))
+        self.assertEqual([cache.obtener((nombre,), 0) for nombre in "acd"], ["a" * 10, "c" * 10, "d" * 10])
+        estadisticas = cache.estadisticas()
+        self.assertEqual((estadisticas["entradas"], estadisticas["caracteres"], estadisticas["desalojadas"]), (3, 30, 1))
+        cache.guardar(("grande",), 0, "x" * 31)  # Más grande que la caché: no se guarda
+        self.assertEqual(cache.estadisticas()["entradas"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
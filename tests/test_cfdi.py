@@ -0,0 +1,115 @@
+"""Pruebas de la ingesta de CFDI: asientos de compras y ventas, UUID repetidos y una
+caída entre guardar los asientos y marcar sus UUID en el índice.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bitacora import BitacoraJSONL
+from cfdi import IndiceUUID, ingerir_directorio, leer_cfdi
+from sistema_contable_completo import SistemaContable
+
+RFC = "EMP010101AAA"
+TERCERO = "XAXX010101000"
+
+
+def escribir_cfdi(ruta, uuid, emisor, receptor, metodo, subtotal="1000.00", iva="160.00", tipo="I"):
+    """CFDI 4.0 timbrado mínimo con un traslado de IVA"""
+    total = f"{float(subtotal) + float(iva):.2f}"
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        archivo.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<cfdi:Comprobante xmlns:cfdi="http://www.sat.gob.mx/cfd/4" '
+            'xmlns:tfd="http://www.sat.gob.mx/TimbreFiscalDigital" Version="4.0" Fecha="2025-03-10T12:00:00" '
+            f'SubTotal="{subtotal}" Moneda="MXN" Total="{total}" TipoDeComprobante="{tipo}" MetodoPago="{metodo}">\n'
+            f'  <cfdi:Emisor Rfc="{emisor}"/><cfdi:Receptor Rfc="{receptor}"/>\n'
+            f'  <cfdi:Impuestos><cfdi:Traslados><cfdi:Traslado Impuesto="002" Importe="{iva}"/></cfdi:Traslados>'
+            '</cfdi:Impuestos>\n'
+            f'  <cfdi:Complemento><tfd:TimbreFiscalDigital UUID="{uuid}"/></cfdi:Complemento>\n'
+            '</cfdi:Comprobante>\n')
+
+
+def uuid_de(numero):
+    return f"{numero:08x}-0000-4000-8000-000000000000"
+
+
+class PruebasCFDI(unittest.TestCase):
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.facturas = os.path.join(self.directorio.name, "cfdi")
+        os.makedirs(self.facturas)
+        casos = ((TERCERO, RFC, "PUE"), (TERCERO, RFC, "PPD"), (RFC, TERCERO, "PUE"), (RFC, TERCERO, "PPD"))
+        for numero, (emisor, receptor, metodo) in enumerate(casos * 3):
+            escribir_cfdi(os.path.join(self.facturas, f"factura_{numero:03d}.xml"), uuid_de(numero), emisor,
+                          receptor, metodo)
+        self.bitacora = os.path.join(self.directorio.name, "diario.jsonl")
+        self.ruta_indice = os.path.join(self.directorio.name, "cfdi.db")
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def ingerir(self):
+        """Ingesta con un sistema y un índice recién abiertos, como en un proceso nuevo"""
+        persistencia = BitacoraJSONL(self.bitacora)
+        sistema = SistemaContable(persistencia)
+        indice = IndiceUUID(self.ruta_indice)
+        try:
+            return ingerir_directorio(sistema, self.facturas, RFC, indice, procesos=1), sistema
+        finally:
+            persistencia.cerrar()
+            indice.cerrar()
+    
+    def test_asientos_por_tipo_de_factura(self):
+        resumen, sistema = self.ingerir()
+        self.assertEqual(resumen, {"archivos": 12, "registrados": 12, "duplicados": 0, "errores": 0})
+        almacen = sistema.almacen
+        registros = list(almacen.iter_registros(range(almacen.num_asientos() - 4, almacen.num_asientos())))
+        self.assertEqual([(registro["cargos"], registro["abonos"]) for registro in registros], [
+            ({"Mercancía": 100000, "IVA acreditable": 16000}, {"Bancos": 116000}),
+            ({"Mercancía": 100000, "IVA por acreditar": 16000}, {"Proveedores": 116000}),
+            ({"Bancos": 116000}, {"Ventas": 100000, "IVA trasladado": 16000}),
+            ({"Clientes": 116000}, {"Ventas": 100000, "IVA por trasladar": 16000}),
+        ])
+        self.assertTrue(registros[0]["descripcion"].endswith(f"CFDI {uuid_de(8).upper()})"))
+    
+    def test_uuid_repetidos(self):
+        # Otra copia de una factura con otro nombre en el mismo directorio
+        escribir_cfdi(os.path.join(self.facturas, "copia.xml"), uuid_de(3), RFC, TERCERO, "PPD")
+        escribir_cfdi(os.path.join(self.facturas, "nota.xml"), uuid_de(99), RFC, TERCERO, "PUE", tipo="E")
+        resumen, _ = self.ingerir()
+        self.assertEqual((resumen["registrados"], resumen["duplicados"], resumen["errores"]), (12, 1, 1))
+        resumen, sistema = self.ingerir()
+        self.assertEqual((resumen["registrados"], resumen["duplicados"]), (0, 13))
+        self.assertEqual(sistema.almacen.num_asientos(), 13)  # Apertura y 12 facturas
+    
+    def test_caida_antes_de_marcar_los_uuid(self):
+        with mock.patch.object(IndiceUUID, "agregar", side_effect=OSError("caída")):
+            self.assertRaises(OSError, self.ingerir)
+        indice = IndiceUUID(self.ruta_indice)
+        self.assertEqual(indice.contiene(uuid_de(numero).upper() for numero in range(12)), set())
+        indice.cerrar()
+        
+        # Los asientos ya estaban en el diario: se recuperan sus UUID y no se registran otra vez
+        resumen, sistema = self.ingerir()
+        self.assertEqual((resumen["registrados"], resumen["duplicados"]), (0, 12))
+        self.assertEqual(sistema.almacen.num_asientos(), 13)
+        indice = IndiceUUID(self.ruta_indice)
+        self.assertEqual(len(indice.contiene(uuid_de(numero).upper() for numero in range(12))), 12)
+        indice.cerrar()
+    
+    def test_leer_cfdi(self):
+        datos = leer_cfdi(os.path.join(self.facturas, "factura_001.xml"))
+        self.assertEqual((datos["uuid"], datos["metodo_pago"], datos["receptor"]), (uuid_de(1).upper(), "PPD", RFC))
+        self.assertEqual((datos["subtotal"], datos["iva"], datos["total"], datos["otros_impuestos"]),
+                         (100000, 16000, 116000, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
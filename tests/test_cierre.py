@@ -0,0 +1,112 @@
+"""Pruebas del cierre de periodo interrumpido entre compactar la persistencia y escribir
+el punto de control nuevo, y de volver a cerrar una fecha ya cerrada.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bitacora import BitacoraJSONL
+from persistencia_sqlite import PersistenciaSQLite
+from puntos_control import PuntosControl
+from sistema_contable_completo import SistemaContable
+
+HASTA = date(2025, 3, 31)
+
+
+class PruebasCierre(unittest.TestCase):
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.puntos = os.path.join(self.directorio.name, "puntos")
+        self.archivo = os.path.join(self.directorio.name, "archivo")
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def bitacora(self):
+        return BitacoraJSONL(os.path.join(self.directorio.name, "diario.jsonl"))
+    
+    def sqlite(self):
+        return PersistenciaSQLite(os.path.join(self.directorio.name, "diario.db"))
+    
+    @staticmethod
+    def reportes(sistema):
+        return (sistema.fecha_cierre, sistema.asientos_aplicados, sistema.generar_diario(),
+                sistema.generar_balanza_comprobacion())
+    
+    def cerrar_con_caida(self, crear_persistencia, conservar_puntos):
+        """Registra 40 ventas con puntos de control cada 10 y cierra el periodo con una caída
+        al escribir el punto de control nuevo (la persistencia ya está compactada). Con
+        conservar_puntos los puntos de control anteriores sobreviven, como si la caída
+        hubiera sido antes de borrarlos. Devuelve los reportes del sistema ya cerrado"""
+        sistema = SistemaContable(crear_persistencia(), PuntosControl(self.puntos, cada=10))
+        for dia in range(40):
+            sistema.registrar_asiento("Venta", {"Bancos": 11600}, {"Ventas": 10000, "IVA trasladado": 1600},
+                                      date(2025, 1, 1) + timedelta(days=dia * 5))
+        sistema.puntos_control.esperar()
+        self.assertTrue(sistema.puntos_control._archivos())
+        
+        with mock.patch.object(PuntosControl, "escribir", side_effect=OSError("caída")):
+            if conservar_puntos:
+                with mock.patch.object(PuntosControl, "descartar"):
+                    self.assertRaises(OSError, sistema.cerrar_periodo, HASTA, directorio_archivo=self.archivo)
+            else:
+                self.assertRaises(OSError, sistema.cerrar_periodo, HASTA, directorio_archivo=self.archivo)
+        self.assertEqual(bool(sistema.puntos_control._archivos()), conservar_puntos)
+        esperado = self.reportes(sistema)
+        sistema.persistencia.cerrar()
+        return esperado
+    
+    def comprobar_recuperacion(self, crear_persistencia, conservar_puntos):
+        esperado = self.cerrar_con_caida(crear_persistencia, conservar_puntos)
+        self.assertEqual(esperado[0], HASTA.toordinal())
+        sistema = SistemaContable(crear_persistencia(), PuntosControl(self.puntos))
+        try:
+            self.assertEqual(self.reportes(sistema), esperado)
+        finally:
+            sistema.persistencia.cerrar()
+    
+    def test_caida_despues_de_compactar_la_bitacora(self):
+        self.comprobar_recuperacion(self.bitacora, conservar_puntos=False)
+    
+    def test_caida_despues_de_compactar_sqlite(self):
+        self.comprobar_recuperacion(self.sqlite, conservar_puntos=False)
+    
+    def test_puntos_de_control_anteriores_a_compactar_la_bitacora_se_ignoran(self):
+        self.comprobar_recuperacion(self.bitacora, conservar_puntos=True)
+    
+    def test_puntos_de_control_anteriores_a_compactar_sqlite_se_ignoran(self):
+        self.comprobar_recuperacion(self.sqlite, conservar_puntos=True)
+    
+    def test_punto_de_control_despues_del_cierre_se_usa(self):
+        for crear_persistencia in (self.bitacora, self.sqlite):
+            puntos = os.path.join(self.directorio.name, crear_persistencia.__name__)
+            sistema = SistemaContable(crear_persistencia(), PuntosControl(puntos))
+            sistema.registrar_asiento("Venta", {"Bancos": 11600}, {"Ventas": 10000, "IVA trasladado": 1600}, HASTA)
+            sistema.cerrar_periodo(HASTA, directorio_archivo=self.archivo)
+            persistencia = sistema.persistencia
+            self.assertIsNotNone(PuntosControl(puntos).restaurar_ultimo(sistema, persistencia))
+            persistencia.cerrar()
+    
+    def test_cerrar_una_fecha_ya_cerrada(self):
+        sistema = SistemaContable(self.bitacora())
+        sistema.registrar_asiento("Venta", {"Bancos": 11600}, {"Ventas": 10000, "IVA trasladado": 1600}, HASTA)
+        sistema.cerrar_periodo(HASTA, directorio_archivo=self.archivo)
+        esperado = self.reportes(sistema)
+        for fecha in (HASTA, HASTA - timedelta(days=1)):
+            with self.subTest(fecha=fecha):
+                self.assertRaises(ValueError, sistema.cerrar_periodo, fecha, directorio_archivo=self.archivo)
+                self.assertEqual(self.reportes(sistema), esperado)
+        self.assertEqual(os.listdir(self.archivo), [f"diario_{HASTA:%Y%m%d}.bin"])
+        sistema.persistencia.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Pruebas de la línea de comandos sin pantalla: registrar desde un archivo, imprimir un
+reporte y cerrar un periodo sin importar tkinter.
+
+Uso: python -m unittest discover tests
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, RAIZ)
+
+from bitacora import BitacoraJSONL
+from sistema_contable_completo import SistemaContable
+
+ASIENTOS = [
+    {"fecha": "2026-01-05", "descripcion": "Venta", "cargos": {"Bancos": "116.00"},
+     "abonos": {"Ventas": "100.00", "IVA trasladado": "16.00"}},
+    {"fecha": "2026-01-05", "descripcion": "Compra", "cargos": {"Mercancía": "50.00", "IVA acreditable": "8.00"},
+     "abonos": {"Bancos": "58.00"}},
+    {"fecha": "2026-02-10", "descripcion": "Cobro", "cargos": {"Caja": "20.00"}, "abonos": {"Bancos": "20.00"},
+     "actividad": "operacion"},
+]
+
+
+class PruebasComandos(unittest.TestCase):
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.bitacora = os.path.join(self.directorio.name, "diario.jsonl")
+        self.asientos = os.path.join(self.directorio.name, "asientos.jsonl")
+        with open(self.asientos, "w", encoding="utf-8") as archivo:
+            for asiento in ASIENTOS:
+                archivo.write(json.dumps(asiento, ensure_ascii=False) + "\n")
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def comandos(self, *argumentos):
+        """Ejecuta python -m comandos en un intérprete nuevo sin pantalla y comprueba al final
+        que tkinter no se importó. Devuelve el proceso terminado"""
+        programa = ("import runpy, sys\n"
+                    "try:\n"
+                    "    runpy.run_module('comandos', run_name='__main__')\n"
+                    "finally:\n"
+                    "    cargados = [nombre for nombre in sys.modules if nombre.split('.')[0] in ('tkinter', '_tkinter')]\n"
+                    "    assert not cargados, cargados\n")
+        entorno = {clave: valor for clave, valor in os.environ.items() if clave != "DISPLAY"}
+        return subprocess.run([sys.executable, "-c", programa, "--bitacora", self.bitacora, *argumentos],
+                              cwd=RAIZ, env=entorno, capture_output=True, text=True, timeout=60)
+    
+    def sistema(self):
+        bitacora = BitacoraJSONL(self.bitacora)
+        self.addCleanup(bitacora.cerrar)
+        return SistemaContable(bitacora)
+    
+    def test_registrar_y_reportes_sin_tkinter(self):
+        proceso = self.comandos("registrar", self.asientos)
+        self.assertEqual(proceso.returncode, 0, proceso.stderr)
+        self.assertEqual(proceso.stdout, "3 asientos registrados\n")
+        
+        sistema = self.sistema()
+        for tipo, esperado in (("balanza", sistema.generar_balanza_comprobacion(hasta=date(2026, 1, 31))),
+                               ("diario", "".join(sistema.iter_diario(hasta=date(2026, 1, 31))))):
+            with self.subTest(tipo=tipo):
+                salida = os.path.join(self.directorio.name, f"{tipo}.txt")
+                proceso = self.comandos("reporte", tipo, "--hasta", "2026-01-31", "--salida", salida)
+                self.assertEqual(proceso.returncode, 0, proceso.stderr)
+                with open(salida, encoding="utf-8") as archivo:
+                    self.assertEqual(archivo.read().rstrip("\n"), esperado.rstrip("\n"))
+        
+        proceso = self.comandos("reporte", "resultados")
+        self.assertEqual(proceso.returncode, 0, proceso.stderr)
+        self.assertIn("100.00", proceso.stdout)
+    
+    def test_cierre_sin_tkinter(self):
+        self.assertEqual(self.comandos("registrar", self.asientos).returncode, 0)
+        archivo = os.path.join(self.directorio.name, "archivo")
+        proceso = self.comandos("cierre", "2026-01-31", "--archivo", archivo)
+        self.assertEqual(proceso.returncode, 0, proceso.stderr)
+        self.assertEqual(os.listdir(archivo), ["diario_20260131.bin"])
+        self.assertEqual(self.sistema().fecha_cierre, date(2026, 1, 31).toordinal())
+        
+        # Volver a cerrar la misma fecha es un error del usuario, no una excepción sin atrapar
+        proceso = self.comandos("cierre", "2026-01-31", "--archivo", archivo)
+        self.assertEqual(proceso.returncode, 1)
+        self.assertTrue(proceso.stderr.startswith("Error: "), proceso.stderr)
+    
+    def test_asiento_no_valido(self):
+        with open(self.asientos, "a", encoding="utf-8") as archivo:
+            archivo.write('{"fecha": "2026-13-01", "descripcion": "x", "cargos": {}, "abonos": {}}\n')
+        proceso = self.comandos("registrar", self.asientos)
+        self.assertEqual(proceso.returncode, 1)
+        self.assertIn("línea 4", proceso.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
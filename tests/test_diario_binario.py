@@ -0,0 +1,82 @@
+"""Pruebas del diario binario: lo escrito desde el almacén se lee igual, incluso con
+asientos registrados con fecha anterior y líneas que cruzan bloques.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import diario_binario
+from diario_binario import DiarioBinario, escribir_diario_binario
+from sistema_contable_completo import SistemaContable
+
+INICIO = date(2025, 1, 1)
+
+
+class PruebasDiarioBinario(unittest.TestCase):
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "diario.bin")
+        self.sistema = SistemaContable()
+        # Fechas salteadas: la mitad de los asientos se registra con fecha anterior
+        for i in range(60):
+            fecha = INICIO + timedelta(days=(i * 7) % 45)
+            self.sistema.registrar_asiento(f"Venta {i}", {"Bancos": 11600 + i},
+                                           {"Ventas": 10000 + i, "IVA trasladado": 1600}, fecha)
+            if i % 4 == 0:
+                self.sistema.registrar_asiento(f"Compra {i}", {"Mercancía": 500, "IVA acreditable": 80},
+                                               {"Proveedores": 580}, fecha)
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def abrir(self):
+        escribir_diario_binario(self.sistema.almacen, self.ruta)
+        diario = DiarioBinario(self.ruta)
+        self.addCleanup(diario.cerrar)
+        return diario
+    
+    def comprobar_reportes(self, diario):
+        sistema = self.sistema
+        desde = (INICIO + timedelta(days=10)).toordinal()
+        hasta = (INICIO + timedelta(days=30)).toordinal()
+        for periodo in ((desde, hasta), (None, hasta), (desde, None)):
+            with self.subTest(periodo=periodo):
+                self.assertEqual(sistema.generar_diario(diario, *periodo), sistema.generar_diario(None, *periodo))
+                self.assertEqual(sistema.generar_mayor(diario, *periodo), sistema.generar_mayor(None, *periodo))
+                self.assertEqual(sistema.generar_balanza_comprobacion(diario.saldos_por_cuenta(*periodo), *periodo),
+                                 sistema.generar_balanza_comprobacion(desde=periodo[0], hasta=periodo[1]))
+        saldos = {cuenta: saldo for cuenta, saldo in sistema.cuentas.items()
+                  if cuenta in sistema.almacen.ids_cuentas}
+        self.assertEqual(diario.saldos_por_cuenta(), saldos)
+    
+    def test_ida_y_vuelta(self):
+        diario = self.abrir()
+        self.assertEqual(diario.num_lineas, self.sistema.almacen.num_lineas())
+        self.comprobar_reportes(diario)
+        # Sin periodo los asientos salen en orden de fecha con su número original
+        asientos = list(diario.iter_asientos())
+        self.assertEqual(sorted(numero for numero, *_ in asientos), list(range(1, len(asientos) + 1)))
+        fechas = [date.fromordinal(self.sistema.almacen.asiento_fecha[numero - 1]) for numero, *_ in asientos]
+        self.assertEqual(fechas, sorted(fechas))
+    
+    def test_lineas_que_cruzan_bloques(self):
+        with mock.patch.object(diario_binario, "LINEAS_POR_BLOQUE", 7):
+            diario = self.abrir()
+            self.comprobar_reportes(diario)
+    
+    def test_archivo_que_no_es_diario_binario(self):
+        with open(self.ruta, "wb") as archivo:
+            archivo.write(b"\x00" * diario_binario.ENCABEZADO.size)
+        self.assertRaises(ValueError, DiarioBinario, self.ruta)
+
+
+if __name__ == "__main__":
+    unittest.main()
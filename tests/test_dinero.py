@@ -0,0 +1,58 @@
+"""Pruebas de los montos en centavos enteros: redondeo, IVA y montos inválidos.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from dinero import a_centavos, calcular_iva, pesos, proporcion, redondear
+from sistema_contable_completo import SistemaContable
+
+
+class PruebasDinero(unittest.TestCase):
+    
+    def test_a_centavos(self):
+        self.assertEqual(a_centavos(0.1), 10)
+        self.assertEqual(a_centavos(1234.565), 123457)
+        self.assertEqual(a_centavos("0.005"), 1)
+        self.assertEqual(a_centavos("-0.005"), -1)
+        self.assertEqual(a_centavos(Decimal("19.99")), 1999)
+        self.assertEqual(a_centavos(7), 700)
+        self.assertEqual(a_centavos("1e3"), 100000)
+    
+    def test_redondeo_mitad_hacia_arriba(self):
+        self.assertEqual(redondear(Decimal("2.5")), 3)
+        self.assertEqual(redondear(Decimal("2.49")), 2)
+        self.assertEqual(redondear(Decimal("-2.5")), -3)
+    
+    def test_iva_proporcion_y_pesos(self):
+        self.assertEqual(calcular_iva(10000), 1600)
+        self.assertEqual(calcular_iva(3), 0)
+        self.assertEqual(calcular_iva(4), 1)
+        self.assertEqual(proporcion(11600, 50), 5800)
+        self.assertEqual(proporcion(101, 0.5), 1)
+        self.assertEqual(pesos(123457), Decimal("1234.57"))
+        self.assertEqual(pesos(-5), Decimal("-0.05"))
+    
+    def test_montos_invalidos_levantan_value_error(self):
+        for monto in ("abc", "", "inf", "-Infinity", "nan", float("inf"), float("nan"), 1e999, "1e999"):
+            with self.subTest(monto=monto):
+                self.assertRaises(ValueError, a_centavos, monto)
+        self.assertRaises(ValueError, proporcion, 10000, float("nan"))
+    
+    def test_operaciones_con_monto_infinito_no_registran_nada(self):
+        # float("inf") y float("1e999") son lo que llega de la captura en la interfaz
+        sistema = SistemaContable()
+        asientos = sistema.almacen.num_asientos()
+        self.assertRaises(ValueError, sistema.compra_efectivo, float("1e999"), "Caja")
+        self.assertRaises(ValueError, sistema.compra_combinada, 1000.0, float("nan"), "Bancos")
+        self.assertRaises(ValueError, sistema.venta_credito, 100.0, float("inf"))
+        self.assertEqual(sistema.almacen.num_asientos(), asientos)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Pruebas de los reportes generados línea por línea y de escribir_reporte.
+
+Uso: python -m unittest discover tests
+"""
+import io
+import os
+import sys
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sistema_contable_completo import SistemaContable, escribir_reporte
+
+
+class DestinoContado(io.StringIO):
+    """StringIO que cuenta las llamadas a write()"""
+    
+    escrituras = 0
+    
+    def write(self, texto):
+        self.escrituras += 1
+        return super().write(texto)
+
+
+class PruebasEscrituraReportes(unittest.TestCase):
+    
+    def setUp(self):
+        self.sistema = SistemaContable()
+        self.sistema.registrar_asientos_lote(
+            [("Venta", {"Bancos": 11600 + dia}, {"Ventas": 10000 + dia, "IVA trasladado": 1600}) for dia in range(300)],
+            date(2025, 4, 1))
+    
+    def test_los_generadores_coinciden_con_los_reportes(self):
+        sistema = self.sistema
+        self.assertEqual("".join(sistema.iter_diario()), sistema.generar_diario())
+        self.assertEqual("".join(sistema.iter_mayor()), sistema.generar_mayor())
+        self.assertEqual("".join(sistema.iter_estado_flujos_efectivo()), sistema.generar_estado_flujos_efectivo())
+    
+    def test_los_generadores_no_arman_el_reporte_completo(self):
+        lineas = self.sistema.iter_diario()
+        self.assertEqual(next(lineas), "=== LIBRO DIARIO ===\n")
+        self.assertTrue(next(lineas).startswith("\nAsiento 1 - "))
+        lineas.close()
+        # Cada línea es una sola línea de texto, no un bloque del reporte
+        self.assertTrue(all(linea.count("\n") <= 2 for linea in self.sistema.iter_mayor()))
+    
+    def test_iter_diario_desde_un_asiento(self):
+        sistema = self.sistema
+        inicio = sistema.almacen.num_asientos() - 2
+        parcial = "".join(sistema.iter_diario(inicio))
+        self.assertFalse(parcial.startswith("=== LIBRO DIARIO ==="))
+        self.assertTrue(sistema.generar_diario().endswith(parcial))
+        self.assertEqual(parcial.count("\nAsiento "), 2)
+    
+    def test_escribir_reporte_por_bloques(self):
+        destino = DestinoContado()
+        lineas = list(self.sistema.iter_diario())
+        escribir_reporte(iter(lineas), destino, lineas_por_bloque=100)
+        self.assertEqual(destino.getvalue(), "".join(lineas))
+        self.assertEqual(destino.escrituras, -(-len(lineas) // 100))
+    
+    def test_secciones_sin_flujos_se_omiten(self):
+        texto = self.sistema.generar_estado_flujos_efectivo()
+        self.assertIn("ACTIVIDADES DE OPERACIÓN", texto)
+        self.assertNotIn("ACTIVIDADES DE INVERSIÓN", texto)
+        self.assertIn("El saldo final de efectivo coincide", texto)
+
+
+if __name__ == "__main__":
+    unittest.main()
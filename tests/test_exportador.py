@@ -0,0 +1,102 @@
+"""Pruebas del exportador del diario y el mayor: bloques de tamaño fijo, límites de un
+periodo con asientos registrados con fecha anterior y exportación por cuenta en paralelo.
+
+Uso: python -m unittest discover tests
+"""
+import csv
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import exportador
+from sistema_contable_completo import SistemaContable
+
+INICIO = date(2025, 1, 1)
+DESDE = (INICIO + timedelta(days=20)).toordinal()
+HASTA = (INICIO + timedelta(days=49)).toordinal()
+
+
+class PruebasExportador(unittest.TestCase):
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.sistema = SistemaContable()
+        # Fechas salteadas: la mayoría de los asientos se registra con fecha anterior a otro
+        for i in range(400):
+            fecha = INICIO + timedelta(days=(i * 37) % 70)
+            self.sistema.venta_credito(100 + i, 40, fecha=fecha)
+            if i % 3 == 0:
+                self.sistema.compra_efectivo(10 + i % 7, "Caja", fecha=fecha)
+        self.almacen = self.sistema.almacen
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def lineas_cuenta(self, cuenta, desde=None, hasta=None):
+        """(fecha, asiento) de las líneas de una cuenta en el periodo, ordenadas sin índice"""
+        almacen = self.almacen
+        id_cuenta = almacen.ids_cuentas[cuenta]
+        lineas = [(almacen.asiento_fecha[almacen.linea_asiento[linea]], almacen.linea_asiento[linea] + 1)
+                  for linea in range(almacen.num_lineas()) if almacen.linea_cuenta[linea] == id_cuenta]
+        return sorted(linea for linea in lineas
+                      if (desde is None or linea[0] >= desde) and (hasta is None or linea[0] <= hasta))
+    
+    def test_mayor_por_bloques_con_fechas_anteriores(self):
+        for cuenta in ("Clientes", "Caja", "Ventas"):
+            id_cuenta = self.almacen.ids_cuentas[cuenta]
+            for desde, hasta in ((None, None), (DESDE, HASTA), (DESDE, None), (None, HASTA)):
+                with self.subTest(cuenta=cuenta, desde=desde, hasta=hasta):
+                    bloques = list(exportador.bloques_mayor(self.almacen, id_cuenta, desde, hasta, tamano_bloque=64))
+                    self.assertTrue(all(len(bloque) <= 64 for bloque in bloques))
+                    filas = [fila for bloque in bloques for fila in bloque]
+                    self.assertEqual([(fila[1], fila[2]) for fila in filas], self.lineas_cuenta(cuenta, desde, hasta))
+                    if filas:
+                        fin = filas[-1][1] if hasta is None else hasta
+                        self.assertEqual(filas[-1][6], self.almacen.saldo_al(id_cuenta, fin))
+    
+    def test_indice_se_actualiza_despues_de_ordenar(self):
+        caja = self.almacen.ids_cuentas["Caja"]
+        list(exportador.bloques_mayor(self.almacen, caja))  # Ordena el índice de la cuenta
+        self.sistema.compra_efectivo(5, "Caja", fecha=INICIO + timedelta(days=80))
+        self.sistema.compra_efectivo(6, "Caja", fecha=INICIO + timedelta(days=81))
+        filas = [fila for bloque in exportador.bloques_mayor(self.almacen, caja) for fila in bloque]
+        self.assertEqual([(fila[1], fila[2]) for fila in filas], self.lineas_cuenta("Caja"))
+        self.sistema.compra_efectivo(7, "Caja", fecha=INICIO)
+        filas = [fila for bloque in exportador.bloques_mayor(self.almacen, caja, DESDE) for fila in bloque]
+        self.assertEqual([(fila[1], fila[2]) for fila in filas], self.lineas_cuenta("Caja", DESDE))
+    
+    def test_diario_del_periodo(self):
+        filas = [fila for bloque in exportador.bloques_diario(self.almacen, DESDE, HASTA, ["Caja"], tamano_bloque=50)
+                 for fila in bloque]
+        fechas = [fila[1] for fila in filas]
+        self.assertEqual(fechas, sorted(fechas))
+        self.assertTrue(DESDE <= fechas[0] and fechas[-1] <= HASTA)
+        asientos = {fila[0] for fila in filas}
+        self.assertEqual(asientos, {asiento for _, asiento in self.lineas_cuenta("Caja", DESDE, HASTA)})
+        self.assertEqual(len(filas), 3 * len(asientos))  # Asientos completos: compra con IVA, tres líneas
+    
+    def test_mayor_por_cuenta_sin_instantanea(self):
+        directorio = os.path.join(self.directorio.name, "mayor")
+        with mock.patch.object(SistemaContable, "instantanea", side_effect=AssertionError("copia completa")):
+            filas = exportador.exportar_mayor_por_cuenta(self.sistema, directorio, "csv", DESDE, HASTA, procesos=2,
+                                                         tamano_bloque=50)
+        esperado = os.path.join(self.directorio.name, "mayor.csv")
+        exportador.exportar_mayor(self.sistema, esperado, desde=DESDE, hasta=HASTA)
+        with open(esperado, newline="", encoding="utf-8") as archivo:
+            todas = list(csv.reader(archivo))[1:]
+        for cuenta, cantidad in filas.items():
+            with open(os.path.join(directorio, f"mayor_{cuenta.replace(' ', '_')}.csv"), newline="",
+                      encoding="utf-8") as archivo:
+                leidas = list(csv.reader(archivo))[1:]
+            self.assertEqual(len(leidas), cantidad)
+            self.assertEqual(leidas, [fila for fila in todas if fila[0] == cuenta])
+        self.assertEqual(sum(filas.values()), len(todas))
+
+
+if __name__ == "__main__":
+    unittest.main()
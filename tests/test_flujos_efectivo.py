@@ -0,0 +1,60 @@
+"""Pruebas de la clasificación de los flujos de efectivo al registrar: la actividad sale
+de las cuentas del asiento o de una indicada, nunca del texto de la descripción.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sistema_contable_completo import SistemaContable
+
+FECHA = date(2025, 6, 1)
+OPERACION, INVERSION, FINANCIAMIENTO, APERTURA = range(4)
+
+
+class PruebasFlujosEfectivo(unittest.TestCase):
+    
+    def setUp(self):
+        self.sistema = SistemaContable()
+        registrar = self.sistema.registrar_asiento
+        # Las descripciones dicen lo contrario de las cuentas a propósito
+        registrar("Venta de equipo de reparto", {"Bancos": 11600}, {"Ventas": 10000, "IVA trasladado": 1600}, FECHA)
+        registrar("Pago de mercancía", {"Equipo de computo": 8000}, {"Caja": 8000}, FECHA)
+        registrar("Cobro a cliente", {"Bancos": 50000}, {"Capital social": 50000}, FECHA)
+        registrar("Préstamo", {"Bancos": 3000}, {"Otros ingresos": 3000}, FECHA, actividad="financiamiento")
+        registrar("Traspaso", {"Bancos": 700}, {"Caja": 700}, FECHA)  # Sin flujo neto
+        registrar("Venta a crédito", {"Clientes": 2000}, {"Ventas": 2000}, FECHA)  # Sin efectivo
+    
+    def test_actividad_por_cuentas_o_indicada(self):
+        almacen = self.sistema.almacen
+        registrados = [(almacen.descripciones[almacen.asiento_descripcion[asiento]], monto, actividad)
+                       for asiento, monto, actividad in zip(almacen.flujo_asiento, almacen.flujo_monto,
+                                                            almacen.flujo_actividad)]
+        self.assertEqual(registrados, [("Asiento de apertura", 130000 * 100, APERTURA),
+                                       ("Venta de equipo de reparto", 11600, OPERACION),
+                                       ("Pago de mercancía", -8000, INVERSION),
+                                       ("Cobro a cliente", 50000, FINANCIAMIENTO),
+                                       ("Préstamo", 3000, FINANCIAMIENTO)])
+    
+    def test_totales_por_actividad(self):
+        self.assertEqual(self.sistema.resumen_flujos(FECHA, FECHA)["totales"],
+                         ((1, 11600), (1, -8000), (2, 53000), (0, 0)))
+        estado = self.sistema.generar_estado_flujos_efectivo(FECHA, FECHA)
+        inversion = estado[estado.index("ACTIVIDADES DE INVERSIÓN"):estado.index("ACTIVIDADES DE FINANCIAMIENTO")]
+        self.assertIn("Pago de mercancía", inversion)
+        self.assertNotIn("Venta de equipo de reparto", inversion)
+        self.assertIn("coincide con el saldo actual", estado)
+    
+    def test_actividad_desconocida(self):
+        asientos = self.sistema.almacen.num_asientos()
+        self.assertRaises(ValueError, self.sistema.registrar_asiento, "Retiro", {"Caja": 100}, {"Bancos": 100},
+                          FECHA, actividad="otra")
+        self.assertEqual(self.sistema.almacen.num_asientos(), asientos)
+
+
+if __name__ == "__main__":
+    unittest.main()
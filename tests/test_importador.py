@@ -0,0 +1,91 @@
+"""Pruebas del importador de estados de cuenta: importes con IVA incluido y asientos de
+las operaciones del sistema sin registrarlos.
+
+Uso: python -m unittest discover tests
+"""
+import csv
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from importador import COLUMNAS_CSV, importar_archivo
+from sistema_contable_completo import SistemaContable
+
+
+class PruebasImportador(unittest.TestCase):
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "estado_cuenta.csv")
+        self.sistema = SistemaContable()
+        self.asientos_apertura = self.sistema.almacen.num_asientos()
+        self.bancos_apertura = self.sistema.cuentas["Bancos"]
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def importar(self, filas, columnas=COLUMNAS_CSV):
+        with open(self.ruta, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(list(columnas.values()))
+            escritor.writerows(filas)
+        resumen = importar_archivo(self.sistema, self.ruta, columnas=columnas)
+        self.assertEqual(resumen["errores"], 0, resumen)
+        almacen = self.sistema.almacen
+        asientos = []
+        for asiento in range(self.asientos_apertura, almacen.num_asientos()):
+            cargos = {}
+            abonos = {}
+            for linea in almacen.lineas_asiento(asiento):
+                lado = abonos if almacen.linea_lado[linea] else cargos
+                lado[almacen.nombres_cuentas[almacen.linea_cuenta[linea]]] = almacen.linea_monto[linea]
+            asientos.append((cargos, abonos))
+        return asientos
+    
+    def test_la_linea_de_bancos_es_el_importe_del_estado_de_cuenta(self):
+        # 0.04 y 0.11 no son ningún neto + IVA redondeado: el IVA absorbe la diferencia
+        importes = ("116.00", "0.04", "0.11", "-0.04", "-1234.57", "-58.00")
+        asientos = self.importar([("2025-01-02", "Depósito ventas", importe) for importe in importes[:3]]
+                                 + [("2025-01-02", "Pago a proveedor", importe) for importe in importes[3:5]]
+                                 + [("2025-01-02", "Comisión por transferencia", importes[5])])
+        esperados = [11600, 4, 11, -4, -123457, -5800]
+        self.assertEqual(self.sistema.cuentas["Bancos"] - self.bancos_apertura, sum(esperados))
+        for (cargos, abonos), esperado in zip(asientos, esperados):
+            self.assertEqual(cargos.get("Bancos", 0) - abonos.get("Bancos", 0), esperado)
+            self.assertEqual(sum(cargos.values()), sum(abonos.values()))
+        
+        self.assertEqual(asientos[0], ({"Bancos": 11600}, {"Ventas": 10000, "IVA trasladado": 1600}))
+        self.assertEqual(asientos[2], ({"Bancos": 11}, {"Ventas": 9, "IVA trasladado": 2}))
+        self.assertEqual(asientos[4], ({"Mercancía": 106428, "IVA acreditable": 17029}, {"Bancos": 123457}))
+        # La comisión no lleva IVA: el gasto es el importe completo
+        self.assertEqual(asientos[5], ({"Gastos financieros": 5800}, {"Bancos": 5800}))
+    
+    def test_sin_columna_de_costo_no_hay_lineas_en_cero(self):
+        cargos, abonos = self.importar([("2025-01-02", "Depósito ventas", "232.00")])[0]
+        self.assertNotIn("Costo de ventas", cargos)
+        self.assertNotIn("Mercancía", abonos)
+    
+    def test_con_columna_de_costo(self):
+        columnas = dict(COLUMNAS_CSV, costo="costo")
+        cargos, abonos = self.importar([("2025-01-02", "Depósito ventas", "232.00", "120.00")], columnas)[0]
+        self.assertEqual(cargos, {"Bancos": 23200, "Costo de ventas": 12000})
+        self.assertEqual(abonos, {"Ventas": 20000, "IVA trasladado": 3200, "Mercancía": 12000})
+    
+    def test_asiento_operacion_es_el_que_se_registra(self):
+        asiento, mensaje = self.sistema.asiento_operacion("venta_efectivo", monto_sin_iva="100.00", costo_venta="60",
+                                                          cuenta_destino="Caja")
+        self.assertEqual(self.sistema.venta_efectivo("100.00", "60", "Caja"), mensaje)
+        self.assertEqual(list(self.sistema.almacen.iter_registros([self.asientos_apertura])),
+                         [{"fecha": self.sistema.fecha_ordinal, "descripcion": asiento[0], "cargos": asiento[1],
+                           "abonos": asiento[2], "actividad": "operacion"}])
+        # Con el total el IVA es la diferencia: 0.11 no es ningún neto + IVA redondeado
+        _, cargos, abonos = self.sistema.asiento_operacion("compra_efectivo", total=11, monto_sin_iva="0.09")[0]
+        self.assertEqual((cargos, abonos), ({"Mercancía": 9, "IVA acreditable": 2}, {"Bancos": 11}))
+        self.assertRaises(ValueError, self.sistema.asiento_operacion, "registrar_asiento")
+
+
+if __name__ == "__main__":
+    unittest.main()
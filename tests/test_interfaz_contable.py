@@ -0,0 +1,212 @@
+"""Pruebas de la actualización de las pestañas de reportes de la interfaz, sin abrir
+ventanas: las áreas de texto de Tk se reemplazan por un texto en memoria con etiquetas.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import queue
+import sys
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import interfaz_contable
+from almacen_asientos import AlmacenAsientos
+from interfaz_contable import AplicacionContable
+from sistema_contable_completo import SistemaContable
+
+
+class TextoEnMemoria:
+    """Lo que usan los reportes de un ScrolledText: insert, delete, index y etiquetas.
+    Los índices "@n" son posiciones de carácter."""
+    
+    def __init__(self):
+        self.caracteres = []
+        self.etiquetas = []  # Etiquetas de cada carácter
+        self.inserciones = 0
+    
+    def _posicion(self, indice):
+        if indice in (interfaz_contable.tk.END, "end"):
+            return len(self.caracteres)
+        if indice in (1.0, "1.0"):
+            return 0
+        if indice.startswith("@"):
+            return int(indice[1:])
+        etiqueta, _, parte = indice.rpartition(".")
+        posiciones = [i for i, etiquetas in enumerate(self.etiquetas) if etiqueta in etiquetas]
+        return posiciones[0] if parte == "first" else posiciones[-1] + 1
+    
+    def index(self, indice):
+        return f"@{self._posicion(indice)}"
+    
+    def insert(self, indice, texto, *etiquetas):
+        posicion = self._posicion(indice)
+        self.caracteres[posicion:posicion] = texto
+        self.etiquetas[posicion:posicion] = [set(etiquetas)] * len(texto)
+        self.inserciones += 1
+    
+    def delete(self, inicio, fin):
+        del self.caracteres[self._posicion(inicio):self._posicion(fin)]
+        del self.etiquetas[self._posicion(inicio):self._posicion(fin)]
+    
+    def tag_ranges(self, etiqueta):
+        return [1] if any(etiqueta in etiquetas for etiquetas in self.etiquetas) else []
+    
+    def texto(self):
+        return "".join(self.caracteres)
+
+
+class Pestana:
+    """Pestaña con su área de texto"""
+    
+    def __init__(self):
+        self.text_area = TextoEnMemoria()
+
+
+class Nada:
+    """Widget que acepta cualquier llamada (ventana, barra de estado)"""
+    
+    def __getattr__(self, nombre):
+        return lambda *args, **kwargs: None
+
+
+class PruebasInterfazContable(unittest.TestCase):
+    
+    def setUp(self):
+        app = self.app = AplicacionContable.__new__(AplicacionContable)
+        app.root = app.estado_label = app.barra_progreso = Nada()
+        app.sistema = SistemaContable()
+        for nombre in ("tab_diario", "tab_mayor", "tab_balanza", "tab_flujos_efectivo"):
+            setattr(app, nombre, Pestana())
+        app._diario_asientos = None
+        app._mayor_lineas = None
+        app._huellas = {}
+        app._cola_trabajos = queue.Queue()
+        app._cola_resultados = queue.Queue()
+        app._generaciones = {}
+        app._en_proceso = {}
+        threading.Thread(target=app._trabajador_reportes, daemon=True).start()
+    
+    def esperar(self):
+        """Aplica los reportes terminados como lo haría el after() de Tk"""
+        for _ in range(500):
+            self.app._revisar_resultados()
+            if not self.app._en_proceso:
+                return
+            time.sleep(0.01)
+        self.fail("El hilo de trabajo no terminó")
+    
+    def registrar_operaciones(self, numero):
+        sistema = self.app.sistema
+        operaciones = (lambda: sistema.compra_efectivo(1000), lambda: sistema.venta_credito(300, 100),
+                       lambda: sistema.compra_combinada(3000, 40, "Caja"), lambda: sistema.gasto_financiero(5),
+                       lambda: sistema.registrar_asiento("Compra de equipo", {"Equipo de computo": 5000},
+                                                         {"Bancos": 5000}),
+                       lambda: sistema.venta_efectivo(9000, 4000, "Caja"))
+        operaciones[numero % len(operaciones)]()
+    
+    def test_diario_y_mayor_solo_agregan_lo_nuevo(self):
+        app = self.app
+        sistema = app.sistema
+        for numero in range(8):
+            app.actualizar_diario()
+            app.actualizar_mayor()
+            self.esperar()
+            self.assertEqual(app.tab_diario.text_area.texto(), sistema.generar_diario())
+            self.assertEqual(app.tab_mayor.text_area.texto(), sistema.generar_mayor())
+            self.registrar_operaciones(numero)
+        
+        # Sin asientos nuevos no se envía nada al hilo de trabajo
+        app.actualizar_diario()
+        app.actualizar_mayor()
+        self.esperar()
+        inserciones = app.tab_diario.text_area.inserciones
+        app.actualizar_diario()
+        app.actualizar_mayor()
+        self.assertEqual(app._en_proceso, {})
+        
+        # Un asiento nuevo se agrega con una sola inserción al final del diario
+        self.registrar_operaciones(0)
+        app.actualizar_diario()
+        self.esperar()
+        self.assertEqual(app.tab_diario.text_area.inserciones, inserciones + 1)
+        self.assertEqual(app.tab_diario.text_area.texto(), sistema.generar_diario())
+    
+    def test_solicitud_reemplazada_no_se_aplica(self):
+        app = self.app
+        app.actualizar_diario()
+        self.registrar_operaciones(0)
+        app.actualizar_diario()  # Reemplaza la solicitud anterior de la pestaña
+        self.esperar()
+        self.assertEqual(app.tab_diario.text_area.texto(), app.sistema.generar_diario())
+    
+    
+    def test_solo_se_genera_la_pestana_visible(self):
+        app = self.app
+        visible = [app.tab_balanza]
+        app.notebook = types.SimpleNamespace(select=lambda: "pestana")
+        app.root = types.SimpleNamespace(nametowidget=lambda nombre: visible[0], after=lambda *args: None)
+        generados = []
+        app._reportes = {app.tab_diario: lambda: generados.append("diario"),
+                         app.tab_balanza: lambda: generados.append("balanza")}
+        app._pendientes = set()
+        
+        app.marcar_reportes_pendientes()
+        self.assertEqual(generados, ["balanza"])
+        self.assertEqual(app._pendientes, {app.tab_diario})
+        
+        # Al cambiar de pestaña se genera la nueva solo si está pendiente
+        visible[0] = app.tab_diario
+        app._al_cambiar_pestana(None)
+        visible[0] = app.tab_balanza
+        app._al_cambiar_pestana(None)
+        self.assertEqual(generados, ["balanza", "diario"])
+        
+        # Actualizar todos regenera también las pestañas ocultas
+        app.actualizar_todos_reportes()
+        self.assertEqual(sorted(generados[2:]), ["balanza", "diario"])
+    
+    def test_resumen_sin_cambios_no_se_regenera(self):
+        app = self.app
+        texto = app.tab_balanza.text_area
+        app.actualizar_balanza()
+        app.actualizar_balanza()
+        self.assertEqual(texto.inserciones, 1)
+        self.registrar_operaciones(0)
+        app.actualizar_balanza()
+        self.assertEqual(texto.inserciones, 2)
+        self.assertEqual(texto.texto(), app.sistema.generar_balanza_comprobacion())
+    
+    
+    def test_flujos_sin_copiar_el_sistema(self):
+        app = self.app
+        sistema = app.sistema
+        for numero in range(6):
+            self.registrar_operaciones(numero)
+        
+        # El trabajador está ocupado mientras se registran más asientos: el estado que
+        # muestra es el de la solicitud, no uno que mezcle los asientos posteriores
+        liberar = threading.Event()
+        app._enviar_trabajo(app.tab_diario, "Ocupado", lambda cancelado: liberar.wait(), lambda valor: None)
+        esperado = sistema.generar_estado_flujos_efectivo()
+        with mock.patch.object(SistemaContable, "instantanea", side_effect=AssertionError("copia completa")), \
+                mock.patch.object(AlmacenAsientos, "copia", side_effect=AssertionError("copia del almacén")):
+            app.actualizar_flujos_efectivo()
+            for numero in range(6):
+                self.registrar_operaciones(numero)
+            liberar.set()
+            self.esperar()
+        self.assertEqual(app.tab_flujos_efectivo.text_area.texto(), esperado)
+        
+        app.actualizar_flujos_efectivo()
+        self.esperar()
+        self.assertEqual(app.tab_flujos_efectivo.text_area.texto(), sistema.generar_estado_flujos_efectivo())
+        self.assertIn("ACTIVIDADES DE INVERSIÓN", app.tab_flujos_efectivo.text_area.texto())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""Pruebas del grupo de empresas: saldos consolidados con empresas cargadas y no
+cargadas (sumadas en otros procesos) y asientos de eliminación.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bitacora import BitacoraJSONL
+from multiempresa import GrupoEmpresas
+from persistencia_sqlite import PersistenciaSQLite
+from sistema_contable_completo import SistemaContable
+
+INICIO = date(2025, 1, 1)
+DESDE = INICIO + timedelta(days=5)
+HASTA = INICIO + timedelta(days=14)
+
+
+def registrar(sistema, factor):
+    """Registra 20 días de ventas y compras con montos distintos por empresa"""
+    for dia in range(20):
+        fecha = INICIO + timedelta(days=dia)
+        sistema.registrar_asiento("Venta", {"Clientes": 1160 * factor}, {"Ventas": 1000 * factor,
+                                                                          "IVA trasladado": 160 * factor}, fecha)
+        sistema.registrar_asiento("Compra", {"Mercancía": 300 + dia}, {"Bancos": 300 + dia}, fecha)
+
+
+class PruebasMultiempresa(unittest.TestCase):
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.grupo = GrupoEmpresas(procesos=2, persistencia=self.bitacora("eliminaciones"))
+        self.sistemas = {}
+        for factor, (nombre, clase, extension) in enumerate((("Norte", BitacoraJSONL, "jsonl"),
+                                                             ("Sur", PersistenciaSQLite, "db")), 1):
+            ruta = os.path.join(self.directorio.name, f"{nombre}.{extension}")
+            sistema = SistemaContable(clase(ruta))
+            registrar(sistema, factor)
+            sistema.persistencia.cerrar()
+            self.sistemas[nombre] = SistemaContable(clase(ruta))
+            self.addCleanup(self.sistemas[nombre].persistencia.cerrar)
+            self.grupo.agregar_empresa(nombre, persistencia=clase(ruta))
+        centro = SistemaContable()
+        registrar(centro, 3)
+        self.sistemas["Centro"] = centro
+        self.grupo.agregar_empresa("Centro", sistema=centro)
+    
+    def tearDown(self):
+        self.grupo.cerrar()
+        self.directorio.cleanup()
+    
+    def bitacora(self, nombre):
+        return BitacoraJSONL(os.path.join(self.directorio.name, f"{nombre}.jsonl"))
+    
+    def suma(self, desde=None, hasta=None):
+        """Suma por cuenta de los saldos de cada empresa cargada por separado"""
+        suma = {}
+        for sistema in self.sistemas.values():
+            for cuenta, saldo in sistema._saldos(None, *sistema._periodo(desde, hasta))[0].items():
+                suma[cuenta] = suma.get(cuenta, 0) + saldo
+        return suma
+    
+    def test_consolidado_es_la_suma_de_las_empresas(self):
+        for periodo in ((None, None), (None, HASTA), (DESDE, HASTA)):
+            with self.subTest(periodo=periodo):
+                self.assertEqual(self.grupo.saldos_consolidados(*periodo), self.suma(*periodo))
+        # Las empresas no cargadas se sumaron en otros procesos, sin cargarlas aquí
+        self.assertIsNone(self.grupo.empresas["Norte"])
+        self.assertIsNotNone(self.grupo._ejecutor)
+        balanza = self.grupo.generar_balanza_consolidada(hasta=HASTA)
+        self.assertTrue(balanza.startswith("=== CONSOLIDADO DE 3 EMPRESAS: Norte, Sur, Centro ===\n"))
+        self.assertIn(self.sistemas["Centro"].generar_balanza_comprobacion(self.suma(None, HASTA), hasta=HASTA),
+                      balanza)
+    
+    def test_eliminaciones(self):
+        # Venta de Norte a Sur el día 10: se eliminan la venta y la cuenta por cobrar
+        fecha = INICIO + timedelta(days=10)
+        self.grupo.registrar_eliminacion("Venta entre empresas", {"Ventas": 5000, "Proveedores": 5800},
+                                         {"Costo de ventas": 5000, "Clientes": 5800}, fecha)
+        esperado = self.suma(DESDE, HASTA)
+        for cuenta, cambio in (("Ventas", 5000), ("Proveedores", 5800), ("Costo de ventas", -5000),
+                               ("Clientes", -5800)):
+            esperado[cuenta] += cambio
+        self.assertEqual(self.grupo.saldos_consolidados(DESDE, HASTA), esperado)
+        # Fuera del periodo no cuenta
+        self.assertEqual(self.grupo.saldos_consolidados(DESDE, fecha - timedelta(days=1)),
+                         self.suma(DESDE, fecha - timedelta(days=1)))
+        
+        recuperado = GrupoEmpresas(persistencia=self.bitacora("eliminaciones"))
+        self.assertEqual(recuperado.eliminaciones, self.grupo.eliminaciones)
+        recuperado.cerrar()
+    
+    def test_errores(self):
+        self.assertRaises(ValueError, self.grupo.agregar_empresa, "Norte", sistema=SistemaContable())
+        self.assertRaises(ValueError, self.grupo.agregar_empresa, "Oeste")
+        self.assertRaises(ValueError, self.grupo.empresa, "Oeste")
+        self.assertRaises(ValueError, self.grupo.registrar_eliminacion, "Descuadrado", {"Ventas": 10}, {"Clientes": 9})
+        self.assertRaises(ValueError, self.grupo.registrar_eliminacion, "Sin cuenta", {"No existe": 10}, {"Clientes": 10})
+        self.assertEqual(self.grupo.eliminaciones, [])
+        # Cargar una empresa para registrar en ella no cambia el consolidado
+        self.assertEqual(self.grupo.empresa("Sur").cuentas, self.sistemas["Sur"].cuentas)
+        self.assertEqual(self.grupo.saldos_consolidados(), self.suma())
+
+
+if __name__ == "__main__":
+    unittest.main()
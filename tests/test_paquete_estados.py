@@ -0,0 +1,62 @@
+"""Pruebas del paquete de estados de cierre de mes: los archivos generados en paralelo
+son iguales a los reportes generados uno tras otro.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from paquete_estados import REPORTES, generar_paquete
+from sistema_contable_completo import SistemaContable
+
+INICIO = date(2025, 1, 1)
+
+
+class PruebasPaqueteEstados(unittest.TestCase):
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.sistema = SistemaContable()
+        for dia in range(40):
+            fecha = INICIO + timedelta(days=dia)
+            self.sistema.venta_credito(1000 + dia, 600, fecha=fecha)
+            self.sistema.compra_efectivo(500, "Caja" if dia % 2 else "Bancos", fecha=fecha)
+            if dia % 10 == 0:
+                self.sistema.gasto_financiero(25, fecha=fecha)
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def esperados(self, desde=None, hasta=None):
+        """Cada reporte del paquete generado en este proceso, uno tras otro"""
+        esperados = {}
+        for nombre, metodo in REPORTES:
+            generado = getattr(self.sistema, metodo)(desde=desde, hasta=hasta)
+            esperados[nombre] = generado if isinstance(generado, str) else "".join(generado)
+        return esperados
+    
+    def leer(self, directorio):
+        leidos = {}
+        for nombre, _ in REPORTES:
+            with open(os.path.join(directorio, nombre + ".txt"), encoding="utf-8") as archivo:
+                leidos[nombre] = archivo.read()
+        return leidos
+    
+    def test_paquete_igual_a_los_reportes_en_secuencia(self):
+        periodos = ((None, None), (INICIO + timedelta(days=10), INICIO + timedelta(days=29)))
+        for procesos, (desde, hasta) in zip((2, 1), periodos):
+            with self.subTest(procesos=procesos, desde=desde, hasta=hasta):
+                directorio = os.path.join(self.directorio.name, str(procesos))
+                tiempos = generar_paquete(self.sistema, directorio, desde, hasta, procesos=procesos)
+                self.assertEqual(set(tiempos), {nombre for nombre, _ in REPORTES} | {"total"})
+                self.assertTrue(all(segundos >= 0 for segundos in tiempos.values()))
+                self.assertEqual(self.leer(directorio), self.esperados(desde, hasta))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Pruebas de las fechas de los asientos y de los reportes de un periodo: los asientos
+con fecha anterior se ordenan por fecha y los reportes solo toman los del periodo.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import re
+import sys
+import unittest
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sistema_contable_completo import SistemaContable
+
+INICIO = date(2025, 1, 1)
+DESDE = INICIO + timedelta(days=10)
+HASTA = INICIO + timedelta(days=19)
+
+
+class PruebasPeriodos(unittest.TestCase):
+    
+    def setUp(self):
+        self.sistema = SistemaContable()
+        # Se registran del día 29 al 0: cada asiento queda antes de los ya registrados
+        for dia in reversed(range(30)):
+            fecha = INICIO + timedelta(days=dia)
+            self.sistema.registrar_asiento(f"Venta del día {dia}", {"Bancos": 1160 + dia},
+                                           {"Ventas": 1000 + dia, "IVA trasladado": 160}, fecha)
+            self.sistema.gasto_administracion(10 + dia, fecha=fecha)
+    
+    def test_fechas_explicitas_en_los_metodos_de_registro(self):
+        sistema = self.sistema
+        sistema.venta_efectivo(100, 60, fecha=datetime(2025, 2, 3, 15, 30))
+        sistema.compra_credito(50, fecha=date(2025, 2, 4).toordinal())
+        almacen = sistema.almacen
+        ultimo = almacen.num_asientos() - 1
+        self.assertEqual(almacen.asiento_fecha[ultimo - 1], date(2025, 2, 3).toordinal())
+        self.assertEqual(almacen.asiento_fecha[ultimo], date(2025, 2, 4).toordinal())
+        self.assertIn(f"Asiento {ultimo + 1} - 04/02/2025 - ", sistema.generar_diario())
+    
+    def test_diario_del_periodo_en_orden_de_fecha(self):
+        diario = self.sistema.generar_diario(desde=DESDE, hasta=HASTA)
+        fechas = [datetime.strptime(fecha, "%d/%m/%Y").date()
+                  for fecha in re.findall(r"^Asiento \d+ - (\S+) - ", diario, re.MULTILINE)]
+        self.assertEqual(len(fechas), 20)
+        self.assertEqual(fechas, sorted(fechas))
+        self.assertEqual((fechas[0], fechas[-1]), (DESDE, HASTA))
+        self.assertIn("Venta del día 10\n", diario)
+        self.assertNotIn("Venta del día 9\n", diario)
+        self.assertNotIn("Venta del día 20\n", diario)
+    
+    def test_mayor_y_resultados_del_periodo(self):
+        sistema = self.sistema
+        mayor = sistema.generar_mayor(desde=DESDE, hasta=HASTA)
+        ventas = sum(1000 + dia for dia in range(10, 20))
+        self.assertIn(f"\nCuenta: Ventas\nCARGOS:\nABONOS:\n  {DESDE:%d/%m/%Y} - Venta del día 10: $10.10\n", mayor)
+        self.assertNotIn("Capital social", mayor)  # La apertura es de otra fecha
+        self.assertEqual(sistema.saldos_periodo(DESDE, HASTA)["Ventas"], -ventas)
+        resultados = sistema.generar_estado_resultados(desde=DESDE, hasta=HASTA)
+        self.assertIn(f"del {DESDE:%d/%m/%Y} al {HASTA:%d/%m/%Y}", resultados)
+        self.assertEqual(resultados, sistema.generar_estado_resultados(sistema.saldos_periodo(DESDE, HASTA),
+                                                                       DESDE, HASTA))
+    
+    def test_flujos_del_periodo(self):
+        flujos = self.sistema.generar_estado_flujos_efectivo(desde=DESDE, hasta=HASTA)
+        self.assertIn("Venta del día 10", flujos)
+        self.assertNotIn("Venta del día 9", flujos)
+        self.assertNotIn("Venta del día 20", flujos)
+        self.assertIn("coincide con el saldo actual", flujos)
+        resumen = self.sistema.resumen_flujos(DESDE, HASTA)
+        saldos = self.sistema.saldos_periodo(DESDE, HASTA)
+        self.assertEqual(sum(total for _, total in resumen["totales"]), saldos["Caja"] + saldos["Bancos"])
+        self.assertEqual(resumen["totales"][0][0], 20)  # 10 ventas y 10 gastos de operación
+
+
+if __name__ == "__main__":
+    unittest.main()
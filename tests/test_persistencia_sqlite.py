@@ -0,0 +1,110 @@
+"""Pruebas de la persistencia en SQLite: recuperación, saldos y mayor con consultas
+agrupadas, y lotes que fallan a la mitad.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from persistencia_sqlite import PersistenciaSQLite
+from sistema_contable_completo import SistemaContable
+
+INICIO = date(2025, 3, 1)
+
+
+class ConexionConFalla:
+    """Envuelve una conexión y falla al insertar las líneas de un lote"""
+    
+    def __init__(self, conexion):
+        self.conexion = conexion
+    
+    def executemany(self, sql, filas):
+        if "INSERT INTO lineas" in sql:
+            raise sqlite3.OperationalError("disco lleno")
+        return self.conexion.executemany(sql, filas)
+    
+    def __getattr__(self, nombre):
+        return getattr(self.conexion, nombre)
+    
+    def __enter__(self):
+        return self.conexion.__enter__()
+    
+    def __exit__(self, *excepcion):
+        return self.conexion.__exit__(*excepcion)
+
+
+class PruebasPersistenciaSQLite(unittest.TestCase):
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "diario.db")
+        self.persistencia = PersistenciaSQLite(self.ruta)
+        self.sistema = SistemaContable(self.persistencia)
+        for dia in range(30):
+            fecha = INICIO + timedelta(days=dia)
+            self.sistema.registrar_asientos_lote(
+                [("Venta", {"Bancos": 1160 + dia}, {"Ventas": 1000 + dia, "IVA trasladado": 160}),
+                 ("Compra", {"Mercancía": 500, "IVA acreditable": 80}, {"Proveedores": 580})], fecha)
+            if dia % 10 == 0:
+                self.sistema.registrar_asiento("Compra de equipo", {"Equipo de computo": 9000}, {"Caja": 9000}, fecha)
+    
+    def tearDown(self):
+        self.persistencia.cerrar()
+        self.directorio.cleanup()
+    
+    def test_recuperar_desde_sqlite(self):
+        recuperado = SistemaContable(PersistenciaSQLite(self.ruta))
+        try:
+            self.assertEqual(recuperado.asientos_recuperados, self.sistema.asientos_aplicados)
+            self.assertEqual(recuperado.cuentas, self.sistema.cuentas)
+            self.assertEqual(recuperado.generar_diario(), self.sistema.generar_diario())
+            self.assertEqual(recuperado.generar_estado_flujos_efectivo(), self.sistema.generar_estado_flujos_efectivo())
+        finally:
+            recuperado.persistencia.cerrar()
+    
+    def test_saldos_y_mayor_con_consultas_agrupadas(self):
+        sistema = self.sistema
+        desde = (INICIO + timedelta(days=5)).toordinal()
+        hasta = (INICIO + timedelta(days=19)).toordinal()
+        for periodo in ((None, None), (None, hasta), (desde, hasta), (desde, None)):
+            with self.subTest(periodo=periodo):
+                saldos = self.persistencia.saldos_por_cuenta(*periodo)
+                self.assertEqual(sistema.generar_balanza_comprobacion(saldos, *periodo),
+                                 sistema.generar_balanza_comprobacion(desde=periodo[0], hasta=periodo[1]))
+                if periodo != (None, None):
+                    # Sin periodo el mayor en memoria sigue el orden de registro (la apertura
+                    # es de hoy y va primero) y el de SQLite el orden de fecha
+                    self.assertEqual(sistema.generar_mayor(self.persistencia, *periodo),
+                                     sistema.generar_mayor(desde=periodo[0], hasta=periodo[1]))
+        self.assertEqual(self.persistencia.saldos_por_cuenta(desde, hasta)["Ventas"],
+                         -sum(1000 + dia for dia in range(5, 20)))
+    
+    def test_el_indice_cubre_la_consulta_de_saldos(self):
+        plan = " ".join(fila[-1] for fila in self.persistencia._conexion.execute(
+            "EXPLAIN QUERY PLAN SELECT cuenta, SUM(monto) FROM lineas WHERE cuenta = 1 AND fecha <= 10 GROUP BY cuenta"))
+        self.assertIn("COVERING INDEX lineas_cuenta_fecha", plan)
+    
+    def test_lote_que_falla_no_deja_nada(self):
+        antes = self.persistencia.posicion()
+        conexion = self.persistencia._conexion
+        self.persistencia._conexion = ConexionConFalla(conexion)
+        with self.assertRaises(sqlite3.OperationalError):
+            self.sistema.registrar_asiento("Descripción nueva", {"Bancos": 10}, {"Otros ingresos": 10}, INICIO)
+        self.persistencia._conexion = conexion
+        self.assertEqual(self.persistencia.posicion(), antes)
+        self.assertNotIn("Descripción nueva", self.persistencia._ids_descripciones)
+        
+        # El siguiente lote se guarda normalmente
+        self.sistema.registrar_asiento("Descripción nueva", {"Bancos": 10}, {"Otros ingresos": 10}, INICIO)
+        registros = list(PersistenciaSQLite(self.ruta).leer(antes))
+        self.assertEqual([registro["descripcion"] for registro in registros], ["Descripción nueva"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Pruebas de los puntos de control: restaurar el último debe dar lo mismo que volver a
+aplicar toda la persistencia, y un punto de control dañado se ignora.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bitacora import BitacoraJSONL
+from puntos_control import PuntosControl
+from sistema_contable_completo import SistemaContable
+
+INICIO = date(2025, 1, 1)
+
+
+class PruebasPuntosControl(unittest.TestCase):
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "diario.jsonl")
+        self.puntos = os.path.join(self.directorio.name, "puntos")
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def registrar(self, cantidad):
+        """Registra ventas, compras de equipo y asientos con fecha anterior, con un punto de
+        control cada 40 asientos; devuelve los asientos aplicados del último punto de control"""
+        sistema = SistemaContable(BitacoraJSONL(self.ruta), PuntosControl(self.puntos, cada=40))
+        for numero in range(cantidad):
+            fecha = INICIO + timedelta(days=numero if numero % 7 else numero // 2)  # Algunos con fecha anterior
+            if numero % 5 == 0:
+                sistema.registrar_asiento("Compra de equipo", {"Equipo de computo": 1000 + numero}, {"Bancos": 1000 + numero},
+                                          fecha)
+            else:
+                sistema.registrar_asientos_lote([("Venta", {"Caja": 116 * numero}, {"Ventas": 100 * numero,
+                                                                                   "IVA trasladado": 16 * numero})] * 2, fecha)
+        sistema.puntos_control.esperar()
+        ultimo = sistema.puntos_control.ultimo_escrito
+        sistema.persistencia.cerrar()
+        return ultimo
+    
+    @staticmethod
+    def reportes(sistema):
+        corte = INICIO + timedelta(days=60)
+        return (sistema.asientos_aplicados, sistema.cuentas, sistema.resultados, sistema.generar_diario(),
+                sistema.generar_mayor(), sistema.generar_estado_flujos_efectivo(),
+                sistema.generar_balanza_comprobacion(hasta=corte), sistema.saldos_al(corte.toordinal()),
+                sistema.generar_estado_flujos_efectivo(desde=INICIO + timedelta(days=30), hasta=corte))
+    
+    def abrir(self, con_puntos):
+        bitacora = BitacoraJSONL(self.ruta)
+        sistema = SistemaContable(bitacora, PuntosControl(self.puntos) if con_puntos else None)
+        self.addCleanup(bitacora.cerrar)
+        return sistema
+    
+    def test_restaurar_es_igual_a_volver_a_aplicar_todo(self):
+        ultimo = self.registrar(130)
+        self.assertGreater(ultimo, 0)
+        restaurado = self.abrir(con_puntos=True)
+        # Solo se vuelven a aplicar los asientos posteriores al punto de control
+        posicion = PuntosControl(self.puntos).restaurar_ultimo(SistemaContable(), restaurado.persistencia)
+        posteriores = len(list(BitacoraJSONL(self.ruta).leer(posicion)))
+        self.assertEqual(posteriores, restaurado.asientos_aplicados - ultimo)
+        self.assertLess(posteriores, 40)
+        self.assertEqual(self.reportes(restaurado), self.reportes(self.abrir(con_puntos=False)))
+        
+        # Y se puede seguir registrando sobre el almacén restaurado
+        for sistema in (restaurado, self.abrir(con_puntos=False)):
+            sistema.registrar_asiento("Venta", {"Bancos": 232}, {"Ventas": 200, "IVA trasladado": 32}, INICIO)
+        self.assertEqual(self.reportes(restaurado)[1:], self.reportes(sistema)[1:])
+    
+    def test_punto_de_control_danado_se_ignora(self):
+        self.registrar(130)
+        mas_reciente = PuntosControl(self.puntos)._archivos()[0]
+        with open(mas_reciente, "r+b") as archivo:
+            archivo.seek(-3, os.SEEK_END)
+            archivo.write(b"\xff\xff\xff")
+        puntos = PuntosControl(self.puntos)
+        sistema = SistemaContable()
+        bitacora = BitacoraJSONL(self.ruta)
+        self.addCleanup(bitacora.cerrar)
+        posicion = puntos.restaurar_ultimo(sistema, bitacora)
+        self.assertIsNotNone(posicion)
+        self.assertLess(sistema.asientos_aplicados, int(os.path.basename(mas_reciente)[14:26]))
+        self.assertEqual(self.reportes(self.abrir(con_puntos=True)), self.reportes(self.abrir(con_puntos=False)))
+    
+    def test_solo_se_conservan_los_mas_recientes(self):
+        self.registrar(130)
+        archivos = PuntosControl(self.puntos)._archivos()
+        self.assertEqual(len(archivos), 2)
+        self.assertFalse([nombre for nombre in os.listdir(self.puntos) if nombre.endswith(".tmp")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Pruebas del registro en lote: todo o nada, persistencia y mismo resultado que asiento por asiento.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bitacora import BitacoraJSONL
+from sistema_contable_completo import SistemaContable
+
+FECHA = date(2025, 2, 10)
+VENTA = ("Venta", {"Bancos": 11600}, {"Ventas": 10000, "IVA trasladado": 1600})
+COMPRA = ("Compra de equipo", {"Equipo de computo": 20000, "IVA acreditable": 3200}, {"Bancos": 23200})
+
+
+class PruebasRegistroLote(unittest.TestCase):
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.bitacora = BitacoraJSONL(os.path.join(self.directorio.name, "diario.jsonl"))
+        self.sistema = SistemaContable(self.bitacora)
+    
+    def tearDown(self):
+        self.bitacora.cerrar()
+        self.directorio.cleanup()
+    
+    def estado(self):
+        sistema = self.sistema
+        return (dict(sistema.cuentas), sistema.almacen.num_asientos(), sistema.almacen.num_lineas(),
+                sistema.almacen.num_flujos(), sistema.version, self.bitacora.posicion())
+    
+    def test_un_asiento_invalido_no_registra_nada(self):
+        antes = self.estado()
+        invalidos = [
+            (("Sin cuadrar", {"Bancos": 100}, {"Ventas": 99}), "no está cuadrado"),
+            (("Cuenta inexistente", {"Bancos": 100}, {"Ventas futuras": 100}), "no existe"),
+            (("En pesos", {"Bancos": 1.5}, {"Ventas": 1.5}), "centavos enteros"),
+            (("Abono en pesos", {"Bancos": 100}, {"Ventas": 100.0}), "centavos enteros"),
+            (VENTA + ("especulacion",), "Actividad"),
+        ]
+        for invalido, mensaje in invalidos:
+            with self.subTest(invalido=invalido[0]):
+                with self.assertRaisesRegex(ValueError, mensaje):
+                    self.sistema.registrar_asientos_lote([VENTA] * 50 + [invalido] + [COMPRA] * 50, FECHA)
+                self.assertEqual(self.estado(), antes)
+    
+    def test_lote_igual_a_asiento_por_asiento(self):
+        asientos = [VENTA, COMPRA, ("Pago de capital", {"Bancos": 50000}, {"Capital social": 50000}),
+                    ("Traspaso", {"Caja": 1000}, {"Bancos": 1000}), VENTA]
+        self.sistema.registrar_asientos_lote(asientos, FECHA)
+        individual = SistemaContable()
+        for asiento in asientos:
+            individual.registrar_asiento(*asiento, fecha=FECHA)
+        for reporte in ("generar_diario", "generar_mayor", "generar_balanza_comprobacion",
+                        "generar_estado_resultados", "generar_estado_flujos_efectivo"):
+            self.assertEqual(getattr(self.sistema, reporte)(), getattr(individual, reporte)(), reporte)
+        self.assertEqual(self.sistema.cuentas, individual.cuentas)
+        self.assertEqual(self.sistema.resultados, individual.resultados)
+        # Un traspaso entre Caja y Bancos no mueve efectivo; la compra de equipo es de inversión
+        self.assertEqual(self.sistema.almacen.num_flujos(), individual.almacen.num_flujos())
+        fecha = FECHA.toordinal()
+        self.assertEqual(self.sistema.almacen.total_flujos(0, fecha, fecha), (2, 23200))
+        self.assertEqual(self.sistema.almacen.total_flujos(1, fecha, fecha), (1, -23200))
+        self.assertEqual(self.sistema.almacen.total_flujos(2, fecha, fecha), (1, 50000))
+    
+    def test_el_lote_se_guarda_y_se_recupera(self):
+        self.sistema.registrar_asientos_lote([VENTA, COMPRA] * 10, FECHA)
+        esperado = self.sistema.generar_diario()
+        self.bitacora.cerrar()
+        self.bitacora = BitacoraJSONL(os.path.join(self.directorio.name, "diario.jsonl"))
+        recuperado = SistemaContable(self.bitacora)
+        self.assertEqual(recuperado.generar_diario(), esperado)
+        self.assertEqual(recuperado.cuentas, self.sistema.cuentas)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Pruebas de los totales de resultados que se mantienen al registrar: son iguales a los
+recalculados y los estados que los leen no dependen del orden en que se generan.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import random
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sistema_contable_completo import SistemaContable
+
+INICIO = date(2025, 1, 1)
+
+
+class PruebasResultados(unittest.TestCase):
+    
+    def setUp(self):
+        self.sistema = SistemaContable()
+        aleatorio = random.Random(19)
+        for _ in range(200):
+            fecha = INICIO + timedelta(days=aleatorio.randrange(90))
+            monto = aleatorio.randrange(1, 3000)
+            operacion = aleatorio.choice((self.sistema.venta_efectivo, self.sistema.venta_credito,
+                                          self.sistema.gasto_venta, self.sistema.gasto_financiero,
+                                          self.sistema.compra_credito))
+            if operacion in (self.sistema.venta_efectivo, self.sistema.venta_credito):
+                operacion(monto, monto // 2, fecha=fecha)
+            else:
+                operacion(monto, fecha=fecha)
+    
+    @staticmethod
+    def estados(sistema, orden):
+        generar = {
+            "resultados": sistema.generar_estado_resultados,
+            "capital": sistema.generar_estado_cambios_capital,
+            "balance": sistema.generar_balance_general,
+        }
+        return {nombre: generar[nombre]() for nombre in orden}
+    
+    def test_totales_incrementales_iguales_a_recalculados(self):
+        sistema = self.sistema
+        self.assertEqual(sistema.resultados, SistemaContable.calcular_resultados(sistema.cuentas))
+        sistema.registrar_asiento("Ajuste", {"Otros ingresos": 500}, {"Productos financieros": 500}, INICIO)
+        self.assertEqual(sistema.resultados, SistemaContable.calcular_resultados(sistema.cuentas))
+        with tempfile.TemporaryDirectory() as directorio:
+            sistema.cerrar_periodo(INICIO + timedelta(days=45), directorio_archivo=directorio)
+        self.assertEqual(sistema.resultados, SistemaContable.calcular_resultados(sistema.cuentas))
+    
+    def test_estados_sin_efectos_ni_dependencia_del_orden(self):
+        cuentas = dict(self.sistema.cuentas)
+        primero = self.estados(self.sistema, ("resultados", "capital", "balance"))
+        self.sistema.cache_reportes.limpiar(self.sistema.version)
+        segundo = self.estados(self.sistema, ("balance", "capital", "resultados"))
+        self.assertEqual(primero, segundo)
+        self.assertEqual(self.sistema.cuentas, cuentas)
+        self.assertIn("El balance general está cuadrado.", primero["balance"])
+    
+    def test_estados_concurrentes(self):
+        esperados = self.estados(self.sistema, ("resultados", "capital", "balance"))
+        self.sistema.cache_reportes.limpiar(self.sistema.version)
+        with ThreadPoolExecutor(max_workers=4) as ejecutor:
+            futuros = [ejecutor.submit(self.estados, self.sistema, orden)
+                       for orden in (("capital", "balance", "resultados"), ("balance", "resultados", "capital")) * 4]
+            for futuro in futuros:
+                self.assertEqual(futuro.result(), esperados)
+
+
+if __name__ == "__main__":
+    unittest.main()
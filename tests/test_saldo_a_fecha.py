@@ -0,0 +1,79 @@
+"""Pruebas del saldo a una fecha con el acumulado por cuenta: se compara con la suma de
+los movimientos, incluso con asientos registrados con fecha anterior.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import random
+import sys
+import unittest
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sistema_contable_completo import SistemaContable
+
+INICIO = date(2025, 1, 1)
+
+
+class PruebasSaldoAFecha(unittest.TestCase):
+    
+    def setUp(self):
+        self.sistema = SistemaContable()
+        aleatorio = random.Random(13)
+        for _ in range(300):
+            fecha = INICIO + timedelta(days=aleatorio.randrange(120))
+            monto = aleatorio.randrange(1, 5000)
+            operacion = aleatorio.randrange(3)
+            if operacion == 0:
+                self.sistema.compra_efectivo(monto, aleatorio.choice(("Bancos", "Caja")), fecha=fecha)
+            elif operacion == 1:
+                self.sistema.venta_credito(monto, monto // 2, fecha=fecha)
+            else:
+                self.sistema.gasto_administracion(monto, fecha=fecha)
+    
+    def saldos_sumando(self, fecha):
+        """Saldo de cada cuenta a una fecha sumando todas las líneas del almacén"""
+        almacen = self.sistema.almacen
+        saldos = dict.fromkeys(self.sistema.cuentas, 0)
+        for linea in range(almacen.num_lineas()):
+            if almacen.asiento_fecha[almacen.linea_asiento[linea]] <= fecha:
+                monto = almacen.linea_monto[linea]
+                cuenta = almacen.nombres_cuentas[almacen.linea_cuenta[linea]]
+                saldos[cuenta] += -monto if almacen.linea_lado[linea] else monto
+        return saldos
+    
+    def comprobar(self, fechas):
+        for fecha in fechas:
+            ordinal = fecha.toordinal()
+            with self.subTest(fecha=fecha):
+                self.assertEqual(self.sistema.saldos_al(fecha), self.saldos_sumando(ordinal))
+    
+    def test_saldo_al_contra_suma_de_movimientos(self):
+        self.comprobar([INICIO - timedelta(days=1), INICIO, INICIO + timedelta(days=37),
+                        INICIO + timedelta(days=119), date.today()])
+    
+    def test_asientos_con_fecha_anterior_despues_de_consultar(self):
+        fecha = INICIO + timedelta(days=60)
+        antes = self.sistema.saldo("Bancos", fecha)
+        self.sistema.registrar_asiento("Depósito", {"Bancos": 700}, {"Caja": 700}, INICIO + timedelta(days=3))
+        self.assertEqual(self.sistema.saldo("Bancos", fecha), antes + 700)
+        self.assertEqual(self.sistema.saldo("Bancos", INICIO + timedelta(days=2)),
+                         self.saldos_sumando((INICIO + timedelta(days=2)).toordinal())["Bancos"])
+        self.comprobar([INICIO + timedelta(days=3), fecha])
+    
+    def test_reportes_a_una_fecha_de_corte(self):
+        fecha = INICIO + timedelta(days=45)
+        saldos = self.saldos_sumando(fecha.toordinal())
+        self.assertEqual(self.sistema.generar_balance_general(hasta=fecha),
+                         self.sistema.generar_balance_general(saldos, hasta=fecha))
+        self.assertEqual(self.sistema.generar_balanza_comprobacion(hasta=fecha),
+                         self.sistema.generar_balanza_comprobacion(saldos, hasta=fecha))
+    
+    def test_cuenta_inexistente(self):
+        self.assertRaises(ValueError, self.sistema.saldo, "No existe", INICIO)
+        self.assertEqual(self.sistema.saldo("Anticipo de clientes", INICIO), 0)  # Sin movimientos
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""Pruebas del servicio HTTP/JSON sin abrir sockets: validación de montos, errores de la
+persistencia a la mitad de un lote, registro con SQLite desde el hilo escritor y
+consultas sobre la vista publicada, que no copian el sistema ni detienen al escritor.
+
+Uso: python -m unittest discover tests
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import date
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bitacora import BitacoraJSONL
+from persistencia_sqlite import PersistenciaSQLite
+from servidor import ErrorPeticion, ServidorContable
+from sistema_contable_completo import SistemaContable
+
+VENTA = ("Venta", {"Bancos": 11600}, {"Ventas": 10000, "IVA trasladado": 1600})
+
+
+class PruebasServidor(unittest.TestCase):
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.bitacora = BitacoraJSONL(os.path.join(self.directorio.name, "diario.jsonl"))
+        self.sistema = SistemaContable(self.bitacora)
+        self.servidor = ServidorContable(self.sistema)
+    
+    def tearDown(self):
+        self.servidor._escritor.shutdown()
+        self.servidor._lectores.shutdown()
+        self.bitacora.cerrar()
+        self.directorio.cleanup()
+    
+    @staticmethod
+    async def con_escritor(servidor, corrutina):
+        """Ejecuta corrutina con la cola y la tarea escritora del servidor, sin abrir el socket"""
+        servidor._cola = asyncio.Queue()
+        servidor._tarea_escritor = asyncio.create_task(servidor._escribir())
+        try:
+            return await corrutina
+        finally:
+            servidor._tarea_escritor.cancel()
+    
+    def test_montos_no_positivos_se_rechazan_antes_de_encolar(self):
+        for operacion, datos in (("venta_efectivo", {"monto_sin_iva": "0", "costo_venta": "0"}),
+                                 ("venta_credito", {"monto_sin_iva": "-100", "costo_venta": "10"}),
+                                 ("venta_credito", {"monto_sin_iva": "100", "costo_venta": "-10"}),
+                                 ("gasto_financiero", {"monto": "-5"})):
+            with self.assertRaises(ErrorPeticion) as contexto:
+                asyncio.run(self.servidor.registrar_operacion(operacion, datos))
+            self.assertEqual(contexto.exception.estado, 400)
+        self.assertIsNone(self.servidor._cola)  # Nada se encoló (la cola se crea al iniciar)
+    
+    def test_error_de_persistencia_solo_falla_lo_que_no_se_guardo(self):
+        fechas = [date(2026, 1, dia).toordinal() for dia in (5, 6, 7)]
+        anexar = self.bitacora.anexar
+        
+        def anexar_con_falla(fecha, asientos):
+            if fecha == fechas[1]:
+                raise OSError("disco lleno")
+            anexar(fecha, asientos)
+        
+        numero = self.sistema.almacen.num_asientos() + 1
+        with mock.patch.object(self.bitacora, "anexar", side_effect=anexar_con_falla):
+            resultados = self.servidor._registrar([(fechas[0], VENTA), (fechas[1], VENTA), (fechas[0], VENTA),
+                                                   (fechas[2], VENTA)])
+        self.assertEqual(resultados[0], numero)
+        self.assertEqual(resultados[2], numero + 1)
+        self.assertIsInstance(resultados[1], OSError)
+        self.assertIsInstance(resultados[3], ErrorPeticion)
+        self.assertEqual(resultados[3].estado, 503)
+        self.assertEqual(self.servidor.registrados, 2)
+        self.assertEqual(self.servidor.publicados.asientos, numero + 1)
+    
+    def test_saldo_a_fecha_y_balanza_sin_instantanea(self):
+        self.servidor._registrar([(date(2026, 1, 5).toordinal(), VENTA), (date(2026, 2, 5).toordinal(), VENTA)])
+        with mock.patch.object(SistemaContable, "instantanea", side_effect=AssertionError("copia completa")):
+            respuesta = asyncio.run(self.servidor.saldo("Ventas", date(2026, 1, 31).toordinal()))
+            self.assertEqual(respuesta["saldo"], -10000)
+            texto = asyncio.run(self.servidor.reporte("balanza", None, date(2026, 1, 31).toordinal()))
+            self.assertEqual(texto, self.sistema.generar_balanza_comprobacion(hasta=date(2026, 1, 31)))
+    
+    
+    def test_reporte_lento_no_retrasa_un_registro(self):
+        self.servidor._registrar([(date(2026, 1, 5).toordinal(), VENTA)])
+        esperado = self.sistema.generar_balanza_comprobacion()
+        generar = SistemaContable.generar_balanza_comprobacion
+        empezado = threading.Event()
+        liberar = threading.Event()
+        
+        def balanza_lenta(sistema, saldos=None, desde=None, hasta=None):
+            empezado.set()
+            liberar.wait(10)
+            return generar(sistema, saldos, desde, hasta)
+        
+        async def reporte_y_registro():
+            loop = asyncio.get_running_loop()
+            reporte = asyncio.ensure_future(self.servidor.reporte("balanza", None, None))
+            await loop.run_in_executor(None, empezado.wait, 10)
+            try:
+                respuesta = await asyncio.wait_for(self.servidor.registrar_operacion(
+                    "venta_efectivo", {"monto_sin_iva": "50.00", "costo_venta": "0", "fecha": "2026-01-06"}), 5)
+            finally:
+                liberar.set()
+            return respuesta, await reporte
+        
+        with mock.patch.object(SistemaContable, "generar_balanza_comprobacion", balanza_lenta):
+            respuesta, texto = asyncio.run(self.con_escritor(self.servidor, reporte_y_registro()))
+        self.assertEqual(respuesta["asiento"], self.sistema.almacen.num_asientos())
+        # El reporte es el de la versión publicada al pedirlo
+        self.assertEqual(texto, esperado)
+    
+    def test_vista_publicada_no_cambia_con_lotes_posteriores(self):
+        self.servidor._registrar([(date(2026, 1, dia).toordinal(), VENTA) for dia in (5, 10, 20)])
+        publicados = self.servidor.publicados
+        
+        def reportes():
+            return [asyncio.run(self.servidor.reporte(tipo, date(2026, 1, 1).toordinal(), date(2026, 1, 12).toordinal()))
+                    for tipo in ("diario", "mayor", "flujos", "balanza")] + [
+                    asyncio.run(self.servidor.saldo("Bancos", date(2026, 1, 12).toordinal()))["saldo"]]
+        
+        esperado = reportes()
+        # Asientos con fecha anterior y posterior que cambian los reportes del periodo
+        self.servidor._registrar([(date(2026, 1, dia).toordinal(), VENTA) for dia in (3, 7, 25)])
+        self.assertNotEqual(reportes(), esperado)
+        with mock.patch.object(self.servidor, "publicados", publicados):
+            self.assertEqual(reportes(), esperado)
+    
+    def test_registrar_con_sqlite(self):
+        ruta = os.path.join(self.directorio.name, "diario.db")
+        persistencia = PersistenciaSQLite(ruta)
+        servidor = ServidorContable(SistemaContable(persistencia))
+        try:
+            respuesta = asyncio.run(self.con_escritor(servidor, servidor.registrar_operacion(
+                "venta_efectivo", {"monto_sin_iva": "100.00", "costo_venta": "40", "fecha": "2026-01-05"})))
+        finally:
+            servidor._escritor.shutdown()
+            servidor._lectores.shutdown()
+            persistencia.cerrar()
+        self.assertEqual(respuesta["cargos"], {"Bancos": 11600, "Costo de ventas": 4000})
+        
+        # El asiento quedó guardado en la base, no solo en memoria
+        persistencia = PersistenciaSQLite(ruta)
+        try:
+            recuperado = SistemaContable(persistencia)
+            self.assertEqual(recuperado.almacen.num_asientos(), respuesta["asiento"])
+            self.assertEqual(recuperado.cuentas, servidor.sistema.cuentas)
+        finally:
+            persistencia.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()